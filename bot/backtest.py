@@ -0,0 +1,653 @@
+"""
+이벤트 기반 백테스터
+
+과거 체결(get_trades_ticks) 또는 캔들(get_ohlcv, 로컬 파일)을 체결 테이프로 재생하면서
+bot.strategy.trade_program(실거래와 같은 매수/매도 상태 머신)을 가상 시계로 실행합니다.
+지정가 주문은 테이프의 체결 가격이 주문 가격을 통과할 때 수수료를 포함해 체결되며,
+결과로 체결 내역, 손익, 낙폭(drawdown) 리포트를 만듭니다.
+
+사용 예:
+    python -m bot.backtest KRW-BTC --source ohlcv --interval minute1 --count 20000
+    python -m bot.backtest KRW-BTC --file btc_trades.npz
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from python_bithumb.order_rules import get_tick_size
+from python_bithumb.resample import bucket_starts
+
+from bot.signals import SignalConfig, evaluate_signals
+from bot.strategy import (
+    Call, GetOrderbook, CheckBuy, CheckEmergency, Sleep, Notify, SavePosition,
+    StrategyConfig, TraderContext, trade_program
+)
+
+# 캔들 간격별 길이(초). 월봉은 달마다 길이가 달라 _bar_seconds에서 KST 달력 기준으로 계산
+INTERVAL_SECONDS = {
+    "minute1": 60, "minute3": 180, "minute5": 300, "minute10": 600, "minute15": 900,
+    "minute30": 1800, "minute60": 3600, "minute240": 14400, "day": 86400, "week": 604800,
+}
+# get_ohlcv 캔들 시각(타임존 없음)은 KST
+KST_OFFSET_SECONDS = 9 * 3600
+
+# 체결 내역: 시각(초), 매수/매도("bid"/"ask"), 주문 유형("limit"/"market"), 가격, 수량, 수수료
+Fill = namedtuple("Fill", ["time", "side", "ord_type", "price", "volume", "fee"])
+
+
+def _to_epoch_seconds(index) -> np.ndarray:
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        return index.tz_convert("UTC").tz_localize(None).values.astype("datetime64[ns]").astype(np.int64) / 1e9
+    return index.values.astype("datetime64[ns]").astype(np.int64) / 1e9 - KST_OFFSET_SECONDS
+
+
+def _bar_seconds(starts, interval) -> np.ndarray:
+    # 캔들별 길이(초). 월봉은 KST 기준 다음 달 1일까지의 실제 길이 (28~31일)
+    if interval != "month":
+        return np.full(len(starts), float(INTERVAL_SECONDS[interval]))
+    months = (np.floor(starts).astype(np.int64) + KST_OFFSET_SECONDS).astype("datetime64[s]").astype("datetime64[M]")
+    next_starts = (months + 1).astype("datetime64[s]").astype(np.int64) - KST_OFFSET_SECONDS
+    return next_starts - starts
+
+
+class TradeTape:
+    """
+    시각 오름차순으로 정렬된 체결 테이프.
+
+    Parameters
+    ----------
+    ticker : str
+        마켓 코드 (예: "KRW-BTC")
+    times : array-like
+        체결 시각 (epoch 초)
+    prices : array-like
+        체결 가격
+    volumes : array-like
+        체결 수량
+    """
+
+    def __init__(self, ticker, times, prices, volumes):
+        times = np.asarray(times, dtype=np.float64)
+        order = np.argsort(times, kind="stable")
+        self.ticker = ticker
+        self.times = times[order]
+        self.prices = np.asarray(prices, dtype=np.float64)[order]
+        self.volumes = np.asarray(volumes, dtype=np.float64)[order]
+        self._bars = {}
+
+    def __len__(self):
+        return len(self.times)
+
+    @property
+    def start(self):
+        return float(self.times[0])
+
+    @property
+    def end(self):
+        return float(self.times[-1])
+
+    @classmethod
+    def from_trades(cls, ticker, trades):
+        """
+        get_trades_ticks 응답(dict 리스트 또는 DataFrame)으로 테이프를 만듭니다.
+        """
+        df = pd.DataFrame(trades)
+        return cls(ticker, df["timestamp"].values / 1000.0, df["trade_price"].values, df["trade_volume"].values)
+
+    @classmethod
+    def from_ohlcv(cls, ticker, df, interval="minute1"):
+        """
+        get_ohlcv 결과로 테이프를 만듭니다.
+
+        캔들 1개를 시가 -> 저가/고가 -> 종가 순서의 체결 4개로 나눕니다. 양봉은 저가를 먼저,
+        음봉은 고가를 먼저 지나는 것으로 가정하며, 거래량은 4등분합니다.
+        """
+        starts = _to_epoch_seconds(df.index)
+        seconds = _bar_seconds(starts, interval)
+        o, h, l, c = (df[field].values.astype(np.float64) for field in ("open", "high", "low", "close"))
+        up = c >= o
+        prices = np.column_stack([o, np.where(up, l, h), np.where(up, h, l), c]).ravel()
+        times = (starts[:, None] + np.array([0.0, 0.25, 0.5, 0.75]) * seconds[:, None]).ravel()
+        if "volume" in df:
+            volumes = np.repeat(df["volume"].values.astype(np.float64) / 4, 4)
+        else:
+            volumes = np.full(len(prices), np.inf)
+        return cls(ticker, times, prices, volumes)
+
+    @classmethod
+    def load(cls, path, ticker=None, interval="minute1"):
+        """
+        로컬 파일에서 테이프를 읽습니다.
+
+        - .npz: save()로 저장한 배열 (times, prices, volumes)
+        - .csv: 체결(timestamp, trade_price, trade_volume) 또는 캔들(open, high, low, close[, volume]) 컬럼
+        """
+        if path.endswith(".npz"):
+            data = np.load(path, allow_pickle=False)
+            if ticker is None and "ticker" in data:
+                ticker = str(data["ticker"])
+            return cls(ticker, data["times"], data["prices"], data["volumes"])
+        df = pd.read_csv(path)
+        if "trade_price" in df:
+            return cls.from_trades(ticker, df)
+        index_column = "candle_date_time_kst" if "candle_date_time_kst" in df else df.columns[0]
+        df = df.set_index(pd.to_datetime(df[index_column]))
+        return cls.from_ohlcv(ticker, df, interval)
+
+    def save(self, path):
+        """
+        테이프를 .npz 파일로 저장합니다.
+        """
+        np.savez(path, ticker=self.ticker, times=self.times, prices=self.prices, volumes=self.volumes)
+
+    def save_arrays(self, directory):
+        """
+        테이프를 디렉터리에 .npy 배열 파일로 저장합니다. open()으로 메모리 매핑하여 여러 프로세스가
+        복사 없이 공유할 수 있습니다.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in ("times", "prices", "volumes"):
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, "ticker.txt"), "w", encoding="utf-8") as f:
+            f.write(self.ticker or "")
+
+    @classmethod
+    def open(cls, directory):
+        """
+        save_arrays()로 저장한 테이프를 읽기 전용 메모리 매핑으로 엽니다. (정렬/복사 없음)
+        """
+        tape = cls.__new__(cls)
+        with open(os.path.join(directory, "ticker.txt"), encoding="utf-8") as f:
+            tape.ticker = f.read().strip() or None
+        for name in ("times", "prices", "volumes"):
+            setattr(tape, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r"))
+        tape._bars = {}
+        return tape
+
+    def index_at(self, t) -> int:
+        """
+        시각 t 이전(포함) 마지막 체결의 위치. 없으면 -1.
+        """
+        return int(np.searchsorted(self.times, t, side="right")) - 1
+
+    def bars(self, interval):
+        """
+        interval 간격 캔들의 (체결별 캔들 번호, 캔들 시가, 캔들 종가)를 반환합니다. (캐시)
+        """
+        bars = self._bars.get(interval)
+        if bars is None:
+            # 거래소 캔들과 같은 경계 (일봉 이상은 KST 자정, 주봉은 월요일, 월봉은 1일 시작)
+            keys = bucket_starts(np.floor(self.times).astype(np.int64), interval)
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+            ends = np.r_[starts[1:], len(keys)] - 1
+            bar_of_trade = np.cumsum(np.r_[True, keys[1:] != keys[:-1]]) - 1
+            bars = self._bars[interval] = (bar_of_trade, self.prices[starts], self.prices[ends])
+        return bars
+
+    def candle_window(self, interval, count, i):
+        """
+        체결 i 시점에 get_ohlcv(interval, count)로 보였을 (시가, 종가) 배열.
+        마지막 캔들은 진행 중인 캔들로, 종가는 체결 i의 가격입니다.
+        """
+        bar_of_trade, opens, closes = self.bars(interval)
+        j = bar_of_trade[i]
+        start = max(0, j - count + 1)
+        window_open = opens[start:j + 1]
+        window_close = closes[start:j + 1].copy()
+        window_close[-1] = self.prices[i]
+        return window_open, window_close
+
+
+class SimulatedExchange:
+    """
+    체결 테이프 위의 가상 거래소 (Bithumb 클라이언트와 같은 주문 메소드).
+
+    지정가 주문은 주문 이후의 체결이 주문 가격을 통과(매수는 더 낮은 가격, 매도는 더 높은 가격)할 때
+    해당 체결 수량 x participation만큼 주문 가격으로 체결됩니다. fill_on_touch=True이면 같은 가격의
+    체결에도 체결됩니다. 주문 시점에 즉시 체결 가능한 가격(매수 >= 최우선 매도호가)이면 최우선 호가로
+    바로 체결되고, 시장가 매도는 최우선 매수호가로 전량 체결됩니다.
+
+    Parameters
+    ----------
+    tape : TradeTape
+        체결 테이프
+    fee_rate : float, optional (default 0.0025)
+        체결 금액 대비 수수료율
+    participation : float, optional (default 1.0)
+        체결 1건의 수량 중 내 주문에 배정되는 비율
+    fill_on_touch : bool, optional (default False)
+        주문 가격과 같은 가격의 체결도 체결로 인정할지 여부
+    levels : int, optional (default 5)
+        호가 단계 수
+    """
+
+    def __init__(self, tape, fee_rate=0.0025, participation=1.0, fill_on_touch=False, levels=5):
+        self.tape = tape
+        self.fee_rate = fee_rate
+        self.participation = participation
+        self.fill_on_touch = fill_on_touch
+        self.levels = levels
+        self.now = tape.start
+        self.cursor = 0  # 처리한 마지막 체결 위치
+        self.position = 0.0
+        self.cash = 0.0
+        self.cost_basis = 0.0  # 보유 수량의 취득 원가 (수수료 포함)
+        self.realized_pnl = 0.0
+        self.fees = 0.0
+        self.fills = []
+        self.closed_trades = []  # 매도 체결별 실현 손익
+        self._orders = {}
+        self._open_orders = {}
+        self._uuid = itertools.count(1)
+
+    # ------------------------------------------------------------------
+    # 시계/체결 처리
+    # ------------------------------------------------------------------
+    @property
+    def last_price(self):
+        return float(self.tape.prices[self.cursor])
+
+    def advance_to(self, t):
+        """
+        시각 t까지의 체결을 처리하여 미체결 주문을 체결시킵니다.
+        """
+        end = self.tape.index_at(t)
+        if end > self.cursor:
+            for order in list(self._open_orders.values()):
+                self._match(order, self.cursor + 1, end + 1)
+            self.cursor = end
+        self.now = max(self.now, t)
+
+    def _match(self, order, start, stop):
+        limit = float(order["price"])
+        prices = self.tape.prices[start:stop]
+        if order["side"] == "bid":
+            hit = prices <= limit if self.fill_on_touch else prices < limit
+        else:
+            hit = prices >= limit if self.fill_on_touch else prices > limit
+        if not hit.any():
+            return
+        index = np.flatnonzero(hit)
+        available = np.cumsum(self.tape.volumes[start:stop][index] * self.participation)
+        remaining = float(order["remaining_volume"])
+        k = min(int(np.searchsorted(available, remaining)), len(index) - 1)
+        volume = min(remaining, float(available[k]))
+        self._fill(order, limit, volume, float(self.tape.times[start + index[k]]))
+
+    def _fill(self, order, price, volume, at):
+        funds = price * volume
+        fee = funds * self.fee_rate
+        order["trades"].append({"price": str(price), "volume": str(volume), "funds": str(funds)})
+        executed = float(order["executed_volume"]) + volume
+        remaining = max(float(order["volume"]) - executed, 0.0)
+        order["executed_volume"] = str(executed)
+        order["remaining_volume"] = str(remaining)
+        order["paid_fee"] = str(float(order["paid_fee"]) + fee)
+        if remaining <= 1e-12:
+            order["remaining_volume"] = "0"
+            order["state"] = "done"
+            self._open_orders.pop(order["uuid"], None)
+
+        self.fees += fee
+        if order["side"] == "bid":
+            self.cash -= funds + fee
+            self.position += volume
+            self.cost_basis += funds + fee
+        else:
+            average_cost = self.cost_basis / self.position if self.position > 0 else price
+            pnl = funds - fee - average_cost * volume
+            self.cash += funds - fee
+            self.cost_basis -= average_cost * volume
+            self.position -= volume
+            if self.position <= 1e-12:
+                self.position = 0.0
+                self.cost_basis = 0.0
+            self.realized_pnl += pnl
+            self.closed_trades.append(pnl)
+        self.fills.append(Fill(at, order["side"], order["ord_type"], price, volume, fee))
+
+    def orderbook(self):
+        """
+        마지막 체결 가격 기준으로 만든 호가 (python_bithumb.get_orderbook 형식).
+        """
+        price = self.last_price
+        tick = float(get_tick_size(price))
+        best_bid = np.floor(price / tick) * tick
+        units = [
+            {
+                "ask_price": round(best_bid + (k + 1) * tick, 8),
+                "bid_price": round(best_bid - k * tick, 8),
+                "ask_size": 0.0,
+                "bid_size": 0.0,
+            }
+            for k in range(self.levels)
+        ]
+        return {"market": self.tape.ticker, "timestamp": int(self.now * 1000), "orderbook_units": units}
+
+    def equity(self):
+        return self.cash + self.position * self.last_price
+
+    # ------------------------------------------------------------------
+    # 주문 (Bithumb 클라이언트 인터페이스)
+    # ------------------------------------------------------------------
+    def _new_order(self, market, side, ord_type, price, volume):
+        order = {
+            "uuid": f"bt-{next(self._uuid)}",
+            "market": market,
+            "side": side,
+            "ord_type": ord_type,
+            "price": None if price is None else str(price),
+            "state": "wait",
+            "volume": str(volume),
+            "remaining_volume": str(volume),
+            "executed_volume": "0",
+            "paid_fee": "0",
+            "trades": [],
+        }
+        self._orders[order["uuid"]] = order
+        return order
+
+    def _check_sell_volume(self, volume):
+        if volume > self.position + 1e-12:
+            raise ValueError(f"insufficient_funds_ask: volume {volume} > balance {self.position}")
+
+    def _limit_order(self, side, ticker, price, volume):
+        order = self._new_order(ticker, side, "limit", float(price), float(volume))
+        units = self.orderbook()["orderbook_units"]
+        if side == "bid" and float(price) >= units[0]["ask_price"]:
+            self._fill(order, units[0]["ask_price"], float(volume), self.now)
+        elif side == "ask" and float(price) <= units[0]["bid_price"]:
+            self._fill(order, units[0]["bid_price"], float(volume), self.now)
+        else:
+            self._open_orders[order["uuid"]] = order
+        return dict(order, trades=list(order["trades"]))
+
+    def buy_limit_order(self, ticker, price, volume):
+        return self._limit_order("bid", ticker, price, volume)
+
+    def sell_limit_order(self, ticker, price, volume):
+        self._check_sell_volume(float(volume))
+        return self._limit_order("ask", ticker, price, volume)
+
+    def sell_market_order(self, ticker, volume):
+        self._check_sell_volume(float(volume))
+        order = self._new_order(ticker, "ask", "market", None, float(volume))
+        self._fill(order, self.orderbook()["orderbook_units"][0]["bid_price"], float(volume), self.now)
+        return dict(order, trades=list(order["trades"]))
+
+    def get_order(self, uuid):
+        order = self._orders[uuid]
+        return dict(order, trades=list(order["trades"]))
+
+    def cancel_order(self, order_uuid):
+        order = self._orders.get(order_uuid)
+        if order is None or order["state"] != "wait":
+            raise ValueError("order_not_found")
+        order["state"] = "cancel"
+        self._open_orders.pop(order_uuid, None)
+        return dict(order, trades=list(order["trades"]))
+
+
+class BacktestResult:
+    """
+    백테스트 결과.
+
+    Attributes
+    ----------
+    ticker : str
+        마켓 코드
+    fills : list of Fill
+        체결 내역
+    equity_times, equity : numpy.ndarray
+        시각별 평가 손익 (현금 + 보유 수량 x 마지막 체결가, 시작 시 0)
+    events : int
+        재생한 체결 수
+    effects : int
+        상태 머신이 요청한 Effect 수
+    elapsed : float
+        실행 시간(초)
+    """
+
+    def __init__(self, ticker, exchange, equity_times, equity, effects, elapsed):
+        self.ticker = ticker
+        self.fills = list(exchange.fills)
+        self.equity_times = np.asarray(equity_times, dtype=np.float64)
+        self.equity = np.asarray(equity, dtype=np.float64)
+        self.events = exchange.cursor + 1
+        self.effects = effects
+        self.elapsed = elapsed
+        self.realized_pnl = exchange.realized_pnl
+        self.fees = exchange.fees
+        self.final_position = exchange.position
+        self.final_price = exchange.last_price
+        self.closed_trades = list(exchange.closed_trades)
+
+    @property
+    def total_pnl(self):
+        return float(self.equity[-1]) if len(self.equity) else 0.0
+
+    def drawdown(self) -> np.ndarray:
+        """
+        시각별 낙폭 (직전 최고 평가 손익 - 현재 평가 손익).
+        """
+        if len(self.equity) == 0:
+            return self.equity
+        return np.maximum.accumulate(np.maximum(self.equity, 0.0)) - self.equity
+
+    def summary(self) -> dict:
+        """
+        주요 지표를 dict로 반환합니다.
+        """
+        drawdown = self.drawdown()
+        wins = sum(1 for pnl in self.closed_trades if pnl > 0)
+        return {
+            "ticker": self.ticker,
+            "events": self.events,
+            "effects": self.effects,
+            "fills": len(self.fills),
+            "buys": sum(1 for fill in self.fills if fill.side == "bid"),
+            "sells": sum(1 for fill in self.fills if fill.side == "ask"),
+            "emergency_sells": sum(1 for fill in self.fills if fill.ord_type == "market"),
+            "realized_pnl": self.realized_pnl,
+            "fees": self.fees,
+            "final_position": self.final_position,
+            "total_pnl": self.total_pnl,
+            "max_drawdown": float(drawdown.max()) if len(drawdown) else 0.0,
+            "win_rate": wins / len(self.closed_trades) if self.closed_trades else None,
+            "events_per_minute": self.events / self.elapsed * 60 if self.elapsed > 0 else None,
+        }
+
+    def fills_frame(self) -> pd.DataFrame:
+        """
+        체결 내역 DataFrame (index: 체결 시각, UTC).
+        """
+        df = pd.DataFrame(self.fills, columns=Fill._fields)
+        df.index = pd.to_datetime(df.pop("time"), unit="s")
+        return df
+
+    def equity_frame(self) -> pd.DataFrame:
+        """
+        평가 손익과 낙폭 DataFrame (index: 시각, UTC).
+        """
+        index = pd.to_datetime(self.equity_times, unit="s")
+        return pd.DataFrame({"equity": self.equity, "drawdown": self.drawdown()}, index=index)
+
+
+class Backtester:
+    """
+    체결 테이프 위에서 trade_program을 가상 시계로 실행합니다.
+
+    Sleep Effect만 시계를 진행시키며, 그 사이의 체결로 미체결 주문을 처리합니다.
+    CheckBuy/CheckEmergency는 테이프에서 만든 캔들로 check_buy_conditions /
+    check_emergency_sell_conditions와 같은 규칙(bot.signals.evaluate_signals)을 평가합니다.
+
+    Parameters
+    ----------
+    tape : TradeTape
+        체결 테이프
+    trade_amount : float
+        1회 주문 수량
+    strategy_config : StrategyConfig, optional
+        상태 머신 설정값 (MAX_POLLS, ORDER_COOLDOWN_SECONDS). 생략 시 .env 설정값 사용
+    signal_config : SignalConfig, optional
+        매수/긴급 매도 조건 설정값 (CANDLE_INTERVAL, CANDLE_COUNT, PERCENTILE_THRESHOLD,
+        EMERGENCY_CANDLE_COUNT). 생략 시 .env 설정값 사용
+    action_delay_seconds : float, optional (default 1)
+        각 액션 후 대기 시간(초)
+    log : callable, optional
+        상태 머신 로그 출력 함수. 생략 시 출력하지 않음
+    equity_interval : float, optional (default 60)
+        평가 손익 기록 간격(초)
+    **exchange_options
+        SimulatedExchange 옵션 (fee_rate, participation, fill_on_touch, levels)
+    """
+
+    def __init__(self, tape, trade_amount, strategy_config=None, signal_config=None, action_delay_seconds=1,
+                 log=None, equity_interval=60.0, **exchange_options):
+        self.tape = tape
+        self.trade_amount = trade_amount
+        self.strategy_config = strategy_config if strategy_config is not None else StrategyConfig.from_env()
+        self.signal_config = signal_config if signal_config is not None else SignalConfig.from_env()
+        self.action_delay_seconds = action_delay_seconds
+        self.log = log or (lambda message: None)
+        self.equity_interval = equity_interval
+        self.exchange = SimulatedExchange(tape, **exchange_options)
+        self.notifications = []
+
+    def _signals(self, bid_price):
+        config = self.signal_config
+        i = self.exchange.cursor
+        _, close = self.tape.candle_window(config.candle_interval, config.candle_count, i)
+        open_short, close_short = self.tape.candle_window(config.down_interval, config.down_count, i)
+        return evaluate_signals([self.tape.ticker], [bid_price], close[None, :],
+                                open_short[None, :], close_short[None, :], config)
+
+    def _handle(self, effect):
+        exchange = self.exchange
+        if isinstance(effect, Call):
+            return getattr(exchange, effect.method)(*effect.args)
+        if isinstance(effect, GetOrderbook):
+            return exchange.orderbook()
+        if isinstance(effect, CheckBuy):
+            return bool(self._signals(effect.bid_price).can_buy[0])
+        if isinstance(effect, CheckEmergency):
+            return bool(self._signals(np.nan).emergency_sell[0])
+        if isinstance(effect, Sleep):
+            exchange.advance_to(exchange.now + effect.seconds)
+            return exchange.now
+        if isinstance(effect, Notify):
+            self.notifications.append((exchange.now, effect.title, effect.message))
+            return None
+        if isinstance(effect, SavePosition):
+            return None
+        raise TypeError(f"Unknown effect: {effect!r}")
+
+    def run(self, end=None) -> BacktestResult:
+        """
+        테이프 끝(또는 end 시각)까지 실행하고 결과를 반환합니다.
+        """
+        end = self.tape.end if end is None else end
+        exchange = self.exchange
+        ctx = TraderContext(f"{self.tape.ticker.split('-')[-1]}-Backtest", self.tape.ticker, self.trade_amount,
+                            self.log, config=self.strategy_config)
+        program = trade_program(ctx, self.action_delay_seconds)
+        equity_times, equity = [exchange.now], [0.0]
+        next_sample = exchange.now + self.equity_interval
+        effects = 0
+        started = time.perf_counter()
+
+        value, error = None, None
+        try:
+            while exchange.now < end:
+                effect = program.throw(error) if error is not None else program.send(value)
+                effects += 1
+                try:
+                    value, error = self._handle(effect), None
+                except Exception as e:
+                    value, error = None, e
+                if exchange.now >= next_sample:
+                    equity_times.append(exchange.now)
+                    equity.append(exchange.equity())
+                    next_sample = exchange.now + self.equity_interval
+        finally:
+            program.close()
+        equity_times.append(exchange.now)
+        equity.append(exchange.equity())
+        return BacktestResult(self.tape.ticker, exchange, equity_times, equity, effects,
+                              time.perf_counter() - started)
+
+
+def run_backtest(tape, trade_amount, **options) -> BacktestResult:
+    """
+    Backtester(tape, trade_amount, **options).run()의 단축 함수.
+    """
+    return Backtester(tape, trade_amount, **options).run()
+
+
+def fetch_trade_tape(ticker, count=10000, days_ago=None):
+    """
+    get_trades_ticks로 최근 체결을 count개까지 (cursor 페이지 단위로) 받아 테이프를 만듭니다.
+    """
+    import python_bithumb
+
+    trades = []
+    cursor = None
+    while len(trades) < count:
+        page = python_bithumb.get_trades_ticks(ticker, count=min(500, count - len(trades)), cursor=cursor,
+                                               daysAgo=days_ago)
+        if not page:
+            break
+        trades.extend(page)
+        cursor = page[-1].get("sequential_id")
+        if cursor is None:
+            break
+    return TradeTape.from_trades(ticker, trades)
+
+
+def fetch_ohlcv_tape(ticker, interval="minute1", count=2000):
+    """
+    get_ohlcv로 과거 캔들을 받아 테이프를 만듭니다.
+    """
+    import python_bithumb
+
+    return TradeTape.from_ohlcv(ticker, python_bithumb.get_ohlcv(ticker, interval=interval, count=count), interval)
+
+
+def _format_summary(summary):
+    lines = []
+    for key, value in summary.items():
+        if isinstance(value, float):
+            value = f"{value:,.4f}"
+        lines.append(f"{key:>18}: {value}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backtest the trading state machine on historical data.")
+    parser.add_argument("ticker", help="market code, e.g. KRW-BTC")
+    parser.add_argument("--file", help="local .npz/.csv tape instead of downloading")
+    parser.add_argument("--source", choices=["ohlcv", "trades"], default="ohlcv")
+    parser.add_argument("--interval", default="minute1", help="candle interval for --source ohlcv or candle CSV")
+    parser.add_argument("--count", type=int, default=2000, help="candles or trades to download")
+    parser.add_argument("--amount", type=float, default=1.0, help="order volume per trade")
+    parser.add_argument("--fee", type=float, default=0.0025, help="fee rate per fill")
+    parser.add_argument("--fills", help="write fills to this CSV path")
+    args = parser.parse_args()
+
+    if args.file:
+        tape = TradeTape.load(args.file, ticker=args.ticker, interval=args.interval)
+    elif args.source == "trades":
+        tape = fetch_trade_tape(args.ticker, count=args.count)
+    else:
+        tape = fetch_ohlcv_tape(args.ticker, interval=args.interval, count=args.count)
+    result = run_backtest(tape, args.amount, fee_rate=args.fee)
+    print(_format_summary(result.summary()), file=sys.stderr)
+    if args.fills:
+        result.fills_frame().to_csv(args.fills)
@@ -1,255 +1,142 @@
 import os
+import sys
 from dotenv import load_dotenv
 load_dotenv()
+# 스크립트로 실행(python3 bot/bot.py)할 때도 bot 패키지를 찾을 수 있도록 상위 디렉토리를 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import python_bithumb
 from python_bithumb.private_api import Bithumb
+from python_bithumb.rate_limit import RateLimiter
 import time
 import threading
-from datetime import datetime
 import numpy as np
-import requests
 import json
+from bot.strategy import (
+    Call, GetOrderbook, CheckBuy, CheckEmergency, Sleep, Notify, SavePosition,
+    TraderContext, TraderState, drive, sell_order_and_wait, buy_order_and_wait, trade_program
+)
+from bot.percentile import percentile_index
+from bot.notifier import get_notifier
+from bot.logger import DEBUG, ERROR, INFO, WARNING, get_logger, leveled
+from bot.profiling import get_profiler
+
+def log_with_timestamp(message, *args, level=INFO, **fields):
+    """
+    공용 구조화 로거(bot.logger.get_logger)로 로그를 남기는 함수. 블로킹하지 않습니다.
 
-def log_with_timestamp(message):
-    print(f"{datetime.now().strftime('[%Y-%m-%d %H:%M:%S]')} {message}")
+    args가 있으면 출력할 때 message % args로 포맷하고, fields는 JSON 로그에 함께 기록합니다.
+    """
+    get_logger().log(level, message, *args, **fields)
 
 # bithumb_client는 스레드들이 공유하므로, 전역 또는 main에서 한 번만 생성합니다.
 # 여기서는 main 함수 내에서 생성하는 것으로 유지하겠습니다.
 
+def _thread_context(ticker, trade_amount=None):
+    """
+    현재 스레드 이름과 스레드에 저장된 매수 정보로 상태 머신 컨텍스트를 만듭니다.
+    """
+    current_thread = threading.current_thread()
+    state = TraderState(
+        last_buy_price=getattr(current_thread, 'last_buy_price', None),
+        last_buy_volume=getattr(current_thread, 'last_buy_volume', None),
+    )
+    return TraderContext(current_thread.name, ticker, trade_amount, log_with_timestamp, state=state)
+
+def market_data_candle_fetcher(market_data):
+    """
+    시세 허브 스냅샷의 캔들을 우선 사용하고, 없거나 오래되었으면 직접 조회하는 get_candles 대체 함수를 만듭니다.
+    """
+    def fetch(ticker, interval="day", count=200):
+        max_age = market_data.candle_refresh.get(interval, 30.0) * 3
+        df = market_data.fetch_candles(ticker, interval=interval, count=count, max_age=max_age)
+        if df is None:
+            df = get_candles(ticker, interval=interval, count=count)
+        return df
+    return fetch
+
+def make_effect_handler(bithumb_api, market_data=None, journal=None, profiler=None):
+    """
+    상태 머신의 Effect를 블로킹 호출로 실행하는 핸들러를 만듭니다. (스레드 방식)
+
+    market_data(MarketDataHub)를 지정하면 호가/캔들을 허브 스냅샷에서 읽고,
+    스냅샷이 없거나 오래된 경우에만 직접 조회합니다.
+    journal(PositionJournal)을 지정하면 포지션 변경을 기록합니다.
+    profiler(StageProfiler)가 켜져 있으면 Effect 종류별 소요 시간과 대기를 뺀 루프 1회 시간(iteration)을
+    기록합니다. 생략 시 PROFILE_STAGES 설정의 공용 프로파일러 사용.
+    """
+    orderbook_max_age = float(os.getenv("MARKET_DATA_MAX_AGE", "3"))
+    fetch_candles = market_data_candle_fetcher(market_data) if market_data is not None else None
+    profiler = profiler or get_profiler()
+    woke_at = [profiler.clock()]
+
+    def run(effect):
+        if isinstance(effect, Call):
+            return getattr(bithumb_api, effect.method)(*effect.args)
+        if isinstance(effect, GetOrderbook):
+            if market_data is not None:
+                orderbook = market_data.get_orderbook(effect.ticker, max_age=orderbook_max_age)
+                if orderbook is not None:
+                    return orderbook
+            return python_bithumb.get_orderbook(effect.ticker)
+        if isinstance(effect, CheckBuy):
+            return check_buy_conditions(effect.ticker, effect.bid_price, fetch_candles)
+        if isinstance(effect, CheckEmergency):
+            return check_emergency_sell_conditions(effect.ticker, fetch_candles)
+        if isinstance(effect, Sleep):
+            time.sleep(effect.seconds)
+            return time.monotonic()
+        if isinstance(effect, Notify):
+            return send_discord_notification(effect.message, effect.title)
+        if isinstance(effect, SavePosition):
+            if journal is not None:
+                journal.record(*effect)
+            return None
+        raise TypeError(f"Unknown effect: {effect!r}")
+
+    def handle(effect):
+        if not profiler.enabled:
+            return run(effect)
+        if isinstance(effect, Sleep):
+            profiler.record("iteration", None, profiler.clock() - woke_at[0])
+            profiler.maybe_dump()
+            try:
+                return run(effect)
+            finally:
+                woke_at[0] = profiler.clock()
+        with profiler.stage(effect_stage(effect)):
+            return run(effect)
+    return handle
+
+# 프로파일링 구간 이름
+EFFECT_STAGES = {GetOrderbook: "orderbook", CheckBuy: "check_buy", CheckEmergency: "check_emergency",
+                 Sleep: "sleep", Notify: "notify", SavePosition: "save_position"}
+
+def effect_stage(effect):
+    """
+    프로파일링에 사용할 Effect의 구간 이름 (Call은 call.<메소드>).
+    """
+    if isinstance(effect, Call):
+        return f"call.{effect.method}"
+    return EFFECT_STAGES.get(type(effect), type(effect).__name__)
+
+def _sync_thread_state(state):
+    current_thread = threading.current_thread()
+    current_thread.last_buy_price = state.last_buy_price
+    current_thread.last_buy_volume = state.last_buy_volume
+
 def place_sell_order_and_wait(bithumb_api, ticker, price, volume):
-    thread_name = threading.current_thread().name
-    log_with_timestamp(f"[{thread_name}] Attempting to place sell order: {ticker}, Price: {price}, Volume: {volume}")
-    response = bithumb_api.sell_limit_order(ticker, price, volume)
-    position = None
-    if response and response.get('uuid'):
-        position = "sell"
-        log_with_timestamp(f"[{thread_name}] Sell order placed successfully. UUID: {response['uuid']}. Current position: {position}")
-        order_uuid = response['uuid']
-        order = bithumb_api.get_order(order_uuid)
-        state = order['state']
-
-        while state != 'done':
-            # 긴급 매도 조건 확인
-            if check_emergency_sell_conditions(ticker):
-                log_with_timestamp(f"[{thread_name}] Emergency sell conditions detected while waiting for sell order. Canceling current order and executing market sell.")
-                try:
-                    # 현재 주문 취소
-                    cancel_status = bithumb_api.cancel_order(order_uuid)
-                    log_with_timestamp(f"[{thread_name}] Cancel order {order_uuid} attempt status: {cancel_status}")
-
-                    # 시장가 매도 주문
-                    market_sell_response = bithumb_api.sell_market_order(ticker, volume)
-                    if market_sell_response and market_sell_response.get('uuid'):
-                        market_order_uuid = market_sell_response['uuid']
-                        market_order = bithumb_api.get_order(market_order_uuid)
-
-                        # 거래 정보 로깅
-                        executed_volume = float(market_order.get('executed_volume', 0))
-                        # trades 배열에서 평균 가격 계산
-                        trades = market_order.get('trades', [])
-                        if trades:
-                            total_funds = sum(float(trade['funds']) for trade in trades)
-                            executed_price = total_funds / executed_volume if executed_volume > 0 else 0
-                        else:
-                            executed_price = 0
-
-                        log_with_timestamp(f"\n=== Emergency Market Sell Details for {ticker} ===")
-                        log_with_timestamp(f"Original Limit Order Price: {price:,.2f}")
-                        log_with_timestamp(f"Market Sell Price: {executed_price:,.2f}")
-                        log_with_timestamp(f"Volume: {executed_volume:,.8f}")
-
-                        # 매수 가격이 저장되어 있다면 손실 금액도 계산
-                        if hasattr(threading.current_thread(), 'last_buy_price') and threading.current_thread().last_buy_price:
-                            loss_amount = (threading.current_thread().last_buy_price - executed_price) * executed_volume
-                            log_with_timestamp(f"Loss Amount: {loss_amount:,.2f} KRW")
-
-                            # 디스코드 알림 전송 (로그는 그대로 유지)
-                            notification_title = f"⚠️ Emergency Market Sell Executed: {ticker}"
-                            notification_message = (
-                                f"**Emergency Market Sell Details**\n\n"
-                                f"Original Limit Order Price: {price:,.2f}\n"
-                                f"Market Sell Price: {executed_price:,.2f}\n"
-                                f"Volume: {executed_volume:,.8f}\n"
-                                f"Loss Amount: {loss_amount:,.2f} KRW"
-                            )
-
-                            # 큰 손실 발생 시 추가 알림
-                            if loss_amount > 0:  # 손실 발생
-                                notification_title = f"💔 Loss Alert: {ticker}"
-
-                            send_discord_notification(notification_message, notification_title)
-
-                        # 매도 성공 시에만 포지션 초기화
-                        position = None
-                        threading.current_thread().last_buy_price = None
-                        threading.current_thread().last_buy_volume = None
-                        return market_order, position
-                    else:
-                        log_with_timestamp(f"[{thread_name}] Market sell order placement failed. Maintaining buy position for retry.")
-                        return None, "buy"  # 매도 실패 시 buy 포지션 유지
-                except Exception as e:
-                    log_with_timestamp(f"[{thread_name}] Error during emergency market sell: {e}")
-                    # 에러 발생 시에도 buy 포지션 유지
-                    return None, "buy"
-
-            time.sleep(1)
-            order = bithumb_api.get_order(order_uuid)
-            state = order['state']
-
-        log_with_timestamp(f"[{thread_name}] Order {order_uuid} (Sell) completed with state: {state}. Details: {order}")
-        # 매도 주문 체결 후 cooldown time 적용
-        cooldown_seconds = int(os.getenv("ORDER_COOLDOWN_SECONDS", "5"))  # 기본값 5초
-        log_with_timestamp(f"[{thread_name}] Applying cooldown time of {cooldown_seconds} seconds after sell order execution.")
-        time.sleep(cooldown_seconds)
-        return order, position
-    else:
-        log_with_timestamp(f"[{thread_name}] Sell order placement failed for {ticker}. Response: {response}")
-        return None, "buy"  # 매도 실패 시 buy 포지션 유지
+    ctx = _thread_context(ticker)
+    result = drive(sell_order_and_wait(ctx, price, volume), make_effect_handler(bithumb_api))
+    _sync_thread_state(ctx.state)
+    return result
 
 def place_buy_order_and_wait(bithumb_api, ticker, price, volume):
-    thread_name = threading.current_thread().name
-    log_with_timestamp(f"[{thread_name}] Attempting to place buy order: {ticker}, Price: {price}, Volume: {volume}")
-    response = bithumb_api.buy_limit_order(ticker, price, volume)
-    position = None
-    if response and response.get('uuid'):
-        position = "buy"
-        log_with_timestamp(f"[{thread_name}] Buy order placed successfully. UUID: {response['uuid']}. Current position: {position}")
-        order_uuid = response['uuid']
-        order = bithumb_api.get_order(order_uuid)
-        state = order['state']
-        poll_count = 0
-        max_polls = int(os.getenv("MAX_POLLS", "30"))  # 기본값 30회
-        last_executed_volume = 0.0
-        while state != 'done':
-            if poll_count >= max_polls:
-                # 현재 체결된 수량 확인
-                current_executed_volume = float(order.get('executed_volume', 0))
-                if current_executed_volume > last_executed_volume:
-                    # 새로운 체결이 발생한 경우, 폴링 카운트 리셋
-                    log_with_timestamp(f"[{thread_name}] New execution detected for order {order_uuid}. Resetting poll count.")
-                    poll_count = 0
-                    last_executed_volume = current_executed_volume
-                    continue
-                log_with_timestamp(f"[{thread_name}] Buy order {order_uuid} for {ticker} (Original Price: {price}) did not complete within {max_polls} polls. Checking current market bid price...")
-                current_orderbook = python_bithumb.get_orderbook(ticker)
-                if current_orderbook and current_orderbook.get('orderbook_units') and len(current_orderbook['orderbook_units']) > 0:
-                    current_bid_price_str = current_orderbook['orderbook_units'][0]['bid_price']
-                    log_with_timestamp(f"[{thread_name}] Original buy price for {order_uuid}: {price}, Current market bid price for {ticker}: {current_bid_price_str}")
-                    if float(current_bid_price_str) == float(price):
-                        # 시장 가격이 주문 가격과 동일한 경우, 주문 유지
-                        log_with_timestamp(f"[{thread_name}] Market bid price ({current_bid_price_str}) is same as order price ({price}). Resetting poll count for order {order_uuid}.")
-                        poll_count = 0
-                        order = bithumb_api.get_order(order_uuid)
-                        state = order['state']
-                        continue
-                    else:
-                        # 시장 가격이 변경된 경우, 남은 수량 취소 처리
-                        remaining_volume = float(order.get('remaining_volume', 0))
-                        if remaining_volume > 0:
-                            # 취소 전에 현재까지의 체결 수량 저장
-                            last_known_executed_volume = float(order.get('executed_volume', 0))
-
-                            log_with_timestamp(f"[{thread_name}] Market bid price ({current_bid_price_str}) differs from order price ({price}). Attempting to cancel remaining volume ({remaining_volume}) for order {order_uuid}.")
-
-                            # 취소 전에 한 번 더 주문 상태 확인
-                            try:
-                                final_check_order = bithumb_api.get_order(order_uuid)
-                                if final_check_order['state'] == 'done':
-                                    log_with_timestamp(f"[{thread_name}] Order {order_uuid} was completed before cancellation. Processing completed order.")
-                                    order = final_check_order
-                                    state = 'done'
-                                    break
-
-                                # 주문이 아직 진행 중인 경우에만 취소 시도
-                                cancel_status = bithumb_api.cancel_order(order_uuid)
-                                log_with_timestamp(f"[{thread_name}] Cancel order {order_uuid} attempt status: {cancel_status}")
-
-                                if last_known_executed_volume > 0:
-                                    # 부분 체결된 경우, 체결된 수량만큼 매도 시도
-                                    log_with_timestamp(f"[{thread_name}] Selling executed volume ({last_known_executed_volume}) from partially filled order.")
-                                    sell_order, _ = place_sell_order_and_wait(bithumb_api, ticker, current_bid_price_str, last_known_executed_volume)
-                                    if sell_order:
-                                        log_with_timestamp(f"[{thread_name}] Successfully sold {last_known_executed_volume} {ticker} from partially filled order.")
-                                        position = "sell"
-                                    else:
-                                        log_with_timestamp(f"[{thread_name}] Failed to sell {last_known_executed_volume} {ticker} from partially filled order.")
-                                else:
-                                    # 체결된 수량이 없는 경우, 포지션 초기화
-                                    log_with_timestamp(f"[{thread_name}] No executed volume for order {order_uuid}. Resetting position to None.")
-                                    position = None
-                                return order, position
-                            except Exception as e:
-                                if "order_not_found" in str(e):
-                                    # 주문이 이미 체결된 경우
-                                    log_with_timestamp(f"[{thread_name}] Order {order_uuid} was completed before cancellation. Processing completed order.")
-                                    state = 'done'
-                                    break
-                                else:
-                                    # 다른 에러의 경우
-                                    log_with_timestamp(f"[{thread_name}] Error during order cancellation: {e}")
-                                    raise
-                        else:
-                            log_with_timestamp(f"[{thread_name}] Order {order_uuid} is already fully executed.")
-                            state = 'done'
-                            continue
-                else:
-                    # 호가창 조회 실패 시 주문 취소 처리
-                    log_with_timestamp(f"[{thread_name}] Failed to fetch current orderbook for {ticker} or orderbook empty. Proceeding to cancel order {order_uuid} as a fallback.")
-                    try:
-                        # 취소 전에 한 번 더 주문 상태 확인
-                        final_check_order = bithumb_api.get_order(order_uuid)
-                        if final_check_order['state'] == 'done':
-                            log_with_timestamp(f"[{thread_name}] Order {order_uuid} was completed before cancellation. Processing completed order.")
-                            order = final_check_order
-                            state = 'done'
-                            break
-
-                        cancel_status = bithumb_api.cancel_order(order_uuid)
-                        log_with_timestamp(f"[{thread_name}] Fallback cancel order {order_uuid} attempt status: {cancel_status}.")
-                        if current_executed_volume > 0:
-                            # 부분 체결된 경우, 체결된 수량만큼 매도 시도
-                            log_with_timestamp(f"[{thread_name}] Selling executed volume ({current_executed_volume}) from partially filled order.")
-                            sell_order, _ = place_sell_order_and_wait(bithumb_api, ticker, price, current_executed_volume)
-                            if sell_order:
-                                log_with_timestamp(f"[{thread_name}] Successfully sold {current_executed_volume} {ticker} from partially filled order.")
-                                position = "sell"
-                            else:
-                                log_with_timestamp(f"[{thread_name}] Failed to sell {current_executed_volume} {ticker} from partially filled order.")
-                        else:
-                            # 체결된 수량이 없는 경우, 포지션 초기화
-                            log_with_timestamp(f"[{thread_name}] No executed volume for order {order_uuid}. Resetting position to None.")
-                            position = None
-                        return order, position
-                    except Exception as e:
-                        if "order_not_found" in str(e):
-                            # 주문이 이미 체결된 경우
-                            log_with_timestamp(f"[{thread_name}] Order {order_uuid} was completed before cancellation. Processing completed order.")
-                            state = 'done'
-                            break
-                        else:
-                            # 다른 에러의 경우
-                            log_with_timestamp(f"[{thread_name}] Error during fallback order cancellation: {e}")
-                            raise
-            time.sleep(1)
-            order = bithumb_api.get_order(order_uuid)
-            state = order['state']
-            poll_count += 1
-        # 주문 완료 시 체결 여부 확인
-        if state == 'done' and float(order.get('executed_volume', 0)) > 0:
-            log_with_timestamp(f"[{thread_name}] Order {order_uuid} (Buy) completed with state: {state}. Details: {order}")
-            # 매수 주문 체결 후 cooldown time 적용
-            cooldown_seconds = int(os.getenv("ORDER_COOLDOWN_SECONDS", "5"))  # 기본값 5초
-            log_with_timestamp(f"[{thread_name}] Applying cooldown time of {cooldown_seconds} seconds after buy order execution.")
-            time.sleep(cooldown_seconds)
-            return order, position
-        else:
-            log_with_timestamp(f"[{thread_name}] Order {order_uuid} completed but no execution. Resetting position to None.")
-            return order, None
-    else:
-        log_with_timestamp(f"[{thread_name}] Buy order placement failed for {ticker}. Response: {response}")
-        return None, position
-
-def check_buy_conditions(ticker: str, bid_price: float) -> bool:
+    ctx = _thread_context(ticker)
+    result = drive(buy_order_and_wait(ctx, price, volume), make_effect_handler(bithumb_api))
+    _sync_thread_state(ctx.state)
+    return result
+
+def check_buy_conditions(ticker: str, bid_price: float, fetch_candles=None) -> bool:
     """
     매수 조건을 확인하는 함수
 
@@ -259,12 +146,15 @@ def check_buy_conditions(ticker: str, bid_price: float) -> bool:
         마켓 코드 (예: "KRW-BTC")
     bid_price : float
         orderbook에서 가져온 매수 가격
+    fetch_candles : callable, optional
+        캔들 조회 함수 (기본값: get_candles). 엔진 모드에서 공유 캐시를 사용할 때 지정
 
     Returns
     -------
     bool
         매수 가능 여부 (True: 매수 가능, False: 매수 불가)
     """
+    fetch_candles = fetch_candles or get_candles
     try:
         # .env에서 설정값 로드
         candle_interval = os.getenv("CANDLE_INTERVAL", "minute60")
@@ -272,15 +162,19 @@ def check_buy_conditions(ticker: str, bid_price: float) -> bool:
         percentile_threshold = float(os.getenv("PERCENTILE_THRESHOLD", "70"))
 
         # 캔들 데이터 가져오기
-        df = get_candles(ticker, interval=candle_interval, count=candle_count)
+        profiler = get_profiler()
+        with profiler.stage("candles"):
+            df = fetch_candles(ticker, interval=candle_interval, count=candle_count)
         if df is None or df.empty:
-            log_with_timestamp(f"Warning: No candle data available for {ticker}")
+            log_with_timestamp("Warning: No candle data available for %s", ticker, level=WARNING)
             return False
 
         # 백분위 가격 계산
-        percentile_price = calculate_percentile(df, percentile_threshold)
+        with profiler.stage("percentile"):
+            percentile_price = calculate_percentile(df, percentile_threshold)
         if percentile_price is None:
-            log_with_timestamp(f"Warning: Could not calculate {percentile_threshold}th percentile for {ticker}")
+            log_with_timestamp("Warning: Could not calculate %sth percentile for %s", percentile_threshold, ticker,
+                               level=WARNING)
             return False
 
         # 매수 조건 확인 (orderbook의 매수 가격이 백분위 가격보다 낮거나 같을 때)
@@ -288,28 +182,32 @@ def check_buy_conditions(ticker: str, bid_price: float) -> bool:
 
         # 연속 하락 여부 확인
         if can_buy:
-            # 1분봉 5개 데이터 가져오기
-            one_min_df = get_candles(ticker, interval="minute1", count=5)
+            # 1분봉 N개(기본 5개) 데이터 가져오기
+            down_count = int(os.getenv("EMERGENCY_CANDLE_COUNT", "5"))
+            with profiler.stage("candles"):
+                one_min_df = fetch_candles(ticker, interval="minute1", count=down_count)
             if one_min_df is not None and not one_min_df.empty:
                 # 모든 캔들이 하락인지 확인 (open > close)
                 all_down = all(one_min_df['open'] > one_min_df['close'])
                 if all_down:
-                    log_with_timestamp(f"Warning: Last 5 1-minute candles are all down for {ticker}. Skipping buy.")
+                    log_with_timestamp("Warning: Last %d 1-minute candles are all down for %s. Skipping buy.",
+                                       down_count, ticker, level=WARNING)
                     can_buy = False
 
         # 로깅
-        log_with_timestamp(f"\n=== Buy Condition Check for {ticker} ===")
-        log_with_timestamp(f"Orderbook Bid Price: {bid_price:,.2f}")
-        log_with_timestamp(f"{percentile_threshold}th Percentile Price: {percentile_price:,.2f}")
-        log_with_timestamp(f"Can Buy: {can_buy}")
+        log_with_timestamp("\n=== Buy Condition Check for %s ===", ticker, level=DEBUG)
+        log_with_timestamp("Orderbook Bid Price: %.2f", bid_price, level=DEBUG, ticker=ticker, bid_price=bid_price)
+        log_with_timestamp("%sth Percentile Price: %.2f", percentile_threshold, percentile_price,
+                           level=DEBUG, ticker=ticker, percentile_price=percentile_price)
+        log_with_timestamp("Can Buy: %s", can_buy, level=DEBUG, ticker=ticker, can_buy=bool(can_buy))
 
         return can_buy
 
     except Exception as e:
-        log_with_timestamp(f"Error checking buy conditions for {ticker}: {e}")
+        log_with_timestamp("Error checking buy conditions for %s: %s", ticker, e, level=ERROR)
         return False
 
-def check_emergency_sell_conditions(ticker: str) -> bool:
+def check_emergency_sell_conditions(ticker: str, fetch_candles=None) -> bool:
     """
     긴급 매도(손절) 조건을 확인하는 함수
 
@@ -317,220 +215,88 @@ def check_emergency_sell_conditions(ticker: str) -> bool:
     ----------
     ticker : str
         마켓 코드 (예: "KRW-BTC")
+    fetch_candles : callable, optional
+        캔들 조회 함수 (기본값: get_candles)
 
     Returns
     -------
     bool
         긴급 매도 필요 여부 (True: 긴급 매도 필요, False: 긴급 매도 불필요)
     """
+    fetch_candles = fetch_candles or get_candles
     try:
-        # 1분봉 5개 데이터 가져오기
-        one_min_df = get_candles(ticker, interval="minute1", count=5)
+        # 1분봉 N개(기본 5개) 데이터 가져오기
+        down_count = int(os.getenv("EMERGENCY_CANDLE_COUNT", "5"))
+        one_min_df = fetch_candles(ticker, interval="minute1", count=down_count)
         if one_min_df is not None and not one_min_df.empty:
             # 모든 캔들이 하락인지 확인 (open > close)
             all_down = all(one_min_df['open'] > one_min_df['close'])
             if all_down:
-                log_with_timestamp(f"\n=== Emergency Sell Condition Detected for {ticker} ===")
-                log_with_timestamp("Last 5 1-minute candles are all down. Detailed candle information:")
-
-                # 각 캔들의 정보를 시간순으로 출력
-                candle_info = []
-                for idx, row in one_min_df.iterrows():
-                    candle_msg = f"Time: {idx}\n  Open: {row['open']:,.2f}\n  Close: {row['close']:,.2f}\n  Change: {row['close'] - row['open']:,.2f} ({((row['close'] - row['open']) / row['open'] * 100):,.2f}%)"
-                    log_with_timestamp(candle_msg)
-                    candle_info.append(candle_msg)
-
-                # 디스코드 알림 전송 (로그는 그대로 유지)
-                notification_title = f"🚨 Emergency Sell Alert: {ticker}"
-                notification_message = f"**Emergency Sell Condition Detected!**\n\nLast 5 1-minute candles are all down:\n\n" + "\n\n".join(candle_info)
-                send_discord_notification(notification_message, notification_title)
-
+                report_emergency_sell(ticker, one_min_df)
                 return True
         return False
     except Exception as e:
-        log_with_timestamp(f"Error checking emergency sell conditions for {ticker}: {e}")
+        log_with_timestamp("Error checking emergency sell conditions for %s: %s", ticker, e, level=ERROR)
         return False
 
-def trade_continuously(bithumb_api_client, ticker, trade_amount, action_delay_seconds=1):
-    thread_name = threading.current_thread().name
-    log_with_timestamp(f"[{thread_name}] Starting continuous trading for {ticker}. Action delay: {action_delay_seconds}s")
-    
-    current_position = None  # None: 초기 상태, "buy": 매수 포지션, "sell": 매도 포지션
-    last_buy_price = None
-    last_buy_volume = None  # 마지막 매수 수량 저장
+def report_emergency_sell(ticker: str, one_min_df, log=None, notify=None):
+    """
+    긴급 매도 조건이 감지된 1분봉 정보를 로그로 남기고 디스코드 알림을 전송하는 함수
+
+    Parameters
+    ----------
+    ticker : str
+        마켓 코드 (예: "KRW-BTC")
+    one_min_df : pandas.DataFrame
+        모두 하락한 1분봉 데이터
+    log : callable, optional
+        로그 출력 함수 (기본값: log_with_timestamp)
+    notify : callable, optional
+        알림 전송 함수 (기본값: send_discord_notification)
+    """
+    log = leveled(log or log_with_timestamp)
+    notify = notify or send_discord_notification
+    log("\n=== Emergency Sell Condition Detected for %s ===", ticker, level=WARNING)
+    log("Last %d 1-minute candles are all down. Detailed candle information:", len(one_min_df), level=WARNING)
+
+    # 각 캔들의 정보를 시간순으로 출력
+    candle_info = []
+    for idx, row in one_min_df.iterrows():
+        candle_msg = f"Time: {idx}\n  Open: {row['open']:,.2f}\n  Close: {row['close']:,.2f}\n  Change: {row['close'] - row['open']:,.2f} ({((row['close'] - row['open']) / row['open'] * 100):,.2f}%)"
+        log("%s", candle_msg, level=WARNING)
+        candle_info.append(candle_msg)
+
+    # 디스코드 알림 전송 (로그는 그대로 유지)
+    notification_title = f"🚨 Emergency Sell Alert: {ticker}"
+    notification_message = f"**Emergency Sell Condition Detected!**\n\nLast {len(one_min_df)} 1-minute candles are all down:\n\n" + "\n\n".join(candle_info)
+    notify(notification_message, notification_title)
+
+def trade_continuously(bithumb_api_client, ticker, trade_amount, action_delay_seconds=1, market_data=None,
+                       journal=None):
+    """
+    한 티커에 대해 매수/매도 상태 머신(bot.strategy.trade_program)을 현재 스레드에서 계속 실행합니다.
 
-    # 스레드에 last_buy_price 저장
-    threading.current_thread().last_buy_price = None
+    market_data(MarketDataHub)를 지정하면 모든 스레드가 허브의 호가/캔들 스냅샷을 공유합니다.
+    journal(PositionJournal)을 지정하면 저장된 포지션으로 시작하고 포지션 변경을 기록합니다.
+    """
+    ctx = _thread_context(ticker, trade_amount)
+    get_profiler().bind(ticker)
+    restore_position(ctx, journal)
+    drive(trade_program(ctx, action_delay_seconds), make_effect_handler(bithumb_api_client, market_data, journal))
 
-    while True:
-        try:
-            if current_position == "buy": # 매도 시도
-                log_with_timestamp(f"[{thread_name}] Current position for {ticker} is 'buy'. Attempting to sell.")
-
-                # 긴급 매도 조건 확인
-                if check_emergency_sell_conditions(ticker):
-                    log_with_timestamp(f"[{thread_name}] Emergency sell conditions met for {ticker}. Attempting market sell.")
-                    try:
-                        # 시장가 매도 주문
-                        response = bithumb_api_client.sell_market_order(ticker, last_buy_volume)
-                        if response and response.get('uuid'):
-                            order_uuid = response['uuid']
-                            order = bithumb_api_client.get_order(order_uuid)
-
-                            # 거래 정보 로깅
-                            executed_volume = float(order.get('executed_volume', 0))
-                            # trades 배열에서 평균 가격 계산
-                            trades = order.get('trades', [])
-                            if trades:
-                                total_funds = sum(float(trade['funds']) for trade in trades)
-                                executed_price = total_funds / executed_volume if executed_volume > 0 else 0
-                            else:
-                                executed_price = 0
-
-                            log_with_timestamp(f"\n=== Emergency Sell Details for {ticker} ===")
-                            log_with_timestamp(f"Buy Price: {last_buy_price:,.2f}")
-                            log_with_timestamp(f"Sell Price: {executed_price:,.2f}")
-                            log_with_timestamp(f"Volume: {executed_volume:,.8f}")
-
-                            if last_buy_price is not None:
-                                loss_amount = (last_buy_price - executed_price) * executed_volume
-                                log_with_timestamp(f"Loss Amount: {loss_amount:,.2f} KRW")
-
-                                # 디스코드 알림 전송 (로그는 그대로 유지)
-                                notification_title = f"⚠️ Emergency Market Sell Executed: {ticker}"
-                                notification_message = (
-                                    f"**Emergency Market Sell Details**\n\n"
-                                    f"Buy Price: {last_buy_price:,.2f}\n"
-                                    f"Sell Price: {executed_price:,.2f}\n"
-                                    f"Volume: {executed_volume:,.8f}\n"
-                                    f"Loss Amount: {loss_amount:,.2f} KRW"
-                                )
-
-                                # 큰 손실 발생 시 추가 알림
-                                if loss_amount > 0:  # 손실 발생
-                                    notification_title = f"💔 Loss Alert: {ticker}"
-
-                                send_discord_notification(notification_message, notification_title)
-
-                            # 매도 성공 시에만 포지션 초기화
-                            current_position = None
-                            last_buy_price = None
-                            last_buy_volume = None
-                            threading.current_thread().last_buy_price = None
-                            threading.current_thread().last_buy_volume = None
-                            continue
-                    except Exception as e:
-                        log_with_timestamp(f"[{thread_name}] Error during emergency sell for {ticker}: {e}")
-                        # 에러 발생 시에도 buy 포지션 유지
-                        time.sleep(action_delay_seconds)
-                        continue
-
-                orderbook = python_bithumb.get_orderbook(ticker)
-                if not orderbook or not orderbook.get('orderbook_units'):
-                    log_with_timestamp(f"[{thread_name}] Failed to fetch orderbook for {ticker} to sell. Retrying after delay...")
-                    time.sleep(action_delay_seconds)
-                    continue
-                
-                # 두 번째 매도호가(ask_price)로 매도 시도, 없으면 첫 번째 호가 사용
-                if len(orderbook['orderbook_units']) > 1:
-                    price_for_sell = orderbook['orderbook_units'][1]['ask_price']
-                    log_with_timestamp(f"[{thread_name}] Using 2nd ask price for {ticker}: {price_for_sell}")
-                else:
-                    price_for_sell = orderbook['orderbook_units'][0]['ask_price']
-                    log_with_timestamp(f"[{thread_name}] Only 1 ask price available for {ticker}, using: {price_for_sell}")
-
-                proceed_with_sell = False
-                if last_buy_price is not None:
-                    if float(price_for_sell) > last_buy_price:
-                        log_with_timestamp(f"[{thread_name}] Sell condition met for {ticker}: Sell price {price_for_sell} > Last buy price {last_buy_price}")
-                        proceed_with_sell = True
-                    else:
-                        log_with_timestamp(f"[{thread_name}] Sell condition NOT met for {ticker}: Sell price {price_for_sell} < Last buy price {last_buy_price}. Holding 'buy' position.")
-                else:
-                    # 이전에 매수한 기록이 없는데 포지션이 'buy'인 경우는 논리적으로 발생하기 어려우나, 방어적으로 매도 시도
-                    log_with_timestamp(f"[{thread_name}] Warning: Position is 'buy' but no last_buy_price for {ticker}. Attempting sell anyway.")
-                    proceed_with_sell = True 
-
-                if proceed_with_sell:
-                    final_order, new_position = place_sell_order_and_wait(bithumb_api_client, ticker, price_for_sell, trade_amount)
-                    if final_order and new_position == "sell":
-                        current_position = "sell"
-                        log_with_timestamp(f"[{thread_name}] Sell successful for {ticker}. New position: {current_position}")
-                    elif final_order and new_position is None:
-                        # emergency sell 등으로 포지션이 초기화된 경우
-                        current_position = None
-                        last_buy_price = None
-                        last_buy_volume = None
-                        threading.current_thread().last_buy_price = None
-                        threading.current_thread().last_buy_volume = None
-                        log_with_timestamp(f"[{thread_name}] Emergency sell or forced position reset. New position: {current_position}")
-                    else:
-                        log_with_timestamp(f"[{thread_name}] Sell attempt for {ticker} failed or did not complete as expected. Retrying after delay...")
-                        # current_position은 "buy"로 유지하고 재시도
-                # else: 매도 조건 안맞으면 current_position "buy" 유지
-
-            elif current_position == "sell" or current_position is None: # 매수 시도
-                action_type = "Initial Buy" if current_position is None else "Buy (after sell)"
-                log_with_timestamp(f"[{thread_name}] Current position for {ticker} is '{current_position}'. Attempting {action_type}.")
-
-                orderbook = python_bithumb.get_orderbook(ticker)
-                if not orderbook or not orderbook.get('orderbook_units'):
-                    log_with_timestamp(f"[{thread_name}] Failed to fetch orderbook for {ticker} to buy. Retrying after delay...")
-                    time.sleep(action_delay_seconds)
-                    continue
-                
-                price_for_buy = orderbook['orderbook_units'][0]['bid_price']
-                log_with_timestamp(f"[{thread_name}] Current bid price for {ticker} (maker): {price_for_buy}")
-
-                # 매수 조건 확인 (orderbook의 매수 가격과 백분위 가격 비교)
-                if not check_buy_conditions(ticker, float(price_for_buy)):
-                    log_with_timestamp(f"[{thread_name}] Buy conditions not met for {ticker}. Waiting for next check...")
-                    time.sleep(action_delay_seconds)
-                    continue
-
-                final_order, new_position = place_buy_order_and_wait(bithumb_api_client, ticker, price_for_buy, trade_amount)
-                if final_order and new_position == "buy":
-                    current_position = "buy"
-                    try:
-                        # trades 배열에서 평균 가격 계산
-                        trades = final_order.get('trades', [])
-                        executed_volume = float(final_order.get('executed_volume', 0))
-
-                        if trades and executed_volume > 0:
-                            total_funds = sum(float(trade['funds']) for trade in trades)
-                            last_buy_price = total_funds / executed_volume
-                            log_with_timestamp(f"[{thread_name}] Stored last buy price for {ticker}: {last_buy_price:,.2f} (calculated from trades)")
-                        else:
-                            # trades 정보가 없는 경우 주문 가격을 사용
-                            order_price_str = final_order.get('price')
-                            if order_price_str:
-                                last_buy_price = float(order_price_str)
-                                log_with_timestamp(f"[{thread_name}] Stored last buy price for {ticker}: {last_buy_price:,.2f} (from order price as fallback)")
-                            else:
-                                log_with_timestamp(f"[{thread_name}] Warning: Could not determine executed price for {ticker} from order details.")
-
-                        # 매수 수량 저장
-                        if executed_volume > 0:
-                            last_buy_volume = executed_volume
-                            threading.current_thread().last_buy_volume = executed_volume
-                            log_with_timestamp(f"[{thread_name}] Stored last buy volume for {ticker}: {last_buy_volume}")
-                    except (ValueError, TypeError, KeyError) as e:
-                        log_with_timestamp(f"[{thread_name}] Error parsing price from buy order for {ticker}: {e}")
-                    log_with_timestamp(f"[{thread_name}] Buy successful for {ticker}. New position: {current_position}, Last buy price: {last_buy_price}")
-                else:
-                    log_with_timestamp(f"[{thread_name}] Buy attempt for {ticker} failed or did not complete as expected. Retrying after delay...")
-                    # current_position은 이전 상태("sell" or None) 유지하고 재시도
-            else:
-                # 논리적으로 도달해서는 안되는 상태
-                log_with_timestamp(f"[{thread_name}] Unexpected position '{current_position}' for {ticker}. Resetting. Retrying after delay...")
-                current_position = None # 안전하게 초기화
-
-            log_with_timestamp(f"[{thread_name}] End of action for {ticker}. Current position: {current_position}, Last buy price: {last_buy_price}. Waiting for {action_delay_seconds}s...")
-            time.sleep(action_delay_seconds)
-
-        except Exception as e:
-            log_with_timestamp(f"[{thread_name}] An error occurred in trading loop for {ticker}: {e}. Retrying after delay...")
-            time.sleep(action_delay_seconds)
+def restore_position(ctx, journal):
+    """
+    저널에 저장된 티커의 포지션을 ctx.state로 복구합니다. 기록이 없으면 그대로 둡니다.
+    """
+    if journal is None:
+        return False
+    state = journal.restore(ctx.ticker)
+    if state is None:
+        return False
+    ctx.state = state
+    ctx.log("[%s] Restored position for %s from journal: %s, Last buy price: %s, Last buy volume: %s",
+            ctx.name, ctx.ticker, state.current_position, state.last_buy_price, state.last_buy_volume)
+    return True
 
 def get_candles(ticker: str, interval: str = "day", count: int = 200):
     """
@@ -553,11 +319,11 @@ def get_candles(ticker: str, interval: str = "day", count: int = 200):
     try:
         df = python_bithumb.get_ohlcv(ticker, interval=interval, count=count)
         if df.empty:
-            log_with_timestamp(f"Warning: No candle data returned for {ticker}")
+            log_with_timestamp("Warning: No candle data returned for %s", ticker, level=WARNING)
             return None
         return df
     except Exception as e:
-        log_with_timestamp(f"Error fetching candles for {ticker}: {e}")
+        log_with_timestamp("Error fetching candles for %s: %s", ticker, e, level=ERROR)
         return None
 
 def calculate_percentile(df, percentile: float):
@@ -583,20 +349,19 @@ def calculate_percentile(df, percentile: float):
         # 종가(close) 기준으로 정렬
         sorted_prices = np.sort(df['close'].values)
 
-        # 백분위 계산
-        percentile_index = int(len(sorted_prices) * (percentile / 100))
-        if percentile_index >= len(sorted_prices):
-            percentile_index = len(sorted_prices) - 1
-
-        return float(sorted_prices[percentile_index])
+        # 백분위 계산 (RollingPercentile, batch_percentile과 같은 인덱스 규칙)
+        return float(sorted_prices[percentile_index(len(sorted_prices), percentile)])
     except Exception as e:
-        log_with_timestamp(f"Error calculating {percentile}th percentile: {e}")
+        log_with_timestamp("Error calculating %sth percentile: %s", percentile, e, level=ERROR)
         return None
 
 def send_discord_notification(message: str, title: str = None):
     """
     디스코드 웹훅을 통해 알림을 전송하는 함수
 
+    알림은 공용 전송기(bot.notifier.get_notifier)의 대기열에 들어가고 바로 반환하므로
+    매도 대기 루프 등 거래 경로가 웹훅 응답을 기다리지 않습니다.
+
     Parameters
     ----------
     message : str
@@ -604,36 +369,52 @@ def send_discord_notification(message: str, title: str = None):
     title : str, optional
         메시지 제목 (기본값: None)
     """
-    webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
-    if not webhook_url:
-        log_with_timestamp("Warning: DISCORD_WEBHOOK_URL not set in environment variables")
-        return
+    get_notifier().notify(message, title)
 
-    try:
-        # 임베드 형식으로 메시지 구성
-        embed = {
-            "title": title if title else "Trading Bot Notification",
-            "description": message,
-            "color": 3447003,  # 파란색
-            "timestamp": datetime.now().isoformat()
-        }
-
-        payload = {
-            "embeds": [embed]
-        }
-
-        headers = {
-            "Content-Type": "application/json"
-        }
-
-        response = requests.post(webhook_url, json=payload, headers=headers)
-        if response.status_code != 204:  # Discord webhook returns 204 on success
-            log_with_timestamp(f"Failed to send Discord notification. Status code: {response.status_code}")
-    except Exception as e:
-        log_with_timestamp(f"Error sending Discord notification: {e}")
+def create_client():
+    """
+    .env 설정값으로 주문용 Bithumb 클라이언트를 만듭니다.
+    """
+    # 지정가 주문 전 주문 가능 정보(캐시)로 최소 주문금액/잔고/호가 단위를 로컬에서 검증
+    validate_orders = os.getenv("VALIDATE_ORDERS", "true").lower() == "true"
+    client = Bithumb(os.getenv("BITHUMB_ACCESS_KEY"), os.getenv("BITHUMB_SECRET_KEY"),
+                     validate_orders=validate_orders,
+                     chance_ttl=float(os.getenv("ORDER_CHANCE_TTL_SECONDS", "60")))
+    # PROFILE_STAGES=true이면 JWT 서명 시간을 sign 구간으로 측정
+    return get_profiler().instrument_client(client)
+
+def create_rate_limiter():
+    """
+    .env 설정값(API_RATE_LIMIT: 초당 호출 수, API_RATE_BURST)으로 공용 API 속도 제한기를 만듭니다.
+    """
+    return RateLimiter(float(os.getenv("API_RATE_LIMIT", "20")), burst=int(os.getenv("API_RATE_BURST", "10")))
+
+def create_market_data_hub(tickers, limiter=None, price_board=None):
+    """
+    .env 설정값으로 시세 허브(MarketDataHub)를 만들어 시작합니다. USE_MARKET_DATA_HUB=false이면 None.
+    """
+    if os.getenv("USE_MARKET_DATA_HUB", "true").lower() != "true":
+        return None
+    from bot.market_data import MarketDataHub
+    market_data = MarketDataHub(
+        tickers,
+        candle_specs=[(os.getenv("CANDLE_INTERVAL", "minute60"), int(os.getenv("CANDLE_COUNT", "24"))),
+                      ("minute1", int(os.getenv("EMERGENCY_CANDLE_COUNT", "5")))],
+        limiter=limiter,
+        orderbook_interval=float(os.getenv("MARKET_DATA_INTERVAL", "1")),
+        log=log_with_timestamp,
+        # 예: TRADE_CANDLE_INTERVALS=minute1,minute60 -> 티커당 체결 조회 1회로 두 간격을 함께 갱신
+        trade_intervals=[i.strip() for i in os.getenv("TRADE_CANDLE_INTERVALS", "").split(",") if i.strip()],
+        trade_count=int(os.getenv("TRADE_TICKS_COUNT", "100")),
+        # minute60 등 긴 간격을 minute1 캐시에서 로컬로 합쳐 만들어 티커당 캔들 조회를 1회로 줄임
+        resample=os.getenv("RESAMPLE_CANDLES", "false").lower() == "true",
+        price_board=price_board,
+    ).start()
+    log_with_timestamp("Market data hub started.")
+    return market_data
 
 def main():
-    bithumb_api_client = Bithumb(os.getenv("BITHUMB_ACCESS_KEY"), os.getenv("BITHUMB_SECRET_KEY"))
+    bithumb_api_client = create_client()
     
     # .env 파일에서 거래 관련 설정값 로드
     usdt_trade_amount = float(os.getenv("USDT_TRADE_AMOUNT", "10")) # 기본값 10 USDT
@@ -669,9 +450,20 @@ def main():
     if ada_trade_amount > 0:
         trading_assets.append(("ADA-Trader", "KRW-ADA", ada_trade_amount))
 
+    # UNIVERSE_TOP_N > 0: 고정 자산 대신 거래대금/스프레드 기준 상위 마켓을 주기적으로 선택 (engine 모드)
+    from bot.universe import UniverseSelector, krw_trade_amount
+    universe = UniverseSelector.from_env()
+    universe_amount = None
+    if universe is not None:
+        trading_assets = []
+        universe_amount = krw_trade_amount(float(os.getenv("UNIVERSE_KRW_PER_TRADE", "10000")))  # 기본값 1만원
+        log_with_timestamp("Universe mode: top %d %s markets, min 24h value %.0f, max spread %s bps",
+                           universe.top_n, universe.quote, universe.min_value_24h, universe.max_spread_bps)
+
     # 거래할 자산이 없는 경우
-    if not trading_assets:
-        log_with_timestamp("No trading assets configured. Please set trade amounts greater than 0 in .env file.")
+    if not trading_assets and universe is None:
+        log_with_timestamp("No trading assets configured. Please set trade amounts greater than 0 in .env file.",
+                           level=WARNING)
         return
 
     # 거래 설정 로깅
@@ -681,12 +473,59 @@ def main():
     log_message += f"\nAction Delay: {action_delay_seconds}s"
     log_with_timestamp(log_message)
 
+    # BOT_MODE=supervisor: 티커를 WORKER_PROCESSES개 프로세스로 나누어 실행 (API 호출 예산은 모든 프로세스가 공유)
+    if os.getenv("BOT_MODE", "threads").lower() == "supervisor" and universe is None:
+        from bot.supervisor import Supervisor
+        log_with_timestamp("Running in multi-process supervisor mode.")
+        Supervisor.from_env(trading_assets, action_delay_seconds=action_delay_seconds).run()
+        get_notifier().close()
+        get_logger().close()
+        return
+
+    # PRICE_BOARD_NAME 지정 시 허브가 조회한 호가를 공유 메모리 가격판에 게시 (리스크 모니터/대시보드가 API 호출 없이 읽음)
+    price_board = None
+    if os.getenv("PRICE_BOARD_NAME"):
+        from python_bithumb.price_board import PriceBoardPublisher
+        price_board = PriceBoardPublisher(os.getenv("PRICE_BOARD_NAME"), [ticker for _, ticker, _ in trading_assets],
+                                          capacity=int(os.getenv("PRICE_BOARD_CAPACITY", "1024")))
+
+    # 시세 허브와 엔진이 하나의 속도 제한기로 API 호출 예산을 나눠 씀
+    limiter = create_rate_limiter()
+
+    # 전체 티커의 호가/캔들을 한 곳에서 폴링하여 모든 트레이더가 공유
+    market_data = create_market_data_hub([ticker for _, ticker, _ in trading_assets], limiter=limiter,
+                                         price_board=price_board)
+
+    # 포지션 저널: 재시작 시 티커별 포지션 복구 (POSITION_JOURNAL_PATH="" 이면 사용 안 함)
+    from bot.journal import PositionJournal
+    journal = PositionJournal.from_env()
+
+    # BOT_MODE=engine: 모든 티커를 하나의 asyncio 이벤트 루프에서 실행 (호가/캔들/속도 제한 공유)
+    if os.getenv("BOT_MODE", "threads").lower() == "engine" or universe is not None:
+        import asyncio
+        from bot.engine import TradingEngine
+        log_with_timestamp("Running in single event-loop engine mode.")
+        engine = TradingEngine(bithumb_api_client, limiter=limiter, action_delay_seconds=action_delay_seconds,
+                               market_data=market_data, journal=journal)
+        try:
+            asyncio.run(engine.run(trading_assets, universe=universe, universe_amount=universe_amount,
+                                   universe_interval=float(os.getenv("UNIVERSE_REFRESH_SECONDS", "300"))))
+        except KeyboardInterrupt:
+            log_with_timestamp("\nBot stopping due to KeyboardInterrupt...")
+        if journal is not None:
+            journal.close()
+        if price_board is not None:
+            price_board.close()
+        get_notifier().close()
+        get_logger().close()
+        return
+
     # 거래 스레드 생성 및 시작
     trading_threads = []
     for thread_name, ticker, amount in trading_assets:
         thread = threading.Thread(
             target=trade_continuously,
-            args=(bithumb_api_client, ticker, amount, action_delay_seconds),
+            args=(bithumb_api_client, ticker, amount, action_delay_seconds, market_data, journal),
             name=thread_name
         )
         trading_threads.append(thread)
@@ -704,6 +543,12 @@ def main():
         # 실제 서비스에서는 스레드에 종료 신호를 보내고 join하는 방식이 더 안전합니다.
 
     log_with_timestamp("All trading threads have been signaled to stop or script interrupted.")
+    if journal is not None:
+        journal.close()
+    if price_board is not None:
+        price_board.close()
+    get_notifier().close()
+    get_logger().close()
 
 if __name__ == "__main__":
     main()
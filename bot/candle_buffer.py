@@ -0,0 +1,156 @@
+"""
+티커/간격별 고정 크기 캔들 링 버퍼
+
+get_ohlcv로 한 번 채운 뒤에는 최근 캔들 몇 개만 받아 진행 중인 캔들을 덮어쓰거나
+새 캔들을 추가(가장 오래된 캔들 제거)합니다. 메모리는 size에 비례해 고정되며,
+갱신은 캔들 1개당 O(1)입니다.
+"""
+import numpy as np
+import pandas as pd
+
+from bot.percentile import RollingPercentile
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class CandleBuffer:
+    """
+    NumPy 배열 기반 캔들 링 버퍼.
+
+    Parameters
+    ----------
+    ticker : str
+        마켓 코드 (예: "KRW-BTC")
+    interval : str
+        캔들 간격 (get_ohlcv의 interval)
+    size : int
+        보관할 최대 캔들 개수
+    track_close : bool, optional (default False)
+        True이면 윈도우 종가의 정렬 상태(close_stats, RollingPercentile)를 함께 유지하여
+        백분위를 정렬 없이 조회
+    """
+
+    def __init__(self, ticker: str, interval: str, size: int, track_close: bool = False):
+        if size <= 0:
+            raise ValueError("size must be positive")
+        self.ticker = ticker
+        self.interval = interval
+        self.size = size
+        self.times = np.zeros(size, dtype="datetime64[ns]")
+        self.arrays = {field: np.zeros(size, dtype=np.float64) for field in FIELDS}
+        self._head = 0  # 다음에 쓸 위치
+        self.count = 0
+        self.close_stats = RollingPercentile() if track_close else None
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def seeded(self) -> bool:
+        return self.count > 0
+
+    @property
+    def last_time(self):
+        if self.count == 0:
+            return None
+        return self.times[(self._head - 1) % self.size]
+
+    def seed(self, df: pd.DataFrame):
+        """
+        get_ohlcv 결과로 버퍼를 새로 채웁니다. (최근 size개만 보관)
+        """
+        self._head = 0
+        self.count = 0
+        if df is None or df.empty:
+            if self.close_stats is not None:
+                self.close_stats.reset()
+            return
+        df = df.iloc[-self.size:]
+        n = len(df)
+        self.times[:n] = df.index.values.astype("datetime64[ns]")
+        for field in FIELDS:
+            self.arrays[field][:n] = df[field].values
+        self._head = n % self.size
+        self.count = n
+        if self.close_stats is not None:
+            self.close_stats.reset(self.arrays["close"][:n])
+
+    def _write(self, pos, ts, row, occupied=True):
+        if self.close_stats is not None:
+            if occupied:
+                self.close_stats.replace(self.arrays["close"][pos], row["close"])
+            else:
+                self.close_stats.add(row["close"])
+        self.times[pos] = ts
+        for field in FIELDS:
+            self.arrays[field][pos] = row[field]
+
+    def update(self, df: pd.DataFrame) -> bool:
+        """
+        최근 캔들(보통 count=2로 조회)로 버퍼를 갱신합니다.
+
+        같은 시각의 캔들은 덮어쓰고, 더 새로운 캔들은 추가합니다. 받은 캔들이
+        버퍼의 마지막 캔들과 겹치지 않으면(중간 캔들을 놓쳤을 수 있음) 갱신하지 않고
+        False를 반환하므로, 호출한 쪽에서 seed()로 다시 채워야 합니다.
+
+        Returns
+        -------
+        bool
+            갱신 성공 여부
+        """
+        if df is None or df.empty:
+            return True
+        if self.count == 0:
+            return False
+        times = df.index.values.astype("datetime64[ns]")
+        last = self.last_time
+        if times[0] > last:
+            return False
+        values = {field: df[field].values for field in FIELDS}
+        for i, ts in enumerate(times):
+            row = {field: values[field][i] for field in FIELDS}
+            last = self.last_time
+            if ts > last:
+                # 새 캔들: 가장 오래된 자리에 덮어쓰며 창을 앞으로 이동
+                self._write(self._head, ts, row, occupied=self.count == self.size)
+                self._head = (self._head + 1) % self.size
+                self.count = min(self.count + 1, self.size)
+                continue
+            # 진행 중(또는 방금 마감된) 캔들: 끝에서부터 같은 시각을 찾아 덮어씀
+            for back in range(1, min(len(times), self.count) + 1):
+                pos = (self._head - back) % self.size
+                if self.times[pos] == ts:
+                    self._write(pos, ts, row)
+                    break
+        return True
+
+    def close_percentile(self, percentile: float):
+        """
+        윈도우 종가의 백분위를 calculate_percentile과 같은 규칙으로 반환합니다. (track_close=True 필요)
+        """
+        if self.close_stats is None:
+            raise ValueError("close_percentile requires track_close=True")
+        return self.close_stats.percentile(percentile)
+
+    def _ordered(self, array, count=None):
+        count = self.count if count is None else min(count, self.count)
+        start = (self._head - count) % self.size
+        if start + count <= self.size:
+            return array[start:start + count].copy()
+        return np.concatenate([array[start:], array[:self._head]])
+
+    def field(self, name: str, count: int = None) -> np.ndarray:
+        """
+        오래된 것부터 정렬된 필드 배열(복사본)을 반환합니다.
+        """
+        return self._ordered(self.arrays[name], count)
+
+    def to_frame(self, count: int = None) -> pd.DataFrame:
+        """
+        get_ohlcv와 같은 컬럼명(open, high, low, close, volume)의 DataFrame으로 변환합니다.
+        """
+        index = pd.DatetimeIndex(self._ordered(self.times, count), name="candle_date_time_kst")
+        data = {field: self._ordered(self.arrays[field], count) for field in FIELDS}
+        df = pd.DataFrame(data, index=index)
+        df.insert(0, "market", self.ticker)
+        return df
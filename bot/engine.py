@@ -0,0 +1,518 @@
+"""
+단일 이벤트 루프 멀티 티커 매매 엔진
+
+티커마다 스레드를 띄우는 대신, 같은 매수/매도 상태 머신(bot.strategy.trade_program)을
+하나의 asyncio 루프 위의 태스크로 실행합니다. 모든 티커가 호가/캔들 데이터와
+API 속도 제한기를 공유합니다.
+
+모의 거래소 데모:
+    python -m bot.engine --mock 500 --duration 10 > engine.log
+    python -m bot.engine --mock 500 --duration 10 --profile --flamegraph engine.folded > engine.log
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import python_bithumb
+from python_bithumb.rate_limit import RateLimiter
+
+from bot.bot import (
+    check_buy_conditions, check_emergency_sell_conditions, create_rate_limiter, report_emergency_sell,
+    log_with_timestamp, send_discord_notification, restore_position, effect_stage
+)
+from bot.logger import DEBUG, ERROR, leveled
+from bot.profiling import get_profiler
+from bot.signals import BatchSignalEvaluator
+from bot.strategy import (
+    Call, GetOrderbook, CheckBuy, CheckEmergency, Sleep, Notify, SavePosition,
+    StrategyConfig, TraderContext, trade_program
+)
+
+
+class CandleCache:
+    """
+    여러 티커 태스크가 공유하는 캔들 캐시 (스레드 안전).
+
+    같은 (티커, 간격, 개수) 요청은 TTL 동안 한 번만 조회하며, 동시에 들어온
+    요청은 먼저 시작된 조회 결과를 함께 사용합니다.
+
+    Parameters
+    ----------
+    ohlcv_fn : callable
+        python_bithumb.get_ohlcv 형식의 조회 함수
+    limiter : RateLimiter, optional
+        공유 API 속도 제한기
+    ttl : float, optional (default 30.0)
+        분봉(minute1) 이외 캔들의 캐시 유효 시간(초)
+    minute_ttl : float, optional (default 1.0)
+        1분봉 캐시 유효 시간(초)
+    """
+
+    def __init__(self, ohlcv_fn, limiter=None, ttl=30.0, minute_ttl=1.0):
+        self._ohlcv_fn = ohlcv_fn
+        self._limiter = limiter
+        self.ttl = ttl
+        self.minute_ttl = minute_ttl
+        self._entries = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.fetches = 0
+
+    def fetch(self, ticker, interval="day", count=200):
+        """
+        get_candles()와 같은 방식으로 캔들 DataFrame을 반환합니다. 데이터가 없으면 None.
+        """
+        key = (ticker, interval, count)
+        ttl = self.minute_ttl if interval == "minute1" else self.ttl
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                return entry[1]
+            if self._limiter is not None:
+                self._limiter.acquire()
+            try:
+                df = self._ohlcv_fn(ticker, interval=interval, count=count)
+            except Exception as e:
+                log_with_timestamp("Error fetching candles for %s: %s", ticker, e, level=ERROR)
+                return None
+            self.fetches += 1
+            if df is None or df.empty:
+                df = None
+            self._entries[key] = (time.monotonic(), df)
+            return df
+
+
+class SharedOrderbooks:
+    """
+    등록된 모든 티커의 호가를 다중 마켓 요청으로 한 번에 갱신하여 공유합니다.
+
+    Parameters
+    ----------
+    orderbook_fn : callable
+        python_bithumb.get_orderbook 형식의 조회 함수 (마켓 리스트 지원)
+    run_blocking : coroutine function
+        블로킹 함수를 실행기에서 실행하는 함수
+    limiter : RateLimiter, optional
+        공유 API 속도 제한기
+    ttl : float, optional (default 1.0)
+        호가 스냅샷 유효 시간(초)
+    chunk_size : int, optional (default 50)
+        한 번의 요청에 담을 최대 마켓 수
+    """
+
+    def __init__(self, orderbook_fn, run_blocking, limiter=None, ttl=1.0, chunk_size=50):
+        self._orderbook_fn = orderbook_fn
+        self._run_blocking = run_blocking
+        self._limiter = limiter
+        self.ttl = ttl
+        self.chunk_size = chunk_size
+        self.tickers = []
+        self._books = {}
+        self._updated_at = 0.0
+        self._lock = None
+        self.fetches = 0
+
+    async def get(self, ticker):
+        """
+        티커의 호가를 반환합니다. 스냅샷이 오래되었으면 전체 티커를 함께 갱신합니다.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if time.monotonic() - self._updated_at >= self.ttl or ticker not in self._books:
+            async with self._lock:
+                # 다른 태스크가 이미 갱신했으면 그대로 사용
+                if time.monotonic() - self._updated_at >= self.ttl or ticker not in self._books:
+                    await self._refresh(ticker)
+        return self._books.get(ticker)
+
+    async def _refresh(self, ticker):
+        tickers = list(self.tickers)
+        if ticker not in tickers:
+            tickers.append(ticker)
+        chunks = [tickers[i:i + self.chunk_size] for i in range(0, len(tickers), self.chunk_size)]
+        results = await asyncio.gather(*(self._fetch_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        books = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, Exception):
+                log_with_timestamp("Error fetching orderbooks for %d markets: %s", len(chunk), result, level=ERROR)
+                continue
+            if not result:
+                continue
+            if "orderbook_units" in result:
+                # 마켓이 하나뿐이면 단일 호가 dict가 반환됨
+                books[result["market"]] = result
+            else:
+                books.update(result)
+        self._books = books
+        self._updated_at = time.monotonic()
+
+    async def _fetch_chunk(self, chunk):
+        if self._limiter is not None:
+            await self._limiter.acquire_async()
+        self.fetches += 1
+        return await self._run_blocking(self._orderbook_fn, chunk)
+
+
+class TradingEngine:
+    """
+    여러 티커의 매매 상태 머신을 하나의 이벤트 루프에서 실행하는 엔진.
+
+    Parameters
+    ----------
+    client : Bithumb
+        주문용 클라이언트 (Bithumb 또는 같은 메소드를 가진 객체)
+    limiter : RateLimiter, optional
+        공유 API 속도 제한기. 생략 시 API_RATE_LIMIT(초당 호출 수) 설정값으로 생성
+    orderbook_fn : callable, optional
+        호가 조회 함수 (기본값: python_bithumb.get_orderbook)
+    ohlcv_fn : callable, optional
+        캔들 조회 함수 (기본값: python_bithumb.get_ohlcv)
+    notify : callable, optional
+        알림 전송 함수 (기본값: send_discord_notification)
+    log : callable, optional
+        로그 출력 함수 (기본값: log_with_timestamp)
+    config : StrategyConfig, optional
+        상태 머신 설정값. 생략 시 .env 설정값 사용
+    action_delay_seconds : float, optional (default 1)
+        각 액션 후 대기 시간(초)
+    sleep_scale : float, optional (default 1.0)
+        상태 머신의 대기 시간에 곱할 배율. 모의 거래소로 빠르게 돌릴 때 사용
+    max_workers : int, optional (default 32)
+        블로킹 API 호출을 실행할 스레드 수
+    orderbook_ttl : float, optional (default 1.0)
+        공유 호가 스냅샷 유효 시간(초)
+    market_data : MarketDataHub, optional
+        지정 시 호가/캔들을 허브 스냅샷에서 우선 읽고, 매수/긴급 매도 조건을
+        스냅샷 단위로 전체 티커에 대해 한 번에 계산(BatchSignalEvaluator)
+    signals : BatchSignalEvaluator, optional
+        market_data 사용 시 신호 평가기. 생략 시 .env 설정값으로 생성
+    journal : PositionJournal, optional
+        지정 시 티커 시작 시 저장된 포지션을 복구하고 포지션 변경을 기록
+    profiler : StageProfiler, optional
+        켜져 있으면 티커별 Effect 소요 시간(이벤트 루프 대기 포함)과 루프 1회 시간을 기록.
+        생략 시 PROFILE_STAGES 설정의 공용 프로파일러 사용
+    """
+
+    def __init__(self, client, limiter=None, orderbook_fn=None, ohlcv_fn=None, notify=None, log=None,
+                 config=None, action_delay_seconds=1, sleep_scale=1.0, max_workers=32, orderbook_ttl=1.0,
+                 market_data=None, signals=None, journal=None, profiler=None):
+        self.client = client
+        self.profiler = profiler or get_profiler()
+        self.journal = journal
+        self.market_data = market_data
+        self.signals = signals if signals is not None or market_data is None else BatchSignalEvaluator()
+        if limiter is None:
+            limiter = create_rate_limiter()
+        self.limiter = limiter
+        self.notify = notify or send_discord_notification
+        self.log = leveled(log or log_with_timestamp)
+        self.config = config if config is not None else StrategyConfig.from_env()
+        self.action_delay_seconds = action_delay_seconds
+        self.sleep_scale = sleep_scale
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="engine-io")
+        self.orderbooks = SharedOrderbooks(orderbook_fn or python_bithumb.get_orderbook, self._run_blocking,
+                                           limiter=limiter, ttl=orderbook_ttl * sleep_scale)
+        self.candles = CandleCache(ohlcv_fn or python_bithumb.get_ohlcv, limiter=limiter,
+                                   ttl=30.0 * sleep_scale, minute_ttl=1.0 * sleep_scale)
+        self._fetch_candles = self.candles.fetch
+        if market_data is not None:
+            self._fetch_candles = self._hub_candle_fetcher(market_data)
+        self.traders = {}
+        self._tasks = {}
+        self.stats = Counter()
+
+    def _hub_candle_fetcher(self, market_data):
+        def fetch(ticker, interval="day", count=200):
+            max_age = market_data.candle_refresh.get(interval, 30.0) * 3
+            df = market_data.fetch_candles(ticker, interval=interval, count=count, max_age=max_age)
+            return df if df is not None else self.candles.fetch(ticker, interval=interval, count=count)
+        return fetch
+
+    def _batch_signals(self, ticker):
+        """
+        허브 스냅샷으로 전체 티커의 신호를 평가하고 (결과, 행 번호)를 반환합니다.
+        허브가 없거나 티커의 캔들이 스냅샷에 없으면 None (개별 조회로 대체).
+        """
+        if self.market_data is None or self.signals is None:
+            return None
+        refresh = self.market_data.candle_refresh
+        config = self.signals.config
+        max_age = {interval: refresh.get(interval, 30.0) * 3
+                   for interval in (config.candle_interval, config.down_interval)}
+        result = self.signals.evaluate_snapshot(self.market_data.snapshot, list(self.traders), max_age=max_age)
+        row = self.signals.row(ticker)
+        if row is None or result.percentile_price[row] != result.percentile_price[row]:  # NaN
+            return None
+        return result, row
+
+    def _report_emergency_sell(self, ticker):
+        config = self.signals.config
+        one_min_df = self._fetch_candles(ticker, interval=config.down_interval, count=config.down_count)
+        if one_min_df is not None and not one_min_df.empty:
+            report_emergency_sell(ticker, one_min_df, log=self.log, notify=self.notify)
+
+    async def _run_blocking(self, fn, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def _handle(self, effect):
+        self.stats[type(effect).__name__] += 1
+        if isinstance(effect, Call):
+            with self.profiler.stage("rate_limit"):
+                await self.limiter.acquire_async()
+            return await self._run_blocking(getattr(self.client, effect.method), *effect.args)
+        if isinstance(effect, GetOrderbook):
+            if self.market_data is not None:
+                orderbook = self.market_data.get_orderbook(effect.ticker, max_age=self.orderbooks.ttl * 3)
+                if orderbook is not None:
+                    return orderbook
+            return await self.orderbooks.get(effect.ticker)
+        if isinstance(effect, CheckBuy):
+            batch = self._batch_signals(effect.ticker)
+            if batch is None:
+                return await self._run_blocking(check_buy_conditions, effect.ticker, effect.bid_price, self._fetch_candles)
+            result, row = batch
+            percentile_price = float(result.percentile_price[row])
+            can_buy = effect.bid_price <= percentile_price and not result.all_down[row]
+            can_buy = can_buy and all(mask[row] for mask in result.rules.values())
+            self.log("\n=== Buy Condition Check for %s ===", effect.ticker, level=DEBUG)
+            self.log("Orderbook Bid Price: %.2f", effect.bid_price, level=DEBUG)
+            self.log("%sth Percentile Price: %.2f", self.signals.config.percentile_threshold, percentile_price,
+                     level=DEBUG)
+            self.log("Can Buy: %s", bool(can_buy), level=DEBUG)
+            return bool(can_buy)
+        if isinstance(effect, CheckEmergency):
+            batch = self._batch_signals(effect.ticker)
+            if batch is None or not batch[0].has_short[batch[1]]:
+                return await self._run_blocking(check_emergency_sell_conditions, effect.ticker, self._fetch_candles)
+            result, row = batch
+            if not result.emergency_sell[row]:
+                return False
+            await self._run_blocking(self._report_emergency_sell, effect.ticker)
+            return True
+        if isinstance(effect, Sleep):
+            await asyncio.sleep(effect.seconds * self.sleep_scale)
+            # 폴링 기한은 상태 머신 기준 시간으로 계산 (sleep_scale로 줄인 대기를 되돌림)
+            return asyncio.get_event_loop().time() / self.sleep_scale if self.sleep_scale else None
+        if isinstance(effect, Notify):
+            return await self._run_blocking(self.notify, effect.message, effect.title)
+        if isinstance(effect, SavePosition):
+            if self.journal is not None:
+                await self._run_blocking(self.journal.record, *effect)
+            return None
+        raise TypeError(f"Unknown effect: {effect!r}")
+
+    async def _drive(self, program, ticker=None):
+        profiler = self.profiler
+        woke_at = profiler.clock()
+        value = None
+        error = None
+        while True:
+            try:
+                effect = program.throw(error) if error is not None else program.send(value)
+            except StopIteration as stop:
+                return stop.value
+            try:
+                if not profiler.enabled:
+                    value = await self._handle(effect)
+                elif isinstance(effect, Sleep):
+                    profiler.record("iteration", ticker, profiler.clock() - woke_at)
+                    profiler.maybe_dump()
+                    value = await self._handle(effect)
+                    woke_at = profiler.clock()
+                else:
+                    with profiler.stage(effect_stage(effect), ticker):
+                        value = await self._handle(effect)
+                error = None
+            except asyncio.CancelledError:
+                program.close()
+                raise
+            except Exception as e:
+                value = None
+                error = e
+
+    def add_ticker(self, ticker, trade_amount, name=None):
+        """
+        티커의 매매 태스크를 시작합니다. 실행 중인 이벤트 루프 안에서 호출해야 합니다.
+        """
+        if ticker in self._tasks:
+            ctx = self.traders[ticker]
+            ctx.stop_requested = False
+            return ctx
+        name = name or f"{ticker.split('-')[-1]}-Trader"
+        ctx = TraderContext(name, ticker, trade_amount, self.log, config=self.config)
+        restore_position(ctx, self.journal)
+        self.traders[ticker] = ctx
+        self.orderbooks.tickers.append(ticker)
+        if self.market_data is not None and ticker not in self.market_data.tickers:
+            self.market_data.set_tickers(self.market_data.tickers + [ticker])
+        task = asyncio.ensure_future(self._drive(trade_program(ctx, self.action_delay_seconds), ticker))
+        task.add_done_callback(lambda done, ticker=ticker: self._forget(ticker, done))
+        self._tasks[ticker] = task
+        return ctx
+
+    def _forget(self, ticker, task):
+        # 상태 머신이 스스로 종료(stop_requested)한 티커 정리
+        if self._tasks.get(ticker) is task and not task.cancelled():
+            self.remove_ticker(ticker)
+
+    def remove_ticker(self, ticker):
+        """
+        티커의 매매 태스크를 중지합니다.
+        """
+        task = self._tasks.pop(ticker, None)
+        if task is not None:
+            task.cancel()
+        if ticker in self.orderbooks.tickers:
+            self.orderbooks.tickers.remove(ticker)
+        if self.market_data is not None:
+            self.market_data.set_tickers([t for t in self.market_data.tickers if t != ticker])
+        return self.traders.pop(ticker, None)
+
+    async def sync_universe(self, universe, amount_fn):
+        """
+        유니버스 선택 결과에 맞춰 트레이더를 시작/중지합니다.
+
+        새로 선택된 마켓은 amount_fn(마켓, 현재가)으로 주문 수량을 정해 시작하고,
+        선택에서 빠진 마켓은 stop_requested를 설정해 보유 포지션이 없을 때 종료되도록 합니다.
+
+        Parameters
+        ----------
+        universe : UniverseSelector
+            마켓 선택기 (bot.universe)
+        amount_fn : callable
+            (market, price) -> 주문 수량. None을 반환하면 해당 마켓은 시작하지 않음
+
+        Returns
+        -------
+        tuple
+            (시작한 마켓 목록, 중지 요청한 마켓 목록)
+        """
+        if universe.limiter is None:
+            universe.limiter = self.limiter
+        selected = await self._run_blocking(universe.select)
+        prices = universe.last_table["trade_price"]
+        added, retiring = [], []
+        for ticker in selected:
+            ctx = self.traders.get(ticker)
+            if ctx is not None:
+                ctx.stop_requested = False
+                continue
+            amount = amount_fn(ticker, float(prices.get(ticker, 0.0)))
+            if amount:
+                self.add_ticker(ticker, amount)
+                added.append(ticker)
+        chosen = set(selected)
+        for ticker, ctx in list(self.traders.items()):
+            if ticker not in chosen and not ctx.stop_requested:
+                ctx.stop_requested = True
+                retiring.append(ticker)
+        if added or retiring:
+            self.log("Universe updated: %d selected, started %s, stopping %s", len(selected), added, retiring)
+        return added, retiring
+
+    async def _universe_loop(self, universe, amount_fn, interval):
+        while True:
+            try:
+                await self.sync_universe(universe, amount_fn)
+            except Exception as e:
+                self.log("Universe update failed: %s", e, level=ERROR)
+            await asyncio.sleep(interval * self.sleep_scale)
+
+    async def run(self, trading_assets, duration=None, universe=None, universe_amount=None,
+                  universe_interval=300.0):
+        """
+        엔진을 실행합니다.
+
+        Parameters
+        ----------
+        trading_assets : list of tuple
+            (트레이더 이름, 티커, 주문 수량) 목록. bot.main의 trading_assets와 같은 형식
+        duration : float, optional
+            실행 시간(초). 생략 시 중지될 때까지 실행
+        universe : UniverseSelector, optional
+            지정 시 universe_interval마다 선택 결과에 맞춰 트레이더를 시작/중지 (sync_universe)
+        universe_amount : callable, optional
+            (market, price) -> 주문 수량. universe 사용 시 필요 (예: bot.universe.krw_trade_amount)
+        universe_interval : float, optional (default 300)
+            유니버스 갱신 주기(초)
+        """
+        for name, ticker, amount in trading_assets:
+            self.add_ticker(ticker, amount, name=name)
+        universe_task = None
+        if universe is not None:
+            universe_task = asyncio.ensure_future(self._universe_loop(universe, universe_amount, universe_interval))
+        try:
+            if duration is None:
+                await asyncio.gather(*self._tasks.values(), *([universe_task] if universe_task else []))
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            if universe_task is not None:
+                universe_task.cancel()
+                await asyncio.gather(universe_task, return_exceptions=True)
+            tasks = list(self._tasks.values())
+            self._tasks.clear()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._executor.shutdown(wait=False)
+
+
+def _run_mock_demo(market_count, duration, speed, profile=False, flamegraph=None):
+    from bot.mock_exchange import MockExchange
+    from bot.profiling import SamplingProfiler, StageProfiler
+
+    markets = [f"KRW-MOCK{i:04d}" for i in range(market_count)]
+    exchange = MockExchange(markets, speed=speed)
+    engine = TradingEngine(
+        exchange,
+        limiter=RateLimiter(1_000_000, burst=1000),
+        orderbook_fn=exchange.get_orderbook,
+        ohlcv_fn=exchange.get_ohlcv,
+        notify=lambda message, title=None: None,
+        config=StrategyConfig(max_polls=30, cooldown_seconds=5),
+        sleep_scale=1.0 / speed,
+        profiler=StageProfiler(enabled=profile, dump_interval=None),
+    )
+    assets = [(f"{m.split('-')[1]}-Trader", m, 1.0) for m in markets]
+    sampler = SamplingProfiler(flamegraph).start() if flamegraph else None
+    started = time.monotonic()
+    asyncio.run(engine.run(assets, duration=duration))
+    elapsed = time.monotonic() - started
+    if sampler is not None:
+        sampler.stop()
+
+    effects = sum(engine.stats.values())
+    summary = [
+        f"Markets: {market_count}, wall time: {elapsed:.1f}s, simulated time: {elapsed * speed:,.0f}s",
+        f"State machine effects: {effects:,} ({effects / elapsed:,.0f}/s)",
+        f"Effects by type: {dict(engine.stats)}",
+        f"Exchange calls: {dict(exchange.calls)}",
+        f"Shared orderbook fetches: {engine.orderbooks.fetches}, candle fetches: {engine.candles.fetches}",
+        f"Positions: {Counter(str(ctx.state.current_position) for ctx in engine.traders.values()) or 'n/a'}",
+    ]
+    if profile:
+        summary.append(engine.profiler.format_summary())
+    if sampler is not None:
+        summary.append(f"Folded stacks ({sampler.samples} samples) written to {flamegraph}")
+    for line in summary:
+        print(line, file=sys.stderr)
+    return engine, exchange
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the asyncio trading engine against the mock exchange.")
+    parser.add_argument("--mock", type=int, default=500, help="number of mock markets")
+    parser.add_argument("--duration", type=float, default=10.0, help="wall-clock seconds to run")
+    parser.add_argument("--speed", type=float, default=100.0, help="simulated seconds per wall-clock second")
+    parser.add_argument("--profile", action="store_true", help="print per-stage p50/p95/p99 latencies")
+    parser.add_argument("--flamegraph", help="write sampled folded stacks to this file (flamegraph.pl/speedscope)")
+    args = parser.parse_args()
+    _run_mock_demo(args.mock, args.duration, args.speed, profile=args.profile, flamegraph=args.flamegraph)
@@ -0,0 +1,735 @@
+"""
+기술적 지표 (EMA, SMA, RSI, ATR, 볼린저 밴드, VWAP, 롤링 백분위)
+
+지표마다 두 가지 구현을 제공합니다.
+- 배치 함수 (sma, ema, rsi, atr, bollinger, vwap, rolling_percentile): get_ohlcv DataFrame의
+  컬럼(Series) 또는 NumPy 배열 전체를 한 번의 벡터 연산으로 계산
+- 스트리밍 클래스 (SMA, EMA, RSI, ATR, BollingerBands, VWAP, Quantile): 캔들 1개당 O(1)로
+  갱신 (Quantile은 정렬 컨테이너로 O(log n)). update(..., new=False)로 진행 중인 마지막 캔들을 다시 계산할 수 있음
+
+두 구현은 같은 정의를 따르므로 같은 입력에 대해 (부동소수점 오차 범위에서) 같은 값을 냅니다.
+- EMA: alpha = 2 / (period + 1), 첫 값으로 시작 (pandas ewm(span=period, adjust=False))
+- RSI, ATR: Wilder 평활 alpha = 1 / period, 첫 값으로 시작 (ewm(alpha=1/period, adjust=False))
+- 볼린저 밴드: 이동평균 ± k * 모표준편차(ddof=0)
+- VWAP: 대표가격 (고가 + 저가 + 종가) / 3의 거래량 가중 평균 (누적, 일별 초기화, 또는 period개 롤링)
+- 롤링 백분위: calculate_percentile과 같은 인덱스 규칙 (bot.percentile)
+값이 period개 모이기 전에는 NaN입니다.
+
+IndicatorSet은 여러 지표를 묶어 CandleBuffer.update와 같은 방식(같은 시각은 덮어쓰기, 새 시각은
+추가)으로 캔들을 반영하고, IndicatorBook은 (티커, 간격)별 IndicatorSet을 CandleBuffer와 맞춥니다.
+
+처리량 측정: python -m bot.indicators --bars 200000
+"""
+import argparse
+import math
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from bot.percentile import RollingPercentile, batch_percentile
+
+NAN = float("nan")
+RESYNC_UPDATES = 1024  # 롤링 합계를 이 횟수(또는 윈도우 길이)마다 다시 계산하여 오차 누적 방지
+PERCENTILE_CHUNK = 65536  # rolling_percentile이 한 번에 정렬하는 윈도우 수
+
+Bands = namedtuple("Bands", ["mid", "upper", "lower"])
+
+
+def _as_series(values):
+    if isinstance(values, pd.Series):
+        return values
+    return pd.Series(np.asarray(values, dtype=np.float64))
+
+
+def _like(result, values, name=None):
+    """
+    입력이 Series이면 같은 인덱스의 Series로, 아니면 NumPy 배열로 반환합니다.
+    """
+    if isinstance(values, (pd.Series, pd.DataFrame)):
+        if isinstance(result, pd.DataFrame):
+            result.index = values.index
+            return result
+        return pd.Series(np.asarray(result, dtype=np.float64), index=values.index, name=name)
+    if isinstance(result, pd.DataFrame):
+        return result.to_numpy()
+    return np.asarray(result, dtype=np.float64)
+
+
+def _wilder(values: pd.Series, period: int) -> pd.Series:
+    return values.ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean()
+
+
+def _rsi_value(gain, loss):
+    if loss == 0:
+        return 50.0 if gain == 0 else 100.0
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+def sma(values, period: int):
+    """
+    단순 이동평균.
+    """
+    return _like(_as_series(values).rolling(period).mean(), values, f"sma{period}")
+
+
+def ema(values, period: int):
+    """
+    지수 이동평균 (alpha = 2 / (period + 1)).
+    """
+    series = _as_series(values)
+    return _like(series.ewm(span=period, adjust=False, min_periods=period).mean(), values, f"ema{period}")
+
+
+def rsi(values, period: int = 14):
+    """
+    Wilder RSI (0-100). 상승/하락이 모두 0이면 50.
+    """
+    series = _as_series(values)
+    delta = series.diff()
+    gain = _wilder(delta.clip(lower=0), period).to_numpy()
+    loss = _wilder((-delta).clip(lower=0), period).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = 100.0 - 100.0 / (1.0 + gain / loss)
+    result = np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), result)
+    result[np.isnan(gain)] = np.nan
+    return _like(result, values, f"rsi{period}")
+
+
+def atr(df: pd.DataFrame, period: int = 14):
+    """
+    Wilder ATR. df는 get_ohlcv 결과처럼 high, low, close 컬럼을 가져야 합니다.
+    """
+    high = df["high"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    close = df["close"].to_numpy(dtype=np.float64)
+    prev_close = np.concatenate([[np.nan], close[:-1]])
+    # 첫 캔들은 이전 종가가 없으므로 고가 - 저가 (fmax는 NaN을 무시)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    result = _wilder(pd.Series(true_range), period).to_numpy()
+    return _like(result, df, f"atr{period}")
+
+
+def bollinger(values, period: int = 20, k: float = 2.0):
+    """
+    볼린저 밴드. mid, upper, lower 컬럼의 DataFrame (입력이 배열이면 (n, 3) 배열)을 반환합니다.
+    """
+    series = _as_series(values)
+    rolling = series.rolling(period)
+    mid = rolling.mean().to_numpy()
+    std = rolling.std(ddof=0).to_numpy()
+    result = pd.DataFrame({"mid": mid, "upper": mid + k * std, "lower": mid - k * std})
+    return _like(result, values)
+
+
+def vwap(df: pd.DataFrame, period: int = None, daily: bool = False):
+    """
+    거래량 가중 평균 가격.
+
+    Parameters
+    ----------
+    df : DataFrame
+        get_ohlcv 결과 (high, low, close, volume 컬럼)
+    period : int, optional
+        지정 시 최근 period개 캔들의 롤링 VWAP. 생략 시 누적 VWAP
+    daily : bool, optional (default False)
+        True이면 누적 VWAP을 날짜(인덱스 기준, get_ohlcv는 KST)가 바뀔 때마다 초기화
+
+    거래량 합이 0인 구간은 NaN입니다.
+    """
+    typical = (df["high"].to_numpy(dtype=np.float64) + df["low"].to_numpy(dtype=np.float64)
+               + df["close"].to_numpy(dtype=np.float64)) / 3.0
+    volume = pd.Series(df["volume"].to_numpy(dtype=np.float64))
+    value = pd.Series(typical * volume.to_numpy())
+    if period is not None:
+        numerator = value.rolling(period).sum().to_numpy()
+        denominator = volume.rolling(period).sum().to_numpy()
+    elif daily:
+        days = pd.DatetimeIndex(df.index).normalize()
+        numerator = value.groupby(days).cumsum().to_numpy()
+        denominator = volume.groupby(days).cumsum().to_numpy()
+    else:
+        numerator = value.cumsum().to_numpy()
+        denominator = volume.cumsum().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.where(denominator > 0, numerator / denominator, np.nan)
+    return _like(result, df, "vwap")
+
+
+def rolling_percentile(values, period: int, percentile: float):
+    """
+    최근 period개 값의 백분위 (calculate_percentile과 같은 인덱스 규칙).
+    """
+    array = np.asarray(values, dtype=np.float64)
+    result = np.full(len(array), np.nan)
+    if len(array) >= period:
+        windows = sliding_window_view(array, period)
+        for start in range(0, len(windows), PERCENTILE_CHUNK):
+            chunk = windows[start:start + PERCENTILE_CHUNK]
+            result[period - 1 + start:period - 1 + start + len(chunk)] = batch_percentile(chunk, percentile)
+    return _like(result, values, f"p{percentile:g}")
+
+
+class _RollingWindow:
+    """
+    고정 길이 윈도우의 합계/제곱합을 O(1)로 유지하는 링 버퍼.
+
+    값에서 기준값(shift)을 뺀 뒤 합산하여 큰 가격(수억 원)에서도 분산 계산의 자릿수 손실을
+    줄이고, 주기적으로 math.fsum으로 다시 계산하여 오차가 쌓이지 않게 합니다.
+    """
+
+    __slots__ = ("size", "squares", "ring", "pos", "count", "shift", "total", "total_sq", "_updates")
+
+    def __init__(self, size: int, squares: bool = False):
+        if size <= 0:
+            raise ValueError("period must be positive")
+        self.size = size
+        self.squares = squares
+        self.ring = [0.0] * size
+        self.pos = 0
+        self.count = 0
+        self.shift = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._updates = 0
+
+    def push(self, value: float):
+        if self.shift is None:
+            self.shift = value
+        delta = value - self.shift
+        if self.count == self.size:
+            old = self.ring[self.pos] - self.shift
+            self.total += delta - old
+            if self.squares:
+                self.total_sq += delta * delta - old * old
+        else:
+            self.count += 1
+            self.total += delta
+            if self.squares:
+                self.total_sq += delta * delta
+        self.ring[self.pos] = value
+        self.pos = (self.pos + 1) % self.size
+        self._tick()
+
+    def replace_last(self, value: float):
+        last = (self.pos - 1) % self.size
+        old = self.ring[last] - self.shift
+        delta = value - self.shift
+        self.total += delta - old
+        if self.squares:
+            self.total_sq += delta * delta - old * old
+        self.ring[last] = value
+        self._tick()
+
+    def _tick(self):
+        self._updates += 1
+        if self._updates >= max(self.size, RESYNC_UPDATES):
+            values = self.ring if self.count == self.size else self.ring[:self.count]
+            self.shift = math.fsum(values) / len(values)
+            self.total = math.fsum(v - self.shift for v in values)
+            if self.squares:
+                self.total_sq = math.fsum((v - self.shift) ** 2 for v in values)
+            self._updates = 0
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.size
+
+    @property
+    def sum(self) -> float:
+        return self.total + self.count * self.shift
+
+    @property
+    def mean(self) -> float:
+        return self.shift + self.total / self.count
+
+    @property
+    def variance(self) -> float:
+        mean = self.total / self.count
+        return max(self.total_sq / self.count - mean * mean, 0.0)
+
+
+class Indicator:
+    """
+    스트리밍 지표의 기본 클래스.
+
+    update(*values)는 새 캔들을 추가하고, update(*values, new=False)는 마지막 캔들을 교체한
+    뒤 현재 값을 반환합니다 (값이 모자라면 NaN). inputs는 캔들에서 읽을 컬럼 이름입니다.
+    """
+
+    inputs = ("close",)
+    timed = False  # True이면 update에 캔들 시각(time=)이 필요
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.value = NAN
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        value = self.value[0] if isinstance(self.value, tuple) else self.value
+        return value == value  # NaN이 아니면 True
+
+    def update(self, *values, new=True, time=None):
+        raise NotImplementedError
+
+    def batch(self, df: pd.DataFrame):
+        """
+        같은 정의의 배치 함수로 df 전체 구간의 값을 계산합니다.
+        """
+        raise NotImplementedError
+
+    def seed(self, df: pd.DataFrame):
+        """
+        상태를 초기화하고 df의 캔들을 순서대로 반영합니다.
+        """
+        self.reset()
+        columns = [df[name].to_numpy(dtype=np.float64) for name in self.inputs]
+        times = df.index.values if self.timed else None
+        for i in range(len(df)):
+            self.update(*(column[i] for column in columns), time=times[i] if self.timed else None)
+        return self.value
+
+
+class SMA(Indicator):
+    """
+    단순 이동평균 (스트리밍).
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self._window = _RollingWindow(self.period)
+
+    def update(self, close, new=True, time=None):
+        if new or self.count == 0:
+            self.count += 1
+            self._window.push(close)
+        else:
+            self._window.replace_last(close)
+        self.value = self._window.mean if self._window.full else NAN
+        return self.value
+
+    def batch(self, df):
+        return sma(df["close"], self.period)
+
+
+class EMA(Indicator):
+    """
+    지수 이동평균 (스트리밍).
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self._ema = None
+        self._prev = None  # 마지막 캔들 반영 전 값
+
+    def update(self, close, new=True, time=None):
+        if new or self.count == 0:
+            self.count += 1
+            self._prev = self._ema
+        prev = self._prev
+        self._ema = close if prev is None else prev + self.alpha * (close - prev)
+        self.value = self._ema if self.count >= self.period else NAN
+        return self.value
+
+    def batch(self, df):
+        return ema(df["close"], self.period)
+
+
+class RSI(Indicator):
+    """
+    Wilder RSI (스트리밍).
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.alpha = 1.0 / period
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self._close = None
+        self._prev_close = None
+        self._avg = None  # (평균 상승, 평균 하락)
+        self._prev_avg = None
+
+    def update(self, close, new=True, time=None):
+        if new or self.count == 0:
+            self.count += 1
+            self._prev_close = self._close
+            self._prev_avg = self._avg
+        self._close = close
+        if self._prev_close is None:
+            self.value = NAN
+            return self.value
+        change = close - self._prev_close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        if self._prev_avg is None:
+            self._avg = (gain, loss)
+        else:
+            avg_gain, avg_loss = self._prev_avg
+            self._avg = (avg_gain + self.alpha * (gain - avg_gain), avg_loss + self.alpha * (loss - avg_loss))
+        self.value = _rsi_value(*self._avg) if self.count > self.period else NAN
+        return self.value
+
+    def batch(self, df):
+        return rsi(df["close"], self.period)
+
+
+class ATR(Indicator):
+    """
+    Wilder ATR (스트리밍).
+    """
+
+    inputs = ("high", "low", "close")
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.alpha = 1.0 / period
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self._close = None
+        self._prev_close = None
+        self._atr = None
+        self._prev_atr = None
+
+    def update(self, high, low, close, new=True, time=None):
+        if new or self.count == 0:
+            self.count += 1
+            self._prev_close = self._close
+            self._prev_atr = self._atr
+        self._close = close
+        true_range = high - low
+        if self._prev_close is not None:
+            true_range = max(true_range, abs(high - self._prev_close), abs(low - self._prev_close))
+        prev = self._prev_atr
+        self._atr = true_range if prev is None else prev + self.alpha * (true_range - prev)
+        self.value = self._atr if self.count >= self.period else NAN
+        return self.value
+
+    def batch(self, df):
+        return atr(df, self.period)
+
+
+class BollingerBands(Indicator):
+    """
+    볼린저 밴드 (스트리밍). value는 Bands(mid, upper, lower).
+    """
+
+    def __init__(self, period: int = 20, k: float = 2.0):
+        self.period = period
+        self.k = k
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self.value = Bands(NAN, NAN, NAN)
+        self._window = _RollingWindow(self.period, squares=True)
+
+    def update(self, close, new=True, time=None):
+        if new or self.count == 0:
+            self.count += 1
+            self._window.push(close)
+        else:
+            self._window.replace_last(close)
+        if not self._window.full:
+            return self.value
+        mid = self._window.mean
+        width = self.k * math.sqrt(self._window.variance)
+        self.value = Bands(mid, mid + width, mid - width)
+        return self.value
+
+    def batch(self, df):
+        return bollinger(df["close"], self.period, self.k)
+
+
+class VWAP(Indicator):
+    """
+    거래량 가중 평균 가격 (스트리밍). period를 지정하면 롤링, 아니면 누적(daily=True이면 날짜별).
+    """
+
+    inputs = ("high", "low", "close", "volume")
+
+    def __init__(self, period: int = None, daily: bool = False):
+        self.period = period
+        self.daily = daily
+        self.timed = daily and period is None
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        if self.period is not None:
+            self._values = _RollingWindow(self.period)
+            self._volumes = _RollingWindow(self.period)
+        self._numerator = 0.0
+        self._denominator = 0.0
+        self._last = (0.0, 0.0)  # 마지막 캔들의 (대표가격 * 거래량, 거래량)
+        self._day = None
+
+    def update(self, high, low, close, volume, new=True, time=None):
+        value = (high + low + close) / 3.0 * volume
+        new = new or self.count == 0
+        if new:
+            self.count += 1
+        if self.period is not None:
+            if new:
+                self._values.push(value)
+                self._volumes.push(volume)
+            else:
+                self._values.replace_last(value)
+                self._volumes.replace_last(volume)
+            if not self._values.full:
+                self.value = NAN
+                return self.value
+            numerator, denominator = self._values.sum, self._volumes.sum
+        else:
+            if new and self.timed:
+                day = np.datetime64(time, "D")
+                if day != self._day:
+                    self._day = day
+                    self._numerator = self._denominator = 0.0
+                    self._last = (0.0, 0.0)
+            if new:
+                self._last = (0.0, 0.0)
+            last_value, last_volume = self._last
+            self._numerator += value - last_value
+            self._denominator += volume - last_volume
+            self._last = (value, volume)
+            numerator, denominator = self._numerator, self._denominator
+        self.value = numerator / denominator if denominator > 0 else NAN
+        return self.value
+
+    def batch(self, df):
+        return vwap(df, self.period, self.daily)
+
+
+class Quantile(Indicator):
+    """
+    최근 period개 종가의 백분위 (스트리밍, calculate_percentile과 같은 규칙).
+    """
+
+    def __init__(self, period: int, percentile: float):
+        self.period = period
+        self.percentile = percentile
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self._stats = RollingPercentile(window=self.period)
+
+    def update(self, close, new=True, time=None):
+        if new or self.count == 0:
+            self.count += 1
+            self._stats.push(close)
+        else:
+            self._stats.replace_last(close)
+        self.value = self._stats.percentile(self.percentile) if len(self._stats) == self.period else NAN
+        return self.value
+
+    def batch(self, df):
+        return rolling_percentile(df["close"], self.period, self.percentile)
+
+
+class IndicatorSet:
+    """
+    한 (티커, 간격)의 캔들에 여러 스트리밍 지표를 함께 반영합니다.
+
+    Parameters
+    ----------
+    indicators : dict
+        이름 -> Indicator (예: {"ema20": EMA(20), "rsi": RSI(14)})
+    """
+
+    def __init__(self, indicators):
+        self.indicators = dict(indicators)
+        self.last_time = None
+        self._fields = sorted({name for indicator in self.indicators.values() for name in indicator.inputs})
+
+    def reset(self):
+        self.last_time = None
+        for indicator in self.indicators.values():
+            indicator.reset()
+
+    def _apply(self, df, start, new_flags):
+        columns = {name: df[name].to_numpy(dtype=np.float64) for name in self._fields}
+        times = df.index.values.astype("datetime64[ns]")
+        for i, new in zip(range(start, len(df)), new_flags):
+            for indicator in self.indicators.values():
+                indicator.update(*(columns[name][i] for name in indicator.inputs), new=new,
+                                 time=times[i] if indicator.timed else None)
+            self.last_time = times[i]
+
+    def seed(self, df: pd.DataFrame):
+        """
+        지표를 초기화하고 get_ohlcv 결과(또는 CandleBuffer.to_frame())의 캔들을 모두 반영합니다.
+        """
+        self.reset()
+        if df is not None and not df.empty:
+            self._apply(df, 0, [True] * len(df))
+        return self.values()
+
+    def update(self, df: pd.DataFrame) -> bool:
+        """
+        최근 캔들로 지표를 갱신합니다 (CandleBuffer.update와 같은 규칙).
+
+        마지막으로 반영한 캔들과 같은 시각이면 다시 계산하고, 더 새로운 캔들은 추가하며,
+        그보다 오래된 캔들은 무시합니다. 받은 캔들이 마지막 캔들과 겹치지 않으면 False를
+        반환하므로 seed()로 다시 채워야 합니다.
+        """
+        if df is None or df.empty:
+            return True
+        if self.last_time is None:
+            return False
+        times = df.index.values.astype("datetime64[ns]")
+        if times[0] > self.last_time:
+            return False
+        start = int(np.searchsorted(times, self.last_time))
+        self._apply(df, start, [times[i] > self.last_time for i in range(start, len(df))])
+        return True
+
+    def sync(self, buffer):
+        """
+        CandleBuffer의 최근 캔들 2개로 갱신하고, 겹치지 않으면 버퍼 전체로 다시 채웁니다.
+        버퍼가 갱신될 때마다 호출하면 진행 중이던 직전 캔들의 마감 값까지 반영됩니다.
+        """
+        if not buffer.seeded:
+            self.reset()
+        elif not self.update(buffer.to_frame(2)):
+            self.seed(buffer.to_frame())
+        return self.values()
+
+    def values(self) -> dict:
+        return {name: indicator.value for name, indicator in self.indicators.items()}
+
+    def batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        모든 지표를 df 전체 구간에 대해 배치 계산합니다. 볼린저 밴드는 이름_mid 등으로 펼칩니다.
+        """
+        columns = {}
+        for name, indicator in self.indicators.items():
+            result = indicator.batch(df)
+            if isinstance(result, pd.DataFrame):
+                for column in result.columns:
+                    columns[f"{name}_{column}"] = result[column]
+            else:
+                columns[name] = result
+        return pd.DataFrame(columns, index=df.index)
+
+
+class IndicatorBook:
+    """
+    (티커, 간격)별 IndicatorSet 모음.
+
+    Parameters
+    ----------
+    factory : callable
+        인자 없이 호출하면 이름 -> Indicator dict를 새로 만들어 반환하는 함수
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._sets = {}
+
+    def get(self, ticker, interval) -> IndicatorSet:
+        key = (ticker, interval)
+        indicators = self._sets.get(key)
+        if indicators is None:
+            indicators = self._sets[key] = IndicatorSet(self.factory())
+        return indicators
+
+    def sync(self, buffer) -> dict:
+        """
+        CandleBuffer(MarketDataHub.buffer() 등)에 맞춰 해당 티커/간격의 지표를 갱신합니다.
+        """
+        return self.get(buffer.ticker, buffer.interval).sync(buffer)
+
+    def values(self, ticker, interval) -> dict:
+        indicators = self._sets.get((ticker, interval))
+        return indicators.values() if indicators is not None else {}
+
+    def discard(self, ticker):
+        for key in [key for key in self._sets if key[0] == ticker]:
+            del self._sets[key]
+
+
+def default_indicators():
+    return {
+        "sma20": SMA(20),
+        "ema20": EMA(20),
+        "rsi14": RSI(14),
+        "atr14": ATR(14),
+        "bb20": BollingerBands(20, 2.0),
+        "vwap": VWAP(daily=True),
+        "p70": Quantile(24, 70),
+    }
+
+
+def synthetic_candles(bars: int, seed: int = 0, start="2025-01-01", price=100_000_000.0) -> pd.DataFrame:
+    """
+    랜덤 워크 1분봉 (get_ohlcv와 같은 컬럼). 정확도 검증과 처리량 측정에 사용합니다.
+    """
+    rng = np.random.default_rng(seed)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.001, bars)))
+    open_ = np.concatenate([[price], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.0005, bars)) * close
+    index = pd.date_range(start, periods=bars, freq="min", name="candle_date_time_kst")
+    return pd.DataFrame({
+        "market": "KRW-BTC",
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": rng.exponential(0.5, bars),
+    }, index=index)
+
+
+def benchmark(bars: int = 100_000, indicators=None, log=print) -> dict:
+    """
+    지표별 배치 계산 처리량과 스트리밍 갱신 처리량(캔들/초)을 측정합니다.
+
+    Returns
+    -------
+    dict
+        이름 -> (배치 캔들/초, 스트리밍 캔들/초)
+    """
+    df = synthetic_candles(bars)
+    results = {}
+    for name, indicator in (indicators or default_indicators()).items():
+        started = time.perf_counter()
+        indicator.batch(df)
+        batch_rate = bars / max(time.perf_counter() - started, 1e-9)
+        started = time.perf_counter()
+        indicator.seed(df)
+        stream_rate = bars / max(time.perf_counter() - started, 1e-9)
+        results[name] = (batch_rate, stream_rate)
+        if log is not None:
+            log(f"{name:>8}: batch {batch_rate:>14,.0f} bars/s, stream {stream_rate:>12,.0f} bars/s "
+                f"({1e6 / stream_rate:.2f} us/update)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure indicator batch and streaming throughput.")
+    parser.add_argument("--bars", type=int, default=100_000)
+    args = parser.parse_args()
+    benchmark(args.bars)
+
+
+if __name__ == "__main__":
+    main()
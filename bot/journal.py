@@ -0,0 +1,201 @@
+"""
+포지션 저널 (재시작 복구용)
+
+상태 머신이 포지션을 바꿀 때마다(SavePosition Effect) 티커의 포지션/매수 가격/수량과
+체결 정보를 SQLite(WAL 모드) events 테이블에 추가합니다. compact_every건마다 티커별 최신
+상태를 positions 테이블(체크포인트)로 접고 오래된 이벤트를 정리하므로, 재시작 시에는
+체크포인트와 그 이후 이벤트 몇 건만 읽어 API 주문 내역 조회 없이 수 밀리초 안에 복구합니다.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from bot.strategy import TraderState
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    ticker TEXT NOT NULL,
+    event TEXT NOT NULL,
+    position TEXT,
+    last_buy_price REAL,
+    last_buy_volume REAL,
+    order_uuid TEXT,
+    price REAL,
+    volume REAL
+);
+CREATE INDEX IF NOT EXISTS events_ticker ON events (ticker, seq);
+CREATE TABLE IF NOT EXISTS positions (
+    ticker TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    position TEXT,
+    last_buy_price REAL,
+    last_buy_volume REAL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class PositionJournal:
+    """
+    추가 전용 포지션/체결 저널. 여러 스레드에서 공유할 수 있습니다.
+
+    Parameters
+    ----------
+    path : str
+        SQLite 파일 경로
+    compact_every : int, optional (default 1000)
+        이 건수만큼 이벤트가 쌓일 때마다 체크포인트를 만들고 오래된 이벤트 정리
+    keep_events : int, optional (default 100000)
+        정리 후에도 남겨 둘 최근 이벤트 수 (체결 내역 확인용)
+    synchronous : str, optional (default "NORMAL")
+        SQLite synchronous 설정. "NORMAL"은 프로세스 비정상 종료에 안전하며,
+        전원 장애까지 대비하려면 "FULL"
+    """
+
+    def __init__(self, path, compact_every=1000, keep_events=100_000, synchronous="NORMAL"):
+        self.path = path
+        self.compact_every = compact_every
+        self.keep_events = keep_events
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript(_SCHEMA)
+        self._since_compact = self._conn.execute(
+            "SELECT COUNT(*) FROM events WHERE seq > ?", (self._checkpoint_seq(),)).fetchone()[0]
+
+    @classmethod
+    def from_env(cls):
+        """
+        .env 설정값(POSITION_JOURNAL_PATH, POSITION_JOURNAL_COMPACT_EVERY)으로 생성합니다.
+        POSITION_JOURNAL_PATH가 빈 문자열이면 None.
+        """
+        path = os.getenv("POSITION_JOURNAL_PATH", "positions.db")
+        if not path:
+            return None
+        return cls(path, compact_every=int(os.getenv("POSITION_JOURNAL_COMPACT_EVERY", "1000")))
+
+    def _checkpoint_seq(self):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'checkpoint_seq'").fetchone()
+        return row[0] if row else 0
+
+    def record(self, ticker, event, position, last_buy_price=None, last_buy_volume=None,
+               order_uuid=None, price=None, volume=None, ts=None):
+        """
+        포지션 변경/체결 이벤트를 추가합니다.
+
+        Parameters
+        ----------
+        ticker : str
+            마켓 코드
+        event : str
+            이벤트 종류 (예: "buy_filled", "sell_filled", "emergency_sell", "reset")
+        position : str or None
+            변경 후 포지션 ("buy", "sell", None)
+        last_buy_price, last_buy_volume : float, optional
+            변경 후 매수 가격/수량
+        order_uuid, price, volume : optional
+            관련 주문과 평균 체결 가격/수량
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO events (ts, ticker, event, position, last_buy_price, last_buy_volume, "
+                "order_uuid, price, volume) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (ts if ts is not None else time.time(), ticker, event, position, last_buy_price,
+                 last_buy_volume, order_uuid, price, volume))
+            self._since_compact += 1
+            if self.compact_every and self._since_compact >= self.compact_every:
+                self._compact()
+
+    def compact(self):
+        """
+        티커별 최신 상태를 체크포인트로 저장하고 keep_events보다 오래된 이벤트를 삭제합니다.
+        """
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            checkpoint = self._checkpoint_seq()
+            conn.execute(
+                "INSERT OR REPLACE INTO positions (ticker, seq, ts, position, last_buy_price, last_buy_volume) "
+                "SELECT ticker, seq, ts, position, last_buy_price, last_buy_volume FROM events "
+                "WHERE seq IN (SELECT MAX(seq) FROM events WHERE seq > ? GROUP BY ticker)", (checkpoint,))
+            last_seq = conn.execute("SELECT COALESCE(MAX(seq), ?) FROM events", (checkpoint,)).fetchone()[0]
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('checkpoint_seq', ?)", (last_seq,))
+            conn.execute("DELETE FROM events WHERE seq <= ?", (last_seq - self.keep_events,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._since_compact = 0
+
+    def restore_all(self) -> dict:
+        """
+        체크포인트와 이후 이벤트로 티커별 최신 상태를 복구합니다.
+
+        Returns
+        -------
+        dict
+            티커 -> TraderState
+        """
+        with self._lock:
+            checkpoint = self._checkpoint_seq()
+            rows = self._conn.execute(
+                "SELECT ticker, position, last_buy_price, last_buy_volume FROM positions").fetchall()
+            rows += self._conn.execute(
+                "SELECT ticker, position, last_buy_price, last_buy_volume FROM events WHERE seq > ? ORDER BY seq",
+                (checkpoint,)).fetchall()
+        states = {}
+        for ticker, position, last_buy_price, last_buy_volume in rows:
+            states[ticker] = TraderState(position, last_buy_price, last_buy_volume)
+        return states
+
+    def restore(self, ticker):
+        """
+        티커의 최신 상태를 복구합니다. 기록이 없으면 None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT position, last_buy_price, last_buy_volume FROM events WHERE ticker = ? AND seq > ? "
+                "ORDER BY seq DESC LIMIT 1", (ticker, self._checkpoint_seq())).fetchone()
+            if row is None:
+                row = self._conn.execute(
+                    "SELECT position, last_buy_price, last_buy_volume FROM positions WHERE ticker = ?",
+                    (ticker,)).fetchone()
+        return TraderState(*row) if row is not None else None
+
+    def events(self, ticker=None, limit=100):
+        """
+        최근 이벤트를 최신순으로 반환합니다 (dict 목록).
+        """
+        query = "SELECT * FROM events"
+        args = ()
+        if ticker is not None:
+            query += " WHERE ticker = ?"
+            args = (ticker,)
+        query += " ORDER BY seq DESC LIMIT ?"
+        with self._lock:
+            cursor = self._conn.execute(query, args + (limit,))
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def close(self):
+        """
+        체크포인트를 만들고 파일을 닫습니다.
+        """
+        with self._lock:
+            if self._since_compact:
+                self._compact()
+            self._conn.close()
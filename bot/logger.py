@@ -0,0 +1,303 @@
+"""
+대기열 기반 구조화 로거
+
+로그 호출은 (시각, 레벨, 스레드, 메시지, 인자, 필드)를 대기열에 넣고 바로 반환하며,
+메시지 포맷과 출력은 백그라운드 스레드가 처리합니다. 설정된 레벨보다 낮은 로그는
+정수 비교 한 번으로 버려지고, 인자는 실제로 출력할 때만 logging 모듈처럼 msg % args로 포맷됩니다.
+
+출력:
+    - 콘솔: 기존 log_with_timestamp와 같은 "[YYYY-MM-DD HH:MM:SS] 메시지" 형식 (start.sh의 output.log)
+    - 파일(LOG_FILE): JSON Lines ({"ts", "level", "thread", "msg", ...필드}), 크기/시간 기준 교체
+
+사용 예:
+    logger = get_logger()
+    logger.info("Orderbook Bid Price: %.2f", bid_price, ticker="KRW-BTC")
+    logger.debug("poll %d for %s", count, order_uuid)  # LOG_LEVEL=INFO이면 비용 거의 없음
+"""
+import atexit
+import inspect
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+_default_logger = None
+_default_lock = threading.Lock()
+# 대기열 종료 표시
+_STOP = object()
+
+
+def parse_level(level) -> int:
+    """
+    "INFO" 같은 레벨 이름 또는 정수를 레벨 값으로 변환합니다.
+    """
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVELS[str(level).upper()]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {level}")
+
+
+class RotatingJsonlWriter:
+    """
+    JSON Lines 파일 출력. 파일이 max_bytes를 넘거나 rotate_seconds가 지나면
+    path.1, path.2, ... 로 밀어내고 새 파일을 엽니다 (backup_count개 보관).
+    """
+
+    def __init__(self, path, max_bytes=10 * 1024 * 1024, rotate_seconds=86400.0, backup_count=7):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_seconds = rotate_seconds
+        self.backup_count = backup_count
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = None
+        self._open()
+
+    def _open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        self._opened_at = time.time()
+
+    def _should_rotate(self, now):
+        if self.max_bytes and self._size >= self.max_bytes:
+            return True
+        return bool(self.rotate_seconds) and self._size > 0 and now - self._opened_at >= self.rotate_seconds
+
+    def rotate(self):
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def write(self, line, now):
+        if self._should_rotate(now):
+            self.rotate()
+        self._file.write(line)
+        self._size += len(line.encode("utf-8"))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class StructuredLogger:
+    """
+    레벨과 지연 포맷을 지원하는 비동기 로거.
+
+    Parameters
+    ----------
+    level : int or str, optional (default "INFO")
+        출력할 최소 레벨
+    path : str, optional
+        JSON Lines 로그 파일 경로. None이면 파일에 쓰지 않음
+    console : bool, optional (default True)
+        콘솔(stream)에 "[시각] 메시지" 형식으로 출력할지 여부
+    stream : file-like, optional
+        콘솔 출력 대상 (기본값: sys.stdout)
+    max_bytes : int, optional (default 10MB)
+        로그 파일 교체 크기
+    rotate_seconds : float, optional (default 86400)
+        로그 파일 교체 주기(초). 0이면 시간 기준 교체 안 함
+    backup_count : int, optional (default 7)
+        보관할 이전 로그 파일 수
+    max_queue : int, optional (default 100000)
+        대기열 최대 크기. 가득 차면 새 로그를 버리고 dropped를 증가
+    """
+
+    def __init__(self, level="INFO", path=None, console=True, stream=None, max_bytes=10 * 1024 * 1024,
+                 rotate_seconds=86400.0, backup_count=7, max_queue=100_000):
+        self.level = parse_level(level)
+        self.console = console
+        self.stream = stream
+        self._writer = RotatingJsonlWriter(path, max_bytes, rotate_seconds, backup_count) if path else None
+        # SimpleQueue(C 구현)는 Queue보다 put 비용이 훨씬 작음. 크기 제한은 qsize로 확인
+        self._queue = queue.SimpleQueue()
+        self.max_queue = max_queue
+        self._thread = threading.Thread(target=self._run, name="StructuredLogger", daemon=True)
+        self._closed = False
+        self._stamp_second = None
+        self._stamp_text = ""
+        self.dropped = 0
+        self._thread.start()
+
+    def is_enabled_for(self, level) -> bool:
+        return level >= self.level
+
+    def set_level(self, level):
+        self.level = parse_level(level)
+
+    def log(self, level, msg, *args, **fields):
+        """
+        level 로그를 남깁니다. args가 있으면 출력 시 msg % args로 포맷합니다.
+
+        args와 fields는 백그라운드에서 포맷되므로 이후에 변경될 수 있는 객체(dict 등)는
+        미리 문자열로 만들어 넘기십시오.
+        """
+        if level < self.level or self._closed:
+            return
+        if self._queue.qsize() >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.put((time.time(), level, threading.current_thread().name, msg, args, fields))
+
+    def debug(self, msg, *args, **fields):
+        if DEBUG >= self.level:
+            self.log(DEBUG, msg, *args, **fields)
+
+    def info(self, msg, *args, **fields):
+        if INFO >= self.level:
+            self.log(INFO, msg, *args, **fields)
+
+    def warning(self, msg, *args, **fields):
+        if WARNING >= self.level:
+            self.log(WARNING, msg, *args, **fields)
+
+    def error(self, msg, *args, **fields):
+        if ERROR >= self.level:
+            self.log(ERROR, msg, *args, **fields)
+
+    # log=print 처럼 메시지 하나를 받는 콜백 자리에 그대로 넘길 수 있도록
+    __call__ = info
+
+    def _stamp(self, ts):
+        second = int(ts)
+        if second != self._stamp_second:
+            self._stamp_second = second
+            self._stamp_text = datetime.fromtimestamp(second).strftime("[%Y-%m-%d %H:%M:%S]")
+        return self._stamp_text
+
+    def _format(self, record):
+        ts, level, thread, msg, args, fields = record
+        if args:
+            try:
+                msg = msg % args
+            except (TypeError, KeyError, ValueError) as e:
+                msg = f"{msg} {args!r} (format error: {e})"
+        else:
+            msg = str(msg)
+        return ts, level, thread, msg, fields
+
+    def _write(self, records):
+        stream = self.stream or sys.stdout
+        console_lines = []
+        for record in records:
+            ts, level, thread, msg, fields = self._format(record)
+            if self.console:
+                console_lines.append(f"{self._stamp(ts)} {msg}\n")
+            if self._writer is not None:
+                entry = {"ts": datetime.fromtimestamp(ts).isoformat(timespec="milliseconds"),
+                         "level": LEVEL_NAMES.get(level, str(level)), "thread": thread, "msg": msg}
+                entry.update(fields)
+                self._writer.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n", ts)
+        if console_lines:
+            stream.write("".join(console_lines))
+            stream.flush()
+        if self._writer is not None:
+            self._writer.flush()
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            # 쌓인 로그를 한 번에 출력
+            while len(items) < 1000:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            records = [item for item in items if isinstance(item, tuple)]
+            try:
+                self._write(records)
+            except Exception as e:  # 로깅 실패로 봇이 멈추지 않도록
+                sys.stderr.write(f"StructuredLogger write failed: {e}\n")
+            # flush()가 넣은 Event는 앞선 로그를 모두 출력한 뒤 알림
+            for item in items:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if any(item is _STOP for item in items):
+                return
+
+    def flush(self, timeout=5.0) -> bool:
+        """
+        지금까지 남긴 로그가 모두 출력될 때까지 기다립니다.
+        """
+        if not self._thread.is_alive():
+            return True
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """
+        남은 로그를 출력하고 백그라운드 스레드와 로그 파일을 닫습니다.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._writer is not None:
+            self._writer.close()
+
+
+def leveled(log):
+    """
+    로그 함수를 log(message, *args, level=INFO, **fields) 형식으로 맞춥니다.
+
+    print나 lambda message: ... 처럼 메시지 하나만 받는 함수는 message % args로 포맷한
+    문자열 하나로 호출하도록 감싸고, 이미 인자/레벨을 받는 함수는 그대로 반환합니다.
+    """
+    try:
+        parameters = inspect.signature(log).parameters.values()
+    except (TypeError, ValueError):
+        parameters = ()
+    kinds = {parameter.kind for parameter in parameters}
+    if inspect.Parameter.VAR_POSITIONAL in kinds and inspect.Parameter.VAR_KEYWORD in kinds:
+        return log
+
+    def plain(message, *args, level=INFO, **fields):
+        log(message % args if args else message)
+
+    return plain
+
+
+def get_logger() -> StructuredLogger:
+    """
+    .env 설정(LOG_LEVEL, LOG_FILE, LOG_CONSOLE, LOG_MAX_BYTES, LOG_ROTATE_SECONDS, LOG_BACKUP_COUNT)으로
+    만든 공용 로거를 반환합니다. 프로세스 종료 시 남은 로그를 출력합니다.
+    """
+    global _default_logger
+    if _default_logger is None:
+        with _default_lock:
+            if _default_logger is None:
+                logger = StructuredLogger(
+                    level=os.getenv("LOG_LEVEL", "INFO"),
+                    path=os.getenv("LOG_FILE") or None,
+                    console=os.getenv("LOG_CONSOLE", "true").lower() == "true",
+                    max_bytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+                    rotate_seconds=float(os.getenv("LOG_ROTATE_SECONDS", "86400")),
+                    backup_count=int(os.getenv("LOG_BACKUP_COUNT", "7")),
+                )
+                atexit.register(logger.close)
+                _default_logger = logger
+    return _default_logger
@@ -0,0 +1,381 @@
+"""
+모든 트레이더가 공유하는 시세 데이터 허브
+
+백그라운드 스레드가 전체 티커의 호가(다중 마켓 요청)와 캔들을 주기적으로 조회하고,
+변경할 수 없는 스냅샷(MarketSnapshot)으로 발행합니다. 트레이더는 잠금 없이
+최신 스냅샷을 읽고, 데이터별 조회 시각으로 오래된 데이터를 걸러냅니다.
+"""
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+import python_bithumb
+from python_bithumb.candle_aggregator import TradeCandleBook, parse_interval
+from python_bithumb.public_api import ohlcv_request_count
+from python_bithumb.resample import OHLCVResampler, interval_minutes
+
+from bot.candle_buffer import CandleBuffer
+from bot.logger import ERROR, WARNING, leveled
+
+# 데이터와 조회 시각(time.time())
+Stamped = namedtuple("Stamped", ["value", "fetched_at"])
+
+
+class MarketSnapshot:
+    """
+    특정 시점의 호가/캔들 데이터 묶음 (읽기 전용).
+
+    Attributes
+    ----------
+    orderbooks : Mapping[str, Stamped]
+        마켓별 호가 (python_bithumb.get_orderbook 단일 마켓 형식)
+    candles : Mapping[tuple, Stamped]
+        (마켓, 간격)별 캔들 DataFrame. 공유 객체이므로 수정하지 마십시오.
+    created_at : float
+        스냅샷 발행 시각
+    """
+
+    __slots__ = ("orderbooks", "candles", "created_at")
+
+    def __init__(self, orderbooks=None, candles=None, created_at=None):
+        object.__setattr__(self, "orderbooks", MappingProxyType(dict(orderbooks or {})))
+        object.__setattr__(self, "candles", MappingProxyType(dict(candles or {})))
+        object.__setattr__(self, "created_at", created_at if created_at is not None else time.time())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MarketSnapshot is immutable")
+
+    @staticmethod
+    def _fresh(entry, max_age, now):
+        if entry is None:
+            return None
+        if max_age is not None and now - entry.fetched_at > max_age:
+            return None
+        return entry.value
+
+    def orderbook(self, ticker, max_age=None, now=None):
+        """
+        마켓의 호가를 반환합니다. 없거나 max_age(초)보다 오래되었으면 None.
+        """
+        return self._fresh(self.orderbooks.get(ticker), max_age, now if now is not None else time.time())
+
+    def candle(self, ticker, interval, max_age=None, now=None):
+        """
+        마켓/간격의 캔들 DataFrame을 반환합니다. 없거나 max_age(초)보다 오래되었으면 None.
+        """
+        return self._fresh(self.candles.get((ticker, interval)), max_age, now if now is not None else time.time())
+
+
+class MarketDataHub:
+    """
+    호가/캔들 폴링 허브.
+
+    Parameters
+    ----------
+    tickers : list of str
+        조회할 마켓 코드 목록
+    candle_specs : list of tuple, optional
+        (간격, 개수) 목록. 기본값 [("minute60", 24), ("minute1", 5)]
+    orderbook_fn : callable, optional
+        호가 조회 함수 (기본값: python_bithumb.get_orderbook)
+    ohlcv_fn : callable, optional
+        캔들 조회 함수 (기본값: python_bithumb.get_ohlcv)
+    limiter : RateLimiter, optional
+        공유 API 속도 제한기
+    orderbook_interval : float, optional (default 1.0)
+        호가 갱신 주기(초)
+    candle_refresh : dict, optional
+        간격별 캔들 갱신 주기(초). 기본값은 minute1 1초, 그 외 30초
+    chunk_size : int, optional (default 50)
+        호가 요청 1회당 최대 마켓 수
+    log : callable, optional
+        오류 로그 출력 함수
+    use_buffers : bool, optional (default True)
+        True이면 캔들을 CandleBuffer에 한 번 채운 뒤 최근 update_count개만 조회하여 갱신
+    update_count : int, optional (default 2)
+        증분 갱신 시 조회할 캔들 개수 (진행 중 캔들 + 직전 마감 캔들)
+    trade_intervals : list of str, optional
+        체결로 직접 만들 캔들 간격 (예: ["minute1"]). 처음 한 번 get_ohlcv로 채운 뒤에는
+        티커당 체결 조회 1회(trades_fn)로 이 간격들을 모두 갱신하며, feed_trades()로
+        체결 스트림을 넣을 수도 있습니다
+    trades_fn : callable, optional
+        체결 조회 함수 (기본값: python_bithumb.get_trades_ticks)
+    trade_count : int, optional (default 100)
+        체결 조회 1회당 요청할 체결 수. 폴링 사이 체결이 더 많으면 cursor로 이전 페이지를 더 조회
+    price_board : PriceBoardPublisher, optional
+        지정 시 조회한 호가(최우선 호가/잔량)를 공유 메모리 가격판에도 게시하여 다른 프로세스가
+        API 호출 없이 읽을 수 있게 합니다
+    resample : bool, optional (default False)
+        True이면 minute1 캐시(OHLCVResampler) 하나를 티커당 1회 조회로 갱신하고, 더 긴 간격
+        (minute60, day 등)은 API 대신 캐시에서 합쳐 만듭니다 (간격별 첫 사용 시 API와 비교 검증)
+    """
+
+    def __init__(self, tickers, candle_specs=None, orderbook_fn=None, ohlcv_fn=None, limiter=None,
+                 orderbook_interval=1.0, candle_refresh=None, chunk_size=50, log=print,
+                 use_buffers=True, update_count=2, trade_intervals=None, trades_fn=None, trade_count=100,
+                 resample=False, price_board=None):
+        self._tickers = list(tickers)
+        self.candle_specs = list(candle_specs or [("minute60", 24), ("minute1", 5)])
+        self._orderbook_fn = orderbook_fn or python_bithumb.get_orderbook
+        self._ohlcv_fn = ohlcv_fn or python_bithumb.get_ohlcv
+        self._limiter = limiter
+        self.orderbook_interval = orderbook_interval
+        self.candle_refresh = {"minute1": 1.0}
+        self.candle_refresh.update(candle_refresh or {})
+        self.chunk_size = chunk_size
+        self.log = leveled(log)
+        self.use_buffers = use_buffers
+        self.update_count = update_count
+        self._buffers = {}
+        self.trade_intervals = set(trade_intervals or [])
+        self.trade_book = None
+        if self.trade_intervals:
+            max_bars = max([200] + [count for interval, count in self.candle_specs])
+            self.trade_book = TradeCandleBook(sorted(self.trade_intervals), max_bars=max_bars)
+        self._trades_fn = trades_fn or python_bithumb.get_trades_ticks
+        self.trade_count = trade_count
+        self.price_board = price_board
+        self.resampler = None
+        self.resample_intervals = set()
+        if resample:
+            needed = {}
+            for interval, count in self.candle_specs:
+                if interval in self.trade_intervals:
+                    continue
+                try:
+                    # 첫 캔들은 캐시 시작 이전 구간을 포함할 수 있으므로 한 개 더
+                    needed[interval] = interval_minutes(interval) * (count + 1)
+                except ValueError:
+                    continue
+            # 일주일치(10080개)를 넘는 minute1 캐시가 필요한 간격은 API로 조회
+            needed = {interval: minutes for interval, minutes in needed.items() if minutes <= 7 * 1440}
+            if needed:
+                self.resample_intervals = set(needed)
+                # 리샘플러는 API 호출(갱신/검증/대체 조회)마다 직접 limiter를 사용
+                self.resampler = OHLCVResampler(self._ohlcv_fn, max_minutes=max(needed.values()), limiter=limiter)
+        self._snapshot = MarketSnapshot()
+        self._publish_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.fetches = 0
+
+    @property
+    def snapshot(self) -> MarketSnapshot:
+        """
+        가장 최근에 발행된 스냅샷 (잠금 없이 읽기).
+        """
+        return self._snapshot
+
+    @property
+    def tickers(self):
+        return list(self._tickers)
+
+    def set_tickers(self, tickers):
+        """
+        조회할 티커 목록을 교체합니다. 다음 갱신 주기부터 반영됩니다.
+        """
+        self._tickers = list(tickers)
+
+    def _acquire(self, requests=1):
+        if self._limiter is not None:
+            for _ in range(requests):
+                self._limiter.acquire()
+        self.fetches += requests
+
+    def _publish(self, orderbooks=None, candles=None):
+        with self._publish_lock:
+            current = self._snapshot
+            new_orderbooks = dict(current.orderbooks)
+            new_candles = dict(current.candles)
+            if orderbooks:
+                new_orderbooks.update(orderbooks)
+            if candles:
+                new_candles.update(candles)
+            # 제외된 티커 데이터 정리
+            active = set(self._tickers)
+            new_orderbooks = {m: v for m, v in new_orderbooks.items() if m in active}
+            new_candles = {k: v for k, v in new_candles.items() if k[0] in active}
+            self._snapshot = MarketSnapshot(new_orderbooks, new_candles)
+
+    def refresh_orderbooks(self):
+        """
+        전체 티커의 호가를 다중 마켓 요청으로 갱신합니다.
+        """
+        tickers = list(self._tickers)
+        updates = {}
+        for i in range(0, len(tickers), self.chunk_size):
+            chunk = tickers[i:i + self.chunk_size]
+            try:
+                self._acquire()
+                result = self._orderbook_fn(chunk)
+            except Exception as e:
+                self.log("Error fetching orderbooks for %d markets: %s", len(chunk), e, level=ERROR)
+                continue
+            fetched_at = time.time()
+            if not result:
+                continue
+            if self.price_board is not None:
+                self.price_board.update_orderbooks(result)
+            if "orderbook_units" in result:
+                updates[result["market"]] = Stamped(result, fetched_at)
+            else:
+                for market, book in result.items():
+                    updates[market] = Stamped(book, fetched_at)
+        self._publish(orderbooks=updates)
+
+    def refresh_candles(self, force=False):
+        """
+        갱신 주기가 지난 (티커, 간격) 캔들을 다시 조회합니다.
+        """
+        now = time.time()
+        snapshot = self._snapshot
+        updates = {}
+        for ticker in list(self._tickers):
+            polled = False
+            resampled = False
+            for interval, count in self.candle_specs:
+                entry = snapshot.candles.get((ticker, interval))
+                refresh = self.candle_refresh.get(interval, 30.0)
+                if not force and entry is not None and now - entry.fetched_at < refresh:
+                    continue
+                try:
+                    if interval in self.trade_intervals:
+                        df = self._refresh_from_trades(ticker, interval, count, poll=not polled)
+                        polled = True
+                    elif interval in self.resample_intervals:
+                        calls = self.resampler.api_calls
+                        try:
+                            if not resampled:
+                                self.resampler.refresh(ticker)
+                                resampled = True
+                            df = self.resampler.get_ohlcv(ticker, interval=interval, count=count)
+                        finally:
+                            self.fetches += self.resampler.api_calls - calls
+                    elif self.use_buffers:
+                        df = self._refresh_buffer(ticker, interval, count)
+                    else:
+                        self._acquire(ohlcv_request_count(count))
+                        df = self._ohlcv_fn(ticker, interval=interval, count=count)
+                except Exception as e:
+                    self.log("Error fetching candles for %s: %s", ticker, e, level=ERROR)
+                    continue
+                if df is not None and not df.empty:
+                    updates[(ticker, interval)] = Stamped(df, time.time())
+        active = set(self._tickers)
+        if self.use_buffers:
+            for key in [key for key in self._buffers if key[0] not in active]:
+                del self._buffers[key]
+        if self.trade_book is not None:
+            for ticker in self.trade_book.markets() - active:
+                self.trade_book.discard(ticker)
+        if self.resampler is not None:
+            for ticker in self.resampler.tickers() - active:
+                self.resampler.discard(ticker)
+        if updates:
+            self._publish(candles=updates)
+
+    def _refresh_buffer(self, ticker, interval, count):
+        """
+        캔들 버퍼를 처음에는 count개로 채우고, 이후에는 최근 update_count개로만 갱신합니다.
+        """
+        key = (ticker, interval)
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.size != count:
+            buffer = self._buffers[key] = CandleBuffer(ticker, interval, count)
+        if buffer.seeded:
+            self._acquire(ohlcv_request_count(self.update_count))
+            latest = self._ohlcv_fn(ticker, interval=interval, count=self.update_count)
+            if not buffer.update(latest):
+                # 마지막 캔들과 겹치지 않으면 놓친 캔들이 있을 수 있으므로 다시 채움
+                buffer.seed(None)
+        if not buffer.seeded:
+            self._acquire(ohlcv_request_count(count))
+            buffer.seed(self._ohlcv_fn(ticker, interval=interval, count=count))
+        return buffer.to_frame() if buffer.seeded else None
+
+    def _refresh_from_trades(self, ticker, interval, count, poll=True):
+        """
+        체결 기반 캔들을 처음에는 get_ohlcv로 채우고, 이후에는 최근 체결로 갱신합니다.
+        poll=False이면 같은 주기에 이미 조회한 체결만 사용합니다.
+        거슬러 조회해도 이전 체결과 이어지지 않으면 티커의 시간 캔들을 get_ohlcv로 다시 채웁니다.
+        """
+        book = self.trade_book
+        if len(book.aggregator(ticker, interval)) == 0:
+            self._acquire(ohlcv_request_count(count))
+            book.seed(ticker, interval, self._ohlcv_fn(ticker, interval=interval, count=count))
+        if poll:
+            gaps = book.gaps[ticker]
+            book.poll(ticker, count=self.trade_count, trades_fn=self._limited_trades)
+            if book.gaps[ticker] > gaps:
+                self.log("Missed trades for %s between polls (more than %d pages of %d). Reseeding candles.",
+                         ticker, book.max_pages, self.trade_count, level=WARNING)
+                for spec_interval, spec_count in self.candle_specs:
+                    # 체결 수/거래량 캔들은 get_ohlcv로 채울 수 없으므로 그대로 이어서 갱신
+                    if spec_interval not in self.trade_intervals or \
+                            parse_interval(spec_interval)[0] in ("tick", "volume", "value"):
+                        continue
+                    self._acquire(ohlcv_request_count(spec_count))
+                    book.seed(ticker, spec_interval, self._ohlcv_fn(ticker, interval=spec_interval, count=spec_count))
+        return book.candles(ticker, interval, count)
+
+    def _limited_trades(self, ticker, **params):
+        # 체결 조회(거슬러 올라가는 페이지 포함)도 요청마다 속도 제한 토큰 사용
+        self._acquire()
+        return self._trades_fn(ticker, **params)
+
+    def feed_trades(self, ticker, trades):
+        """
+        체결 스트림 등에서 받은 체결을 체결 기반 캔들(trade_intervals)에 반영합니다.
+        """
+        if self.trade_book is None:
+            raise ValueError("trade_intervals is not configured")
+        return self.trade_book.feed(ticker, trades)
+
+    def buffer(self, ticker, interval):
+        """
+        (티커, 간격)의 CandleBuffer를 반환합니다. 허브 스레드가 갱신하므로 다른 스레드에서는
+        스냅샷(fetch_candles)을 읽는 것이 안전합니다.
+        """
+        return self._buffers.get((ticker, interval))
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.refresh_orderbooks()
+            self.refresh_candles()
+            elapsed = time.monotonic() - started
+            self._stop.wait(max(0.0, self.orderbook_interval - elapsed))
+
+    def start(self):
+        """
+        백그라운드 폴링 스레드를 시작합니다.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="MarketDataHub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def get_orderbook(self, ticker, max_age=None):
+        """
+        최신 스냅샷에서 호가를 읽습니다. 없거나 오래되었으면 None.
+        """
+        return self._snapshot.orderbook(ticker, max_age=max_age)
+
+    def fetch_candles(self, ticker, interval="day", count=200, max_age=None):
+        """
+        get_candles()와 같은 호출 방식으로 스냅샷의 캔들을 반환합니다.
+
+        스냅샷에 해당 간격이 없거나, 요청 개수가 보관 개수보다 많거나, 오래된 경우 None을 반환합니다.
+        """
+        df = self._snapshot.candle(ticker, interval, max_age=max_age)
+        if df is None or len(df) < count:
+            return None
+        return df.iloc[-count:]
@@ -0,0 +1,119 @@
+"""
+엔진 부하 테스트용 인메모리 모의 거래소
+
+python_bithumb.simulator.ExchangeSimulator를 HTTP 없이 직접 호출하여, python_bithumb의
+공개 함수(get_orderbook, get_ohlcv)와 Bithumb 클라이언트의 주문 메소드를 흉내 냅니다.
+시세/주문장/체결 규칙은 로컬 시뮬레이터 서버와 같습니다.
+"""
+import re
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from python_bithumb.public_api import candles_to_frame
+from python_bithumb.simulator import ExchangeSimulator, SimulatorError
+
+_MINUTE_RE = re.compile(r"^minute(\d+)$")
+_CANDLE_KINDS = {"day": "days", "week": "weeks", "month": "months"}
+
+
+class MockExchange:
+    """
+    ExchangeSimulator 위에 클라이언트 인터페이스를 얹은 모의 거래소.
+
+    Parameters
+    ----------
+    markets : list of str
+        마켓 코드 목록 (예: ["KRW-BTC", "KRW-XRP"])
+    seed : int, optional (default 0)
+        난수 시드 (시작 가격과 시세 모두)
+    levels : int, optional (default 5)
+        호가 단계 수
+    speed : float, optional (default 1.0)
+        실제 1초당 흐르는 모의 시간(초). sleep_scale과 역수로 맞추면 전체가 빨라집니다.
+    volatility : float, optional (default 0.0005)
+        모의 1초당 로그 가격 변동성
+    history : int, optional (default 1500)
+        시작 시 만들어 둘 과거 분봉 개수 (minute60 24개를 만들려면 1440개 이상)
+    """
+
+    ACCESS_KEY = "mock-access-key"
+
+    def __init__(self, markets, seed=0, levels=5, speed=1.0, volatility=0.0005, history=1500):
+        self.markets = list(markets)
+        # 마켓마다 10원 ~ 100만원 사이의 시작 가격
+        prices = 10 ** np.random.default_rng(seed).uniform(1, 6, size=len(self.markets))
+        # 주문 수량을 1개 단위로 쓰는 부하 테스트에서 저가 마켓도 주문되도록 최소 주문 금액 없음
+        self.simulator = ExchangeSimulator(dict(zip(self.markets, prices.tolist())), seed=seed, speed=speed,
+                                           volatility=volatility, min_total=0, depth_levels=levels, history=history)
+        self._account = self.simulator.add_account(self.ACCESS_KEY, "mock-secret", {"KRW": 1e15})
+        self.calls = Counter()
+
+    def advance(self):
+        """
+        실제 경과 시간 * speed 만큼 모의 시간을 진행하고 미체결 주문을 체결 처리합니다.
+        """
+        self.simulator.advance()
+
+    # ------------------------------------------------------------------
+    # 시세
+    # ------------------------------------------------------------------
+    def get_orderbook(self, markets):
+        """
+        python_bithumb.get_orderbook과 같은 형식으로 호가를 반환합니다.
+        """
+        self.calls["get_orderbook"] += 1
+        self.advance()
+        if not isinstance(markets, list):
+            markets = [markets]
+        books = [self.simulator.orderbook(m) for m in markets if m in self.simulator.markets]
+        if len(books) == 0:
+            return None
+        if len(books) == 1:
+            return books[0]
+        return {book["market"]: book for book in books}
+
+    def get_ohlcv(self, ticker, interval="day", count=200, **kwargs):
+        """
+        python_bithumb.get_ohlcv와 같은 컬럼의 DataFrame을 반환합니다. 없는 마켓/간격이면 빈 DataFrame.
+        """
+        self.calls["get_ohlcv"] += 1
+        self.advance()
+        match = _MINUTE_RE.match(interval)
+        kind = "minutes" if match else _CANDLE_KINDS.get(interval)
+        if kind is None or ticker not in self.simulator.markets:
+            return pd.DataFrame()
+        try:
+            candles = self.simulator.candles(kind, ticker, count, unit=int(match.group(1)) if match else None)
+        except SimulatorError:
+            return pd.DataFrame()
+        return candles_to_frame(candles)
+
+    # ------------------------------------------------------------------
+    # 주문 (Bithumb 클라이언트 인터페이스)
+    # ------------------------------------------------------------------
+    def _place(self, body):
+        self.advance()
+        return self.simulator.place_order(self._account, body)
+
+    def buy_limit_order(self, ticker, price, volume):
+        self.calls["buy_limit_order"] += 1
+        return self._place({"market": ticker, "side": "bid", "ord_type": "limit", "price": price, "volume": volume})
+
+    def sell_limit_order(self, ticker, price, volume):
+        self.calls["sell_limit_order"] += 1
+        return self._place({"market": ticker, "side": "ask", "ord_type": "limit", "price": price, "volume": volume})
+
+    def sell_market_order(self, ticker, volume):
+        self.calls["sell_market_order"] += 1
+        return self._place({"market": ticker, "side": "ask", "ord_type": "market", "volume": volume})
+
+    def get_order(self, uuid):
+        self.calls["get_order"] += 1
+        self.advance()
+        return self.simulator.get_order(self._account, uuid)
+
+    def cancel_order(self, order_uuid):
+        self.calls["cancel_order"] += 1
+        return self.simulator.cancel_order(self._account, order_uuid)
@@ -0,0 +1,300 @@
+"""
+디스코드 웹훅 알림 전송기
+
+트레이더 스레드는 notify()로 알림을 대기열에 넣고 바로 반환하며, 백그라운드 스레드가
+여러 알림을 임베드 묶음(메시지당 최대 10개)으로 모아 웹훅에 전송합니다. 아직 전송되지 않은
+같은 키(기본값: 제목, 예: "🚨 Emergency Sell Alert: KRW-XRP")의 알림은 최신 내용으로
+합쳐지고 반복 횟수만 표시됩니다. 429 응답과 X-RateLimit-* 헤더에 따라 전송을 늦추며,
+close()는 남은 알림을 전송한 뒤 종료합니다.
+"""
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import requests
+
+from bot.logger import ERROR, leveled
+
+# 디스코드 웹훅 제한
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+MAX_TITLE_CHARS = 256
+MAX_DESCRIPTION_CHARS = 4096
+DEFAULT_COLOR = 3447003  # 파란색
+
+_default_notifier = None
+_default_lock = threading.Lock()
+
+
+def _truncate(text, limit):
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+class DiscordNotifier:
+    """
+    대기열 기반 비동기 디스코드 알림 전송기.
+
+    Parameters
+    ----------
+    webhook_url : str
+        디스코드 웹훅 URL. 없으면 알림을 버리고 경고만 한 번 남김
+    max_pending : int, optional (default 1000)
+        전송 대기 알림 최대 개수. 가득 차면 가장 오래된 알림을 버림
+    batch_delay : float, optional (default 0.5)
+        첫 알림이 들어온 뒤 같은 메시지로 묶을 알림을 기다리는 시간(초)
+    max_retries : int, optional (default 5)
+        네트워크 오류/5xx/429 응답 시 재시도 횟수 (지수 백오프). 모두 실패하면 알림을 버림
+    max_retry_after : float, optional (default 60.0)
+        429 응답의 retry_after(Retry-After)를 따를 최대 대기 시간(초)
+    timeout : float, optional (default 10.0)
+        웹훅 요청 타임아웃(초)
+    session : requests.Session, optional
+        웹훅 요청에 사용할 세션
+    log : callable, optional
+        오류 로그 출력 함수
+    """
+
+    def __init__(self, webhook_url, max_pending=1000, batch_delay=0.5, max_retries=5, timeout=10.0,
+                 session=None, log=print, max_retry_after=60.0):
+        self.webhook_url = webhook_url
+        self.max_pending = max_pending
+        self.batch_delay = batch_delay
+        self.max_retries = max_retries
+        self.max_retry_after = max_retry_after
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.log = leveled(log)
+        # 키 -> [embed, 반복 횟수, 처음 들어온 시각]
+        self._pending = OrderedDict()
+        self._sequence = 0
+        self._cond = threading.Condition()
+        self._sending = False
+        self._closed = False
+        self._thread = None
+        self._blocked_until = 0.0
+        self._warned = False
+        self.sent = 0
+        self.messages = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self):
+        """
+        전송 스레드를 시작합니다.
+        """
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return self
+            self._closed = False
+            self._thread = threading.Thread(target=self._run, name="DiscordNotifier", daemon=True)
+            self._thread.start()
+        return self
+
+    def notify(self, message: str, title: str = None, key=None, color: int = DEFAULT_COLOR) -> bool:
+        """
+        알림을 대기열에 넣습니다. 블로킹하지 않습니다.
+
+        Parameters
+        ----------
+        message : str
+            알림 내용
+        title : str, optional
+            알림 제목 (기본값: "Trading Bot Notification")
+        key : hashable, optional
+            합칠 알림을 구분하는 키 (기본값: 제목)
+        color : int, optional
+            임베드 색상
+
+        Returns
+        -------
+        bool
+            대기열에 들어갔으면 True, 종료 후이거나 웹훅 URL이 없으면 False
+        """
+        if not self.webhook_url:
+            if not self._warned:
+                self._warned = True
+                self.log("Warning: DISCORD_WEBHOOK_URL not set in environment variables")
+            return False
+        title = title if title else "Trading Bot Notification"
+        embed = {
+            "title": _truncate(title, MAX_TITLE_CHARS),
+            "description": _truncate(message, MAX_DESCRIPTION_CHARS),
+            "color": color,
+            "timestamp": datetime.now().isoformat(),
+        }
+        with self._cond:
+            if self._closed:
+                return False
+            if key is None:
+                key = title
+            entry = self._pending.get(key)
+            if entry is not None:
+                entry[0] = embed
+                entry[1] += 1
+                self.coalesced += 1
+                return True
+            if len(self._pending) >= self.max_pending:
+                self._pending.popitem(last=False)
+                self.dropped += 1
+            self._pending[key] = [embed, 1, time.monotonic()]
+            self._cond.notify()
+        if self._thread is None:
+            self.start()
+        return True
+
+    __call__ = notify
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def _take_batch(self):
+        """
+        대기 중인 알림을 메시지 하나 분량(임베드 10개, 6000자)만큼 꺼냅니다.
+        """
+        batch = []
+        chars = 0
+        while self._pending and len(batch) < MAX_EMBEDS_PER_MESSAGE:
+            key, (embed, count, _) = next(iter(self._pending.items()))
+            if count > 1:
+                embed = dict(embed, footer={"text": f"Repeated {count} times"})
+            size = len(embed["title"]) + len(embed["description"]) + len(embed.get("footer", {}).get("text", ""))
+            if batch and chars + size > MAX_EMBED_CHARS_PER_MESSAGE:
+                break
+            del self._pending[key]
+            batch.append(embed)
+            chars += size
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+                # 묶어 보낼 알림을 잠시 기다림 (종료 중이면 바로 전송)
+                oldest = next(iter(self._pending.values()))[2]
+                wait = oldest + self.batch_delay - time.monotonic()
+                if wait > 0 and not self._closed and len(self._pending) < MAX_EMBEDS_PER_MESSAGE:
+                    self._cond.wait(wait)
+                    continue
+                batch = self._take_batch()
+                self._sending = True
+            try:
+                self._send(batch)
+            finally:
+                with self._cond:
+                    self._sending = False
+                    self._cond.notify_all()
+
+    def _send(self, embeds):
+        attempt = 0
+        while True:
+            delay = self._blocked_until - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            retry_after = None
+            try:
+                response = self.session.post(self.webhook_url, json={"embeds": embeds}, timeout=self.timeout)
+            except requests.RequestException as e:
+                error = str(e)
+            else:
+                self._update_rate_limit(response)
+                if response.status_code in (200, 204):
+                    self.sent += len(embeds)
+                    self.messages += 1
+                    return True
+                error = f"Status code: {response.status_code}"
+                if response.status_code == 429:
+                    retry_after = self._retry_after(response)
+                elif response.status_code < 500:
+                    attempt = self.max_retries
+            attempt += 1
+            if attempt > self.max_retries:
+                self.failed += len(embeds)
+                self.log("Failed to send Discord notification. %s", error, level=ERROR)
+                return False
+            backoff = min(2 ** (attempt - 1), 30)
+            if retry_after is None:
+                time.sleep(backoff)
+            else:
+                # 429도 재시도 횟수에 포함. retry_after와 백오프 중 긴 시간 (최대 max_retry_after초)
+                self._blocked_until = time.monotonic() + min(max(retry_after, backoff), self.max_retry_after)
+
+    def _update_rate_limit(self, response):
+        headers = response.headers or {}
+        if headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                reset_after = float(headers.get("X-RateLimit-Reset-After", 1))
+            except ValueError:
+                reset_after = 1.0
+            self._blocked_until = max(self._blocked_until, time.monotonic() + min(reset_after, self.max_retry_after))
+
+    @staticmethod
+    def _retry_after(response):
+        try:
+            return float(response.json().get("retry_after", 1))
+        except (ValueError, AttributeError):
+            pass
+        try:
+            return float(response.headers.get("Retry-After", 1))
+        except (TypeError, ValueError):
+            return 1.0
+
+    def flush(self, timeout=None) -> bool:
+        """
+        대기 중인 알림을 기다리지 않고 바로 전송하고, 모두 전송될 때까지 기다립니다.
+
+        Returns
+        -------
+        bool
+            timeout 안에 모두 전송했으면 True
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            for entry in self._pending.values():
+                entry[2] = float("-inf")
+            self._cond.notify_all()
+            while self._pending or self._sending:
+                if self._thread is None or not self._thread.is_alive():
+                    return not self._pending
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=10.0) -> bool:
+        """
+        남은 알림을 전송하고 전송 스레드를 종료합니다.
+        """
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return flushed
+
+
+def get_notifier() -> DiscordNotifier:
+    """
+    환경변수 DISCORD_WEBHOOK_URL로 만든 공용 전송기를 반환합니다. 프로세스 종료 시 남은 알림을 전송합니다.
+    """
+    global _default_notifier
+    with _default_lock:
+        if _default_notifier is None:
+            from bot.bot import log_with_timestamp
+            _default_notifier = DiscordNotifier(
+                os.getenv("DISCORD_WEBHOOK_URL"),
+                max_pending=int(os.getenv("DISCORD_MAX_PENDING", "1000")),
+                batch_delay=float(os.getenv("DISCORD_BATCH_DELAY_SECONDS", "0.5")),
+                log=log_with_timestamp,
+            )
+            atexit.register(_default_notifier.close)
+        return _default_notifier
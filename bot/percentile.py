@@ -0,0 +1,200 @@
+"""
+롤링 윈도우 백분위 계산
+
+calculate_percentile과 같은 인덱스 규칙(int(n * p / 100), n 이상이면 마지막 값,
+음수면 NumPy 인덱싱처럼 뒤에서부터)을 그대로 따르면서,
+- RollingPercentile: 값 추가/제거 O(log n), 조회 O(log n)의 정렬 컨테이너 (sortedcontainers.SortedList)
+- batch_percentile: 여러 티커의 윈도우를 한 번의 NumPy 호출로 계산
+을 제공합니다.
+"""
+from bisect import bisect_left, insort
+from collections import deque
+
+import numpy as np
+
+try:
+    from sortedcontainers import SortedList
+except ImportError:  # 필수 의존성이지만, 설치 전 환경에서도 동작하도록 bisect 기반 리스트로 대체
+    SortedList = None
+
+
+class _BisectList:
+    """
+    sortedcontainers.SortedList의 일부 기능만 bisect로 구현한 대체 클래스 (sortedcontainers 미설치 시에만 사용).
+    검색은 O(log n)이지만 삽입/삭제는 메모리 이동으로 O(n)입니다.
+    """
+
+    def __init__(self, iterable=()):
+        self._items = sorted(iterable)
+
+    def add(self, value):
+        insort(self._items, value)
+
+    def remove(self, value):
+        index = bisect_left(self._items, value)
+        if index >= len(self._items) or self._items[index] != value:
+            raise ValueError(f"{value} not in list")
+        del self._items[index]
+
+    def clear(self):
+        self._items.clear()
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+def _sorted_container(values=()):
+    if SortedList is not None:
+        return SortedList(values)
+    return _BisectList(values)
+
+
+def percentile_index(count: int, percentile: float) -> int:
+    """
+    calculate_percentile과 동일한 방식으로 정렬된 배열의 인덱스를 계산합니다.
+    """
+    index = int(count * (percentile / 100))
+    if index >= count:
+        index = count - 1
+    return index
+
+
+class RollingPercentile:
+    """
+    롤링 윈도우 값의 백분위를 점진적으로 계산하는 구조.
+
+    push()로 윈도우 방식(가장 오래된 값 자동 제거)으로 사용하거나, add/remove/replace로
+    외부 버퍼(CandleBuffer 등)의 값 변경을 그대로 반영하는 멀티셋으로 사용할 수 있습니다.
+
+    Parameters
+    ----------
+    window : int, optional
+        push() 사용 시 보관할 최대 값 개수
+    values : iterable, optional
+        초기 값
+    """
+
+    def __init__(self, window: int = None, values=()):
+        self.window = window
+        values = list(values)
+        if window is not None:
+            values = values[-window:]
+        self._order = deque(values)
+        self._sorted = _sorted_container(values)
+
+    def __len__(self):
+        return len(self._sorted)
+
+    def push(self, value: float):
+        """
+        값을 추가하고, window를 넘으면 가장 오래된 값을 제거합니다.
+        """
+        value = float(value)
+        self._order.append(value)
+        self._sorted.add(value)
+        if self.window is not None and len(self._order) > self.window:
+            self._sorted.remove(self._order.popleft())
+
+    def add(self, value: float):
+        self._sorted.add(float(value))
+
+    def remove(self, value: float):
+        self._sorted.remove(float(value))
+
+    def replace(self, old: float, new: float):
+        """
+        값 하나를 다른 값으로 교체합니다. (진행 중인 캔들의 종가 갱신 등)
+        """
+        self._sorted.remove(float(old))
+        self._sorted.add(float(new))
+
+    def replace_last(self, value: float):
+        """
+        push()로 마지막에 추가한 값을 교체합니다.
+        """
+        old = self._order[-1]
+        self._order[-1] = float(value)
+        self.replace(old, value)
+
+    def reset(self, values=()):
+        values = [float(v) for v in values]
+        if self.window is not None:
+            values = values[-self.window:]
+        self._order = deque(values)
+        self._sorted = _sorted_container(values)
+
+    def percentile(self, percentile: float):
+        """
+        calculate_percentile과 같은 규칙으로 백분위 값을 반환합니다. 값이 없으면 None.
+
+        Raises
+        ------
+        IndexError
+            음수 백분위로 계산한 인덱스가 범위를 벗어나는 경우 (np.sort 결과 인덱싱과 동일)
+        """
+        count = len(self._sorted)
+        if count == 0:
+            return None
+        index = percentile_index(count, percentile)
+        if index < -count:
+            raise IndexError(f"index {index} is out of bounds for size {count}")
+        return float(self._sorted[index])
+
+    def percentiles(self, percentiles):
+        """
+        여러 백분위를 한 번에 조회합니다.
+        """
+        return [self.percentile(p) for p in percentiles]
+
+
+def batch_percentile(windows, percentile: float, counts=None) -> np.ndarray:
+    """
+    여러 티커의 윈도우 백분위를 한 번에 계산합니다.
+
+    Parameters
+    ----------
+    windows : array-like (티커 수 x 윈도우 길이) 또는 list of 1-D arrays
+        티커별 종가 윈도우. 2-D 배열에서 길이가 짧은 티커는 NaN으로 채웁니다.
+    percentile : float or array-like
+        백분위 (0-100). 티커별로 다르게 지정 가능
+    counts : array-like, optional
+        티커별 유효 값 개수. 생략 시 NaN이 아닌 값의 개수
+
+    Returns
+    -------
+    numpy.ndarray
+        티커별 백분위 값. 데이터가 없거나 인덱스가 범위를 벗어나면 NaN
+    """
+    if isinstance(windows, (list, tuple)) and windows and np.ndim(windows[0]) == 1 \
+            and len({len(w) for w in windows}) > 1:
+        width = max(len(w) for w in windows)
+        matrix = np.full((len(windows), width), np.nan)
+        for row, window in enumerate(windows):
+            matrix[row, :len(window)] = window
+    else:
+        matrix = np.array(windows, dtype=np.float64, ndmin=2)
+
+    # NaN은 정렬 시 뒤로 이동하므로 유효 값은 각 행의 앞쪽 counts개
+    ordered = np.sort(matrix, axis=1)
+    if counts is None:
+        counts = np.count_nonzero(~np.isnan(matrix), axis=1)
+    counts = np.asarray(counts, dtype=np.int64)
+
+    scaled = counts * (np.asarray(percentile, dtype=np.float64) / 100)
+    index = np.trunc(scaled).astype(np.int64)
+    index = np.where(index >= counts, counts - 1, index)
+    valid = (counts > 0) & (index >= -counts)
+    index = np.where(index < 0, index + counts, index)
+    index = np.clip(index, 0, max(matrix.shape[1] - 1, 0))
+
+    result = np.full(len(counts), np.nan)
+    if matrix.shape[1] > 0:
+        picked = np.take_along_axis(ordered, index[:, None], axis=1)[:, 0]
+        result[valid] = picked[valid]
+    return result
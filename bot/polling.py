@@ -0,0 +1,190 @@
+"""
+주문 체결 대기 폴링 정책
+
+고정 간격(1초)으로 get_order를 반복하는 대신, 주문 직후와 주문 가격이 최우선 호가일 때는
+짧은 간격으로, 체결 변화가 없는 동안에는 지수적으로 늘어나는 간격으로 폴링하고,
+대기 시간이 deadline을 넘으면 만료를 알립니다. 고정 간격 폴링과 비교해 절약한 호출 수를 집계합니다.
+
+상태 머신(bot.strategy)은 I/O를 하지 않으므로 시각은 Sleep Effect의 반환값
+(드라이버의 시계: time.monotonic, 이벤트 루프 시각, 백테스트 가상 시각)으로 전달받습니다.
+"""
+import os
+import threading
+
+
+class PollingPolicy:
+    """
+    폴링 간격/기한 설정과 전체 통계.
+
+    Parameters
+    ----------
+    min_interval : float, optional (default 0.25)
+        가장 짧은 폴링 간격(초). 주문 직후, 최우선 호가일 때, 새 체결이 있을 때 사용
+    max_interval : float, optional (default 4.0)
+        가장 긴 폴링 간격(초)
+    backoff : float, optional (default 2.0)
+        체결 변화가 없을 때 간격을 늘리는 배수
+    fast_polls : int, optional (default 3)
+        주문 직후 min_interval로 폴링할 횟수 (이 동안은 호가를 조회하지 않음)
+    deadline : float, optional
+        매수 주문 대기 기한(초). None이면 StrategyConfig의 max_polls x poll_interval
+    fixed_interval : float, optional (default 1.0)
+        절약한 호출 수를 계산할 때 비교하는 고정 폴링 간격(초)
+    """
+
+    def __init__(self, min_interval=0.25, max_interval=4.0, backoff=2.0, fast_polls=3, deadline=None,
+                 fixed_interval=1.0):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.fast_polls = fast_polls
+        self.deadline = deadline
+        self.fixed_interval = fixed_interval
+        self._lock = threading.Lock()
+        self.polls = 0
+        self.fixed_polls = 0.0
+        self.waits = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        .env 설정값(POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_BACKOFF, POLL_FAST_POLLS, ORDER_WAIT_SECONDS)으로 생성합니다.
+        """
+        deadline = os.getenv("ORDER_WAIT_SECONDS")
+        return cls(
+            min_interval=float(os.getenv("POLL_MIN_INTERVAL", "0.25")),
+            max_interval=float(os.getenv("POLL_MAX_INTERVAL", "4")),
+            backoff=float(os.getenv("POLL_BACKOFF", "2")),
+            fast_polls=int(os.getenv("POLL_FAST_POLLS", "3")),
+            deadline=float(deadline) if deadline else None,
+        )
+
+    def start(self, deadline=None):
+        """
+        주문 하나의 폴링을 시작합니다.
+
+        Parameters
+        ----------
+        deadline : float, optional
+            이 주문의 대기 기한(초). None이면 기한 없음
+        """
+        return FillPoller(self, deadline)
+
+    def _record(self, polls, elapsed, finished=False):
+        with self._lock:
+            self.polls += polls
+            self.fixed_polls += elapsed / self.fixed_interval
+            if finished:
+                self.waits += 1
+
+    @property
+    def saved_calls(self) -> int:
+        """
+        고정 간격 폴링 대비 절약한 get_order 호출 수 (음수면 더 많이 호출).
+        """
+        return int(round(self.fixed_polls)) - self.polls
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {"waits": self.waits, "polls": self.polls, "fixed_polls": int(round(self.fixed_polls)),
+                    "saved_calls": int(round(self.fixed_polls)) - self.polls}
+
+
+class FillPoller:
+    """
+    주문 하나의 폴링 상태. PollingPolicy.start()로 만듭니다.
+
+    사용 순서: delay = next_delay(...) -> now = yield Sleep(delay) -> observe(now, delay) -> get_order
+
+    Parameters
+    ----------
+    policy : PollingPolicy
+        간격 설정과 통계를 집계할 정책
+    deadline : float, optional
+        대기 기한(초). None이면 expired가 항상 False
+    """
+
+    def __init__(self, policy, deadline=None):
+        self.policy = policy
+        self.deadline = deadline
+        self.interval = policy.min_interval
+        self.polls = 0
+        self.elapsed = 0.0
+        self._total_elapsed = 0.0
+        self._started_at = None
+        self._last_now = None
+        self._last_executed = None
+        self._round_polls = 0
+
+    @property
+    def wants_orderbook(self) -> bool:
+        """
+        다음 간격을 정하기 위해 호가(최우선 호가 여부)가 필요한지 여부. 주문 직후에는 필요 없음.
+        """
+        return self._round_polls >= self.policy.fast_polls
+
+    def next_delay(self, order=None, at_top=None) -> float:
+        """
+        다음 폴링까지 대기할 시간(초)을 정합니다.
+
+        Parameters
+        ----------
+        order : dict, optional
+            마지막으로 조회한 주문 (executed_volume 변화로 체결 진행을 감지)
+        at_top : bool, optional
+            주문 가격이 최우선 호가(매수: 최우선 매수호가 이상, 매도: 최우선 매도호가 이하)인지 여부
+        """
+        policy = self.policy
+        executed = float(order.get("executed_volume", 0) or 0) if order else None
+        progressed = executed is not None and self._last_executed is not None and executed > self._last_executed
+        if executed is not None:
+            self._last_executed = executed
+        if self._round_polls < policy.fast_polls or progressed or at_top:
+            self.interval = policy.min_interval
+        else:
+            self.interval = min(self.interval * policy.backoff, policy.max_interval)
+        if self.deadline is not None:
+            # 기한 직후에 한 번 더 확인할 수 있도록 남은 시간 이상 대기하지 않음
+            remaining = self.deadline - self.elapsed
+            self.interval = max(min(self.interval, remaining), 0.0)
+        return self.interval
+
+    def observe(self, now, slept):
+        """
+        Sleep 후 드라이버 시각(now)을 반영하고 폴링 횟수를 증가시킵니다. now가 None이면 대기 시간만 누적합니다.
+        """
+        self.polls += 1
+        self._round_polls += 1
+        self._last_now = now
+        if now is None:
+            self.elapsed += slept
+            return
+        if self._started_at is None:
+            self._started_at = now - slept - self.elapsed
+        self.elapsed = now - self._started_at
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and self.elapsed >= self.deadline
+
+    def restart(self):
+        """
+        대기 기한을 다시 시작합니다 (주문 유지 결정 또는 새 체결 발생 시).
+        """
+        self._started_at = self._last_now
+        self.policy._record(self._round_polls, self.elapsed)
+        self._total_elapsed += self.elapsed
+        self._round_polls = 0
+        self.elapsed = 0.0
+        self.interval = self.policy.min_interval
+
+    def finish(self):
+        """
+        폴링을 끝내고 (폴링 횟수, 경과 시간, 고정 간격 대비 절약 호출 수)를 반환합니다.
+        """
+        self.policy._record(self._round_polls, self.elapsed, finished=True)
+        self._total_elapsed += self.elapsed
+        self._round_polls = 0
+        self.elapsed = 0.0
+        elapsed = self._total_elapsed
+        return self.polls, elapsed, int(elapsed / self.policy.fixed_interval) - self.polls
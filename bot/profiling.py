@@ -0,0 +1,347 @@
+"""
+매매 결정 경로 구간별 프로파일링
+
+호가를 본 시점부터 주문을 보내기까지 시간이 어디에 쓰이는지 확인하기 위한 도구입니다.
+
+- StageProfiler: 구간(stage)별 타이머. `with profiler.stage("orderbook", ticker):`처럼 감싸면
+  time.perf_counter로 걸린 시간을 재서 구간별/티커별 최근 window개를 보관하고,
+  p50/p95/p99를 계산해 dump_interval초마다 로그로 남깁니다. 꺼져 있으면 stage()는
+  아무 일도 하지 않는 컨텍스트 매니저를 반환합니다.
+- SamplingProfiler: 백그라운드 스레드가 interval초마다 모든 스레드의 스택을 표본 추출해
+  접힌 스택(folded stack) 형식으로 저장합니다. flamegraph.pl, inferno, speedscope로
+  플레임그래프를 그릴 수 있습니다. (외부 패키지 불필요)
+
+기록되는 구간 (bot.make_effect_handler, TradingEngine):
+    orderbook, check_buy, check_emergency, candles, percentile, rate_limit,
+    call.<메소드> (서명 + HTTP 요청), sign (JWT 서명), notify, save_position,
+    iteration (대기를 제외한 루프 1회 시간)
+
+.env 설정:
+    PROFILE_STAGES=true             구간 타이머 사용
+    PROFILE_WINDOW=1024             구간/티커별 보관할 최근 측정값 수
+    PROFILE_DUMP_INTERVAL=60        통계를 로그로 남기는 주기(초)
+    PROFILE_TOP_TICKERS=3           구간마다 함께 남길 느린 티커 수 (p99 기준)
+    PROFILE_SAMPLING_FILE=          지정 시 표본 추출 프로파일러를 켜고 접힌 스택을 이 파일에 저장
+    PROFILE_SAMPLING_INTERVAL=0.005 표본 추출 주기(초)
+"""
+import atexit
+import contextlib
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from functools import wraps
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+_default_profiler = None
+_default_lock = threading.Lock()
+_NULL_STAGE = contextlib.nullcontext()
+
+
+class _StageTimer:
+    __slots__ = ("_profiler", "_name", "_ticker", "_started")
+
+    def __init__(self, profiler, name, ticker):
+        self._profiler = profiler
+        self._name = name
+        self._ticker = ticker
+
+    def __enter__(self):
+        self._started = self._profiler.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler.record(self._name, self._ticker, self._profiler.clock() - self._started)
+        return False
+
+
+class StageProfiler:
+    """
+    구간별 소요 시간의 롤링 p50/p95/p99를 티커별, 전체("*")로 집계합니다.
+
+    Parameters
+    ----------
+    enabled : bool, optional (default True)
+        False이면 stage()가 측정하지 않는 컨텍스트 매니저를 반환
+    window : int, optional (default 1024)
+        구간/티커별로 보관할 최근 측정값 수
+    dump_interval : float, optional (default 60)
+        maybe_dump()가 통계를 로그로 남기는 주기(초). None이면 남기지 않음
+    top_tickers : int, optional (default 3)
+        dump() 때 구간마다 함께 남길 느린 티커 수 (p99 기준)
+    log : callable, optional
+        로그 출력 함수 (기본값: bot.logger.get_logger().info)
+    clock : callable, optional
+        단조 시계 (기본값: time.perf_counter)
+    """
+
+    def __init__(self, enabled=True, window=1024, dump_interval=60.0, top_tickers=3, log=None,
+                 clock=time.perf_counter):
+        self.enabled = enabled
+        self.window = window
+        self.dump_interval = dump_interval
+        self.top_tickers = top_tickers
+        self.clock = clock
+        self._log = log
+        self.sampler = None
+        self._samples = {}
+        self._local = threading.local()
+        self._last_dump = time.monotonic()
+        self._dump_lock = threading.Lock()
+
+    def bind(self, ticker):
+        """
+        현재 스레드의 기본 티커를 지정합니다. stage()에 티커를 주지 않은 측정(예: 서명)에 사용됩니다.
+        """
+        self._local.ticker = ticker
+
+    def stage(self, name, ticker=None):
+        """
+        with 블록의 소요 시간을 name 구간으로 기록하는 컨텍스트 매니저.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _StageTimer(self, name, ticker)
+
+    def record(self, name, ticker, seconds):
+        """
+        측정값(초)을 전체("*")와 티커별 윈도우에 추가합니다. ticker가 None이면 bind()한 티커.
+        """
+        if not self.enabled:
+            return
+        if ticker is None:
+            ticker = getattr(self._local, "ticker", None)
+        samples = self._samples
+        for key in ((name, "*"), (name, ticker)) if ticker is not None else ((name, "*"),):
+            window = samples.get(key)
+            if window is None:
+                window = samples.setdefault(key, deque(maxlen=self.window))
+            window.append(seconds)
+
+    def stages(self):
+        return sorted({name for name, _ in list(self._samples)})
+
+    def summary(self, stage=None, ticker="*"):
+        """
+        구간별 통계 목록. 각 항목은 stage, ticker, count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms.
+
+        Parameters
+        ----------
+        stage : str, optional
+            지정 시 해당 구간만
+        ticker : str, optional (default "*")
+            "*"이면 전체 합산, None이면 티커별 항목 전부, 그 외에는 해당 티커만
+        """
+        rows = []
+        for (name, key), window in list(self._samples.items()):
+            if stage is not None and name != stage:
+                continue
+            if ticker is None:
+                if key == "*":
+                    continue
+            elif key != ticker:
+                continue
+            values = np.fromiter(list(window), dtype=np.float64) * 1000.0
+            if not len(values):
+                continue
+            p50, p95, p99 = np.percentile(values, PERCENTILES)
+            rows.append({"stage": name, "ticker": key, "count": len(values), "mean_ms": float(values.mean()),
+                         "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+                         "max_ms": float(values.max())})
+        rows.sort(key=lambda row: (row["stage"], row["ticker"]))
+        return rows
+
+    def format_summary(self):
+        """
+        전체 통계와 구간별 느린 티커를 표 형식 문자열로 반환합니다.
+        """
+        lines = [f"{'stage':<24}{'ticker':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        slow = {}
+        if self.top_tickers:
+            for row in self.summary(ticker=None):
+                slow.setdefault(row["stage"], []).append(row)
+        for row in self.summary():
+            rows = [row] + sorted(slow.get(row["stage"], []), key=lambda r: -r["p99_ms"])[:self.top_tickers]
+            for item in rows:
+                lines.append(f"{item['stage']:<24}{item['ticker']:<16}{item['count']:>7}{item['p50_ms']:>10.2f}"
+                             f"{item['p95_ms']:>10.2f}{item['p99_ms']:>10.2f}{item['max_ms']:>10.2f}")
+        return "\n".join(lines)
+
+    def dump(self):
+        """
+        현재 통계를 로그로 남깁니다. 구간별 전체 통계는 JSON 로그 필드로도 기록됩니다.
+        """
+        if not self._samples:
+            return
+        log = self._log
+        if log is None:
+            from bot.logger import get_logger
+            log = get_logger().info
+        log("=== Stage profile (rolling window %d) ===\n%s", self.window, self.format_summary(),
+            profile=self.summary())
+
+    def maybe_dump(self, now=None):
+        """
+        마지막 dump 후 dump_interval초가 지났으면 dump()하고 True를 반환합니다.
+        """
+        if not self.enabled or self.dump_interval is None:
+            return False
+        now = time.monotonic() if now is None else now
+        if now - self._last_dump < self.dump_interval or not self._dump_lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_dump = now
+            self.dump()
+        finally:
+            self._dump_lock.release()
+        return True
+
+    def reset(self):
+        self._samples = {}
+
+    def instrument_client(self, client):
+        """
+        클라이언트의 JWT 서명(_create_token)을 "sign" 구간으로 측정하도록 감쌉니다.
+        call.<메소드> 구간에서 sign을 빼면 HTTP 요청/응답 처리 시간입니다.
+        """
+        create_token = getattr(client, "_create_token", None)
+        if not self.enabled or create_token is None or getattr(create_token, "_profiled", False):
+            return client
+
+        @wraps(create_token)
+        def timed(*args, **kwargs):
+            with self.stage("sign"):
+                return create_token(*args, **kwargs)
+
+        timed._profiled = True
+        client._create_token = timed
+        return client
+
+    @classmethod
+    def from_env(cls, log=None):
+        return cls(
+            enabled=os.getenv("PROFILE_STAGES", "false").lower() == "true",
+            window=int(os.getenv("PROFILE_WINDOW", "1024")),
+            dump_interval=float(os.getenv("PROFILE_DUMP_INTERVAL", "60")),
+            top_tickers=int(os.getenv("PROFILE_TOP_TICKERS", "3")),
+            log=log,
+        )
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", os.path.basename(code.co_filename))
+    return f"{module}:{code.co_name}"
+
+
+class SamplingProfiler:
+    """
+    모든 스레드의 스택을 주기적으로 표본 추출하는 프로파일러.
+
+    sys._current_frames()로 interval초마다 각 스레드의 호출 스택을 읽어
+    "스레드;모듈:함수;...;모듈:함수 횟수" 형식(접힌 스택)으로 집계합니다.
+    실행 중인 코드를 바꾸지 않으므로 운영 중에도 켜 둘 수 있으며, 부하는 주기와 스레드 수에 비례합니다.
+
+    Parameters
+    ----------
+    path : str, optional
+        write() 기본 출력 파일
+    interval : float, optional (default 0.005)
+        표본 추출 주기(초)
+    max_depth : int, optional (default 64)
+        기록할 최대 스택 깊이
+    """
+
+    def __init__(self, path=None, interval=0.005, max_depth=64):
+        self.path = path
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        """
+        현재 모든 스레드(프로파일러 자신 제외)의 스택을 한 번 기록합니다.
+        """
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, str(ident)))
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, write=True):
+        """
+        표본 추출을 멈추고 write=True이면 path에 저장합니다.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if write and self.path:
+            self.write()
+
+    def folded(self):
+        """
+        접힌 스택 형식 문자열 (플레임그래프 도구 입력).
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write(self, path=None):
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.folded())
+        return path
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+def get_profiler() -> StageProfiler:
+    """
+    .env 설정(PROFILE_*)으로 만든 공용 프로파일러를 반환합니다.
+    PROFILE_SAMPLING_FILE이 지정되어 있으면 표본 추출 프로파일러도 시작하고 종료 시 저장합니다.
+    """
+    global _default_profiler
+    if _default_profiler is None:
+        with _default_lock:
+            if _default_profiler is None:
+                profiler = StageProfiler.from_env()
+                path = os.getenv("PROFILE_SAMPLING_FILE")
+                if path:
+                    sampler = SamplingProfiler(path, interval=float(os.getenv("PROFILE_SAMPLING_INTERVAL", "0.005")))
+                    profiler.sampler = sampler.start()
+                    atexit.register(sampler.stop)
+                if profiler.enabled:
+                    atexit.register(profiler.dump)
+                _default_profiler = profiler
+    return _default_profiler
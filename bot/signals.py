@@ -0,0 +1,209 @@
+"""
+여러 티커의 매수/긴급 매도 신호를 한 번에 계산하는 배치 평가기
+
+티커별 최근 캔들 윈도우를 2차원 NumPy 배열(티커 x 윈도우, 부족한 부분은 NaN)로 쌓고,
+check_buy_conditions / check_emergency_sell_conditions와 같은 규칙을 한 번의 벡터 연산으로
+평가하여 티커별 불리언 마스크를 반환합니다.
+"""
+import os
+from collections import namedtuple
+
+import numpy as np
+
+from bot.percentile import batch_percentile
+
+SignalResult = namedtuple("SignalResult", [
+    "tickers",           # 평가한 티커 목록
+    "percentile_price",  # 티커별 백분위 가격 (데이터 없으면 NaN)
+    "below_percentile",  # 매수 가격 <= 백분위 가격
+    "all_down",          # 최근 N개 1분봉이 모두 하락 (open > close)
+    "has_short",         # 연속 하락 확인용 캔들이 하나 이상 있는지 여부
+    "rules",             # 추가 규칙 이름 -> 마스크
+    "can_buy",           # 최종 매수 가능 여부
+    "emergency_sell",    # 긴급 매도 필요 여부
+])
+
+
+class SignalConfig:
+    """
+    신호 평가 설정값.
+
+    Parameters
+    ----------
+    candle_interval : str, optional (default "minute60")
+        백분위 계산용 캔들 간격
+    candle_count : int, optional (default 24)
+        백분위 계산용 캔들 개수
+    percentile_threshold : float, optional (default 70)
+        매수 기준 백분위
+    down_interval : str, optional (default "minute1")
+        연속 하락 확인용 캔들 간격
+    down_count : int, optional (default 5)
+        연속 하락 확인용 캔들 개수
+    rules : dict, optional
+        추가 매수 규칙. 이름 -> 함수(arrays dict) -> 티커별 불리언 마스크.
+        arrays에는 "bid", "close", "open_short", "close_short", "percentile_price"가 들어 있으며,
+        모든 추가 규칙이 True인 티커만 매수 가능
+    """
+
+    def __init__(self, candle_interval="minute60", candle_count=24, percentile_threshold=70.0,
+                 down_interval="minute1", down_count=5, rules=None):
+        self.candle_interval = candle_interval
+        self.candle_count = candle_count
+        self.percentile_threshold = percentile_threshold
+        self.down_interval = down_interval
+        self.down_count = down_count
+        self.rules = dict(rules or {})
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            candle_interval=os.getenv("CANDLE_INTERVAL", "minute60"),
+            candle_count=int(os.getenv("CANDLE_COUNT", "24")),
+            percentile_threshold=float(os.getenv("PERCENTILE_THRESHOLD", "70")),
+            down_count=int(os.getenv("EMERGENCY_CANDLE_COUNT", "5")),
+        )
+
+
+def stack_windows(windows, length):
+    """
+    티커별 1차원 배열을 (티커 수 x length) 배열로 쌓습니다.
+
+    최신 값이 마지막 열에 오도록 오른쪽 정렬하고, 모자란 앞부분은 NaN으로 채웁니다.
+    None인 티커는 전부 NaN입니다.
+    """
+    matrix = np.full((len(windows), length), np.nan)
+    for row, window in enumerate(windows):
+        if window is None:
+            continue
+        window = np.asarray(window, dtype=np.float64)[-length:]
+        if len(window):
+            matrix[row, length - len(window):] = window
+    return matrix
+
+
+def evaluate_signals(tickers, bid, close, open_short, close_short, config):
+    """
+    배열로 주어진 티커들의 신호를 한 번에 평가합니다.
+
+    Parameters
+    ----------
+    tickers : list of str
+        티커 목록 (행 순서)
+    bid : array-like (티커 수)
+        티커별 매수 가격. 모르면 NaN
+    close : numpy.ndarray (티커 수 x candle_count)
+        백분위 계산용 종가 윈도우 (NaN 패딩)
+    open_short, close_short : numpy.ndarray (티커 수 x down_count)
+        연속 하락 확인용 시가/종가 윈도우 (NaN 패딩)
+    config : SignalConfig
+        평가 설정값
+
+    Returns
+    -------
+    SignalResult
+    """
+    bid = np.asarray(bid, dtype=np.float64)
+    percentile_price = batch_percentile(close, config.percentile_threshold)
+    with np.errstate(invalid="ignore"):
+        below = bid <= percentile_price  # NaN 비교는 False
+
+    # NaN(캔들 없음) 자리는 조건을 만족한 것으로 보고, 캔들이 하나 이상 있는 티커만 판정
+    present = ~np.isnan(open_short)
+    with np.errstate(invalid="ignore"):
+        down = (open_short > close_short) | ~present
+    all_down = down.all(axis=1) & present.any(axis=1)
+
+    arrays = {
+        "bid": bid,
+        "close": close,
+        "open_short": open_short,
+        "close_short": close_short,
+        "percentile_price": percentile_price,
+    }
+    rule_masks = {name: np.asarray(rule(arrays), dtype=bool) for name, rule in config.rules.items()}
+    can_buy = below & ~all_down
+    for mask in rule_masks.values():
+        can_buy &= mask
+
+    return SignalResult(list(tickers), percentile_price, below, all_down, present.any(axis=1),
+                        rule_masks, can_buy, all_down.copy())
+
+
+class BatchSignalEvaluator:
+    """
+    시세 허브 스냅샷에서 전체 티커의 신호를 계산하고 스냅샷 단위로 결과를 재사용합니다.
+
+    Parameters
+    ----------
+    config : SignalConfig, optional
+        평가 설정값. 생략 시 .env 설정값 사용
+    """
+
+    def __init__(self, config=None):
+        self.config = config if config is not None else SignalConfig.from_env()
+        self._cache_snapshot = None
+        self._cache_tickers = None
+        self._result = None
+        self._rows = {}
+        self.evaluations = 0
+
+    def evaluate_snapshot(self, snapshot, tickers, max_age=None, orderbook_max_age=None):
+        """
+        스냅샷의 캔들/호가로 티커들의 신호를 평가합니다. 같은 스냅샷/티커 조합이면 이전 결과를 반환합니다.
+
+        Parameters
+        ----------
+        snapshot : MarketSnapshot
+            시세 허브 스냅샷
+        tickers : list of str
+            평가할 티커 목록
+        max_age : float or dict, optional
+            이보다 오래된 캔들은 없는 것으로 취급(초). dict이면 간격별 값
+        orderbook_max_age : float, optional
+            이보다 오래된 호가는 없는 것으로 취급(초)
+
+        Returns
+        -------
+        SignalResult
+        """
+        tickers = list(tickers)
+        if snapshot is self._cache_snapshot and tickers == self._cache_tickers:
+            return self._result
+
+        config = self.config
+        if isinstance(max_age, dict):
+            long_age, short_age = max_age.get(config.candle_interval), max_age.get(config.down_interval)
+        else:
+            long_age = short_age = max_age
+        closes, opens_short, closes_short, bids = [], [], [], []
+        for ticker in tickers:
+            long_df = snapshot.candle(ticker, config.candle_interval, max_age=long_age)
+            short_df = snapshot.candle(ticker, config.down_interval, max_age=short_age)
+            book = snapshot.orderbook(ticker, max_age=orderbook_max_age)
+            closes.append(None if long_df is None else long_df["close"].values)
+            opens_short.append(None if short_df is None else short_df["open"].values)
+            closes_short.append(None if short_df is None else short_df["close"].values)
+            units = book.get("orderbook_units") if book else None
+            bids.append(float(units[0]["bid_price"]) if units else np.nan)
+
+        result = evaluate_signals(
+            tickers,
+            np.array(bids, dtype=np.float64),
+            stack_windows(closes, config.candle_count),
+            stack_windows(opens_short, config.down_count),
+            stack_windows(closes_short, config.down_count),
+            config,
+        )
+        self._cache_snapshot = snapshot
+        self._cache_tickers = tickers
+        self._result = result
+        self._rows = {ticker: i for i, ticker in enumerate(tickers)}
+        self.evaluations += 1
+        return result
+
+    def row(self, ticker):
+        """
+        마지막 평가 결과에서 티커의 행 번호를 반환합니다. 없으면 None.
+        """
+        return self._rows.get(ticker)
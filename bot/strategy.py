@@ -0,0 +1,753 @@
+"""
+매수/매도 상태 머신 (I/O 분리)
+
+trade_continuously의 매매 로직을 제너레이터로 작성하여, 거래소 호출이나 대기 등
+외부 작업은 Effect 객체로 yield하고 그 결과를 send()로 돌려받습니다.
+같은 로직을 스레드 방식(drive), asyncio 엔진, 백테스터가 각자의 방식으로 실행합니다.
+"""
+import math
+import os
+from collections import namedtuple
+
+from python_bithumb.execution_cost import estimate_cost, max_size_within
+
+from bot.logger import DEBUG, ERROR, WARNING, leveled
+from bot.polling import PollingPolicy
+
+# 외부 작업(Effect) 정의
+# Call: 거래소 클라이언트 메소드 호출 (예: Call("get_order", (uuid,)))
+Call = namedtuple("Call", ["method", "args"])
+# GetOrderbook: 호가 정보 조회 (python_bithumb.get_orderbook 형식)
+GetOrderbook = namedtuple("GetOrderbook", ["ticker"])
+# CheckBuy: 매수 조건 확인 (check_buy_conditions)
+CheckBuy = namedtuple("CheckBuy", ["ticker", "bid_price"])
+# CheckEmergency: 긴급 매도 조건 확인 (check_emergency_sell_conditions)
+CheckEmergency = namedtuple("CheckEmergency", ["ticker"])
+# Sleep: 지정된 시간(초) 대기. 드라이버는 대기 후 자신의 현재 시각(초)을 반환할 수 있음 (폴링 기한 계산용)
+Sleep = namedtuple("Sleep", ["seconds"])
+# Notify: 디스코드 알림 전송
+Notify = namedtuple("Notify", ["message", "title"])
+# SavePosition: 변경된 포지션과 관련 체결을 저널에 기록 (bot.journal.PositionJournal.record)
+SavePosition = namedtuple("SavePosition", ["ticker", "event", "position", "last_buy_price", "last_buy_volume",
+                                           "order_uuid", "price", "volume"])
+
+
+class StrategyConfig:
+    """
+    매매 상태 머신 설정값.
+
+    Parameters
+    ----------
+    max_polls : int, optional (default 30)
+        매수 주문 체결 대기 최대 폴링 횟수
+    cooldown_seconds : float, optional (default 5)
+        주문 체결 후 대기 시간(초)
+    poll_interval : float, optional (default 1)
+        고정 폴링 기준 간격(초). 매도 대기 중 긴급 매도 조건 확인 간격으로도 사용
+    polling : PollingPolicy, optional
+        주문 체결 대기 폴링 정책 (기본값: PollingPolicy())
+    max_slippage : float, optional
+        긴급 시장가 매도의 허용 슬리피지 (비율, 0.005 = 0.5%). 지정하면 매도 전에 호가를 조회해
+        예상 평균 체결 가격을 기록하고, 예산을 넘으면 예산 안의 수량만 먼저 매도합니다
+        (남은 수량은 다음 루프에서 다시 긴급 매도 조건을 확인한 뒤 매도). None이면 전량 즉시 매도
+    """
+
+    def __init__(self, max_polls: int = 30, cooldown_seconds: float = 5, poll_interval: float = 1, polling=None,
+                 max_slippage: float = None):
+        self.max_polls = max_polls
+        self.cooldown_seconds = cooldown_seconds
+        self.poll_interval = poll_interval
+        self.polling = polling if polling is not None else PollingPolicy(fixed_interval=poll_interval)
+        self.max_slippage = max_slippage
+
+    @property
+    def order_wait_seconds(self) -> float:
+        """
+        매수 주문 대기 기한(초). 폴링 정책에 기한이 없으면 max_polls x poll_interval.
+        """
+        if self.polling.deadline is not None:
+            return self.polling.deadline
+        return self.max_polls * self.poll_interval
+
+    @classmethod
+    def from_env(cls):
+        """
+        .env 설정값(MAX_POLLS, ORDER_COOLDOWN_SECONDS, POLL_*, MAX_SLIPPAGE)으로 생성합니다.
+        """
+        max_slippage = os.getenv("MAX_SLIPPAGE")
+        return cls(
+            max_polls=int(os.getenv("MAX_POLLS", "30")),  # 기본값 30회
+            cooldown_seconds=int(os.getenv("ORDER_COOLDOWN_SECONDS", "5")),  # 기본값 5초
+            polling=PollingPolicy.from_env(),
+            max_slippage=float(max_slippage) if max_slippage else None,  # 기본값 제한 없음
+        )
+
+
+class TraderState:
+    """
+    티커별 포지션 상태.
+
+    current_position : None(초기 상태), "buy"(매수 포지션), "sell"(매도 포지션)
+    """
+
+    def __init__(self, current_position=None, last_buy_price=None, last_buy_volume=None):
+        self.current_position = current_position
+        self.last_buy_price = last_buy_price
+        self.last_buy_volume = last_buy_volume
+
+    def reset(self):
+        self.current_position = None
+        self.last_buy_price = None
+        self.last_buy_volume = None
+
+
+class TraderContext:
+    """
+    상태 머신 실행에 필요한 티커 정보와 로깅 함수.
+
+    Parameters
+    ----------
+    name : str
+        로그에 표시할 트레이더 이름 (예: "XRP-Trader")
+    ticker : str
+        마켓 코드 (예: "KRW-XRP")
+    trade_amount : float
+        1회 주문 수량
+    log : callable
+        로그 출력 함수. ``log(message, *args, level=...)`` 형태가 아니면 leveled로 감싸서 사용
+    config : StrategyConfig, optional
+        상태 머신 설정값. 생략 시 .env 설정값 사용
+    state : TraderState, optional
+        초기 포지션 상태
+    """
+
+    def __init__(self, name, ticker, trade_amount, log, config=None, state=None):
+        self.name = name
+        self.ticker = ticker
+        self.trade_amount = trade_amount
+        self.log = leveled(log)
+        self.config = config if config is not None else StrategyConfig.from_env()
+        self.state = state if state is not None else TraderState()
+        # True이면 보유 포지션이 없을 때 trade_program이 다음 단계 시작 전에 종료
+        self.stop_requested = False
+
+
+def drive(program, handle):
+    """
+    상태 머신 제너레이터를 동기 방식으로 끝까지 실행합니다.
+
+    Parameters
+    ----------
+    program : generator
+        Effect를 yield하는 제너레이터
+    handle : callable
+        Effect를 받아 결과를 반환하는 함수. 예외는 제너레이터 안으로 전달됩니다.
+
+    Returns
+    -------
+    object
+        제너레이터의 반환값
+    """
+    value = None
+    error = None
+    while True:
+        try:
+            effect = program.throw(error) if error is not None else program.send(value)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            value = handle(effect)
+            error = None
+        except Exception as e:
+            value = None
+            error = e
+
+
+def average_fill_price(order):
+    """
+    주문의 trades 배열로 평균 체결 가격을 계산합니다. 체결 내역이 없으면 0을 반환합니다.
+    """
+    executed_volume = float(order.get('executed_volume', 0))
+    trades = order.get('trades', [])
+    if trades:
+        total_funds = sum(float(trade['funds']) for trade in trades)
+        return total_funds / executed_volume if executed_volume > 0 else 0
+    return 0
+
+
+def save_position(ctx, event, order=None):
+    """
+    현재 포지션 상태와 주문의 평균 체결 가격/수량으로 SavePosition Effect를 만듭니다.
+    """
+    state = ctx.state
+    order_uuid = price = volume = None
+    if order:
+        order_uuid = order.get('uuid')
+        volume = float(order.get('executed_volume', 0) or 0)
+        price = average_fill_price(order) or None
+    return SavePosition(ctx.ticker, event, state.current_position, state.last_buy_price, state.last_buy_volume,
+                        order_uuid, price, volume)
+
+
+def _at_top(orderbook, side, price):
+    """
+    주문 가격이 최우선 호가인지 확인합니다. 호가가 없으면 None.
+    """
+    if not orderbook or not orderbook.get('orderbook_units'):
+        return None
+    best = orderbook['orderbook_units'][0]
+    if side == "bid":
+        return float(price) >= float(best['bid_price'])
+    return float(price) <= float(best['ask_price'])
+
+
+def emergency_sell_volume(ctx, orderbook, volume):
+    """
+    긴급 시장가 매도 수량을 정합니다. 호가를 따라 체결할 때의 예상 비용을 기록하고,
+    슬리피지가 max_slippage를 넘으면 예산 안에서 체결되는 수량만 반환합니다.
+    """
+    volume = float(volume)
+    budget = ctx.config.max_slippage
+    if budget is None or not orderbook or not orderbook.get('orderbook_units'):
+        return volume
+    estimate = estimate_cost(orderbook, "ask", volume=volume)
+    ctx.log("[%s] Estimated market sell of %.8f %s: avg %.2f vs best bid %.2f "
+            "(slippage %.4f%%, %d levels, cost %.0f KRW)%s",
+            ctx.name, volume, ctx.ticker, estimate.average_price, estimate.reference_price, estimate.slippage * 100,
+            estimate.levels, estimate.cost, "" if estimate.complete else ", exceeds visible depth")
+    if estimate.complete and estimate.slippage <= budget:
+        return volume
+    limited = math.floor(max_size_within(orderbook, "ask", budget) * 1e8) / 1e8  # 수량 소수점 8자리
+    if limited <= 0 or limited >= volume:
+        return volume
+    ctx.log("[%s] Limiting emergency sell to %.8f %s to stay within %.4f%% slippage; the rest will be sold on the next loop.",
+            ctx.name, limited, ctx.ticker, budget * 100)
+    return limited
+
+
+def _report_polling(ctx, poller, order_uuid):
+    polls, elapsed, saved = poller.finish()
+    ctx.log("[%s] Polled order %s %s times over %.1fs (%+d calls saved vs fixed %ss polling)",
+            ctx.name, order_uuid, polls, elapsed, saved, ctx.config.poll_interval, level=DEBUG)
+
+
+def sell_order_and_wait(ctx, price, volume):
+    name, ticker, log, state = ctx.name, ctx.ticker, ctx.log, ctx.state
+    log("[%s] Attempting to place sell order: %s, Price: %s, Volume: %s", name, ticker, price, volume)
+    response = yield Call("sell_limit_order", (ticker, price, volume))
+    position = None
+    if response and response.get('uuid'):
+        position = "sell"
+        log("[%s] Sell order placed successfully. UUID: %s. Current position: %s", name, response['uuid'], position)
+        order_uuid = response['uuid']
+        order = yield Call("get_order", (order_uuid,))
+        order_state = order['state']
+        # get_order는 폴링 정책 간격으로, 긴급 매도 조건은 poll_interval마다 확인
+        poller = ctx.config.polling.start()
+        delay = poller.next_delay(order)
+        waited = 0.0
+
+        while order_state != 'done':
+            # 긴급 매도 조건 확인
+            if (yield CheckEmergency(ticker)):
+                _report_polling(ctx, poller, order_uuid)
+                log("[%s] Emergency sell conditions detected while waiting for sell order. Canceling current order and executing market sell.",
+                    name, level=WARNING)
+                try:
+                    # 현재 주문 취소
+                    cancel_status = yield Call("cancel_order", (order_uuid,))
+                    log("[%s] Cancel order %s attempt status: %s", name, order_uuid, cancel_status, level=DEBUG)
+
+                    # 시장가 매도 주문 (max_slippage 설정 시 호가 깊이에 맞춰 수량 제한)
+                    sell_volume = volume
+                    if ctx.config.max_slippage is not None:
+                        sell_volume = emergency_sell_volume(ctx, (yield GetOrderbook(ticker)), volume)
+                    market_sell_response = yield Call("sell_market_order", (ticker, sell_volume))
+                    if market_sell_response and market_sell_response.get('uuid'):
+                        market_order_uuid = market_sell_response['uuid']
+                        market_order = yield Call("get_order", (market_order_uuid,))
+
+                        # 거래 정보 로깅
+                        executed_volume = float(market_order.get('executed_volume', 0))
+                        executed_price = average_fill_price(market_order)
+
+                        log("\n=== Emergency Market Sell Details for %s ===", ticker)
+                        log("Original Limit Order Price: %.2f", float(price))
+                        log("Market Sell Price: %.2f", executed_price)
+                        log("Volume: %.8f", executed_volume)
+
+                        # 매수 가격이 저장되어 있다면 손실 금액도 계산
+                        if state.last_buy_price:
+                            loss_amount = (state.last_buy_price - executed_price) * executed_volume
+                            log("Loss Amount: %.2f KRW", loss_amount)
+
+                            # 디스코드 알림 전송 (로그는 그대로 유지)
+                            notification_title = f"⚠️ Emergency Market Sell Executed: {ticker}"
+                            notification_message = (
+                                f"**Emergency Market Sell Details**\n\n"
+                                f"Original Limit Order Price: {float(price):,.2f}\n"
+                                f"Market Sell Price: {executed_price:,.2f}\n"
+                                f"Volume: {executed_volume:,.8f}\n"
+                                f"Loss Amount: {loss_amount:,.2f} KRW"
+                            )
+
+                            # 큰 손실 발생 시 추가 알림
+                            if loss_amount > 0:  # 손실 발생
+                                notification_title = f"💔 Loss Alert: {ticker}"
+
+                            yield Notify(notification_message, notification_title)
+
+                        if float(sell_volume) < float(volume):
+                            # 일부만 매도: 주문한 수량을 뺀 나머지로 매수 포지션 유지
+                            # (get_order 시점에 아직 체결 중일 수 있으므로 executed_volume은 쓰지 않음)
+                            state.last_buy_volume = float(volume) - float(sell_volume)
+                            return market_order, "buy"
+
+                        # 매도 성공 시에만 포지션 초기화
+                        state.last_buy_price = None
+                        state.last_buy_volume = None
+                        return market_order, None
+                    else:
+                        log("[%s] Market sell order placement failed. Maintaining buy position for retry.",
+                            name, level=ERROR)
+                        return None, "buy"  # 매도 실패 시 buy 포지션 유지
+                except Exception as e:
+                    log("[%s] Error during emergency market sell: %s", name, e, level=ERROR)
+                    # 에러 발생 시에도 buy 포지션 유지
+                    return None, "buy"
+
+            step = min(delay - waited, ctx.config.poll_interval)
+            now = yield Sleep(step)
+            waited += step
+            if waited < delay - 1e-9:
+                continue
+            poller.observe(now, delay)
+            order = yield Call("get_order", (order_uuid,))
+            order_state = order['state']
+            if order_state != 'done':
+                at_top = None
+                if poller.wants_orderbook:
+                    at_top = _at_top((yield GetOrderbook(ticker)), "ask", price)
+                delay = poller.next_delay(order, at_top)
+                waited = 0.0
+
+        _report_polling(ctx, poller, order_uuid)
+        log("[%s] Order %s (Sell) completed with state: %s. Details: %s", name, order_uuid, order_state, order)
+        # 매도 주문 체결 후 cooldown time 적용
+        cooldown_seconds = ctx.config.cooldown_seconds
+        log("[%s] Applying cooldown time of %s seconds after sell order execution.",
+            name, cooldown_seconds, level=DEBUG)
+        yield Sleep(cooldown_seconds)
+        return order, position
+    else:
+        log("[%s] Sell order placement failed for %s. Response: %s", name, ticker, response, level=ERROR)
+        return None, "buy"  # 매도 실패 시 buy 포지션 유지
+
+
+def _sell_partial_fill(ctx, order, buy_price, sell_price, volume):
+    """
+    취소한 매수 주문의 부분 체결 수량을 매도합니다.
+
+    긴급 매도가 슬리피지 예산 때문에 일부만 실행되면 남은 수량을 매수 포지션으로 기록하고
+    (sell_order, "buy")를 반환합니다. 그 외에는 sell_order_and_wait 결과를 그대로 반환합니다.
+    """
+    name, ticker, log, state = ctx.name, ctx.ticker, ctx.log, ctx.state
+    log("[%s] Selling executed volume (%s) from partially filled order.", name, volume)
+    # 긴급 매도 손실 계산과 남은 수량 기록에 쓰이도록 부분 체결분을 먼저 포지션 정보로 저장
+    state.last_buy_price = average_fill_price(order) or float(order.get('price') or buy_price)
+    state.last_buy_volume = float(volume)
+    sell_order, sell_position = yield from sell_order_and_wait(ctx, sell_price, volume)
+    if sell_order and sell_position == "buy":
+        state.current_position = "buy"
+        log("[%s] Partial emergency sell for %s. Holding remaining volume %s (buy price %s).",
+            name, ticker, state.last_buy_volume, state.last_buy_price)
+        yield save_position(ctx, "emergency_sell_partial", sell_order)
+    elif sell_order:
+        log("[%s] Successfully sold %s %s from partially filled order.", name, volume, ticker)
+    else:
+        log("[%s] Failed to sell %s %s from partially filled order.", name, volume, ticker, level=WARNING)
+    return sell_order, sell_position
+
+
+def buy_order_and_wait(ctx, price, volume):
+    name, ticker, log = ctx.name, ctx.ticker, ctx.log
+    log("[%s] Attempting to place buy order: %s, Price: %s, Volume: %s", name, ticker, price, volume)
+    response = yield Call("buy_limit_order", (ticker, price, volume))
+    position = None
+    if response and response.get('uuid'):
+        position = "buy"
+        log("[%s] Buy order placed successfully. UUID: %s. Current position: %s", name, response['uuid'], position)
+        order_uuid = response['uuid']
+        order = yield Call("get_order", (order_uuid,))
+        order_state = order['state']
+        wait_seconds = ctx.config.order_wait_seconds
+        poller = ctx.config.polling.start(wait_seconds)
+        last_executed_volume = 0.0
+        while order_state != 'done':
+            if poller.expired:
+                # 현재 체결된 수량 확인
+                current_executed_volume = float(order.get('executed_volume', 0))
+                if current_executed_volume > last_executed_volume:
+                    # 새로운 체결이 발생한 경우, 폴링 카운트 리셋
+                    log("[%s] New execution detected for order %s. Resetting wait deadline.",
+                        name, order_uuid, level=DEBUG)
+                    poller.restart()
+                    last_executed_volume = current_executed_volume
+                    continue
+                log("[%s] Buy order %s for %s (Original Price: %s) did not complete within %g seconds. Checking current market bid price...",
+                    name, order_uuid, ticker, price, wait_seconds)
+                current_orderbook = yield GetOrderbook(ticker)
+                if current_orderbook and current_orderbook.get('orderbook_units') and len(current_orderbook['orderbook_units']) > 0:
+                    current_bid_price_str = current_orderbook['orderbook_units'][0]['bid_price']
+                    log("[%s] Original buy price for %s: %s, Current market bid price for %s: %s",
+                        name, order_uuid, price, ticker, current_bid_price_str, level=DEBUG)
+                    if float(current_bid_price_str) == float(price):
+                        # 시장 가격이 주문 가격과 동일한 경우, 주문 유지
+                        log("[%s] Market bid price (%s) is same as order price (%s). Resetting wait deadline for order %s.",
+                            name, current_bid_price_str, price, order_uuid, level=DEBUG)
+                        poller.restart()
+                        order = yield Call("get_order", (order_uuid,))
+                        order_state = order['state']
+                        continue
+                    else:
+                        # 시장 가격이 변경된 경우, 남은 수량 취소 처리
+                        remaining_volume = float(order.get('remaining_volume', 0))
+                        if remaining_volume > 0:
+                            # 취소 전에 현재까지의 체결 수량 저장
+                            last_known_executed_volume = float(order.get('executed_volume', 0))
+
+                            log("[%s] Market bid price (%s) differs from order price (%s). Attempting to cancel remaining volume (%s) for order %s.",
+                                name, current_bid_price_str, price, remaining_volume, order_uuid)
+
+                            # 취소 전에 한 번 더 주문 상태 확인
+                            try:
+                                final_check_order = yield Call("get_order", (order_uuid,))
+                                if final_check_order['state'] == 'done':
+                                    log("[%s] Order %s was completed before cancellation. Processing completed order.",
+                                        name, order_uuid)
+                                    order = final_check_order
+                                    order_state = 'done'
+                                    break
+
+                                # 주문이 아직 진행 중인 경우에만 취소 시도
+                                cancel_status = yield Call("cancel_order", (order_uuid,))
+                                log("[%s] Cancel order %s attempt status: %s",
+                                    name, order_uuid, cancel_status, level=DEBUG)
+
+                                if last_known_executed_volume > 0:
+                                    # 부분 체결된 경우, 체결된 수량만큼 매도 시도
+                                    sell_order, sell_position = yield from _sell_partial_fill(
+                                        ctx, order, price, current_bid_price_str, last_known_executed_volume)
+                                    if sell_position == "buy" and sell_order:
+                                        _report_polling(ctx, poller, order_uuid)
+                                        return sell_order, "buy"
+                                    if sell_order:
+                                        position = "sell"
+                                else:
+                                    # 체결된 수량이 없는 경우, 포지션 초기화
+                                    log("[%s] No executed volume for order %s. Resetting position to None.",
+                                        name, order_uuid)
+                                    position = None
+                                _report_polling(ctx, poller, order_uuid)
+                                return order, position
+                            except Exception as e:
+                                if "order_not_found" in str(e):
+                                    # 주문이 이미 체결된 경우
+                                    log("[%s] Order %s was completed before cancellation. Processing completed order.",
+                                        name, order_uuid)
+                                    order_state = 'done'
+                                    break
+                                else:
+                                    # 다른 에러의 경우
+                                    log("[%s] Error during order cancellation: %s", name, e, level=ERROR)
+                                    raise
+                        else:
+                            log("[%s] Order %s is already fully executed.", name, order_uuid)
+                            order_state = 'done'
+                            continue
+                else:
+                    # 호가창 조회 실패 시 주문 취소 처리
+                    log("[%s] Failed to fetch current orderbook for %s or orderbook empty. Proceeding to cancel order %s as a fallback.",
+                        name, ticker, order_uuid, level=WARNING)
+                    try:
+                        # 취소 전에 한 번 더 주문 상태 확인
+                        final_check_order = yield Call("get_order", (order_uuid,))
+                        if final_check_order['state'] == 'done':
+                            log("[%s] Order %s was completed before cancellation. Processing completed order.",
+                                name, order_uuid)
+                            order = final_check_order
+                            order_state = 'done'
+                            break
+
+                        cancel_status = yield Call("cancel_order", (order_uuid,))
+                        log("[%s] Fallback cancel order %s attempt status: %s.",
+                            name, order_uuid, cancel_status, level=DEBUG)
+                        if current_executed_volume > 0:
+                            # 부분 체결된 경우, 체결된 수량만큼 매도 시도
+                            sell_order, sell_position = yield from _sell_partial_fill(
+                                ctx, order, price, price, current_executed_volume)
+                            if sell_position == "buy" and sell_order:
+                                _report_polling(ctx, poller, order_uuid)
+                                return sell_order, "buy"
+                            if sell_order:
+                                position = "sell"
+                        else:
+                            # 체결된 수량이 없는 경우, 포지션 초기화
+                            log("[%s] No executed volume for order %s. Resetting position to None.", name, order_uuid)
+                            position = None
+                        _report_polling(ctx, poller, order_uuid)
+                        return order, position
+                    except Exception as e:
+                        if "order_not_found" in str(e):
+                            # 주문이 이미 체결된 경우
+                            log("[%s] Order %s was completed before cancellation. Processing completed order.",
+                                name, order_uuid)
+                            order_state = 'done'
+                            break
+                        else:
+                            # 다른 에러의 경우
+                            log("[%s] Error during fallback order cancellation: %s", name, e, level=ERROR)
+                            raise
+            at_top = None
+            if poller.wants_orderbook:
+                at_top = _at_top((yield GetOrderbook(ticker)), "bid", price)
+            delay = poller.next_delay(order, at_top)
+            now = yield Sleep(delay)
+            poller.observe(now, delay)
+            order = yield Call("get_order", (order_uuid,))
+            order_state = order['state']
+        _report_polling(ctx, poller, order_uuid)
+        # 주문 완료 시 체결 여부 확인
+        if order_state == 'done' and float(order.get('executed_volume', 0)) > 0:
+            log("[%s] Order %s (Buy) completed with state: %s. Details: %s", name, order_uuid, order_state, order)
+            # 매수 주문 체결 후 cooldown time 적용
+            cooldown_seconds = ctx.config.cooldown_seconds
+            log("[%s] Applying cooldown time of %s seconds after buy order execution.",
+                name, cooldown_seconds, level=DEBUG)
+            yield Sleep(cooldown_seconds)
+            return order, position
+        else:
+            log("[%s] Order %s completed but no execution. Resetting position to None.", name, order_uuid)
+            return order, None
+    else:
+        log("[%s] Buy order placement failed for %s. Response: %s", name, ticker, response, level=ERROR)
+        return None, position
+
+
+def trade_step(ctx, action_delay_seconds=1):
+    """
+    매매 루프 1회분. 현재 포지션에 따라 매수 또는 매도를 시도합니다.
+    """
+    name, ticker, log, state = ctx.name, ctx.ticker, ctx.log, ctx.state
+
+    if state.current_position == "buy": # 매도 시도
+        log("[%s] Current position for %s is 'buy'. Attempting to sell.", name, ticker, level=DEBUG)
+
+        # 긴급 매도 조건 확인
+        if (yield CheckEmergency(ticker)):
+            log("[%s] Emergency sell conditions met for %s. Attempting market sell.", name, ticker, level=WARNING)
+            try:
+                # 시장가 매도 주문 (max_slippage 설정 시 호가 깊이에 맞춰 수량 제한)
+                sell_volume = state.last_buy_volume
+                if ctx.config.max_slippage is not None:
+                    sell_volume = emergency_sell_volume(ctx, (yield GetOrderbook(ticker)), sell_volume)
+                response = yield Call("sell_market_order", (ticker, sell_volume))
+                if response and response.get('uuid'):
+                    order_uuid = response['uuid']
+                    order = yield Call("get_order", (order_uuid,))
+
+                    # 거래 정보 로깅
+                    executed_volume = float(order.get('executed_volume', 0))
+                    executed_price = average_fill_price(order)
+
+                    log("\n=== Emergency Sell Details for %s ===", ticker)
+                    log("Sell Price: %.2f", executed_price)
+                    log("Volume: %.8f", executed_volume)
+
+                    if state.last_buy_price is not None:
+                        log("Buy Price: %.2f", state.last_buy_price)
+                        loss_amount = (state.last_buy_price - executed_price) * executed_volume
+                        log("Loss Amount: %.2f KRW", loss_amount)
+
+                        # 디스코드 알림 전송 (로그는 그대로 유지)
+                        notification_title = f"⚠️ Emergency Market Sell Executed: {ticker}"
+                        notification_message = (
+                            f"**Emergency Market Sell Details**\n\n"
+                            f"Buy Price: {state.last_buy_price:,.2f}\n"
+                            f"Sell Price: {executed_price:,.2f}\n"
+                            f"Volume: {executed_volume:,.8f}\n"
+                            f"Loss Amount: {loss_amount:,.2f} KRW"
+                        )
+
+                        # 큰 손실 발생 시 추가 알림
+                        if loss_amount > 0:  # 손실 발생
+                            notification_title = f"💔 Loss Alert: {ticker}"
+
+                        yield Notify(notification_message, notification_title)
+
+                    if float(sell_volume) < float(state.last_buy_volume):
+                        # 일부만 매도: 주문한 수량을 뺀 나머지로 매수 포지션 유지
+                        # (get_order 시점에 아직 체결 중일 수 있으므로 executed_volume은 쓰지 않음)
+                        state.last_buy_volume = float(state.last_buy_volume) - float(sell_volume)
+                        yield save_position(ctx, "emergency_sell_partial", order)
+                        yield Sleep(action_delay_seconds)
+                        return
+
+                    # 매도 성공 시에만 포지션 초기화
+                    state.reset()
+                    yield save_position(ctx, "emergency_sell", order)
+                    return
+            except Exception as e:
+                log("[%s] Error during emergency sell for %s: %s", name, ticker, e, level=ERROR)
+                # 에러 발생 시에도 buy 포지션 유지
+                yield Sleep(action_delay_seconds)
+                return
+
+        orderbook = yield GetOrderbook(ticker)
+        if not orderbook or not orderbook.get('orderbook_units'):
+            log("[%s] Failed to fetch orderbook for %s to sell. Retrying after delay...", name, ticker, level=WARNING)
+            yield Sleep(action_delay_seconds)
+            return
+
+        # 두 번째 매도호가(ask_price)로 매도 시도, 없으면 첫 번째 호가 사용
+        if len(orderbook['orderbook_units']) > 1:
+            price_for_sell = orderbook['orderbook_units'][1]['ask_price']
+            log("[%s] Using 2nd ask price for %s: %s", name, ticker, price_for_sell, level=DEBUG)
+        else:
+            price_for_sell = orderbook['orderbook_units'][0]['ask_price']
+            log("[%s] Only 1 ask price available for %s, using: %s", name, ticker, price_for_sell, level=DEBUG)
+
+        proceed_with_sell = False
+        if state.last_buy_price is not None:
+            if float(price_for_sell) > state.last_buy_price:
+                log("[%s] Sell condition met for %s: Sell price %s > Last buy price %s",
+                    name, ticker, price_for_sell, state.last_buy_price)
+                proceed_with_sell = True
+            else:
+                log("[%s] Sell condition NOT met for %s: Sell price %s < Last buy price %s. Holding 'buy' position.",
+                    name, ticker, price_for_sell, state.last_buy_price, level=DEBUG)
+        else:
+            # 이전에 매수한 기록이 없는데 포지션이 'buy'인 경우는 논리적으로 발생하기 어려우나, 방어적으로 매도 시도
+            log("[%s] Warning: Position is 'buy' but no last_buy_price for %s. Attempting sell anyway.",
+                name, ticker, level=WARNING)
+            proceed_with_sell = True
+
+        if proceed_with_sell:
+            # 일부 긴급 매도 후에는 남은 보유 수량만 매도
+            sell_volume = ctx.trade_amount
+            if state.last_buy_volume is not None:
+                sell_volume = min(float(ctx.trade_amount), float(state.last_buy_volume))
+            final_order, new_position = yield from sell_order_and_wait(ctx, price_for_sell, sell_volume)
+            if final_order and new_position == "sell":
+                state.current_position = "sell"
+                log("[%s] Sell successful for %s. New position: %s", name, ticker, state.current_position)
+                yield save_position(ctx, "sell_filled", final_order)
+            elif final_order and new_position is None:
+                # emergency sell 등으로 포지션이 초기화된 경우
+                state.reset()
+                log("[%s] Emergency sell or forced position reset. New position: %s", name, state.current_position)
+                yield save_position(ctx, "emergency_sell", final_order)
+            elif final_order and new_position == "buy":
+                # 슬리피지 예산 때문에 일부만 긴급 매도한 경우: 남은 수량은 다음 루프에서 매도
+                log("[%s] Partial emergency sell for %s. Remaining volume: %s", name, ticker, state.last_buy_volume)
+                yield save_position(ctx, "emergency_sell_partial", final_order)
+            else:
+                log("[%s] Sell attempt for %s failed or did not complete as expected. Retrying after delay...",
+                    name, ticker, level=WARNING)
+                # current_position은 "buy"로 유지하고 재시도
+        # else: 매도 조건 안맞으면 current_position "buy" 유지
+
+    elif state.current_position == "sell" or state.current_position is None: # 매수 시도
+        action_type = "Initial Buy" if state.current_position is None else "Buy (after sell)"
+        log("[%s] Current position for %s is '%s'. Attempting %s.",
+            name, ticker, state.current_position, action_type, level=DEBUG)
+
+        orderbook = yield GetOrderbook(ticker)
+        if not orderbook or not orderbook.get('orderbook_units'):
+            log("[%s] Failed to fetch orderbook for %s to buy. Retrying after delay...", name, ticker, level=WARNING)
+            yield Sleep(action_delay_seconds)
+            return
+
+        price_for_buy = orderbook['orderbook_units'][0]['bid_price']
+        log("[%s] Current bid price for %s (maker): %s", name, ticker, price_for_buy, level=DEBUG)
+
+        # 매수 조건 확인 (orderbook의 매수 가격과 백분위 가격 비교)
+        if not (yield CheckBuy(ticker, float(price_for_buy))):
+            log("[%s] Buy conditions not met for %s. Waiting for next check...", name, ticker, level=DEBUG)
+            yield Sleep(action_delay_seconds)
+            return
+
+        final_order, new_position = yield from buy_order_and_wait(ctx, price_for_buy, ctx.trade_amount)
+        if state.current_position == "buy":
+            # 부분 체결분 긴급 매도가 일부만 실행되어 buy_order_and_wait가 남은 수량을 이미 포지션으로 기록함
+            log("[%s] Holding remaining %s %s after partial emergency sell. Last buy price: %s",
+                name, state.last_buy_volume, ticker, state.last_buy_price)
+        elif final_order and new_position == "buy":
+            state.current_position = "buy"
+            try:
+                # trades 배열에서 평균 가격 계산
+                trades = final_order.get('trades', [])
+                executed_volume = float(final_order.get('executed_volume', 0))
+
+                if trades and executed_volume > 0:
+                    state.last_buy_price = average_fill_price(final_order)
+                    log("[%s] Stored last buy price for %s: %.2f (calculated from trades)",
+                        name, ticker, state.last_buy_price, level=DEBUG)
+                else:
+                    # trades 정보가 없는 경우 주문 가격을 사용
+                    order_price_str = final_order.get('price')
+                    if order_price_str:
+                        state.last_buy_price = float(order_price_str)
+                        log("[%s] Stored last buy price for %s: %.2f (from order price as fallback)",
+                            name, ticker, state.last_buy_price, level=DEBUG)
+                    else:
+                        log("[%s] Warning: Could not determine executed price for %s from order details.",
+                            name, ticker, level=WARNING)
+
+                # 매수 수량 저장
+                if executed_volume > 0:
+                    state.last_buy_volume = executed_volume
+                    log("[%s] Stored last buy volume for %s: %s", name, ticker, state.last_buy_volume, level=DEBUG)
+            except (ValueError, TypeError, KeyError) as e:
+                log("[%s] Error parsing price from buy order for %s: %s", name, ticker, e, level=ERROR)
+            log("[%s] Buy successful for %s. New position: %s, Last buy price: %s",
+                name, ticker, state.current_position, state.last_buy_price)
+            yield save_position(ctx, "buy_filled", final_order)
+        else:
+            log("[%s] Buy attempt for %s failed or did not complete as expected. Retrying after delay...",
+                name, ticker, level=WARNING)
+            # current_position은 이전 상태("sell" or None) 유지하고 재시도
+    else:
+        # 논리적으로 도달해서는 안되는 상태
+        log("[%s] Unexpected position '%s' for %s. Resetting. Retrying after delay...",
+            name, state.current_position, ticker, level=WARNING)
+        state.current_position = None # 안전하게 초기화
+        yield save_position(ctx, "reset")
+
+    log("[%s] End of action for %s. Current position: %s, Last buy price: %s. Waiting for %ss...",
+        name, ticker, state.current_position, state.last_buy_price, action_delay_seconds, level=DEBUG)
+    yield Sleep(action_delay_seconds)
+
+
+def trade_program(ctx, action_delay_seconds=1):
+    """
+    trade_step을 무한히 반복하는 매매 상태 머신.
+
+    Parameters
+    ----------
+    ctx : TraderContext
+        티커 정보와 포지션 상태
+    action_delay_seconds : float, optional (default 1)
+        각 액션 후 대기 시간(초)
+    """
+    ctx.log("[%s] Starting continuous trading for %s. Action delay: %ss", ctx.name, ctx.ticker, action_delay_seconds)
+    while True:
+        if ctx.stop_requested and ctx.state.current_position != "buy":
+            ctx.log("[%s] Stop requested. Stopping trading for %s.", ctx.name, ctx.ticker)
+            return
+        try:
+            yield from trade_step(ctx, action_delay_seconds)
+        except Exception as e:
+            ctx.log("[%s] An error occurred in trading loop for %s: %s. Retrying after delay...",
+                    ctx.name, ctx.ticker, e, level=ERROR)
+            yield Sleep(action_delay_seconds)
@@ -0,0 +1,330 @@
+"""
+다중 프로세스 샤딩 감독자 (BOT_MODE=supervisor)
+
+DataFrame 생성, 신호 계산, JSON 디코딩, JWT 서명 같은 CPU 작업이 하나의 GIL을 두고
+경쟁하지 않도록 티커를 여러 워커 프로세스에 나누어 각 프로세스에서 TradingEngine을 실행합니다.
+API 호출 예산은 공유 메모리 기반 SharedRateLimiter 하나로 모든 워커가 함께 사용합니다.
+
+워커는 이벤트 루프에서 주기적으로 공유 배열에 하트비트를 기록하고, 감독자는 프로세스가
+종료되었거나 하트비트가 heartbeat_timeout 이상 멈춘 샤드를 지수 백오프로 다시 시작합니다.
+포지션은 워커마다 같은 PositionJournal(SQLite WAL)에 기록하므로 재시작한 샤드도 이어서 거래합니다.
+
+사용 예 (모의 거래소 처리량 확인):
+    python -m bot.supervisor --mock 2000 --workers 4 --duration 10
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import sys
+import time
+
+from python_bithumb.rate_limit import SharedRateLimiter
+
+from bot.bot import (
+    create_client, create_market_data_hub, get_logger, get_notifier, log_with_timestamp,
+    send_discord_notification
+)
+from bot.logger import ERROR, WARNING, leveled
+
+
+def shard_assets(trading_assets, workers):
+    """
+    (트레이더 이름, 티커, 주문 수량) 목록을 workers개 샤드로 번갈아 나눕니다 (빈 샤드 제외).
+    """
+    shards = [[] for _ in range(max(1, workers))]
+    for index, asset in enumerate(trading_assets):
+        shards[index % len(shards)].append(asset)
+    return [shard for shard in shards if shard]
+
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+async def _heartbeat(heartbeats, shard_id, interval):
+    while True:
+        heartbeats[shard_id] = time.monotonic()
+        await asyncio.sleep(interval)
+
+
+async def _run_with_heartbeat(coro, heartbeats, shard_id, interval):
+    beat = asyncio.ensure_future(_heartbeat(heartbeats, shard_id, interval))
+    try:
+        return await coro
+    finally:
+        beat.cancel()
+
+
+def run_shard(shard_id, assets, limiter, heartbeats, options):
+    """
+    워커 프로세스 진입점. 샤드의 티커를 TradingEngine 하나로 실행합니다.
+
+    Parameters
+    ----------
+    shard_id : int
+        샤드 번호 (heartbeats 인덱스)
+    assets : list of tuple
+        (트레이더 이름, 티커, 주문 수량) 목록
+    limiter : SharedRateLimiter
+        모든 워커가 공유하는 속도 제한기
+    heartbeats : multiprocessing.Array
+        샤드별 마지막 하트비트 시각 (time.monotonic())
+    options : dict
+        action_delay_seconds, heartbeat_interval
+    """
+    from bot.engine import TradingEngine
+    from bot.journal import PositionJournal
+
+    # 감독자의 terminate()(SIGTERM)에도 저널/로그를 정리하고 종료
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    log_with_timestamp("Shard %s (pid %d) starting with %d markets.", shard_id, os.getpid(), len(assets))
+    market_data = create_market_data_hub([ticker for _, ticker, _ in assets], limiter=limiter)
+    journal = PositionJournal.from_env()
+    engine = TradingEngine(create_client(), limiter=limiter, action_delay_seconds=options["action_delay_seconds"],
+                           market_data=market_data, journal=journal)
+    try:
+        asyncio.run(_run_with_heartbeat(engine.run(assets), heartbeats, shard_id, options["heartbeat_interval"]))
+    except KeyboardInterrupt:
+        log_with_timestamp("Shard %s stopping.", shard_id)
+    finally:
+        if market_data is not None:
+            market_data.stop(timeout=5)
+        if journal is not None:
+            journal.close()
+        get_notifier().close()
+        get_logger().close()
+
+
+class Supervisor:
+    """
+    티커 샤드를 워커 프로세스로 실행하고 감시하는 감독자.
+
+    Parameters
+    ----------
+    trading_assets : list of tuple
+        (트레이더 이름, 티커, 주문 수량) 목록
+    workers : int, optional
+        워커 프로세스 수 (기본값: CPU 수)
+    rate : float, optional (default 20)
+        모든 워커 합계 초당 API 호출 수
+    burst : int, optional (default 10)
+        대기 없이 허용되는 최대 연속 호출 수
+    heartbeat_interval : float, optional (default 5)
+        워커의 하트비트 기록 주기(초)
+    heartbeat_timeout : float, optional (default 60)
+        하트비트가 이 시간(초) 이상 멈추면 워커를 다시 시작 (시작 직후 유예 시간 포함)
+    restart_backoff : float, optional (default 1)
+        첫 재시작 대기 시간(초). 연속으로 실패하면 두 배씩 늘어남
+    max_backoff : float, optional (default 300)
+        최대 재시작 대기 시간(초)
+    target : callable, optional
+        워커 진입점 (기본값: run_shard). target(shard_id, assets, limiter, heartbeats, options) 형식
+    options : dict, optional
+        target에 전달할 추가 설정 (action_delay_seconds 등)
+    log : callable, optional
+        로그 출력 함수 (기본값: log_with_timestamp)
+    notify : callable, optional
+        워커 재시작 알림 함수 (기본값: send_discord_notification)
+    """
+
+    def __init__(self, trading_assets, workers=None, rate=20.0, burst=10, heartbeat_interval=5.0,
+                 heartbeat_timeout=60.0, restart_backoff=1.0, max_backoff=300.0, target=None, options=None,
+                 log=None, notify=None):
+        self.context = multiprocessing.get_context("spawn")
+        self.shards = shard_assets(trading_assets, workers or os.cpu_count() or 1)
+        self.limiter = SharedRateLimiter(rate, burst, context=self.context)
+        self.heartbeats = self.context.Array("d", len(self.shards), lock=False)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.restart_backoff = restart_backoff
+        self.max_backoff = max_backoff
+        self.target = target or run_shard
+        self.options = {"action_delay_seconds": 1, "heartbeat_interval": heartbeat_interval}
+        self.options.update(options or {})
+        self.log = leveled(log or log_with_timestamp)
+        self.notify = notify or send_discord_notification
+        self.processes = [None] * len(self.shards)
+        self.restarts = [0] * len(self.shards)
+        self._failures = [0] * len(self.shards)
+        self._started_at = [0.0] * len(self.shards)
+        self._restart_at = [None] * len(self.shards)
+
+    @classmethod
+    def from_env(cls, trading_assets, action_delay_seconds=1):
+        """
+        .env 설정값(WORKER_PROCESSES, API_RATE_LIMIT, API_RATE_BURST, WORKER_HEARTBEAT_TIMEOUT)으로 생성합니다.
+        """
+        workers = int(os.getenv("WORKER_PROCESSES", "0")) or None
+        return cls(
+            trading_assets,
+            workers=workers,
+            rate=float(os.getenv("API_RATE_LIMIT", "20")),
+            burst=int(os.getenv("API_RATE_BURST", "10")),
+            heartbeat_timeout=float(os.getenv("WORKER_HEARTBEAT_TIMEOUT", "60")),
+            options={"action_delay_seconds": action_delay_seconds},
+        )
+
+    def _spawn(self, index):
+        # 시작 직후에는 하트비트가 없으므로 지금 시각으로 채워 유예 시간을 줌
+        self.heartbeats[index] = time.monotonic()
+        process = self.context.Process(
+            target=self.target,
+            args=(index, self.shards[index], self.limiter, self.heartbeats, self.options),
+            name=f"shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[index] = process
+        self._started_at[index] = time.monotonic()
+        self._restart_at[index] = None
+
+    def start(self):
+        for index in range(len(self.shards)):
+            self._spawn(index)
+        tickers = sum(len(shard) for shard in self.shards)
+        self.log("Supervisor started %d workers for %d markets (shared rate %g/s).",
+                 len(self.shards), tickers, self.limiter.rate)
+        return self
+
+    def check(self, now=None):
+        """
+        워커 상태를 확인하고 종료/정지한 워커를 다시 시작합니다. 재시작한 샤드 번호 목록을 반환합니다.
+        """
+        now = time.monotonic() if now is None else now
+        restarted = []
+        for index, process in enumerate(self.processes):
+            if process is None:
+                continue
+            if self._restart_at[index] is not None:
+                if now >= self._restart_at[index]:
+                    self._spawn(index)
+                    self.restarts[index] += 1
+                    restarted.append(index)
+                continue
+            stale = now - self.heartbeats[index] > self.heartbeat_timeout
+            if process.is_alive() and not stale:
+                # 백오프 시간보다 오래 정상 동작했으면 연속 실패 횟수 초기화
+                if self._failures[index] and now - self._started_at[index] > self._backoff(index) * 2:
+                    self._failures[index] = 0
+                continue
+            if process.is_alive():
+                reason = f"heartbeat stale for {now - self.heartbeats[index]:.0f}s"
+                process.terminate()
+                process.join(5)
+                if process.is_alive():
+                    process.kill()
+                    process.join(5)
+            else:
+                reason = f"exited with code {process.exitcode}"
+            self._failures[index] += 1
+            delay = self._backoff(index)
+            self._restart_at[index] = now + delay
+            tickers = ", ".join(ticker for _, ticker, _ in self.shards[index])
+            message = f"Shard {index} ({tickers}) {reason}. Restarting in {delay:g}s."
+            self.log(message, level=WARNING)
+            try:
+                self.notify(message, "Worker Restart")
+            except Exception as e:
+                self.log("Failed to send restart notification: %s", e, level=ERROR)
+        return restarted
+
+    def _backoff(self, index):
+        return min(self.restart_backoff * 2 ** max(self._failures[index] - 1, 0), self.max_backoff)
+
+    def run(self, poll_interval=1.0, duration=None):
+        """
+        워커를 시작하고 중지될 때까지(또는 duration초 동안) 감시합니다.
+        """
+        if not any(self.processes):
+            self.start()
+        deadline = None if duration is None else time.monotonic() + duration
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                self.check()
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            self.log("Supervisor stopping due to KeyboardInterrupt...")
+        finally:
+            self.stop()
+
+    def stop(self, timeout=10.0):
+        """
+        모든 워커에 종료 신호(SIGTERM)를 보내고 기다립니다.
+        """
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            if process is not None:
+                process.join(timeout)
+                if process.is_alive():
+                    process.kill()
+                    process.join()
+
+
+def run_mock_shard(shard_id, assets, limiter, heartbeats, options):
+    """
+    모의 거래소로 샤드를 실행하고 상태 머신 Effect 처리 수를 options["effects"][shard_id]에 기록합니다.
+    """
+    from bot.engine import TradingEngine
+    from bot.mock_exchange import MockExchange
+    from bot.strategy import StrategyConfig
+
+    speed = options["speed"]
+    markets = [ticker for _, ticker, _ in assets]
+    exchange = MockExchange(markets, speed=speed)
+    engine = TradingEngine(
+        exchange,
+        limiter=limiter,
+        orderbook_fn=exchange.get_orderbook,
+        ohlcv_fn=exchange.get_ohlcv,
+        notify=lambda message, title=None: None,
+        log=lambda message: None,
+        config=StrategyConfig(max_polls=30, cooldown_seconds=5),
+        sleep_scale=1.0 / speed,
+    )
+
+    async def report():
+        while True:
+            await asyncio.sleep(0.2)
+            options["effects"][shard_id] = sum(engine.stats.values())
+
+    async def main():
+        task = asyncio.ensure_future(report())
+        try:
+            await engine.run(assets, duration=options["duration"])
+        finally:
+            task.cancel()
+            options["effects"][shard_id] = sum(engine.stats.values())
+
+    asyncio.run(_run_with_heartbeat(main(), heartbeats, shard_id, options["heartbeat_interval"]))
+
+
+def _run_mock_demo(market_count, workers, duration, speed):
+    markets = [f"KRW-MOCK{i:04d}" for i in range(market_count)]
+    assets = [(f"{m.split('-')[1]}-Trader", m, 1.0) for m in markets]
+    context = multiprocessing.get_context("spawn")
+    effects = context.Array("d", workers, lock=False)
+    supervisor = Supervisor(assets, workers=workers, rate=1_000_000, burst=1000, target=run_mock_shard,
+                            options={"speed": speed, "duration": duration, "effects": effects},
+                            log=lambda message: print(message, file=sys.stderr), notify=lambda *args: None)
+    supervisor.start()
+    started = time.monotonic()
+    for process in supervisor.processes:
+        process.join()
+    elapsed = time.monotonic() - started
+    total = sum(effects)
+    print(f"Workers: {workers}, markets: {market_count}, wall time: {elapsed:.1f}s, "
+          f"state machine effects: {total:,.0f} ({total / duration:,.0f}/s)", file=sys.stderr)
+    return total / duration
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run mock markets sharded across worker processes.")
+    parser.add_argument("--mock", type=int, default=2000, help="number of mock markets")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--duration", type=float, default=10.0, help="wall-clock seconds to run")
+    parser.add_argument("--speed", type=float, default=100.0, help="simulated seconds per wall-clock second")
+    args = parser.parse_args()
+    _run_mock_demo(args.mock, args.workers, args.duration, args.speed)
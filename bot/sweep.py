@@ -0,0 +1,271 @@
+"""
+전략 설정값 파라미터 스윕
+
+봇의 .env 설정값(CANDLE_INTERVAL, CANDLE_COUNT, PERCENTILE_THRESHOLD, ORDER_COOLDOWN_SECONDS,
+MAX_POLLS, EMERGENCY_CANDLE_COUNT) 조합을 격자 또는 무작위로 만들어 프로세스 풀에서 백테스트합니다.
+체결 테이프는 TradeTape.save_arrays()로 저장한 .npy 파일을 각 워커가 메모리 매핑으로 한 번만 열어
+공유하며, 결과는 완료되는 대로 JSON Lines 파일에 추가되어 중단 후 같은 명령으로 이어서 실행할 수 있습니다.
+
+사용 예:
+    python -m bot.sweep --tape data/KRW-BTC --results sweep.jsonl \\
+        --grid CANDLE_COUNT=12,24,48 --grid PERCENTILE_THRESHOLD=50,60,70,80
+    python -m bot.sweep --tape data/KRW-BTC --results random.jsonl --random 2000 --seed 1 \\
+        --space PERCENTILE_THRESHOLD=30:90 --space CANDLE_COUNT=6:96 --space CANDLE_INTERVAL=minute15,minute60
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from bot.backtest import Backtester, TradeTape
+from bot.signals import SignalConfig
+from bot.strategy import StrategyConfig
+
+# 스윕 가능한 설정값과 타입
+PARAMETERS = {
+    "CANDLE_INTERVAL": str,
+    "CANDLE_COUNT": int,
+    "PERCENTILE_THRESHOLD": float,
+    "ORDER_COOLDOWN_SECONDS": float,
+    "MAX_POLLS": int,
+    "EMERGENCY_CANDLE_COUNT": int,
+}
+
+# 워커 프로세스별로 한 번만 연 테이프
+_worker_tapes = None
+_worker_options = None
+
+
+def params_key(params) -> str:
+    """
+    파라미터 조합을 결과 파일에서 찾기 위한 키 (정렬된 JSON).
+    """
+    return json.dumps(params, sort_keys=True)
+
+
+def make_configs(params):
+    """
+    파라미터 dict를 (StrategyConfig, SignalConfig)로 변환합니다. 빠진 값은 .env 설정값을 사용합니다.
+    """
+    strategy = StrategyConfig.from_env()
+    signal = SignalConfig.from_env()
+    if "MAX_POLLS" in params:
+        strategy.max_polls = int(params["MAX_POLLS"])
+        # ORDER_WAIT_SECONDS가 설정되어 있으면 대기 기한이 max_polls보다 우선하므로 기한도 함께 변경
+        strategy.polling.deadline = strategy.max_polls * strategy.poll_interval
+    if "ORDER_COOLDOWN_SECONDS" in params:
+        strategy.cooldown_seconds = float(params["ORDER_COOLDOWN_SECONDS"])
+    if "CANDLE_INTERVAL" in params:
+        signal.candle_interval = params["CANDLE_INTERVAL"]
+    if "CANDLE_COUNT" in params:
+        signal.candle_count = int(params["CANDLE_COUNT"])
+    if "PERCENTILE_THRESHOLD" in params:
+        signal.percentile_threshold = float(params["PERCENTILE_THRESHOLD"])
+    if "EMERGENCY_CANDLE_COUNT" in params:
+        signal.down_count = int(params["EMERGENCY_CANDLE_COUNT"])
+    return strategy, signal
+
+
+def grid(space):
+    """
+    {이름: 값 목록} 격자의 모든 조합을 dict로 나열합니다.
+    """
+    names = sorted(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_search(space, count, seed=0):
+    """
+    무작위 조합 count개를 만듭니다. 같은 seed면 같은 순서이므로 중단 후 재개할 수 있습니다.
+
+    Parameters
+    ----------
+    space : dict
+        이름 -> 값 목록(하나를 선택) 또는 (최소, 최대) 튜플(int면 정수, float면 실수 균등 분포)
+    count : int
+        조합 개수
+    seed : int, optional (default 0)
+        난수 시드
+    """
+    rng = random.Random(seed)
+    names = sorted(space)
+    for _ in range(count):
+        params = {}
+        for name in names:
+            choices = space[name]
+            if isinstance(choices, tuple):
+                low, high = choices
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = rng.randint(low, high)
+                else:
+                    params[name] = round(rng.uniform(low, high), 4)
+            else:
+                params[name] = rng.choice(list(choices))
+        yield params
+
+
+def load_results(path):
+    """
+    결과 파일(JSON Lines)을 읽습니다. 마지막 줄이 중단으로 깨졌으면 무시합니다.
+    """
+    results = []
+    if not path or not os.path.exists(path):
+        return results
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return results
+
+
+def ranked(results, by="total_pnl", ascending=False) -> pd.DataFrame:
+    """
+    결과를 파라미터 컬럼과 지표 컬럼을 가진 순위표 DataFrame으로 만듭니다.
+    """
+    if not results:
+        return pd.DataFrame()
+    rows = [dict(result["params"], **result["metrics"]) for result in results]
+    return pd.DataFrame(rows).sort_values(by, ascending=ascending).reset_index(drop=True)
+
+
+def _init_worker(tape_dirs, options):
+    global _worker_tapes, _worker_options
+    _worker_tapes = [TradeTape.open(directory) for directory in tape_dirs]
+    _worker_options = options
+
+
+def _run_params(params):
+    """
+    워커에서 파라미터 조합 하나를 모든 테이프에 대해 백테스트하고 지표를 합산합니다.
+    """
+    strategy_config, signal_config = make_configs(params)
+    options = dict(_worker_options)
+    trade_amounts = options.pop("trade_amounts")
+    metrics = {"total_pnl": 0.0, "realized_pnl": 0.0, "fees": 0.0, "fills": 0, "emergency_sells": 0,
+               "max_drawdown": 0.0, "events": 0}
+    for tape in _worker_tapes:
+        result = Backtester(tape, trade_amounts.get(tape.ticker, trade_amounts.get(None, 1.0)),
+                            strategy_config=strategy_config, signal_config=signal_config, **options).run()
+        summary = result.summary()
+        for name in ("total_pnl", "realized_pnl", "fees", "fills", "emergency_sells", "events"):
+            metrics[name] += summary[name]
+        metrics["max_drawdown"] = max(metrics["max_drawdown"], summary["max_drawdown"])
+    return params, metrics
+
+
+def run_sweep(tape_dirs, combinations, results_path, workers=None, trade_amounts=None, on_result=None,
+              **backtest_options):
+    """
+    파라미터 조합을 프로세스 풀에서 백테스트합니다.
+
+    Parameters
+    ----------
+    tape_dirs : list of str
+        TradeTape.save_arrays()로 저장한 테이프 디렉터리 목록
+    combinations : iterable of dict
+        파라미터 조합 (grid() 또는 random_search() 결과)
+    results_path : str
+        결과 JSON Lines 파일. 이미 있는 조합은 건너뛰고 새 결과는 완료 즉시 추가
+    workers : int, optional
+        워커 프로세스 수 (기본값: CPU 수)
+    trade_amounts : dict, optional
+        티커별 1회 주문 수량. None 키는 기본값 (기본 1.0)
+    on_result : callable, optional
+        결과 하나가 끝날 때마다 (params, metrics)로 호출
+    **backtest_options
+        Backtester 옵션 (fee_rate, participation, action_delay_seconds 등)
+
+    Returns
+    -------
+    list of dict
+        이전 실행분을 포함한 전체 결과 ({"params": ..., "metrics": ...})
+    """
+    results = load_results(results_path)
+    done = {params_key(result["params"]) for result in results}
+    pending = []
+    for params in combinations:
+        key = params_key(params)
+        if key not in done:
+            done.add(key)
+            pending.append(params)
+    if not pending:
+        return results
+
+    options = dict(backtest_options, trade_amounts=dict(trade_amounts or {}))
+    with open(results_path, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(list(tape_dirs), options)) as pool:
+        futures = [pool.submit(_run_params, params) for params in pending]
+        for future in as_completed(futures):
+            params, metrics = future.result()
+            record = {"params": params, "metrics": metrics}
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            results.append(record)
+            if on_result is not None:
+                on_result(params, metrics)
+    return results
+
+
+def _parse_values(name, text):
+    kind = PARAMETERS[name]
+    return [kind(value) for value in text.split(",")]
+
+
+def _parse_range(name, text):
+    kind = PARAMETERS[name]
+    if ":" in text and kind is not str:
+        low, high = text.split(":")
+        return kind(low), kind(high)
+    return _parse_values(name, text)
+
+
+def _parse_assignment(text):
+    name, _, value = text.partition("=")
+    name = name.strip().upper()
+    if name not in PARAMETERS:
+        raise argparse.ArgumentTypeError(f"unknown parameter {name}; choose from {', '.join(PARAMETERS)}")
+    return name, value
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep strategy settings over backtests in a process pool.")
+    parser.add_argument("--tape", action="append", required=True, help="tape directory written by TradeTape.save_arrays")
+    parser.add_argument("--results", required=True, help="JSON Lines results file (appended, used to resume)")
+    parser.add_argument("--grid", action="append", type=_parse_assignment, default=[], help="NAME=v1,v2,...")
+    parser.add_argument("--space", action="append", type=_parse_assignment, default=[],
+                        help="NAME=low:high or NAME=v1,v2 for --random")
+    parser.add_argument("--random", type=int, help="number of random combinations instead of a grid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--amount", type=float, default=1.0, help="order volume per trade")
+    parser.add_argument("--fee", type=float, default=0.0025, help="fee rate per fill")
+    parser.add_argument("--top", type=int, default=20, help="rows of the ranked table to print")
+    parser.add_argument("--sort", default="total_pnl", help="metric to rank by")
+    args = parser.parse_args()
+
+    if args.random:
+        combinations = random_search({name: _parse_range(name, value) for name, value in args.space},
+                                     args.random, seed=args.seed)
+    else:
+        combinations = grid({name: _parse_values(name, value) for name, value in args.grid})
+
+    progress = {"count": 0}
+
+    def report(params, metrics):
+        progress["count"] += 1
+        print(f"[{progress['count']}] {params} -> total_pnl {metrics['total_pnl']:,.2f}, "
+              f"max_drawdown {metrics['max_drawdown']:,.2f}", file=sys.stderr)
+
+    results = run_sweep(args.tape, combinations, args.results, workers=args.workers,
+                        trade_amounts={None: args.amount}, on_result=report, fee_rate=args.fee)
+    table = ranked(results, by=args.sort)
+    print(table.head(args.top).to_string())
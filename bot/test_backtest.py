@@ -0,0 +1,127 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.backtest import Backtester, SimulatedExchange, TradeTape, run_backtest
+from bot.signals import SignalConfig
+from bot.strategy import StrategyConfig
+
+START = 1_700_000_040.0  # 분 경계
+
+def make_tape(prices, volume=1.0, step=1.0):
+    times = START + np.arange(len(prices)) * step
+    return TradeTape("KRW-TEST", times, prices, np.full(len(prices), volume))
+
+class TestSimulatedExchange(unittest.TestCase):
+    def test_limit_order_fills_only_when_price_trades_through(self):
+        """매수 지정가는 주문 가격보다 낮은 체결이 나와야 체결"""
+        exchange = SimulatedExchange(make_tape([1000, 1000, 999, 999]), fee_rate=0.0)
+        order = exchange.buy_limit_order("KRW-TEST", 1000, 1.5)
+        exchange.advance_to(START + 1)
+        self.assertEqual(exchange.get_order(order["uuid"])["state"], "wait")
+        exchange.advance_to(START + 2)
+        partial = exchange.get_order(order["uuid"])
+        self.assertEqual(float(partial["executed_volume"]), 1.0)  # 체결 수량만큼만 부분 체결
+        exchange.advance_to(START + 3)
+        done = exchange.get_order(order["uuid"])
+        self.assertEqual(done["state"], "done")
+        self.assertEqual(float(done["trades"][-1]["price"]), 1000.0)
+        self.assertAlmostEqual(exchange.position, 1.5)
+
+    def test_cancel_and_sell_validation(self):
+        exchange = SimulatedExchange(make_tape([1000, 1001]))
+        order = exchange.buy_limit_order("KRW-TEST", 990, 1)
+        exchange.cancel_order(order["uuid"])
+        with self.assertRaisesRegex(ValueError, "order_not_found"):
+            exchange.cancel_order(order["uuid"])
+        with self.assertRaisesRegex(ValueError, "insufficient_funds_ask"):
+            exchange.sell_limit_order("KRW-TEST", 1010, 1)
+
+    def test_ohlcv_tape_visits_low_before_high_on_up_candle(self):
+        index = pd.date_range("2024-01-01", periods=2, freq="1min")
+        df = pd.DataFrame({"open": [100, 110], "high": [120, 115], "low": [90, 95], "close": [110, 100],
+                           "volume": [4, 8]}, index=index)
+        tape = TradeTape.from_ohlcv("KRW-TEST", df, "minute1")
+        np.testing.assert_array_equal(tape.prices, [100, 90, 120, 110, 110, 115, 95, 100])
+        self.assertEqual(tape.volumes.sum(), 12)
+        self.assertEqual(tape.times[4] - tape.times[0], 60)
+
+    def test_month_candles_spread_over_calendar_month(self):
+        """월봉 가상 체결은 실제 달 길이(2월 29일, 3월 31일)에 맞춰 나뉘어 다음 달로 넘어가지 않음"""
+        index = pd.DatetimeIndex(["2024-02-01", "2024-03-01"])
+        df = pd.DataFrame({"open": 100.0, "high": 101.0, "low": 99.0, "close": 100.0}, index=index)
+        tape = TradeTape.from_ohlcv("KRW-TEST", df, "month")
+        np.testing.assert_array_equal(np.diff(tape.times[[0, 1, 4, 5]]), np.array([29, 29 * 3, 31]) * 86400 / 4)
+        np.testing.assert_array_equal(tape.bars("month")[0], np.repeat([0, 1], 4))
+
+    def test_week_and_month_bars_follow_exchange_boundaries(self):
+        """주봉은 KST 월요일, 월봉은 KST 1일에 새 캔들 시작"""
+        index = pd.date_range("2024-01-25", "2024-02-06", freq="D")  # 목요일부터 (2024-01-29 월요일)
+        df = pd.DataFrame({"open": 100.0, "high": 101.0, "low": 99.0, "close": np.arange(len(index)) + 100.0},
+                          index=index)
+        tape = TradeTape.from_ohlcv("KRW-TEST", df, "day")
+        days = np.repeat(index.day.values, 4)
+        bar_of_trade, opens, closes = tape.bars("week")
+        np.testing.assert_array_equal(np.flatnonzero(np.diff(bar_of_trade)) + 1,
+                                      np.flatnonzero(np.isin(days, [29, 5]) & (np.arange(len(days)) % 4 == 0)))
+        self.assertEqual(len(opens), 3)
+        self.assertEqual(closes[0], df["close"].iloc[3])  # 1월 28일(일) 종가로 첫 주봉 마감
+        bar_of_trade, opens, closes = tape.bars("month")
+        self.assertEqual(len(opens), 2)
+        self.assertEqual(bar_of_trade[4 * 7], 1)  # 2월 1일
+        self.assertEqual(bar_of_trade[4 * 7 - 1], 0)
+        np.testing.assert_array_equal(tape.bars("day")[0], np.repeat(np.arange(len(index)), 4))
+
+class TestBacktester(unittest.TestCase):
+    def setUp(self):
+        self.strategy_config = StrategyConfig(max_polls=30, cooldown_seconds=5)
+        self.signal_config = SignalConfig(candle_interval="minute1", candle_count=5, percentile_threshold=100)
+
+    def test_round_trip_pnl_and_fees(self):
+        """매수(최우선 매수호가) -> 매도(두 번째 매도호가) 한 번의 손익과 수수료"""
+        prices = [1010] * 300 + [1009] * 50 + [1015] * 30  # 보합 캔들 5개 뒤 하락 후 반등
+        result = run_backtest(make_tape(prices), 1.0, strategy_config=self.strategy_config,
+                              signal_config=self.signal_config, fee_rate=0.001)
+        fills = result.fills_frame()
+        self.assertEqual(list(fills["side"]), ["bid", "ask"])
+        self.assertEqual(list(fills["price"]), [1010.0, 1011.0])
+        self.assertAlmostEqual(result.fees, 0.001 * 2021)
+        self.assertAlmostEqual(result.realized_pnl, 1011 - 1010 - 0.001 * 2021)
+        summary = result.summary()
+        self.assertEqual(summary["events"], len(prices))
+        self.assertEqual(summary["win_rate"], 0.0)
+        self.assertGreaterEqual(summary["max_drawdown"], 0.0)
+
+    def test_emergency_sell_on_consecutive_down_candles(self):
+        """1분봉이 연속 하락하면 시장가 매도"""
+        prices = [1000] * 10 + [999] * 20  # 매수 체결
+        level = 1100.0
+        for _ in range(6):  # 분마다 시가 > 종가인 캔들
+            prices += list(np.linspace(level, level - 20, 60))
+            level -= 10
+        tape = make_tape(prices)
+        backtester = Backtester(tape, 1.0, strategy_config=self.strategy_config,
+                                signal_config=self.signal_config, fee_rate=0.0)
+        result = backtester.run()
+        self.assertIn("market", [fill.ord_type for fill in result.fills])
+        self.assertTrue(backtester.notifications)
+
+    def test_replays_a_million_events_per_minute(self):
+        rng = np.random.default_rng(0)
+        n = 100_000
+        times = START + np.cumsum(rng.exponential(0.2, n))
+        prices = np.round(10000 * np.exp(np.cumsum(rng.normal(0, 2e-4, n))))
+        tape = TradeTape("KRW-TEST", times, prices, rng.exponential(1, n))
+        result = run_backtest(tape, 1.0, strategy_config=self.strategy_config, signal_config=SignalConfig())
+        summary = result.summary()
+        self.assertEqual(summary["events"], n)
+        self.assertGreater(summary["events_per_minute"], 1_000_000)
+        self.assertGreater(summary["fills"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+import unittest
+import sys
+import os
+from collections import Counter
+
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_bithumb.candle_aggregator import CandleAggregator, TradeCandleBook, bucket_start
+from bot.market_data import MarketDataHub
+
+# 2024-01-01 10:00:00 KST (월요일)
+T0 = 1704070800
+
+
+def trade(ts, price, volume, seq=None):
+    item = {"market": "KRW-BTC", "timestamp": int(ts * 1000), "trade_price": price, "trade_volume": volume,
+            "ask_bid": "BID"}
+    if seq is not None:
+        item["sequential_id"] = seq
+    return item
+
+
+class TickFeed:
+    """get_trades_ticks처럼 최신 체결부터 count건, cursor가 있으면 그보다 이전 체결을 반환"""
+
+    def __init__(self):
+        self.trades = []
+        self.calls = 0
+
+    def add(self, n, price=100):
+        for _ in range(n):
+            seq = len(self.trades) + 1
+            self.trades.append(trade(T0 + seq, price, 1, seq=seq))
+
+    def __call__(self, market, count=100, cursor=None):
+        self.calls += 1
+        older = [t for t in reversed(self.trades) if cursor is None or t["sequential_id"] < cursor]
+        return older[:count]
+
+
+class TestCandleAggregator(unittest.TestCase):
+    def test_minute_bars_match_get_ohlcv_format(self):
+        """체결로 만든 1분 캔들이 get_ohlcv와 같은 컬럼/인덱스를 가짐"""
+        aggregator = CandleAggregator("KRW-BTC", "minute1")
+        trades = [trade(T0 + 1, 100, 1), trade(T0 + 20, 105, 2), trade(T0 + 59, 98, 1),
+                  trade(T0 + 61, 99, 3), trade(T0 + 150, 101, 1)]
+        # get_trades_ticks는 최신순으로 반환
+        self.assertEqual(aggregator.add_trades(list(reversed(trades))), 2)
+        # 늦게 도착한 체결은 해당 캔들의 고가/거래량에만 반영
+        aggregator.add(int((T0 + 30) * 1000), 110, 1)
+
+        df = aggregator.to_frame()
+        self.assertEqual(df.index.name, "candle_date_time_kst")
+        self.assertEqual(list(df.index), [pd.Timestamp("2024-01-01 10:00"), pd.Timestamp("2024-01-01 10:01"),
+                                          pd.Timestamp("2024-01-01 10:02")])
+        for column in ("open", "high", "low", "close", "volume", "value", "candle_date_time_utc", "market"):
+            self.assertIn(column, df.columns)
+        first = df.iloc[0]
+        self.assertEqual((first.open, first.high, first.low, first.close, first.volume), (100, 110, 98, 98, 5))
+        self.assertEqual(first.value, 100 + 210 + 98 + 110)
+        self.assertEqual(first.candle_date_time_utc, "2024-01-01T01:00:00")
+        # 진행 중인 마지막 캔들 제외
+        self.assertEqual(len(aggregator.to_frame(include_partial=False, now=T0 + 170)), 2)
+        self.assertEqual(len(aggregator.to_frame(include_partial=False, now=T0 + 181)), 3)
+
+    def test_kst_boundaries(self):
+        """분/일/주/월 캔들 시작 시각이 KST 기준"""
+        ts = T0 + 5 * 3600 + 123  # 2024-01-01 15:02:03 KST
+        kst = lambda start: pd.Timestamp(int(start + 9 * 3600), unit="s")
+        self.assertEqual(kst(bucket_start(ts, "minute15")), pd.Timestamp("2024-01-01 15:00"))
+        self.assertEqual(kst(bucket_start(ts, "minute240")), pd.Timestamp("2024-01-01 13:00"))
+        self.assertEqual(kst(bucket_start(T0 - 10 * 3600 - 1, "day")), pd.Timestamp("2023-12-31"))
+        self.assertEqual(kst(bucket_start(ts + 3 * 86400, "week")), pd.Timestamp("2024-01-01"))
+        self.assertEqual(kst(bucket_start(ts + 40 * 86400, "month")), pd.Timestamp("2024-02-01"))
+        self.assertEqual(kst(bucket_start(ts, "second10")), pd.Timestamp("2024-01-01 15:02:00"))
+
+    def test_tick_and_volume_bars(self):
+        """체결 건수/거래량 기준 캔들"""
+        ticks = CandleAggregator("KRW-BTC", "tick3")
+        volume = CandleAggregator("KRW-BTC", "volume5")
+        trades = [trade(T0 + i, 100 + i, 2) for i in range(7)]
+        ticks.add_trades(trades)
+        volume.add_trades(trades)
+        self.assertEqual(list(ticks.to_frame()["volume"]), [6, 6, 2])
+        self.assertEqual(list(ticks.to_frame()["close"]), [102, 105, 106])
+        self.assertEqual(list(volume.to_frame()["volume"]), [6, 6, 2])
+        self.assertEqual(len(volume.to_frame(include_partial=False)), 2)
+
+    def test_book_dedupes_polled_trades_and_skips_seeded(self):
+        """폴링으로 겹쳐 들어온 체결과 seed 캔들에 포함된 체결은 다시 더하지 않음"""
+        book = TradeCandleBook(["minute1", "tick2"])
+        seed = pd.DataFrame({"open": [90.0], "high": [95.0], "low": [89.0], "close": [94.0], "volume": [7.0],
+                             "value": [650.0], "timestamp": [int((T0 + 10) * 1000)]},
+                            index=pd.DatetimeIndex([pd.Timestamp("2024-01-01 10:00")], name="candle_date_time_kst"))
+        book.seed("KRW-BTC", "minute1", seed)
+        first = [trade(T0 + 10, 94, 1, seq=1), trade(T0 + 30, 96, 1, seq=2)]
+        second = [trade(T0 + 30, 96, 1, seq=2), trade(T0 + 70, 97, 1, seq=3)]
+        self.assertEqual(book.feed("KRW-BTC", first), 2)
+        self.assertEqual(book.feed("KRW-BTC", second), 1)
+        bars = book.candles("KRW-BTC", "minute1")
+        self.assertEqual(list(bars["volume"]), [8.0, 1.0])
+        self.assertEqual(list(bars["high"]), [96.0, 97.0])
+        self.assertEqual(list(book.candles("KRW-BTC", "tick2")["volume"]), [2.0, 1.0])
+
+    def test_poll_pages_back_when_more_trades_than_count_arrive(self):
+        """폴링 사이 체결이 count건보다 많으면 이전 체결과 겹칠 때까지 cursor로 거슬러 조회"""
+        feed = TickFeed()
+        book = TradeCandleBook(["tick1000"])
+        feed.add(5)
+        self.assertEqual(book.poll("KRW-BTC", count=3, trades_fn=feed), 3)
+        feed.add(7)
+        self.assertEqual(book.poll("KRW-BTC", count=3, trades_fn=feed), 7)
+        self.assertEqual(feed.calls, 4)  # 처음 1번 + 최근 3건, 이전 3건, 겹치는 페이지
+        self.assertEqual(book.candles("KRW-BTC", "tick1000")["volume"].iloc[-1], 10.0)
+        self.assertEqual(book.gaps["KRW-BTC"], 0)
+
+        # max_pages 안에 겹치지 않으면 빠진 체결이 있다고 기록
+        book.max_pages = 2
+        feed.add(10)
+        self.assertEqual(book.poll("KRW-BTC", count=3, trades_fn=feed), 6)
+        self.assertEqual(book.gaps["KRW-BTC"], 1)
+
+
+class TestHubTradeCandles(unittest.TestCase):
+    def test_one_trade_poll_refreshes_all_trade_intervals(self):
+        """체결 기반 간격은 처음만 get_ohlcv로 채우고 이후에는 티커당 체결 조회 1회로 갱신"""
+        calls = Counter()
+        clock = {"t": T0}
+
+        def ohlcv(ticker, interval="day", count=200):
+            calls["ohlcv"] += 1
+            return pd.DataFrame()
+
+        def trades(ticker, count=100):
+            calls["trades"] += 1
+            clock["t"] += 30
+            return [trade(clock["t"], 100 + calls["trades"], 1, seq=calls["trades"])]
+
+        hub = MarketDataHub(["KRW-BTC", "KRW-ETH"], candle_specs=[("minute60", 24), ("minute1", 5)],
+                            orderbook_fn=lambda markets: None, ohlcv_fn=ohlcv, trades_fn=trades,
+                            trade_intervals=["minute1", "minute60"], log=lambda message: None)
+        for _ in range(4):
+            hub.refresh_candles(force=True)
+
+        self.assertEqual(calls["trades"], 8)  # 4회 x 2티커, 간격 수와 무관
+        self.assertLessEqual(calls["ohlcv"], 4 * 2 * 2)
+        df = hub.fetch_candles("KRW-BTC", interval="minute1", count=2)
+        self.assertIsNotNone(df)
+        self.assertEqual(len(hub.fetch_candles("KRW-BTC", interval="minute60", count=1)), 1)
+        hub.set_tickers(["KRW-BTC"])
+        hub.refresh_candles(force=True)
+        self.assertEqual(hub.trade_book.markets(), {"KRW-BTC"})
+
+    def test_gap_between_polls_reseeds_from_ohlcv_with_warning(self):
+        """거슬러 조회해도 이어지지 않으면 경고를 남기고 get_ohlcv로 다시 채움 (페이지마다 limiter 사용)"""
+        feed = TickFeed()
+        ohlcv_calls = []
+        logs = []
+
+        def ohlcv(ticker, interval="day", count=200):
+            ohlcv_calls.append(interval)
+            return pd.DataFrame()
+
+        class Limiter:
+            acquired = 0
+
+            def acquire(self):
+                Limiter.acquired += 1
+
+        hub = MarketDataHub(["KRW-BTC"], candle_specs=[("minute1", 5)], orderbook_fn=lambda markets: None,
+                            ohlcv_fn=ohlcv, trades_fn=feed, trade_intervals=["minute1"], trade_count=3,
+                            limiter=Limiter(), log=lambda message: logs.append(message))
+        hub.trade_book.max_pages = 2
+        feed.add(3)
+        hub.refresh_candles(force=True)
+        self.assertEqual(ohlcv_calls, ["minute1"])
+        feed.add(5)  # 두 페이지(6건) 안에서 겹침
+        hub.refresh_candles(force=True)
+        self.assertEqual(ohlcv_calls, ["minute1"])
+        self.assertEqual(logs, [])
+        feed.add(20)
+        hub.refresh_candles(force=True)
+        self.assertEqual(ohlcv_calls, ["minute1", "minute1"])
+        self.assertEqual(len(logs), 1)
+        self.assertIn("Missed trades for KRW-BTC", logs[0])
+        self.assertEqual(Limiter.acquired, len(ohlcv_calls) + feed.calls)
+        self.assertEqual(hub.fetches, Limiter.acquired)
+
+
+if __name__ == '__main__':
+    unittest.main()
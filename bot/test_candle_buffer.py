@@ -0,0 +1,62 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.candle_buffer import CandleBuffer
+
+def make_candles(start, count, base=100.0):
+    index = pd.date_range(start, periods=count, freq="min", name="candle_date_time_kst")
+    closes = base + np.arange(count, dtype=float)
+    return pd.DataFrame({
+        "market": "KRW-XRP",
+        "open": closes - 0.5,
+        "high": closes + 1,
+        "low": closes - 1,
+        "close": closes,
+        "volume": np.ones(count),
+    }, index=index)
+
+class TestCandleBuffer(unittest.TestCase):
+    def test_seed_keeps_latest_window(self):
+        """seed는 최근 size개만 보관"""
+        buffer = CandleBuffer("KRW-XRP", "minute1", 5)
+        buffer.seed(make_candles("2025-01-01 00:00", 8))
+        self.assertEqual(len(buffer), 5)
+        np.testing.assert_array_equal(buffer.field("close"), [103, 104, 105, 106, 107])
+
+    def test_update_overwrites_in_progress_and_rolls_window(self):
+        """같은 시각 캔들은 덮어쓰고 새 캔들은 추가하며 창을 이동"""
+        buffer = CandleBuffer("KRW-XRP", "minute1", 5)
+        buffer.seed(make_candles("2025-01-01 00:00", 5))
+        # 마지막 캔들(00:04) 갱신 + 새 캔들(00:05) 추가
+        latest = make_candles("2025-01-01 00:04", 2, base=200.0)
+        self.assertTrue(buffer.update(latest))
+        np.testing.assert_array_equal(buffer.field("close"), [101, 102, 103, 200, 201])
+        frame = buffer.to_frame()
+        self.assertEqual(list(frame.columns), ["market", "open", "high", "low", "close", "volume"])
+        self.assertEqual(frame.index[-1], pd.Timestamp("2025-01-01 00:05"))
+        self.assertTrue(frame.index.is_monotonic_increasing)
+
+    def test_update_without_overlap_requires_reseed(self):
+        """마지막 캔들과 겹치지 않는 갱신은 거부"""
+        buffer = CandleBuffer("KRW-XRP", "minute1", 5)
+        buffer.seed(make_candles("2025-01-01 00:00", 5))
+        self.assertFalse(buffer.update(make_candles("2025-01-01 00:10", 2)))
+        np.testing.assert_array_equal(buffer.field("close"), [100, 101, 102, 103, 104])
+
+    def test_matches_full_refetch_over_many_updates(self):
+        """증분 갱신 결과가 전체 재조회와 동일"""
+        history = make_candles("2025-01-01 00:00", 300)
+        buffer = CandleBuffer("KRW-XRP", "minute1", 24)
+        buffer.seed(history.iloc[:24])
+        for end in range(25, 301):
+            self.assertTrue(buffer.update(history.iloc[end - 2:end]))
+        pd.testing.assert_frame_equal(buffer.to_frame(), history.iloc[-24:], check_freq=False, check_index_type=False)
+
+if __name__ == '__main__':
+    unittest.main()
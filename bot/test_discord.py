@@ -1,5 +1,6 @@
 import unittest
 from bot.bot import send_discord_notification
+from bot.notifier import get_notifier
 import os
 from dotenv import load_dotenv
 
@@ -12,6 +13,10 @@ class TestDiscordNotification(unittest.TestCase):
         if not self.webhook_url:
             self.skipTest("DISCORD_WEBHOOK_URL not set in environment variables")
 
+    def tearDown(self):
+        # 알림은 백그라운드에서 전송되므로 테스트마다 전송 완료를 기다림
+        self.assertTrue(get_notifier().flush(timeout=30))
+
     def test_basic_notification(self):
         """기본 알림 전송 테스트"""
         message = "This is a test notification"
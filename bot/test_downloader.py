@@ -0,0 +1,171 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_bithumb.downloader import HistoryDownloader, main
+from python_bithumb.rate_limit import RateLimiter
+
+# 2024-01-04 12:00 UTC (KST 21:00)
+NOW = 1704369600.0
+KST = pd.Timedelta(hours=9)
+
+
+def minute_candles(start="2024-01-01 00:00", end="2024-01-04 20:59", seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, end, freq="min", name="candle_date_time_kst")
+    index = index[rng.random(len(index)) > 0.1]  # 체결 없는 분은 캔들 없음
+    close = 100 + np.cumsum(rng.normal(0, 1, len(index)))
+    return pd.DataFrame({"market": "KRW-BTC", "open": close, "high": close + 1, "low": close - 1,
+                         "close": close, "volume": rng.random(len(index)), "value": close}, index=index)
+
+
+class FakeApi:
+    """get_ohlcv(to, count)와 get_trades_ticks(cursor, daysAgo)를 흉내 내는 API"""
+
+    def __init__(self, candles, fail_after=None):
+        self.candles = candles
+        self.fail_after = fail_after
+        self.calls = Counter()
+        self.lock = threading.Lock()
+        # 각 분봉 거래량을 체결 2건으로 나눔
+        trades = []
+        for ts, row in candles.iterrows():
+            epoch = int((ts - KST).timestamp())
+            for i, part in enumerate((0.4, 0.6)):
+                t = epoch + 10 + i * 20
+                trades.append({"market": "KRW-BTC", "timestamp": t * 1000,
+                               "trade_date_utc": pd.Timestamp(t, unit="s").strftime("%Y-%m-%d"),
+                               "trade_price": row["close"], "trade_volume": row["volume"] * part,
+                               "ask_bid": "BID", "sequential_id": t * 10 + i})
+        self.trades = trades[::-1]  # 최신순
+
+    def _count(self, name):
+        with self.lock:
+            self.calls[name] += 1
+            if self.fail_after is not None and sum(self.calls.values()) > self.fail_after:
+                raise ConnectionError("network down")
+
+    def get_ohlcv(self, ticker, interval="day", count=200, to=None):
+        self._count("ohlcv")
+        visible = self.candles[self.candles.index < pd.Timestamp(to)] if to else self.candles
+        return visible.iloc[-count:]
+
+    def get_trades_ticks(self, market, count=1, cursor=None, daysAgo=None):
+        self._count("ticks")
+        day = (pd.Timestamp(NOW, unit="s").normalize() - pd.Timedelta(days=daysAgo or 0)).strftime("%Y-%m-%d")
+        items = [t for t in self.trades if t["trade_date_utc"] <= day and (cursor is None or t["sequential_id"] < cursor)]
+        return items[:count]
+
+
+def downloader(root, api, workers=3, **kwargs):
+    return HistoryDownloader(root, fmt="csv", limiter=RateLimiter(1_000_000, burst=1000), workers=workers,
+                             ohlcv_fn=api.get_ohlcv, trades_fn=api.get_trades_ticks, log=lambda message: None,
+                             clock=lambda: NOW, **kwargs)
+
+
+class TestHistoryDownloader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_date_partitions_and_resume(self):
+        """날짜별 파일로 저장하고, 중단 후 다시 실행하면 끝난 날짜는 건너뜀"""
+        candles = minute_candles()
+        markets = ["KRW-BTC", "KRW-ETH"]
+        broken = FakeApi(candles, fail_after=12)
+        # 작업자 1개: 호출 제한 전에 첫 날짜가 반드시 끝나도록 함 (여러 작업자면 모두 도중에 실패할 수 있음)
+        stats = downloader(self.tmp.name, broken, workers=1).run(markets, "2024-01-01", "2024-01-04", check=False)
+        self.assertGreater(stats["failed"], 0)
+
+        api = FakeApi(candles)
+        loader = downloader(self.tmp.name, api)
+        pending = loader.plan(markets, "2024-01-01", "2024-01-04")
+        self.assertLess(len(pending), 8)
+        stats = loader.run(markets, "2024-01-01", "2024-01-04", check=False)
+        self.assertEqual(stats["downloaded"], len(pending))
+        self.assertEqual(stats.get("failed", 0), 0)
+
+        for day in ("2024-01-01", "2024-01-02", "2024-01-03"):
+            stored = loader.load("candles", "KRW-BTC", pd.Timestamp(day).date())
+            expected = candles[candles.index.normalize() == pd.Timestamp(day)]
+            self.assertEqual(list(stored.index), list(expected.index))
+            np.testing.assert_allclose(stored["close"].to_numpy(), expected["close"].to_numpy())
+        # 진행 중인 날짜(KST 2024-01-04)는 완료로 기록하지 않아 다음 실행 때 다시 받음
+        manifest = loader.manifest("candles", "KRW-BTC")
+        self.assertTrue(manifest["2024-01-03"]["complete"])
+        self.assertFalse(manifest["2024-01-04"]["complete"])
+        self.assertEqual(loader.plan(markets, "2024-01-01", "2024-01-04"),
+                         [("candles", "KRW-BTC", pd.Timestamp("2024-01-04").date()),
+                          ("candles", "KRW-ETH", pd.Timestamp("2024-01-04").date())])
+
+    def test_ticks_follow_cursor_and_match_candles(self):
+        """체결은 UTC 날짜별로 커서를 따라 모두 받고, 분봉 거래량과 일치하면 공백 없음"""
+        candles = minute_candles()
+        api = FakeApi(candles)
+        loader = downloader(self.tmp.name, api)
+        loader.run(["KRW-BTC"], "2024-01-01", "2024-01-03", ticks=True, check=False)
+        day = pd.Timestamp("2024-01-02").date()
+        ticks = loader.load("ticks", "KRW-BTC", day)
+        expected = [t for t in api.trades if t["trade_date_utc"] == "2024-01-02"]
+        self.assertEqual(len(ticks), len(expected))
+        self.assertGreater(len(ticks), 500)
+        self.assertTrue((ticks["timestamp"].diff().dropna() >= 0).all())
+        self.assertEqual(loader.check(["KRW-BTC"], "2024-01-01", "2024-01-02", ticks=True), [])
+
+    def test_check_finds_and_refills_gaps(self):
+        """빠진 날짜, 공백, 체결/분봉 불일치를 찾아 다시 받음"""
+        candles = minute_candles()
+        # 첫 다운로드 때 2024-01-02 KST 10:00~14:00 분봉이 빠진 응답
+        holey = candles[~((candles.index >= "2024-01-02 10:00") & (candles.index < "2024-01-02 14:00"))]
+        first = FakeApi(candles)
+        first.candles = holey
+        loader = downloader(self.tmp.name, first)
+        loader.run(["KRW-BTC"], "2024-01-01", "2024-01-03", ticks=True, check=False)
+        os.remove(loader.path("candles", "KRW-BTC", pd.Timestamp("2024-01-03").date()))
+
+        api = FakeApi(candles)
+        loader = downloader(self.tmp.name, api)
+        gaps = loader.check(["KRW-BTC"], "2024-01-01", "2024-01-03", ticks=True)
+        reasons = {(gap.kind, str(gap.date), gap.reason) for gap in gaps}
+        self.assertIn(("candles", "2024-01-03", "missing"), reasons)
+        self.assertIn(("candles", "2024-01-02", "hole"), reasons)
+        self.assertIn(("ticks", "2024-01-02", "tick_mismatch"), reasons)  # 빠진 분의 체결은 남아 있음
+
+        self.assertEqual(loader.refill(gaps), len({(g.kind, g.date) for g in gaps}))
+        self.assertEqual(loader.check(["KRW-BTC"], "2024-01-01", "2024-01-03", ticks=True), [])
+        stored = loader.load("candles", "KRW-BTC", pd.Timestamp("2024-01-02").date())
+        self.assertEqual(len(stored), (candles.index.normalize() == pd.Timestamp("2024-01-02")).sum())
+
+    @unittest.skipUnless(__import__("importlib").util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_parquet_round_trip(self):
+        """parquet 파일도 get_ohlcv 형식으로 다시 읽음"""
+        api = FakeApi(minute_candles())
+        loader = HistoryDownloader(self.tmp.name, fmt="parquet", limiter=RateLimiter(1_000_000, burst=1000),
+                                   ohlcv_fn=api.get_ohlcv, log=lambda message: None, clock=lambda: NOW)
+        loader.run(["KRW-BTC"], "2024-01-01", "2024-01-01")
+        self.assertEqual(loader.load("candles", "KRW-BTC", pd.Timestamp("2024-01-01").date()).index.name,
+                         "candle_date_time_kst")
+
+    @unittest.skipIf(__import__("importlib").util.find_spec("pyarrow"), "pyarrow installed")
+    def test_cli_rejects_parquet_without_pyarrow(self):
+        """pyarrow가 없으면 마켓 조회 전에 설치 안내와 함께 종료 (기본 형식은 csv)"""
+        self.assertEqual(HistoryDownloader(self.tmp.name).fmt, "csv")
+        with self.assertRaises(SystemExit) as raised:
+            main(["--start", "2024-01-01", "--markets", "KRW-BTC", "--out", self.tmp.name, "--format", "parquet"])
+        self.assertEqual(raised.exception.code, 2)
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import asyncio
+import sys
+import os
+from contextlib import redirect_stdout
+from io import StringIO
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_bithumb.rate_limit import RateLimiter
+from bot.engine import TradingEngine
+from bot.mock_exchange import MockExchange
+from bot.strategy import StrategyConfig, TraderContext, drive, buy_order_and_wait, Call, Sleep
+
+class TestStrategyProgram(unittest.TestCase):
+    def test_buy_order_and_wait_fills(self):
+        """체결되는 매수 주문은 buy 포지션을 반환"""
+        responses = iter([
+            {"uuid": "u1"},
+            {"uuid": "u1", "state": "wait", "executed_volume": "0"},
+            {"uuid": "u1", "state": "done", "executed_volume": "1", "trades": [{"funds": "100"}]},
+        ])
+        effects = []
+
+        def handle(effect):
+            effects.append(effect)
+            if isinstance(effect, Call):
+                return next(responses)
+            return None
+
+        ctx = TraderContext("T", "KRW-XRP", 1, lambda message: None, config=StrategyConfig(max_polls=3, cooldown_seconds=0))
+        order, position = drive(buy_order_and_wait(ctx, 100, 1), handle)
+        self.assertEqual(position, "buy")
+        self.assertEqual(order["state"], "done")
+        self.assertEqual([type(e) for e in effects], [Call, Call, Sleep, Call, Sleep])
+
+    def test_errors_are_thrown_into_program(self):
+        """핸들러 예외는 상태 머신 안으로 전달되어 처리됨"""
+        def handle(effect):
+            if isinstance(effect, Call):
+                raise RuntimeError("network down")
+            return None
+
+        ctx = TraderContext("T", "KRW-XRP", 1, lambda message: None, config=StrategyConfig())
+        with self.assertRaises(RuntimeError):
+            drive(buy_order_and_wait(ctx, 100, 1), handle)
+
+class TestTradingEngine(unittest.TestCase):
+    def test_engine_drives_500_mock_markets(self):
+        """모의 거래소 500개 마켓을 하나의 이벤트 루프에서 실행"""
+        markets = [f"KRW-MOCK{i:04d}" for i in range(500)]
+        speed = 200.0
+        exchange = MockExchange(markets, speed=speed)
+        engine = TradingEngine(
+            exchange,
+            limiter=RateLimiter(1_000_000, burst=1000),
+            orderbook_fn=exchange.get_orderbook,
+            ohlcv_fn=exchange.get_ohlcv,
+            notify=lambda message, title=None: None,
+            log=lambda message: None,
+            config=StrategyConfig(max_polls=5, cooldown_seconds=1),
+            sleep_scale=1.0 / speed,
+        )
+        assets = [(f"{m}-Trader", m, 1.0) for m in markets]
+        with redirect_stdout(StringIO()):
+            asyncio.run(engine.run(assets, duration=3.0))
+
+        self.assertEqual(len(engine.traders), 500)
+        # 모든 티커가 호가를 조회했지만, 실제 호가 요청은 여러 마켓을 묶어서 훨씬 적게 발생
+        self.assertGreaterEqual(engine.stats["GetOrderbook"], 500)
+        self.assertLess(exchange.calls["get_orderbook"], engine.stats["GetOrderbook"])
+        self.assertGreater(exchange.calls["buy_limit_order"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,257 @@
+import unittest
+import sys
+import os
+import time
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_bithumb import estimate_cost, max_size_within
+from bot.strategy import (
+    Call, CheckBuy, CheckEmergency, GetOrderbook, SavePosition, Sleep, StrategyConfig, TraderContext, TraderState,
+    drive, trade_step,
+)
+
+def make_book(rng, levels=30, price=50_000_000.0, tick=1000.0):
+    return {
+        "market": "KRW-BTC",
+        "orderbook_units": [
+            {
+                "ask_price": price + (k + 1) * tick,
+                "bid_price": str(price - k * tick),  # 문자열 가격도 허용
+                "ask_size": float(rng.uniform(0, 0.5)),
+                "bid_size": float(rng.uniform(0, 0.5)),
+            }
+            for k in range(levels)
+        ],
+    }
+
+def walk_book(orderbook, side, volume):
+    """호가를 한 단계씩 따라가며 체결 (검증용)"""
+    book = "ask" if side == "bid" else "bid"
+    left, funds, filled, levels = volume, 0.0, 0.0, 0
+    for unit in orderbook["orderbook_units"]:
+        if left <= 0:
+            break
+        take = min(left, float(unit[f"{book}_size"]))
+        funds += take * float(unit[f"{book}_price"])
+        filled += take
+        left -= take
+        levels += 1
+    return filled, funds, levels
+
+class TestExecutionCost(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(11)
+        self.book = make_book(self.rng)
+
+    def test_matches_level_by_level_walk(self):
+        """수량/금액 배열을 한 번에 계산한 결과가 호가를 직접 따라간 결과와 일치"""
+        for side in ("bid", "ask"):
+            volumes = np.concatenate([self.rng.uniform(0, 5, 200), [0.0, 1e9]])
+            estimate = estimate_cost(self.book, side, volume=volumes)
+            for i, volume in enumerate(volumes):
+                filled, funds, levels = walk_book(self.book, side, volume)
+                self.assertAlmostEqual(estimate.volume[i], filled, places=9)
+                self.assertAlmostEqual(estimate.funds[i], funds, delta=1e-3)
+                if filled > 0:
+                    self.assertEqual(estimate.levels[i], levels, (side, volume))
+            self.assertFalse(estimate.complete[-1])
+            self.assertTrue(estimate.complete[:-1].all())
+            self.assertTrue((estimate.slippage[estimate.volume > 0] > -1e-12).all())
+            self.assertEqual(estimate.levels[-2], 0)
+
+            by_amount = estimate_cost(self.book, side, amount=estimate.funds[:-1])
+            np.testing.assert_allclose(by_amount.volume, estimate.volume[:-1], rtol=1e-9, atol=1e-12)
+
+        single = estimate_cost(self.book, "ask", volume=0.1)
+        self.assertIsInstance(single.average_price, float)
+        self.assertEqual(single.reference_price, 50_000_000.0)
+        self.assertAlmostEqual(single.cost, single.slippage * single.reference_price * single.volume, places=3)
+
+    def test_max_size_within_slippage_budget(self):
+        """예산 안 최대 수량은 평균 슬리피지가 예산과 같고, 조금 더 크면 예산 초과"""
+        budgets = np.array([0.0, 0.00003, 0.0001, 0.0002, 1.0])
+        for side in ("bid", "ask"):
+            volumes = max_size_within(self.book, side, budgets)
+            self.assertTrue(np.all(np.diff(volumes) >= 0))
+            slippage = estimate_cost(self.book, side, volume=volumes).slippage
+            self.assertTrue(np.all(slippage <= budgets + 1e-12))
+            for budget, volume in zip(budgets[1:4], volumes[1:4]):
+                self.assertAlmostEqual(estimate_cost(self.book, side, volume=volume).slippage, budget, places=9)
+                self.assertGreater(estimate_cost(self.book, side, volume=volume * 1.001).slippage, budget)
+            # 예산이 충분하면 보이는 호가 전체
+            self.assertAlmostEqual(volumes[-1], estimate_cost(self.book, side, volume=1e9).volume)
+        amount = max_size_within(self.book, "bid", 0.0001, amount=True)
+        self.assertAlmostEqual(amount, estimate_cost(self.book, "bid", volume=max_size_within(self.book, "bid", 0.0001)).funds)
+        self.assertEqual(max_size_within({"orderbook_units": []}, "ask", 0.01), 0.0)
+
+        started = time.perf_counter()
+        for _ in range(1000):
+            estimate_cost(self.book, "ask", volume=1.0)
+            max_size_within(self.book, "ask", 0.002)
+        self.assertLess((time.perf_counter() - started) / 1000, 0.002)  # 판단마다 호출 가능한 비용
+
+    def test_emergency_sell_respects_slippage_budget(self):
+        """max_slippage 설정 시 긴급 시장가 매도를 예산 안의 수량으로 나누어 실행"""
+        book = {"orderbook_units": [{"bid_price": 100.0 - k, "bid_size": 1.0, "ask_price": 101.0 + k, "ask_size": 1.0}
+                                    for k in range(10)]}
+        sold, saved = [], []
+
+        def handle(effect):
+            if isinstance(effect, CheckEmergency):
+                return True
+            if isinstance(effect, GetOrderbook):
+                return book
+            if isinstance(effect, (Sleep, SavePosition)):
+                saved.append(effect)
+                return None
+            if isinstance(effect, Call) and effect.method == "sell_market_order":
+                sold.append(effect.args[1])
+                return {"uuid": f"s{len(sold)}"}
+            if isinstance(effect, Call) and effect.method == "get_order":
+                volume = sold[-1]
+                return {"uuid": f"s{len(sold)}", "executed_volume": str(volume),
+                        "trades": [{"funds": str(volume * 99.5)}]}
+            return None
+
+        state = TraderState("buy", 100.0, 5.0)
+        config = StrategyConfig(cooldown_seconds=0, max_slippage=0.01)
+        ctx = TraderContext("T", "KRW-XRP", 5.0, lambda message: None, config=config, state=state)
+        drive(trade_step(ctx), handle)
+        # 평균 슬리피지 1%: 100, 99, 98에서 3개 (평균 99)
+        self.assertEqual(sold, [3.0])
+        self.assertEqual(state.current_position, "buy")
+        self.assertAlmostEqual(state.last_buy_volume, 2.0)
+        self.assertEqual([e.event for e in saved if isinstance(e, SavePosition)], ["emergency_sell_partial"])
+
+        drive(trade_step(ctx), handle)
+        self.assertEqual(sold, [3.0, 2.0])
+        self.assertIsNone(state.current_position)
+
+        # 설정하지 않으면 호가 조회 없이 전량 매도
+        sold.clear()
+        ctx = TraderContext("T", "KRW-XRP", 5.0, lambda message: None, config=StrategyConfig(cooldown_seconds=0),
+                            state=TraderState("buy", 100.0, 5.0))
+        drive(trade_step(ctx), handle)
+        self.assertEqual(sold, [5.0])
+
+    def thin_book_exchange(self, emergency_after=0, fill_ratio=1.0):
+        """호가 단계마다 1개씩만 있는 얇은 호가와, 시장가 주문이 fill_ratio만큼만 체결된 상태로 조회되는 거래소"""
+        book = {"orderbook_units": [{"bid_price": 100.0 - k, "bid_size": 1.0, "ask_price": 101.0 + k, "ask_size": 1.0}
+                                    for k in range(10)]}
+        exchange = {"sold": [], "events": [], "checks": 0}
+
+        def handle(effect):
+            if isinstance(effect, CheckEmergency):
+                exchange["checks"] += 1
+                return exchange["checks"] > emergency_after
+            if isinstance(effect, GetOrderbook):
+                return book
+            if isinstance(effect, SavePosition):
+                exchange["events"].append(effect.event)
+                return None
+            if not isinstance(effect, Call):  # Sleep, Notify
+                return None
+            if effect.method == "sell_limit_order":
+                return {"uuid": "limit"}
+            if effect.method == "cancel_order":
+                return {"uuid": "limit", "state": "cancel"}
+            if effect.method == "sell_market_order":
+                exchange["sold"].append(effect.args[1])
+                return {"uuid": f"m{len(exchange['sold'])}"}
+            if effect.method == "get_order" and effect.args[0] == "limit":
+                return {"uuid": "limit", "state": "wait", "executed_volume": "0", "remaining_volume": "5"}
+            if effect.method == "get_order":
+                volume = exchange["sold"][-1] * fill_ratio
+                return {"uuid": effect.args[0], "state": "wait" if fill_ratio < 1 else "done",
+                        "executed_volume": str(volume), "trades": [{"funds": str(volume * 99.5)}]}
+            return None
+
+        return exchange, handle
+
+    def test_partial_emergency_sell_uses_ordered_volume(self):
+        """조회 시점에 시장가 주문이 일부만 체결되었어도 남은 포지션은 주문 수량 기준"""
+        exchange, handle = self.thin_book_exchange(fill_ratio=1 / 3)
+        state = TraderState("buy", 100.0, 5.0)
+        ctx = TraderContext("T", "KRW-XRP", 5.0, lambda message: None,
+                            config=StrategyConfig(cooldown_seconds=0, max_slippage=0.01), state=state)
+        drive(trade_step(ctx), handle)
+        self.assertEqual(exchange["sold"], [3.0])
+        self.assertEqual(state.current_position, "buy")
+        self.assertAlmostEqual(state.last_buy_volume, 2.0)  # executed_volume(1.0) 기준이면 4.0
+        self.assertEqual(exchange["events"], ["emergency_sell_partial"])
+
+    def test_emergency_while_waiting_for_sell_respects_slippage_budget(self):
+        """매도 대기 중 긴급 매도도 호가를 조회해 예산 안의 수량만 시장가 매도"""
+        exchange, handle = self.thin_book_exchange(emergency_after=1)  # 첫 확인(trade_step)은 통과, 대기 중 발생
+        state = TraderState("buy", 90.0, 5.0)
+        ctx = TraderContext("T", "KRW-XRP", 5.0, lambda message: None,
+                            config=StrategyConfig(cooldown_seconds=0, max_slippage=0.01), state=state)
+        drive(trade_step(ctx), handle)
+        self.assertEqual(exchange["sold"], [3.0])
+        self.assertEqual(state.current_position, "buy")
+        self.assertAlmostEqual(state.last_buy_volume, 2.0)
+        self.assertEqual(exchange["events"], ["emergency_sell_partial"])
+
+        # 다음 루프: 남은 수량은 예산 안이므로 전량 매도 후 포지션 초기화
+        exchange["checks"] = 0
+        drive(trade_step(ctx), handle)
+        self.assertEqual(exchange["sold"], [3.0, 2.0])
+        self.assertIsNone(state.current_position)
+        self.assertEqual(exchange["events"], ["emergency_sell_partial", "emergency_sell"])
+
+    def test_partial_buy_fill_keeps_remainder_after_capped_emergency_sell(self):
+        """부분 체결된 매수분을 매도하던 중 긴급 매도가 일부만 실행되면 남은 수량을 매수 포지션으로 기록"""
+        thin = {"orderbook_units": [{"bid_price": 100.0 - k, "bid_size": 1.0, "ask_price": 101.0 + k, "ask_size": 1.0}
+                                    for k in range(10)]}
+        exchange = {"now": 0.0, "placed": False, "sold": [], "events": []}
+
+        def handle(effect):
+            if isinstance(effect, Sleep):
+                exchange["now"] += effect.seconds
+                return exchange["now"]
+            if isinstance(effect, (CheckBuy, CheckEmergency)):
+                return True
+            if isinstance(effect, GetOrderbook):
+                # 매수 주문 전에는 최우선 매수호가 101, 이후에는 100으로 내려감
+                return thin if exchange["placed"] else {"orderbook_units": [{"bid_price": 101.0, "ask_price": 102.0}]}
+            if isinstance(effect, SavePosition):
+                exchange["events"].append(effect)
+                return None
+            if not isinstance(effect, Call):  # Notify
+                return None
+            if effect.method == "buy_limit_order":
+                exchange["placed"] = True
+                return {"uuid": "buy"}
+            if effect.method == "get_order" and effect.args[0] == "buy":
+                return {"uuid": "buy", "state": "wait", "price": "101", "executed_volume": "5", "remaining_volume": "3",
+                        "trades": [{"funds": "505"}]}
+            if effect.method == "sell_limit_order":
+                return {"uuid": "limit"}
+            if effect.method == "get_order" and effect.args[0] == "limit":
+                return {"uuid": "limit", "state": "wait", "executed_volume": "0", "remaining_volume": "5"}
+            if effect.method == "sell_market_order":
+                exchange["sold"].append(effect.args[1])
+                return {"uuid": "market"}
+            if effect.method == "get_order":
+                volume = exchange["sold"][-1]
+                return {"uuid": "market", "state": "done", "executed_volume": str(volume),
+                        "trades": [{"funds": str(volume * 99.0)}]}
+            return {"state": "cancel"}  # cancel_order
+
+        state = TraderState()
+        config = StrategyConfig(max_polls=2, cooldown_seconds=0, max_slippage=0.01)
+        ctx = TraderContext("T", "KRW-XRP", 8.0, lambda message: None, config=config, state=state)
+        drive(trade_step(ctx), handle)
+        self.assertEqual(exchange["sold"], [3.0])  # 체결된 5개 중 예산 안의 3개만 시장가 매도
+        self.assertEqual(state.current_position, "buy")
+        self.assertAlmostEqual(state.last_buy_volume, 2.0)
+        self.assertAlmostEqual(state.last_buy_price, 101.0)
+        saved = exchange["events"]
+        self.assertEqual([e.event for e in saved], ["emergency_sell_partial"])
+        self.assertEqual((saved[0].position, saved[0].last_buy_price, saved[0].last_buy_volume), ("buy", 101.0, 2.0))
+
+if __name__ == '__main__':
+    unittest.main()
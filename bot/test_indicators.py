@@ -0,0 +1,158 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.bot import calculate_percentile
+from bot.candle_buffer import CandleBuffer
+from bot.indicators import (
+    ATR, EMA, RSI, SMA, VWAP, BollingerBands, IndicatorBook, IndicatorSet, Quantile,
+    atr, benchmark, bollinger, default_indicators, ema, rolling_percentile, rsi, sma, synthetic_candles, vwap,
+)
+
+def wilder_reference(values, period):
+    out, avg = [], None
+    for i, value in enumerate(values):
+        avg = value if avg is None else avg + (value - avg) / period
+        out.append(avg if i >= period - 1 else np.nan)
+    return np.array(out)
+
+class TestBatchIndicators(unittest.TestCase):
+    def setUp(self):
+        self.df = synthetic_candles(600, seed=1)
+        self.close = self.df["close"].to_numpy()
+
+    def test_matches_reference_definitions(self):
+        """배치 지표가 정의대로 직접 계산한 값과 일치"""
+        close, n = self.close, len(self.close)
+        expected_sma = [np.nan] * 19 + [close[i - 19:i + 1].mean() for i in range(19, n)]
+        np.testing.assert_allclose(sma(close, 20), expected_sma, rtol=1e-12)
+
+        bands = bollinger(self.df["close"], 20, 2.0)
+        std = np.array([np.nan] * 19 + [close[i - 19:i + 1].std() for i in range(19, n)])
+        np.testing.assert_allclose(bands["upper"] - bands["mid"], 2 * std, rtol=1e-6)
+
+        alpha, value, expected_ema = 2 / 21, close[0], []
+        for i, x in enumerate(close):
+            value = value + alpha * (x - value) if i else x
+            expected_ema.append(value if i >= 19 else np.nan)
+        np.testing.assert_allclose(ema(close, 20), expected_ema, rtol=1e-12)
+
+        diff = np.diff(close)
+        gain = wilder_reference(np.maximum(diff, 0), 14)
+        loss = wilder_reference(np.maximum(-diff, 0), 14)
+        np.testing.assert_allclose(rsi(close, 14)[1:], 100 - 100 / (1 + gain / loss), rtol=1e-9)
+
+        high, low = self.df["high"].to_numpy(), self.df["low"].to_numpy()
+        prev = np.concatenate([[close[0]], close[:-1]])
+        true_range = np.maximum(high - low, np.maximum(abs(high - prev), abs(low - prev)))
+        np.testing.assert_allclose(atr(self.df, 14), wilder_reference(true_range, 14), rtol=1e-9)
+
+        for p in (0, 50, 70, 100):
+            expected = [np.nan] * 23 + [calculate_percentile(pd.DataFrame({"close": close[i - 23:i + 1]}), p)
+                                        for i in range(23, n)]
+            np.testing.assert_array_equal(rolling_percentile(close, 24, p), expected)
+
+    def test_vwap_and_series_output(self):
+        """VWAP(누적/일별/롤링)과 Series 입력 시 인덱스 유지"""
+        df = synthetic_candles(3000, seed=2)  # 이틀 이상
+        typical = (df["high"] + df["low"] + df["close"]) / 3
+        value = typical * df["volume"]
+        days = df.index.normalize()
+        expected = value.groupby(days).cumsum() / df["volume"].groupby(days).cumsum()
+        result = vwap(df, daily=True)
+        self.assertIsInstance(result, pd.Series)
+        self.assertTrue(result.index.equals(df.index))
+        np.testing.assert_allclose(result, expected, rtol=1e-12)
+        first_of_day2 = df.index.get_loc(pd.Timestamp("2025-01-02"))
+        self.assertAlmostEqual(result.iloc[first_of_day2], typical.iloc[first_of_day2])
+        np.testing.assert_allclose(vwap(df, period=30), value.rolling(30).sum() / df["volume"].rolling(30).sum(),
+                                   rtol=1e-9)
+        self.assertIsInstance(sma(df["close"].to_numpy(), 5), np.ndarray)
+
+class TestStreamingIndicators(unittest.TestCase):
+    def test_streaming_matches_batch(self):
+        """스트리밍 갱신 결과가 매 캔들마다 배치 계산과 일치 (억 원대 가격, 재동기화 포함)"""
+        df = synthetic_candles(3000, seed=3)
+        indicators = default_indicators()
+        indicators["vwap30"] = VWAP(period=30)
+        indicators["ema1"] = EMA(1)
+        indicator_set = IndicatorSet(indicators)
+        expected = indicator_set.batch(df)
+        streamed = []
+        for end in range(1, len(df) + 1):
+            if end == 1:
+                indicator_set.seed(df.iloc[:1])
+            else:
+                self.assertTrue(indicator_set.update(df.iloc[end - 2:end]))
+            values = indicator_set.values()
+            bands = values.pop("bb20")
+            values.update({"bb20_mid": bands.mid, "bb20_upper": bands.upper, "bb20_lower": bands.lower})
+            streamed.append(values)
+        streamed = pd.DataFrame(streamed, index=df.index)[expected.columns]
+        pd.testing.assert_frame_equal(streamed, expected, check_exact=False, rtol=1e-9)
+        self.assertEqual(expected["rsi14"].isna().sum(), 14)
+        self.assertEqual(expected["atr14"].isna().sum(), 13)
+
+    def test_in_progress_candle_revisions_follow_candle_buffer(self):
+        """진행 중 캔들을 여러 번 고쳐도 최종 캔들로 계산한 값과 동일"""
+        df = synthetic_candles(400, seed=4)
+        rng = np.random.default_rng(4)
+        buffer = CandleBuffer("KRW-BTC", "minute1", 50)
+        book = IndicatorBook(default_indicators)
+        buffer.seed(df.iloc[:60])
+        book.sync(buffer)
+        for end in range(61, len(df) + 1):
+            for _ in range(2):  # 진행 중 캔들의 중간 값
+                partial = df.iloc[end - 2:end].copy()
+                partial.iloc[-1, partial.columns.get_loc("close")] *= 1 + rng.normal(0, 0.002)
+                partial.iloc[-1, partial.columns.get_loc("volume")] *= rng.uniform(0, 1)
+                self.assertTrue(buffer.update(partial))
+                book.sync(buffer)
+            self.assertTrue(buffer.update(df.iloc[end - 2:end]))
+            values = book.sync(buffer)
+        # 시드(버퍼 50개) 이후 모든 캔들을 반영한 값 = 같은 구간의 배치 계산 마지막 값
+        expected = IndicatorSet(default_indicators()).batch(df.iloc[10:]).iloc[-1]
+        for name in ("sma20", "ema20", "rsi14", "atr14", "vwap", "p70"):
+            self.assertAlmostEqual(values[name], expected[name], delta=abs(expected[name]) * 1e-9, msg=name)
+        self.assertAlmostEqual(values["bb20"].upper, expected["bb20_upper"], delta=expected["bb20_upper"] * 1e-9)
+
+        # 겹치지 않는 갱신은 거부 후 버퍼 전체로 다시 채움
+        indicators = book.get("KRW-BTC", "minute1")
+        self.assertFalse(indicators.update(synthetic_candles(2, start="2030-01-01")))
+        reseeded = synthetic_candles(30, start="2030-01-01")
+        buffer.seed(reseeded)
+        self.assertAlmostEqual(book.sync(buffer)["sma20"], reseeded["close"].iloc[-20:].mean(), delta=1e-3)
+        self.assertEqual(indicators.indicators["sma20"].count, 30)
+
+        ema_indicator = EMA(3)
+        for price in (1.0, 2.0, 3.0):
+            ema_indicator.update(price)
+        ema_indicator.update(9.0, new=False)
+        self.assertEqual(ema_indicator.value, EMA(3).seed(pd.DataFrame({"close": [1.0, 2.0, 9.0]})))
+
+    def test_benchmark_measures_every_indicator(self):
+        """benchmark는 모든 기본 지표를 배치/스트리밍으로 캔들 수만큼 계산 (시간은 검사하지 않음)"""
+        indicators = default_indicators()
+        results = benchmark(1_000, indicators, log=None)
+        self.assertEqual(set(results), set(indicators))
+        for name, indicator in indicators.items():
+            self.assertEqual(indicator.count, 1_000, name)
+            self.assertTrue(all(rate > 0 for rate in results[name]), name)
+        for indicator in (SMA(5), EMA(5), RSI(5), ATR(5), BollingerBands(5), VWAP(), Quantile(5, 50)):
+            self.assertFalse(indicator.ready)
+
+    @unittest.skipUnless(os.getenv("RUN_BENCHMARKS"), "RUN_BENCHMARKS not set")
+    def test_throughput(self):
+        """배치는 10만 캔들을 1초 안에, 스트리밍은 캔들당 수십 마이크로초 이내로 계산 (실행 환경에 따라 다름)"""
+        results = benchmark(100_000, log=None)
+        for name, (batch_rate, stream_rate) in results.items():
+            self.assertGreater(batch_rate, 100_000, name)
+            self.assertGreater(stream_rate, 20_000, name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.bot import make_effect_handler, restore_position
+from bot.journal import PositionJournal
+from bot.strategy import StrategyConfig, TraderContext, TraderState, drive, trade_step
+
+class TestPositionJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "positions.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_restores_latest_state_after_reopen(self):
+        journal = PositionJournal(self.path, compact_every=3)
+        journal.record("KRW-XRP", "buy_filled", "buy", 800.0, 10.0, "u1", 800.0, 10.0)
+        journal.record("KRW-BTC", "buy_filled", "buy", 9e7, 0.001)
+        journal.record("KRW-XRP", "sell_filled", "sell", 800.0, 10.0, "u2", 801.0, 10.0)  # 체크포인트
+        journal.record("KRW-BTC", "emergency_sell", None)
+        # close() 없이 버림 (비정상 종료)
+        del journal
+
+        reopened = PositionJournal(self.path)
+        states = reopened.restore_all()
+        self.assertEqual(states["KRW-XRP"].current_position, "sell")
+        self.assertEqual(states["KRW-XRP"].last_buy_price, 800.0)
+        self.assertIsNone(states["KRW-BTC"].current_position)
+        self.assertEqual(reopened.restore("KRW-BTC").current_position, None)
+        self.assertIsNone(reopened.restore("KRW-ETH"))
+        self.assertEqual([e["event"] for e in reopened.events("KRW-XRP")], ["sell_filled", "buy_filled"])
+        reopened.close()
+
+    def test_compaction_bounds_events_and_restore_is_fast(self):
+        journal = PositionJournal(self.path, compact_every=1000, keep_events=500)
+        tickers = [f"KRW-T{i:03d}" for i in range(200)]
+        for i in range(20_000):
+            journal.record(tickers[i % 200], "buy_filled", "buy", float(i), 1.0)
+        self.assertLessEqual(len(journal.events(limit=10_000)), 1500)
+        journal.close()
+
+        reopened = PositionJournal(self.path)
+        started = time.perf_counter()
+        states = reopened.restore_all()
+        elapsed = time.perf_counter() - started
+        self.assertEqual(len(states), 200)
+        self.assertEqual(states["KRW-T199"].last_buy_price, 19_999.0)
+        self.assertLess(elapsed, 0.05)
+        reopened.close()
+
+    def test_trade_step_records_buy_fill_and_restart_resumes_selling(self):
+        """매수 체결 후 재시작하면 다시 매수하지 않고 매도부터 시도"""
+        journal = PositionJournal(self.path)
+
+        class Exchange:
+            def __init__(self):
+                self.calls = []
+
+            def buy_limit_order(self, ticker, price, volume):
+                self.calls.append("buy")
+                return {"uuid": "b1"}
+
+            def get_order(self, uuid):
+                return {"uuid": uuid, "state": "done", "executed_volume": "2", "price": "100",
+                        "trades": [{"funds": "200"}]}
+
+        exchange = Exchange()
+        handle = make_effect_handler(exchange, journal=journal)
+        config = StrategyConfig(cooldown_seconds=0)
+        ctx = TraderContext("T", "KRW-XRP", 2, lambda message: None, config=config)
+
+        def handler(effect):
+            name = type(effect).__name__
+            if name == "GetOrderbook":
+                return {"orderbook_units": [{"bid_price": 100, "ask_price": 101}]}
+            if name == "CheckBuy":
+                return True
+            if name == "Sleep":
+                return None
+            return handle(effect)
+
+        drive(trade_step(ctx, 0), handler)
+        self.assertEqual(ctx.state.current_position, "buy")
+        journal.close()
+
+        restarted = TraderContext("T", "KRW-XRP", 2, lambda message: None, config=config, state=TraderState())
+        self.assertTrue(restore_position(restarted, PositionJournal(self.path)))
+        self.assertEqual(restarted.state.current_position, "buy")
+        self.assertEqual(restarted.state.last_buy_price, 100.0)
+        self.assertEqual(restarted.state.last_buy_volume, 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+import io
+import json
+import tempfile
+import time
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.logger import ERROR, StructuredLogger, leveled
+
+class Explosive:
+    """포맷되면 실패하는 인자 (레벨 미만 로그가 포맷되지 않는지 확인용)"""
+    def __str__(self):
+        raise AssertionError("formatted a disabled log record")
+
+class TestStructuredLogger(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "logs", "bot.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_lines(self, path):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_writes_console_and_json_lines_with_lazy_format(self):
+        stream = io.StringIO()
+        logger = StructuredLogger("INFO", path=self.path, stream=stream)
+        logger.debug("hidden %s", Explosive())
+        logger.info("Orderbook Bid Price: %.2f", 1234567.891, ticker="KRW-BTC")
+        logger.warning("literal 100% without args")
+        logger.close()
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertRegex(lines[0], r"^\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] Orderbook Bid Price: 1234567.89$")
+        entries = self.read_lines(self.path)
+        self.assertEqual(entries[0]["msg"], "Orderbook Bid Price: 1234567.89")
+        self.assertEqual(entries[0]["ticker"], "KRW-BTC")
+        self.assertEqual(entries[0]["level"], "INFO")
+        self.assertEqual(entries[1]["msg"], "literal 100% without args")
+        self.assertEqual(entries[1]["level"], "WARNING")
+
+    def test_rotates_by_size_and_keeps_backups(self):
+        logger = StructuredLogger("DEBUG", path=self.path, console=False, max_bytes=500, backup_count=2)
+        for i in range(100):
+            logger.debug("line %d", i)
+        self.assertTrue(logger.flush())
+        logger.close()
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        self.assertTrue(os.path.exists(self.path + ".2"))
+        self.assertFalse(os.path.exists(self.path + ".3"))
+        self.assertEqual(self.read_lines(self.path)[-1]["msg"], "line 99")
+
+    def test_rotates_by_time(self):
+        logger = StructuredLogger("INFO", path=self.path, console=False, rotate_seconds=0.05)
+        logger.info("first")
+        logger.flush()
+        time.sleep(0.1)
+        logger.info("second")
+        logger.close()
+        self.assertEqual([e["msg"] for e in self.read_lines(self.path + ".1")], ["first"])
+        self.assertEqual([e["msg"] for e in self.read_lines(self.path)], ["second"])
+
+    def test_leveled_wraps_single_message_callbacks(self):
+        """메시지 하나만 받는 함수는 포맷한 문자열로 호출하고, 레벨을 받는 함수는 그대로 사용"""
+        lines = []
+        log = leveled(lambda message: lines.append(message))
+        log("sold %.2f %s", 1.5, "KRW-XRP", level=ERROR, ticker="KRW-XRP")
+        log("plain 100%")
+        self.assertEqual(lines, ["sold 1.50 KRW-XRP", "plain 100%"])
+        logger = StructuredLogger("INFO", console=False)
+        self.assertEqual(leveled(logger.info), logger.info)
+        logger.close()
+
+if __name__ == '__main__':
+    unittest.main()
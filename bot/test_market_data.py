@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import time
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.market_data import MarketDataHub, MarketSnapshot, Stamped
+from bot.mock_exchange import MockExchange
+
+class TestMarketDataHub(unittest.TestCase):
+    def setUp(self):
+        self.markets = [f"KRW-MOCK{i:02d}" for i in range(120)]
+        self.exchange = MockExchange(self.markets)
+        self.hub = MarketDataHub(self.markets, orderbook_fn=self.exchange.get_orderbook,
+                                 ohlcv_fn=self.exchange.get_ohlcv, chunk_size=50)
+
+    def test_orderbooks_fetched_with_multi_market_calls(self):
+        """120개 마켓 호가를 50개씩 묶어 3번의 요청으로 조회"""
+        self.hub.refresh_orderbooks()
+        self.assertEqual(self.exchange.calls["get_orderbook"], 3)
+        for market in self.markets:
+            self.assertEqual(self.hub.get_orderbook(market)["market"], market)
+
+    def test_candles_refreshed_only_when_due(self):
+        """갱신 주기가 지나지 않은 캔들은 다시 조회하지 않음"""
+        self.hub.refresh_candles()
+        first = self.exchange.calls["get_ohlcv"]
+        self.assertEqual(first, len(self.markets) * 2)
+        self.hub.refresh_candles()
+        self.assertEqual(self.exchange.calls["get_ohlcv"], first)
+        df = self.hub.fetch_candles(self.markets[0], interval="minute1", count=5)
+        self.assertEqual(len(df), 5)
+        self.assertIsNone(self.hub.fetch_candles(self.markets[0], interval="minute1", count=50))
+
+    def test_candle_buffers_fetch_only_latest_after_seed(self):
+        """처음 한 번만 전체 캔들을 받고 이후에는 최근 2개만 조회"""
+        requested = []
+
+        def ohlcv(ticker, interval="day", count=200):
+            requested.append(count)
+            return self.exchange.get_ohlcv(ticker, interval=interval, count=count)
+
+        hub = MarketDataHub(self.markets[:1], candle_specs=[("minute60", 24)], orderbook_fn=self.exchange.get_orderbook,
+                            ohlcv_fn=ohlcv)
+        hub.refresh_candles()
+        hub.refresh_candles(force=True)
+        self.assertEqual(requested, [24, 2])
+        self.assertEqual(len(hub.fetch_candles(self.markets[0], interval="minute60", count=24)), 24)
+
+    def test_snapshot_is_immutable_and_stale_data_rejected(self):
+        """스냅샷은 수정 불가이며 max_age보다 오래된 데이터는 None"""
+        snapshot = MarketSnapshot({"KRW-A": Stamped({"market": "KRW-A"}, time.time() - 10)})
+        with self.assertRaises(AttributeError):
+            snapshot.created_at = 0
+        with self.assertRaises(TypeError):
+            snapshot.orderbooks["KRW-B"] = None
+        self.assertIsNotNone(snapshot.orderbook("KRW-A"))
+        self.assertIsNone(snapshot.orderbook("KRW-A", max_age=5))
+
+    def test_publishing_does_not_change_old_snapshot(self):
+        """새 스냅샷 발행 후에도 이전에 읽은 스냅샷은 그대로 유지"""
+        self.hub.refresh_orderbooks()
+        old = self.hub.snapshot
+        self.hub.set_tickers(self.markets[:10])
+        self.hub.refresh_orderbooks()
+        self.assertEqual(len(old.orderbooks), len(self.markets))
+        self.assertEqual(len(self.hub.snapshot.orderbooks), 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.notifier import DiscordNotifier
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("no body")
+        return self._body
+
+class FakeSession:
+    """웹훅 요청을 기록하고 정해진 응답을 차례로 돌려주는 세션"""
+    def __init__(self, responses=None, delay=0.0):
+        self.responses = list(responses or [])
+        self.delay = delay
+        self.payloads = []
+        self.times = []
+
+    def post(self, url, json=None, timeout=None):
+        time.sleep(self.delay)
+        self.payloads.append(json)
+        self.times.append(time.monotonic())
+        return self.responses.pop(0) if self.responses else FakeResponse(204)
+
+class TestDiscordNotifier(unittest.TestCase):
+    def test_notify_does_not_block_on_slow_webhook(self):
+        session = FakeSession(delay=0.5)
+        notifier = DiscordNotifier("https://example.invalid/webhook", batch_delay=0.0, session=session, log=lambda m: None)
+        started = time.monotonic()
+        for i in range(50):
+            notifier.notify(f"message {i}", f"Alert {i}")
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertTrue(notifier.close(timeout=10))
+        self.assertEqual(notifier.sent, 50)
+        self.assertTrue(all(len(payload["embeds"]) <= 10 for payload in session.payloads))
+
+    def test_batches_and_coalesces_repeated_alerts(self):
+        """같은 제목의 미전송 알림은 최신 내용 하나로 합치고 반복 횟수를 표시"""
+        session = FakeSession()
+        notifier = DiscordNotifier("https://example.invalid/webhook", batch_delay=5.0, session=session, log=lambda m: None)
+        for i in range(3):
+            notifier.notify(f"drop {i}", "🚨 Emergency Sell Alert: KRW-XRP")
+        notifier.notify("filled", "Order filled: KRW-BTC")
+        self.assertEqual(notifier.pending(), 2)
+        self.assertTrue(notifier.flush(timeout=5))
+        self.assertEqual(len(session.payloads), 1)
+        embeds = session.payloads[0]["embeds"]
+        self.assertEqual([e["description"] for e in embeds], ["drop 2", "filled"])
+        self.assertEqual(embeds[0]["footer"]["text"], "Repeated 3 times")
+        self.assertEqual(notifier.coalesced, 2)
+        notifier.close()
+
+    def test_waits_retry_after_on_429(self):
+        session = FakeSession([FakeResponse(429, body={"retry_after": 0.3})])
+        notifier = DiscordNotifier("https://example.invalid/webhook", batch_delay=0.0, session=session, log=lambda m: None)
+        notifier.notify("hello")
+        self.assertTrue(notifier.close(timeout=5))
+        self.assertEqual(len(session.payloads), 2)
+        self.assertGreaterEqual(session.times[1] - session.times[0], 0.3)
+        self.assertEqual(notifier.sent, 1)
+
+    def test_gives_up_after_repeated_429_with_capped_retry_after(self):
+        """429가 계속되면 max_retries번까지만 재시도하고, 긴 retry_after도 max_retry_after까지만 대기"""
+        session = FakeSession([FakeResponse(429, body={"retry_after": 3600})] * 10)
+        errors = []
+        notifier = DiscordNotifier("https://example.invalid/webhook", batch_delay=0.0, max_retries=2,
+                                   max_retry_after=0.05, session=session, log=lambda m: errors.append(m))
+        started = time.monotonic()
+        notifier.notify("hello")
+        self.assertTrue(notifier.close(timeout=5))
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(len(session.payloads), 3)
+        self.assertEqual((notifier.sent, notifier.failed), (0, 1))
+        self.assertEqual(errors, ["Failed to send Discord notification. Status code: 429"])
+
+    def test_bounded_queue_drops_oldest(self):
+        gate = threading.Event()
+        session = FakeSession()
+        session.post = lambda url, json=None, timeout=None: (gate.wait(), FakeResponse(204))[1]
+        notifier = DiscordNotifier("https://example.invalid/webhook", max_pending=3, batch_delay=60.0,
+                                   session=session, log=lambda m: None)
+        for i in range(5):
+            notifier.notify(str(i), f"Alert {i}")
+        self.assertEqual(notifier.pending(), 3)
+        self.assertEqual(notifier.dropped, 2)
+        gate.set()
+        self.assertTrue(notifier.close(timeout=5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import sys
+import os
+import time
+from decimal import Decimal
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_bithumb import Bithumb, OrderValidationError, get_tick_size, round_price
+from python_bithumb.order_rules import OrderChanceCache, validate_limit_order
+
+def make_chance(bid_balance="1000000", ask_balance="10", bid_fee="0.0025", min_total="5000", max_total="1000000000",
+                price_unit=None):
+    side = {"min_total": min_total}
+    if price_unit is not None:
+        side["price_unit"] = price_unit
+    return {
+        "bid_fee": bid_fee,
+        "ask_fee": "0.0025",
+        "market": {"id": "KRW-BTC", "state": "active", "order_sides": ["ask", "bid"],
+                   "bid": dict(side), "ask": dict(side), "max_total": max_total},
+        "bid_account": {"currency": "KRW", "balance": bid_balance},
+        "ask_account": {"currency": "BTC", "balance": ask_balance},
+    }
+
+class FakeChanceClient(Bithumb):
+    """주문 가능 정보 조회와 주문 전송만 흉내 내는 클라이언트"""
+
+    def __init__(self, chances, chance_ttl=60.0):
+        super().__init__("access", "secret", validate_orders=True, chance_ttl=chance_ttl)
+        self.chances = list(chances)
+        self.fetches = 0
+        self.sent = []
+
+    def get_order_chance(self, market):
+        chance = self.chances[min(self.fetches, len(self.chances) - 1)]
+        self.fetches += 1
+        return chance
+
+    def _request(self, method, endpoint, params=None, data=None):
+        self.sent.append(data)
+        return {"uuid": f"o{len(self.sent)}"}
+
+class TestOrderRules(unittest.TestCase):
+    def test_tick_rounding_at_table_boundaries(self):
+        """호가 단위 경계에서 매수는 내림, 매도는 올림"""
+        self.assertEqual(get_tick_size("999.99"), Decimal("0.1"))
+        self.assertEqual(get_tick_size("1000"), Decimal("1"))
+        self.assertEqual(get_tick_size("999999"), Decimal("500"))
+        self.assertEqual(get_tick_size("1000000"), Decimal("1000"))
+        cases = [
+            ("999.99", "999.9", "1000.0"),
+            ("1000.5", "1000", "1001"),
+            ("4999.5", "4999", "5000"),
+            ("5003", "5000", "5005"),
+            ("999999", "999500", "1000000"),
+            ("1000000", "1000000", "1000000"),
+        ]
+        for price, bid, ask in cases:
+            self.assertEqual(round_price(price, "bid"), Decimal(bid), price)
+            self.assertEqual(round_price(price, "ask"), Decimal(ask), price)
+
+    def test_price_unit_overrides_table_and_total_limits(self):
+        """price_unit이 있으면 표보다 우선하고, 최소/최대 주문금액을 벗어나면 거절"""
+        chance = make_chance(price_unit="25")
+        self.assertEqual(validate_limit_order(chance, "KRW-BTC", "bid", "1049", "10")[0], Decimal("1025"))
+        self.assertEqual(validate_limit_order(chance, "KRW-BTC", "ask", "1001", "10")[0], Decimal("1025"))
+
+        with self.assertRaises(OrderValidationError) as raised:
+            validate_limit_order(make_chance(), "KRW-BTC", "ask", "4999", "1")
+        self.assertEqual(raised.exception.reason, "min_total")
+        with self.assertRaises(OrderValidationError) as raised:
+            validate_limit_order(make_chance(max_total="100000", ask_balance="100"), "KRW-BTC", "ask", "50000", "3")
+        self.assertEqual(raised.exception.reason, "max_total")
+        self.assertEqual(raised.exception.market, "KRW-BTC")
+
+    def test_bid_balance_includes_fee(self):
+        """매수는 수수료를 포함한 금액으로 잔고를 확인"""
+        chance = make_chance(bid_balance="100250")
+        price, volume = validate_limit_order(chance, "KRW-BTC", "bid", "100000", "1")
+        self.assertEqual((price, volume), (Decimal("100000"), Decimal("1")))
+        with self.assertRaises(OrderValidationError) as raised:
+            validate_limit_order(make_chance(bid_balance="100249"), "KRW-BTC", "bid", "100000", "1")
+        self.assertEqual(raised.exception.reason, "insufficient_balance")
+
+    def test_refresh_and_retry_after_insufficient_balance(self):
+        """캐시된 잔고로 부족하면 한 번 새로 조회해 다시 검증하고, 그래도 부족하면 전송하지 않음"""
+        client = FakeChanceClient([make_chance(bid_balance="1000"), make_chance(bid_balance="1000000")])
+        client.buy_limit_order("KRW-BTC", 100049, 1)
+        self.assertEqual(client.fetches, 2)
+        self.assertEqual(client.sent, [{"market": "KRW-BTC", "side": "bid", "ord_type": "limit",
+                                        "price": "100000", "volume": "1"}])
+
+        client.buy_limit_order("KRW-BTC", 100000, 1)  # 새로 조회한 정보가 캐시됨
+        self.assertEqual(client.fetches, 2)
+
+        poor = FakeChanceClient([make_chance(bid_balance="1000")])
+        with self.assertRaises(OrderValidationError):
+            poor.buy_limit_order("KRW-BTC", 100000, 1)
+        self.assertEqual(poor.fetches, 2)
+        self.assertEqual(poor.sent, [])
+
+        # 잔고 외의 이유로 거절되면 새로 조회하지 않음
+        small = FakeChanceClient([make_chance()])
+        with self.assertRaises(OrderValidationError):
+            small.sell_limit_order("KRW-BTC", 1000, 1)
+        self.assertEqual(small.fetches, 1)
+
+    def test_cache_expires_after_ttl(self):
+        """TTL 안에서는 재사용하고, 지나면 다시 조회"""
+        fetched = []
+        cache = OrderChanceCache(lambda market: fetched.append(market) or {"n": len(fetched)}, ttl=0.05)
+        self.assertEqual(cache.get("KRW-BTC"), {"n": 1})
+        self.assertEqual(cache.get("KRW-BTC"), {"n": 1})
+        self.assertEqual(cache.get("KRW-ETH"), {"n": 2})
+        time.sleep(0.06)
+        self.assertEqual(cache.get("KRW-BTC"), {"n": 3})
+        cache.invalidate("KRW-BTC")
+        self.assertEqual(cache.get("KRW-BTC"), {"n": 4})
+        self.assertEqual(fetched, ["KRW-BTC", "KRW-ETH", "KRW-BTC", "KRW-BTC"])
+
+if __name__ == '__main__':
+    unittest.main()
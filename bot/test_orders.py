@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_bithumb import Bithumb, OrderStore
+
+def make_orders(count, market="KRW-BTC"):
+    return [{"uuid": f"o{i:04d}", "market": market, "state": "done" if i % 3 else "cancel", "side": "bid",
+             "created_at": f"2025-01-01T00:{i // 60:02d}:{i % 60:02d}+09:00"} for i in range(count)]
+
+class FakeOrdersClient(Bithumb):
+    """get_orders만 흉내 내는 클라이언트. 앞 페이지일수록 늦게 응답하여 미리 요청한 페이지가 먼저 끝남"""
+
+    def __init__(self, orders, delay=0.0):
+        super().__init__("access", "secret")
+        self.orders = orders
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def get_orders(self, market=None, uuids=None, state=None, states=None, page=1, limit=100, order_by='desc'):
+        with self.lock:
+            self.requests.append((page, limit))
+        time.sleep(self.delay / page)
+        served = min(limit, 100)  # 거래소는 최대 100개만 반환
+        return self.orders[(page - 1) * limit:(page - 1) * limit + served]
+
+class TestIterOrders(unittest.TestCase):
+    def test_pages_in_order_under_prefetch_and_stop_on_short_page(self):
+        """미리 요청한 페이지가 먼저 끝나도 페이지 순서대로 반환하고, 짧은 페이지에서 종료"""
+        orders = make_orders(250)
+        client = FakeOrdersClient(orders, delay=0.05)
+        result = list(client.iter_orders(limit=100, prefetch=4))
+        self.assertEqual([o["uuid"] for o in result], [o["uuid"] for o in orders])
+        pages = sorted(page for page, _ in client.requests)
+        self.assertEqual(pages[:3], [1, 2, 3])
+        self.assertLessEqual(max(pages), 4)  # 3페이지(50개)가 마지막이므로 그 이후는 더 요청하지 않음
+
+        exact = FakeOrdersClient(make_orders(200))
+        self.assertEqual(len(list(exact.iter_orders(limit=100, prefetch=2))), 200)  # 빈 3페이지에서 종료
+
+    def test_limit_is_clamped_to_api_maximum(self):
+        """limit이 100보다 크면 100으로 요청하여 첫 페이지에서 멈추지 않음"""
+        client = FakeOrdersClient(make_orders(250))
+        result = list(client.iter_orders(limit=500, prefetch=2))
+        self.assertEqual(len(result), 250)
+        self.assertEqual({limit for _, limit in client.requests}, {100})
+
+    def test_stopping_early_stops_fetching(self):
+        """호출한 쪽이 도중에 멈추면 미리 요청한 범위 이후로는 요청하지 않음"""
+        client = FakeOrdersClient(make_orders(5000), delay=0.01)
+        iterator = client.iter_orders(limit=100, prefetch=3)
+        first = [next(iterator) for _ in range(150)]
+        iterator.close()
+        self.assertEqual(first[-1]["uuid"], "o0149")
+        requested = len(client.requests)
+        time.sleep(0.1)
+        self.assertEqual(len(client.requests), requested)
+        self.assertLessEqual(max(page for page, _ in client.requests), 2 + 3)
+
+    def test_prefetch_starts_when_page_is_consumed_and_takes_limiter_tokens(self):
+        """첫 주문만 읽고 멈추면 한 페이지만 요청하고, 미리 요청한 페이지도 limiter 토큰을 사용"""
+        class CountingLimiter:
+            def __init__(self):
+                self.acquired = 0
+
+            def acquire(self):
+                self.acquired += 1
+
+        client = FakeOrdersClient(make_orders(1000))
+        limiter = CountingLimiter()
+        iterator = client.iter_orders(limit=100, prefetch=3, limiter=limiter)
+        next(iterator)
+        time.sleep(0.05)
+        self.assertEqual(client.requests, [(1, 100)])
+        next(iterator)  # 첫 페이지를 계속 읽으면 현재 페이지 포함 3개까지 미리 요청
+        iterator.close()
+        self.assertEqual(sorted(page for page, _ in client.requests), [1, 2, 3])
+        self.assertEqual(limiter.acquired, len(client.requests))
+
+        single = FakeOrdersClient(make_orders(250))
+        self.assertEqual(len(list(single.iter_orders(limit=100, prefetch=1))), 250)
+        self.assertEqual([page for page, _ in single.requests], [1, 2, 3])
+
+class TestOrderStore(unittest.TestCase):
+    def test_upsert_and_query(self):
+        """uuid 기준 덮어쓰기와 market/state 조건 조회, iter_orders(store=...) 저장"""
+        store = OrderStore()
+        client = FakeOrdersClient(make_orders(120))
+        self.assertEqual(len(list(client.iter_orders(store=store))), 120)
+        self.assertEqual(len(store), 120)
+
+        store.upsert({"uuid": "o0001", "market": "KRW-BTC", "state": "wait", "side": "bid",
+                      "created_at": "2025-01-01T00:00:01+09:00", "price": "100"})
+        store.upsert_many([{"uuid": "x1", "market": "KRW-XRP", "state": "wait", "side": "ask",
+                            "created_at": "2025-01-02T00:00:00+09:00"}])
+        self.assertEqual(len(store), 121)
+        self.assertEqual(store.get("o0001")["price"], "100")
+        self.assertIsNone(store.get("missing"))
+
+        waiting = store.query(state="wait")
+        self.assertEqual([o["uuid"] for o in waiting], ["x1", "o0001"])  # created_at 내림차순
+        self.assertEqual([o["uuid"] for o in store.query(state="wait", order_by="asc")], ["o0001", "x1"])
+        self.assertEqual([o["uuid"] for o in store.query(market="KRW-XRP")], ["x1"])
+        cancelled = store.query(market="KRW-BTC", states=["cancel"])
+        self.assertEqual(len(cancelled), 40)
+        self.assertTrue(all(o["state"] == "cancel" for o in cancelled))
+        store.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.bot import calculate_percentile
+from bot.candle_buffer import CandleBuffer
+from bot.percentile import RollingPercentile, batch_percentile
+import bot.percentile as percentile_module
+
+PERCENTILES = [-10, 0, 1, 25, 50, 70, 99.9, 100, 150]
+
+class TestRollingPercentile(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+
+    def reference(self, values, p):
+        return calculate_percentile(pd.DataFrame({"close": values}), p)
+
+    def test_matches_calculate_percentile_over_rolling_window(self):
+        """롤링 윈도우 전 구간에서 calculate_percentile과 동일한 값"""
+        prices = np.round(self.rng.uniform(100, 200, size=500), 1)  # 중복 값 포함
+        rolling = RollingPercentile(window=24)
+        for end in range(1, len(prices) + 1):
+            rolling.push(prices[end - 1])
+            window = prices[max(0, end - 24):end]
+            for p in PERCENTILES:
+                self.assertEqual(rolling.percentile(p), self.reference(window, p), (end, p))
+
+    def test_replace_last_updates_in_progress_value(self):
+        """마지막 값 교체(진행 중 캔들 갱신)"""
+        rolling = RollingPercentile(window=3, values=[1.0, 2.0, 3.0])
+        rolling.replace_last(0.5)
+        self.assertEqual(rolling.percentile(0), 0.5)
+        self.assertEqual(rolling.percentile(100), 2.0)
+
+    def test_out_of_range_negative_percentile(self):
+        """인덱스가 범위를 벗어나는 음수 백분위는 calculate_percentile처럼 실패"""
+        rolling = RollingPercentile(values=[1.0, 2.0])
+        self.assertIsNone(self.reference([1.0, 2.0], -200))
+        with self.assertRaises(IndexError):
+            rolling.percentile(-200)
+
+    def test_bisect_fallback(self):
+        """sortedcontainers가 없어도 동일한 결과"""
+        original = percentile_module.SortedList
+        percentile_module.SortedList = None
+        try:
+            rolling = RollingPercentile(window=10)
+            values = self.rng.uniform(0, 1, size=50)
+            for v in values:
+                rolling.push(v)
+            self.assertEqual(rolling.percentile(70), self.reference(values[-10:], 70))
+        finally:
+            percentile_module.SortedList = original
+
+    def test_candle_buffer_tracks_close_percentile(self):
+        """CandleBuffer의 종가 백분위가 윈도우 이동 후에도 정확"""
+        index = pd.date_range("2025-01-01", periods=100, freq="min", name="candle_date_time_kst")
+        closes = self.rng.uniform(100, 200, size=100)
+        df = pd.DataFrame({"open": closes, "high": closes, "low": closes, "close": closes, "volume": 1.0}, index=index)
+        buffer = CandleBuffer("KRW-XRP", "minute1", 24, track_close=True)
+        buffer.seed(df.iloc[:24])
+        for end in range(25, 101):
+            buffer.update(df.iloc[end - 2:end])
+            self.assertEqual(buffer.close_percentile(70), self.reference(closes[end - 24:end], 70))
+
+class TestBatchPercentile(unittest.TestCase):
+    def test_matches_calculate_percentile_per_ticker(self):
+        """티커별 길이가 달라도 calculate_percentile과 동일"""
+        rng = np.random.default_rng(3)
+        windows = [rng.uniform(1, 10, size=n) for n in (24, 5, 1, 17, 24)]
+        for p in PERCENTILES:
+            expected = [calculate_percentile(pd.DataFrame({"close": w}), p) for w in windows]
+            np.testing.assert_array_equal(batch_percentile(windows, p), expected)
+
+    def test_empty_and_out_of_range_rows_are_nan(self):
+        matrix = np.array([[1.0, 2.0, 3.0], [np.nan, np.nan, np.nan]])
+        result = batch_percentile(matrix, [50, 50])
+        self.assertEqual(result[0], 2.0)
+        self.assertTrue(np.isnan(result[1]))
+        self.assertTrue(np.isnan(batch_percentile(matrix, -500)[0]))
+
+if __name__ == '__main__':
+    unittest.main()
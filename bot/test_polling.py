@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.polling import PollingPolicy
+from bot.strategy import StrategyConfig, TraderContext, drive, buy_order_and_wait, Sleep, GetOrderbook
+
+class TestFillPoller(unittest.TestCase):
+    def test_fast_start_then_exponential_backoff(self):
+        policy = PollingPolicy(min_interval=0.25, max_interval=4.0, backoff=2.0, fast_polls=2)
+        poller = policy.start()
+        delays = []
+        for _ in range(8):
+            delays.append(poller.next_delay({"executed_volume": "0"}, at_top=False))
+            poller.observe(None, delays[-1])
+        self.assertEqual(delays, [0.25, 0.25, 0.5, 1.0, 2.0, 4.0, 4.0, 4.0])
+
+    def test_top_of_book_and_new_fills_poll_fast(self):
+        """최우선 호가이거나 새 체결이 있으면 가장 짧은 간격으로 복귀"""
+        policy = PollingPolicy(fast_polls=0)
+        poller = policy.start()
+        for _ in range(5):
+            poller.observe(None, poller.next_delay({"executed_volume": "0"}, at_top=False))
+        self.assertEqual(poller.interval, policy.max_interval)
+        self.assertEqual(poller.next_delay({"executed_volume": "0"}, at_top=True), policy.min_interval)
+        poller.next_delay({"executed_volume": "0"}, at_top=False)
+        self.assertEqual(poller.next_delay({"executed_volume": "0.5"}, at_top=False), policy.min_interval)
+
+    def test_deadline_uses_driver_clock(self):
+        poller = PollingPolicy(fast_polls=0).start(deadline=10.0)
+        delay = poller.next_delay()
+        poller.observe(1000.0 + delay, delay)
+        self.assertFalse(poller.expired)
+        # 드라이버 시각으로 계산하므로 API 지연도 기한에 포함됨
+        poller.observe(1011.0, poller.next_delay())
+        self.assertTrue(poller.expired)
+        polls, elapsed, saved = poller.finish()
+        self.assertEqual(polls, 2)
+        self.assertAlmostEqual(elapsed, 11.0)
+        self.assertEqual(saved, 9)
+
+class TestBuyWaitPolling(unittest.TestCase):
+    def test_idle_order_backs_off_until_deadline_then_cancels(self):
+        """체결 없는 매수 주문은 간격을 늘려 폴링하고, 기한이 지나면 호가 확인 후 취소"""
+        clock = {"now": 0.0}
+        calls = []
+
+        def handle(effect):
+            if isinstance(effect, Sleep):
+                clock["now"] += effect.seconds
+                return clock["now"]
+            if isinstance(effect, GetOrderbook):
+                return {"orderbook_units": [{"bid_price": 101, "ask_price": 102}]}
+            calls.append(effect.method)
+            if effect.method == "buy_limit_order":
+                return {"uuid": "u1"}
+            if effect.method == "get_order":
+                return {"uuid": "u1", "state": "wait", "executed_volume": "0", "remaining_volume": "1"}
+            return {"uuid": "u1", "state": "cancel"}
+
+        config = StrategyConfig(max_polls=30, cooldown_seconds=0)
+        ctx = TraderContext("T", "KRW-XRP", 1, lambda message: None, config=config)
+        order, position = drive(buy_order_and_wait(ctx, 100, 1), handle)
+        self.assertIsNone(position)
+        self.assertEqual(calls[-1], "cancel_order")
+        self.assertGreaterEqual(clock["now"], 30.0)
+        # 1초 고정 폴링이면 30번 이상 조회
+        self.assertLessEqual(calls.count("get_order"), 15)
+        self.assertGreater(config.polling.saved_calls, 15)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+import multiprocessing
+import threading
+import uuid
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_bithumb.price_board import PriceBoardPublisher, PriceBoardReader
+from bot.market_data import MarketDataHub
+
+
+def board_name():
+    return f"test-board-{uuid.uuid4().hex[:8]}"
+
+
+def book(market, bid, ask):
+    return {"market": market, "timestamp": 1704070800000,
+            "orderbook_units": [{"bid_price": bid, "ask_price": ask, "bid_size": 1.5, "ask_size": 2.5}]}
+
+
+def read_in_child(name, market, reads, queue):
+    # 다른 프로세스에서 읽으며 찢어진 행(bid/ask/last가 서로 다른 갱신에서 온 값)이 있는지 확인
+    with PriceBoardReader(name) as reader:
+        torn = 0
+        for _ in range(reads):
+            row = reader.get(market)
+            if not (row["ask"] == row["bid"] + 1 and row["last"] == row["bid"]):
+                torn += 1
+        queue.put((torn, reader.get(market)["bid"]))
+
+
+class TestPriceBoard(unittest.TestCase):
+    def test_round_trip_and_late_markets(self):
+        """게시한 호가/체결가를 읽고, 읽는 쪽이 연결된 뒤 추가된 마켓도 보임"""
+        name = board_name()
+        with PriceBoardPublisher(name, ["KRW-BTC"], capacity=8) as publisher:
+            reader = PriceBoardReader(name)
+            publisher.update_orderbooks({"KRW-BTC": book("KRW-BTC", 100.0, 101.0)})
+            publisher.update_prices({"KRW-BTC": 100.5})
+            row = reader.get("KRW-BTC")
+            self.assertEqual((row["bid"], row["ask"], row["last"]), (100.0, 101.0, 100.5))
+            self.assertEqual((row["bid_size"], row["ask_size"]), (1.5, 2.5))
+            self.assertEqual(row["updated_at"] > 0, True)
+            self.assertEqual(row["seq"] % 2, 0)
+
+            self.assertIsNone(reader.get("KRW-ETH"))
+            publisher.update("KRW-ETH", last=3000.0)
+            self.assertEqual(reader.markets, ["KRW-BTC", "KRW-ETH"])
+            snapshot = reader.snapshot()
+            self.assertEqual(list(snapshot["last"]), [100.5, 3000.0])
+            # rows는 공유 메모리를 그대로 가리킴 (복사 없음)
+            publisher.update("KRW-ETH", last=3100.0)
+            self.assertEqual(reader.rows["last"][1], 3100.0)
+            self.assertEqual(snapshot["last"][1], 3000.0)
+            reader.close()
+        with self.assertRaises(FileNotFoundError):
+            PriceBoardReader(name)
+
+    def test_reader_process_never_sees_torn_rows(self):
+        """다른 프로세스의 읽기는 쓰는 도중의 값을 반환하지 않음"""
+        name = board_name()
+        with PriceBoardPublisher(name, ["KRW-BTC"]) as publisher:
+            publisher.update("KRW-BTC", last=0.0, bid=0.0, ask=1.0)
+            stop = threading.Event()
+
+            def write():
+                price = 0.0
+                while not stop.is_set():
+                    price += 1
+                    publisher.update("KRW-BTC", last=price, bid=price, ask=price + 1)
+
+            writer = threading.Thread(target=write)
+            writer.start()
+            context = multiprocessing.get_context("spawn")
+            queue = context.Queue()
+            child = context.Process(target=read_in_child, args=(name, "KRW-BTC", 20000, queue))
+            child.start()
+            try:
+                torn, seen = queue.get(timeout=60)
+            finally:
+                stop.set()
+                writer.join()
+                child.join(10)
+        self.assertEqual(torn, 0)
+        self.assertGreater(seen, 0)
+
+    def test_refresh_uses_multi_market_requests(self):
+        """refresh()는 청크마다 호가/현재가를 한 번씩 조회"""
+        calls = []
+
+        def orderbooks(markets):
+            calls.append(("orderbook", tuple(markets)))
+            return {m: book(m, 10.0 + i, 11.0 + i) for i, m in enumerate(markets)}
+
+        def prices(markets):
+            calls.append(("price", tuple(markets)))
+            if len(markets) == 1:
+                return 99.0
+            return {m: 10.5 + i for i, m in enumerate(markets)}
+
+        name = board_name()
+        with PriceBoardPublisher(name, ["KRW-A", "KRW-B", "KRW-C"]) as publisher, PriceBoardReader(name) as reader:
+            publisher.refresh(chunk_size=2, orderbook_fn=orderbooks, price_fn=prices)
+            self.assertEqual(len(calls), 4)
+            self.assertEqual(reader.get("KRW-B")["last"], 11.5)
+            self.assertEqual(reader.get("KRW-C")["last"], 99.0)
+            self.assertEqual(reader.get("KRW-C")["bid"], 10.0)
+
+    def test_hub_publishes_orderbooks(self):
+        """시세 허브가 조회한 호가를 가격판에도 게시"""
+        name = board_name()
+        with PriceBoardPublisher(name) as publisher, PriceBoardReader(name) as reader:
+            hub = MarketDataHub(["KRW-BTC", "KRW-ETH"], candle_specs=[],
+                                orderbook_fn=lambda markets: {m: book(m, 5.0, 6.0) for m in markets},
+                                ohlcv_fn=lambda *args, **kwargs: None, price_board=publisher,
+                                log=lambda message: None)
+            hub.refresh_orderbooks()
+            self.assertEqual(sorted(reader.markets), ["KRW-BTC", "KRW-ETH"])
+            self.assertEqual(reader.get("KRW-ETH")["ask"], 6.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
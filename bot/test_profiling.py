@@ -0,0 +1,143 @@
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from io import StringIO
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_bithumb.rate_limit import RateLimiter
+from bot.bot import make_effect_handler
+from bot.engine import TradingEngine
+from bot.mock_exchange import MockExchange
+from bot.profiling import SamplingProfiler, StageProfiler
+from bot.strategy import Call, Sleep, StrategyConfig
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStageProfiler(unittest.TestCase):
+    def test_rolling_percentiles_per_stage_and_ticker(self):
+        """구간별/티커별 최근 window개로 p50/p95/p99를 계산"""
+        clock = FakeClock()
+        profiler = StageProfiler(window=100, clock=clock)
+        for i in range(200):
+            with profiler.stage("orderbook", "KRW-BTC" if i % 2 else "KRW-ETH"):
+                clock.now += (i + 1) / 1000.0
+        total = profiler.summary("orderbook")[0]
+        self.assertEqual(total["count"], 100)  # 오래된 100개는 윈도우에서 빠짐
+        self.assertAlmostEqual(total["p50_ms"], 150.5)
+        self.assertAlmostEqual(total["max_ms"], 200.0)
+        per_ticker = {row["ticker"]: row for row in profiler.summary(ticker=None)}
+        self.assertEqual(set(per_ticker), {"KRW-BTC", "KRW-ETH"})
+        self.assertAlmostEqual(per_ticker["KRW-BTC"]["max_ms"], 200.0)
+        self.assertLess(per_ticker["KRW-ETH"]["p99_ms"], per_ticker["KRW-BTC"]["p99_ms"])
+
+        # 꺼진 프로파일러는 아무것도 기록하지 않음
+        disabled = StageProfiler(enabled=False)
+        with disabled.stage("orderbook"):
+            pass
+        self.assertEqual(disabled.summary(), [])
+
+    def test_periodic_dump(self):
+        """dump_interval마다 한 번만 로그로 남김"""
+        lines = []
+        profiler = StageProfiler(dump_interval=60, log=lambda message, *args, **fields: lines.append((args, fields)))
+        profiler.record("check_buy", "KRW-BTC", 0.01)
+        start = profiler._last_dump
+        self.assertFalse(profiler.maybe_dump(start + 30))
+        self.assertTrue(profiler.maybe_dump(start + 61))
+        self.assertFalse(profiler.maybe_dump(start + 62))
+        self.assertEqual(len(lines), 1)
+        self.assertIn("check_buy", lines[0][0][1])
+        self.assertEqual(lines[0][1]["profile"][0]["stage"], "check_buy")
+
+
+class FakeClient:
+    def _create_token(self):
+        time.sleep(0.002)
+        return "Bearer token"
+
+    def get_order(self, uuid):
+        self._create_token()
+        time.sleep(0.003)
+        return {"uuid": uuid, "state": "wait"}
+
+
+class TestProfiledDrivers(unittest.TestCase):
+    def test_thread_handler_records_effect_stages(self):
+        """스레드 방식 핸들러가 Effect별 구간, 서명, 루프 1회 시간을 티커별로 기록"""
+        profiler = StageProfiler()
+        client = profiler.instrument_client(FakeClient())
+        profiler.bind("KRW-XRP")
+        handle = make_effect_handler(client, profiler=profiler)
+        for _ in range(3):
+            handle(Call("get_order", ("abc",)))
+            handle(Sleep(0.001))
+        stages = {row["stage"]: row for row in profiler.summary(ticker="KRW-XRP")}
+        self.assertEqual(set(stages), {"call.get_order", "sign", "iteration"})
+        self.assertEqual(stages["call.get_order"]["count"], 3)
+        self.assertGreaterEqual(stages["call.get_order"]["p50_ms"], 5.0)
+        self.assertLess(stages["sign"]["p50_ms"], stages["call.get_order"]["p50_ms"])
+        # 대기 시간은 iteration에 포함되지 않음
+        self.assertLess(stages["iteration"]["max_ms"], stages["call.get_order"]["max_ms"] * 3)
+
+    def test_engine_records_stages_per_ticker(self):
+        """엔진이 티커별 호가/주문/루프 시간을 기록"""
+        markets = [f"KRW-MOCK{i:02d}" for i in range(20)]
+        speed = 200.0
+        exchange = MockExchange(markets, speed=speed)
+        profiler = StageProfiler(dump_interval=None)
+        engine = TradingEngine(exchange, limiter=RateLimiter(1_000_000, burst=1000),
+                               orderbook_fn=exchange.get_orderbook, ohlcv_fn=exchange.get_ohlcv,
+                               notify=lambda message, title=None: None, log=lambda message: None,
+                               config=StrategyConfig(max_polls=5, cooldown_seconds=1), sleep_scale=1.0 / speed,
+                               profiler=profiler)
+        with redirect_stdout(StringIO()):
+            asyncio.run(engine.run([(m, m, 1.0) for m in markets], duration=1.5))
+        stages = {row["stage"] for row in profiler.summary()}
+        self.assertTrue({"orderbook", "check_buy", "iteration", "rate_limit"} <= stages)
+        self.assertTrue(any(stage.startswith("call.") for stage in stages))
+        self.assertEqual({row["ticker"] for row in profiler.summary("orderbook", ticker=None)}, set(markets))
+        self.assertIn("orderbook", profiler.format_summary())
+
+
+def busy_wait_for_profiler(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def test_writes_folded_stacks(self):
+        """표본 추출한 스택을 플레임그래프 도구용 접힌 스택 형식으로 저장"""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_wait_for_profiler, args=(stop,), name="busy")
+        worker.start()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile", "bot.folded")
+            with SamplingProfiler(path, interval=0.002):
+                time.sleep(0.2)
+            stop.set()
+            worker.join()
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        busy = [line for line in lines if line.startswith("busy;")]
+        self.assertTrue(busy)
+        stack, count = busy[0].rsplit(" ", 1)
+        self.assertIn("busy_wait_for_profiler", stack)
+        self.assertGreater(int(count), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import unittest
+import sys
+import os
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import python_bithumb
+from python_bithumb import ExchangeSimulator, SimulatorServer
+from python_bithumb.resample import OHLCVResampler, resample_ohlcv
+from bot.market_data import MarketDataHub
+
+AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum", "value": "sum"}
+
+
+def minute_candles(count=3000, seed=1):
+    """체결이 없는 분(캔들 없음)이 섞인 minute1 캔들"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2024-01-01 00:00", periods=count, freq="min", name="candle_date_time_kst")
+    close = 1000 + np.cumsum(rng.normal(0, 2, count))
+    open_ = np.r_[close[0], close[:-1]]
+    df = pd.DataFrame({
+        "open": open_, "close": close,
+        "high": np.maximum(open_, close) + rng.random(count), "low": np.minimum(open_, close) - rng.random(count),
+        "volume": rng.random(count) * 10,
+    }, index=index)
+    df["value"] = df["volume"] * df["close"]
+    return df[rng.random(count) > 0.2]
+
+
+def expected(df, rule, shift_utc=False):
+    # pandas resample로 따로 계산한 기대값 (minute240은 UTC 기준 4시간 경계)
+    frame = df.copy()
+    if shift_utc:
+        frame.index = frame.index - pd.Timedelta(hours=9)
+    origin = "epoch" if rule.endswith("min") else "start_day"
+    out = frame.resample(rule, label="left", closed="left", origin=origin).agg(AGG).dropna()
+    if shift_utc:
+        out.index = out.index + pd.Timedelta(hours=9)
+    return out
+
+
+class TestResampleOHLCV(unittest.TestCase):
+    def test_matches_pandas_resample_on_kst_boundaries(self):
+        """minute1 캔들을 합친 결과가 KST 경계 기준 pandas resample과 같음"""
+        df = minute_candles()
+        for interval, rule, shift in (("minute5", "5min", False), ("minute60", "60min", False),
+                                      ("minute240", "240min", True), ("day", "D", False)):
+            ours = resample_ohlcv(df, interval)
+            theirs = expected(df, rule, shift)
+            self.assertEqual(list(ours.index), list(theirs.index), interval)
+            np.testing.assert_allclose(ours[list(AGG)].to_numpy(), theirs[list(AGG)].to_numpy(), rtol=1e-12)
+        # minute240은 KST 01/05/09/13/17/21시 시작
+        self.assertEqual(sorted({t.hour for t in resample_ohlcv(df, "minute240").index}), [1, 5, 9, 13, 17, 21])
+        with self.assertRaises(ValueError):
+            resample_ohlcv(df, "tick10")
+
+
+class FakeApi:
+    """전체 minute1 캔들 중 now까지를 get_ohlcv처럼 반환"""
+
+    def __init__(self, df, now, wrong=()):
+        self.df = df
+        self.now = now
+        self.wrong = set(wrong)
+        self.calls = Counter()
+        # get_ohlcv처럼 200개마다 HTTP 요청 1번으로 계산
+        self.requests = 0
+
+    def get_ohlcv(self, ticker, interval="day", count=200):
+        self.calls[interval] += 1
+        self.requests += -(-count // 200)
+        visible = self.df[self.df.index <= self.now]
+        if interval == "minute1":
+            return visible.iloc[-count:]
+        bars = resample_ohlcv(visible, interval).iloc[-count:]
+        if interval in self.wrong:
+            bars = bars.assign(close=bars["close"] + 1)
+        return bars
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+
+
+class TestOHLCVResampler(unittest.TestCase):
+    def test_serves_coarser_intervals_from_minute1_cache(self):
+        """minute1 캐시 갱신 1회로 여러 간격을 로컬 생성하고 간격별 첫 사용 시에만 API와 비교"""
+        df = minute_candles()
+        api = FakeApi(df, df.index[1500])
+        resampler = OHLCVResampler(api.get_ohlcv, max_minutes=1500)
+        for step in range(10):
+            api.now = df.index[1500 + step * 3]
+            resampler.refresh("KRW-BTC")
+            for interval, count in (("minute60", 20), ("minute15", 50), ("minute1", 5)):
+                bars = resampler.get_ohlcv("KRW-BTC", interval, count)
+                self.assertEqual(len(bars), count)
+                visible = df[df.index <= api.now]
+                truth = resample_ohlcv(visible, interval).iloc[-count:] if interval != "minute1" else visible.iloc[-count:]
+                np.testing.assert_allclose(bars[list(AGG)].to_numpy(), truth[list(AGG)].to_numpy(), rtol=1e-9)
+
+        # 검증용 조회 1회씩 외에는 minute60/minute15를 API로 조회하지 않음
+        self.assertEqual(api.calls["minute60"], 1)
+        self.assertEqual(api.calls["minute15"], 1)
+        self.assertEqual(resampler.verified, {"minute60": True, "minute15": True})
+        self.assertEqual(resampler.fallbacks, 0)
+
+        # 캐시가 덮지 못하는 요청은 API로 대체
+        resampler.get_ohlcv("KRW-BTC", "minute60", 100)
+        self.assertEqual(api.calls["minute60"], 2)
+        self.assertEqual(resampler.fallbacks, 1)
+
+    def test_failed_verification_falls_back_to_api(self):
+        """API와 결과가 다른 간격은 로컬 생성을 사용하지 않음"""
+        df = minute_candles()
+        api = FakeApi(df, df.index[1200], wrong={"minute30"})
+        resampler = OHLCVResampler(api.get_ohlcv, max_minutes=1200)
+        for _ in range(3):
+            resampler.get_ohlcv("KRW-BTC", "minute30", 10, refresh=True)
+        self.assertFalse(resampler.verified["minute30"])
+        self.assertEqual(api.calls["minute30"], 4)  # 검증 1회 + 매번 API
+
+    def test_every_http_request_takes_a_limiter_token(self):
+        """갱신/검증/대체 조회 모두 HTTP 요청(200개 페이지)마다 limiter를 한 번씩 사용 (허브 경유 포함)"""
+        df = minute_candles()
+        api = FakeApi(df, df.index[1500])
+        limiter = CountingLimiter()
+        resampler = OHLCVResampler(api.get_ohlcv, max_minutes=1500, limiter=limiter)
+        resampler.get_ohlcv("KRW-BTC", "minute60", 20)   # 채우기 + 검증
+        resampler.get_ohlcv("KRW-BTC", "minute60", 100)  # 대체 조회
+        resampler.refresh("KRW-BTC")
+        # 1500개 채우기는 8페이지, 검증/대체/갱신은 1페이지씩
+        self.assertEqual(sum(api.calls.values()), 4)
+        self.assertEqual(limiter.acquired, 11)
+        self.assertEqual(limiter.acquired, api.requests)
+        self.assertEqual(limiter.acquired, resampler.api_calls)
+
+        api = FakeApi(df, df.index[1500])
+        limiter = CountingLimiter()
+        hub = MarketDataHub(["KRW-BTC"], candle_specs=[("minute60", 20), ("minute15", 30)], ohlcv_fn=api.get_ohlcv,
+                            limiter=limiter, resample=True)
+        hub.refresh_candles()
+        hub.refresh_candles(force=True)
+        self.assertEqual(api.calls["minute60"], 1)
+        self.assertEqual(limiter.acquired, api.requests)
+        self.assertEqual(hub.fetches, limiter.acquired)
+
+        # 허브가 직접 조회할 때도 200개를 넘으면 페이지 수만큼 사용
+        api = FakeApi(df, df.index[1500])
+        limiter = CountingLimiter()
+        hub = MarketDataHub(["KRW-BTC"], candle_specs=[("minute1", 450)], ohlcv_fn=api.get_ohlcv, limiter=limiter,
+                            use_buffers=False)
+        hub.refresh_candles()
+        self.assertEqual(limiter.acquired, 3)
+        self.assertEqual(hub.fetches, api.requests)
+
+    def test_matches_simulator_candles(self):
+        """로컬 시뮬레이터의 minute1 캔들로 만든 minute60/minute10이 API 캔들과 같음"""
+        server = SimulatorServer(ExchangeSimulator(["KRW-XRP"], history=600)).start()
+        python_bithumb.set_base_url(server.url)
+        try:
+            resampler = OHLCVResampler(max_minutes=600)
+            resampler.refresh("KRW-XRP")
+            self.assertTrue(resampler.verify("KRW-XRP", "minute60", 5))
+            self.assertTrue(resampler.verify("KRW-XRP", "minute10", 20))
+        finally:
+            python_bithumb.set_base_url(None)
+            server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.bot import check_buy_conditions, check_emergency_sell_conditions
+from bot.market_data import MarketSnapshot, Stamped
+from bot.signals import BatchSignalEvaluator, SignalConfig, stack_windows
+
+class TestBatchSignalEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(3)
+        self.config = SignalConfig(candle_interval="minute60", candle_count=24, percentile_threshold=70, down_count=5)
+
+    def make_snapshot(self, tickers):
+        """티커별로 길이/추세가 다른 캔들과 호가를 가진 스냅샷"""
+        candles, orderbooks, frames = {}, {}, {}
+        for i, ticker in enumerate(tickers):
+            long_len = 24 if i % 4 else 10  # 일부는 데이터가 부족한 티커
+            close = np.round(self.rng.uniform(100, 200, size=long_len), 1)
+            long_df = pd.DataFrame({"open": close, "close": close})
+            opens = self.rng.uniform(100, 200, size=5)
+            closes = opens - 1 if i % 3 == 0 else opens + self.rng.uniform(-1, 1, size=5)
+            short_df = pd.DataFrame({"open": opens, "close": closes})
+            bid = float(np.round(self.rng.uniform(100, 200), 1))
+            candles[(ticker, "minute60")] = Stamped(long_df, 0.0)
+            candles[(ticker, "minute1")] = Stamped(short_df, 0.0)
+            orderbooks[ticker] = Stamped({"market": ticker, "orderbook_units": [{"bid_price": bid}]}, 0.0)
+            frames[ticker] = (long_df, short_df, bid)
+        return MarketSnapshot(orderbooks, candles), frames
+
+    def test_matches_per_ticker_checks(self):
+        """매수/긴급 매도 마스크가 check_buy_conditions / check_emergency_sell_conditions와 동일"""
+        tickers = [f"KRW-T{i:03d}" for i in range(60)]
+        snapshot, frames = self.make_snapshot(tickers)
+        evaluator = BatchSignalEvaluator(self.config)
+        result = evaluator.evaluate_snapshot(snapshot, tickers)
+
+        env = {"CANDLE_INTERVAL": "minute60", "CANDLE_COUNT": "24", "PERCENTILE_THRESHOLD": "70",
+               "EMERGENCY_CANDLE_COUNT": "5"}
+        with patch.dict(os.environ, env), patch("bot.bot.log_with_timestamp"), \
+                patch("bot.bot.send_discord_notification"):
+            for ticker in tickers:
+                long_df, short_df, bid = frames[ticker]
+                fetch = lambda t, interval, count: long_df if interval == "minute60" else short_df
+                row = evaluator.row(ticker)
+                self.assertEqual(bool(result.can_buy[row]), check_buy_conditions(ticker, bid, fetch), ticker)
+                self.assertEqual(bool(result.emergency_sell[row]), check_emergency_sell_conditions(ticker, fetch), ticker)
+
+    def test_result_reused_for_same_snapshot(self):
+        """같은 스냅샷/티커 조합은 다시 계산하지 않음"""
+        tickers = ["KRW-A", "KRW-B"]
+        snapshot, _ = self.make_snapshot(tickers)
+        evaluator = BatchSignalEvaluator(self.config)
+        first = evaluator.evaluate_snapshot(snapshot, tickers)
+        self.assertIs(evaluator.evaluate_snapshot(snapshot, tickers), first)
+        evaluator.evaluate_snapshot(snapshot, tickers[:1])
+        self.assertEqual(evaluator.evaluations, 2)
+
+    def test_missing_data_and_extra_rules(self):
+        """데이터 없는 티커는 NaN/False, 추가 규칙은 마스크로 결합"""
+        tickers = ["KRW-A", "KRW-EMPTY"]
+        snapshot, _ = self.make_snapshot(tickers[:1])
+        config = SignalConfig(percentile_threshold=100, rules={"never": lambda arrays: np.zeros(len(arrays["bid"]), bool)})
+        result = BatchSignalEvaluator(config).evaluate_snapshot(snapshot, tickers)
+        self.assertTrue(np.isnan(result.percentile_price[1]))
+        self.assertFalse(result.has_short[1])
+        self.assertFalse(result.can_buy.any())
+
+    def test_stack_windows_right_aligned(self):
+        matrix = stack_windows([[1, 2], None, [1, 2, 3, 4]], 3)
+        np.testing.assert_array_equal(matrix[0], [np.nan, 1, 2])
+        self.assertTrue(np.isnan(matrix[1]).all())
+        np.testing.assert_array_equal(matrix[2], [2, 3, 4])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import python_bithumb
+from python_bithumb import Bithumb, BithumbAPIException, ExchangeSimulator, SimulatorServer
+
+SECRET = "simulator-secret-for-unit-tests-0123456789"
+
+class TestExchangeSimulator(unittest.TestCase):
+    def setUp(self):
+        self.server = SimulatorServer(ExchangeSimulator(["KRW-XRP", "KRW-BTC"], default_secret=SECRET)).start()
+        python_bithumb.set_base_url(self.server.url)
+        self.bithumb = Bithumb("test-access-key", SECRET, base_url=self.server.url)
+
+    def tearDown(self):
+        python_bithumb.set_base_url(None)
+        self.server.stop()
+
+    def test_public_api_against_simulator(self):
+        orderbook = python_bithumb.get_orderbook("KRW-XRP")
+        units = orderbook["orderbook_units"]
+        self.assertEqual(len(units), 15)
+        self.assertLess(units[0]["bid_price"], units[0]["ask_price"])
+
+        df = python_bithumb.get_ohlcv("KRW-XRP", interval="minute5", count=10)
+        self.assertEqual(len(df), 10)
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertTrue((df["high"] >= df["low"]).all())
+        self.assertGreater(python_bithumb.get_current_price("KRW-XRP"), 0)
+
+    def test_limit_order_round_trip_and_cancel(self):
+        """미체결 지정가 주문 조회/취소와 잔고 잠금 해제"""
+        bid = python_bithumb.get_orderbook("KRW-XRP")["orderbook_units"][0]["bid_price"]
+        price = python_bithumb.round_price(bid * 0.9, "bid")
+        order = self.bithumb.buy_limit_order("KRW-XRP", price, 100)
+        self.assertEqual(order["state"], "wait")
+        krw = {item["currency"]: item for item in self.bithumb.get_balances()}["KRW"]
+        self.assertGreater(float(krw["locked"]), 0)
+
+        waiting = self.bithumb.get_orders(uuids=[order["uuid"]], states=["wait"])
+        self.assertEqual([o["uuid"] for o in waiting], [order["uuid"]])
+        self.assertEqual(self.bithumb.cancel_order(order["uuid"])["state"], "cancel")
+        self.assertEqual(self.bithumb.get_order(order["uuid"])["state"], "cancel")
+        krw = {item["currency"]: item for item in self.bithumb.get_balances()}["KRW"]
+        self.assertEqual(float(krw["locked"]), 0)
+        with self.assertRaisesRegex(BithumbAPIException, "order_not_found"):
+            self.bithumb.cancel_order(order["uuid"])
+
+    def test_market_orders_settle_balances(self):
+        order = self.bithumb.buy_market_order("KRW-XRP", 100_000)
+        done = self.bithumb.get_order(order["uuid"])
+        self.assertEqual(done["state"], "done")
+        volume = self.bithumb.get_balance("XRP")
+        self.assertAlmostEqual(volume, float(done["executed_volume"]), places=6)
+        self.bithumb.sell_market_order("KRW-XRP", volume)
+        self.assertAlmostEqual(self.bithumb.get_balance("XRP"), 0.0, places=6)
+        with self.assertRaisesRegex(BithumbAPIException, "insufficient_funds_ask"):
+            self.bithumb.sell_market_order("KRW-XRP", 100)
+
+    def test_rejects_bad_signature(self):
+        intruder = Bithumb("test-access-key", "wrong-secret-" + SECRET, base_url=self.server.url)
+        with self.assertRaisesRegex(BithumbAPIException, "401"):
+            intruder.get_balances()
+
+class TestSimulatorAdvance(unittest.TestCase):
+    def test_advance_releases_lock_between_steps(self):
+        """긴 구간을 진행하는 동안에도 다른 스레드의 호가 조회가 진행 완료를 기다리지 않음"""
+        simulator = ExchangeSimulator([f"KRW-M{i:03d}" for i in range(100)], history=10)
+        start = simulator.now
+        worker = threading.Thread(target=simulator.advance, args=(3600,))
+        worker.start()
+        while simulator.now == start:
+            time.sleep(0.001)
+        orderbook = simulator.orderbook("KRW-M000")
+        still_running = worker.is_alive()
+        worker.join()
+        self.assertTrue(still_running)
+        self.assertLess(orderbook["timestamp"], int((start + 3600) * 1000))
+        self.assertEqual(simulator.now, start + 3600)
+
+if __name__ == '__main__':
+    unittest.main()
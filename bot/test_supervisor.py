@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import time
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.supervisor import Supervisor, shard_assets
+
+
+def acquire_many(shard_id, assets, limiter, heartbeats, options):
+    for _ in range(options["calls"]):
+        limiter.acquire()
+        heartbeats[shard_id] = time.monotonic()
+    options["done"][shard_id] = time.monotonic()
+
+
+def crash(shard_id, assets, limiter, heartbeats, options):
+    sys.exit(3)
+
+
+def hang(shard_id, assets, limiter, heartbeats, options):
+    time.sleep(60)
+
+
+def quiet(message, title=None):
+    pass
+
+
+class TestSupervisor(unittest.TestCase):
+    def test_shard_assets_round_robin(self):
+        assets = [(f"T{i}", f"KRW-T{i}", 1.0) for i in range(5)]
+        shards = shard_assets(assets, 2)
+        self.assertEqual([[t for _, t, _ in shard] for shard in shards],
+                         [["KRW-T0", "KRW-T2", "KRW-T4"], ["KRW-T1", "KRW-T3"]])
+        self.assertEqual(len(shard_assets(assets[:1], 4)), 1)
+
+    def test_rate_budget_is_shared_across_processes(self):
+        """두 워커 프로세스의 호출 합계가 하나의 초당 호출 예산을 넘지 않음"""
+        assets = [("A", "KRW-A", 1.0), ("B", "KRW-B", 1.0)]
+        supervisor = Supervisor(assets, workers=2, rate=100, burst=1, target=acquire_many, log=quiet, notify=quiet)
+        done = supervisor.context.Array("d", 2, lock=False)
+        supervisor.options.update(calls=40, done=done)
+        started = time.monotonic()
+        supervisor.start()
+        try:
+            for process in supervisor.processes:
+                process.join(30)
+            self.assertEqual([process.exitcode for process in supervisor.processes], [0, 0])
+        finally:
+            supervisor.stop()
+        # 80회 / 초당 100회 -> 약 0.8초 (프로세스별 예산이었다면 약 0.4초)
+        self.assertGreaterEqual(max(done) - started, 0.75)
+
+    def test_restarts_crashed_and_stalled_workers(self):
+        """종료된 워커와 하트비트가 멈춘 워커를 다시 시작"""
+        messages = []
+        supervisor = Supervisor([("A", "KRW-A", 1.0)], workers=1, heartbeat_timeout=30, restart_backoff=0.05,
+                                target=crash, log=messages.append, notify=quiet)
+        supervisor.start()
+        try:
+            deadline = time.monotonic() + 20
+            while supervisor.restarts[0] < 2 and time.monotonic() < deadline:
+                supervisor.check()
+                time.sleep(0.05)
+        finally:
+            supervisor.stop()
+        self.assertGreaterEqual(supervisor.restarts[0], 2)
+        self.assertTrue(any("exited with code 3" in message for message in messages))
+
+        messages.clear()
+        supervisor = Supervisor([("A", "KRW-A", 1.0)], workers=1, heartbeat_timeout=1.0, restart_backoff=0.05,
+                                target=hang, log=messages.append, notify=quiet)
+        supervisor.start()
+        try:
+            deadline = time.monotonic() + 20
+            while supervisor.restarts[0] < 1 and time.monotonic() < deadline:
+                supervisor.check()
+                time.sleep(0.05)
+            self.assertTrue(supervisor.processes[0].is_alive())
+        finally:
+            supervisor.stop()
+        self.assertEqual(supervisor.restarts[0], 1)
+        self.assertTrue(any("heartbeat stale" in message for message in messages))
+
+
+if __name__ == '__main__':
+    unittest.main()
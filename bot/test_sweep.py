@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.backtest import TradeTape
+from bot.sweep import grid, load_results, make_configs, random_search, ranked, run_sweep
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(5)
+        n = 20_000
+        times = 1_700_000_040.0 + np.cumsum(rng.exponential(0.5, n))
+        prices = np.round(3000 * np.exp(np.cumsum(rng.normal(0, 3e-4, n))))
+        self.tape = TradeTape("KRW-TEST", times, prices, rng.exponential(1, n))
+        self.tape_dir = os.path.join(self.tmp.name, "KRW-TEST")
+        self.tape.save_arrays(self.tape_dir)
+        self.results = os.path.join(self.tmp.name, "sweep.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_open_memory_maps_saved_tape(self):
+        tape = TradeTape.open(self.tape_dir)
+        self.assertIsInstance(tape.prices, np.memmap)
+        self.assertEqual(tape.ticker, "KRW-TEST")
+        np.testing.assert_array_equal(tape.prices, self.tape.prices)
+
+    def test_grid_sweep_streams_ranks_and_resumes(self):
+        """결과를 파일에 추가하고, 같은 조합은 다시 실행하지 않음"""
+        space = {"PERCENTILE_THRESHOLD": [50, 70], "CANDLE_COUNT": [12, 24]}
+        seen = []
+        results = run_sweep([self.tape_dir], grid(space), self.results, workers=2,
+                            on_result=lambda params, metrics: seen.append(params))
+        self.assertEqual(len(results), 4)
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(load_results(self.results)), 4)
+
+        space["PERCENTILE_THRESHOLD"].append(90)
+        seen.clear()
+        results = run_sweep([self.tape_dir], grid(space), self.results, workers=2,
+                            on_result=lambda params, metrics: seen.append(params))
+        self.assertEqual(len(results), 6)
+        self.assertEqual({params["PERCENTILE_THRESHOLD"] for params in seen}, {90})
+
+        table = ranked(results)
+        self.assertTrue(table["total_pnl"].is_monotonic_decreasing)
+        self.assertIn("CANDLE_COUNT", table.columns)
+
+    def test_max_polls_overrides_order_wait_seconds(self):
+        """.env에 ORDER_WAIT_SECONDS가 있어도 스윕한 MAX_POLLS가 대기 기한에 반영"""
+        previous = os.environ.get("ORDER_WAIT_SECONDS")
+        os.environ["ORDER_WAIT_SECONDS"] = "120"
+        try:
+            self.assertEqual(make_configs({})[0].order_wait_seconds, 120)
+            strategy, _ = make_configs({"MAX_POLLS": 7})
+            self.assertEqual(strategy.max_polls, 7)
+            self.assertEqual(strategy.order_wait_seconds, 7 * strategy.poll_interval)
+        finally:
+            if previous is None:
+                del os.environ["ORDER_WAIT_SECONDS"]
+            else:
+                os.environ["ORDER_WAIT_SECONDS"] = previous
+
+    def test_random_search_is_reproducible(self):
+        space = {"PERCENTILE_THRESHOLD": (30.0, 90.0), "CANDLE_COUNT": (6, 96), "CANDLE_INTERVAL": ["minute15", "minute60"]}
+        first = list(random_search(space, 20, seed=3))
+        self.assertEqual(first, list(random_search(space, 20, seed=3)))
+        self.assertTrue(all(isinstance(params["CANDLE_COUNT"], int) for params in first))
+
+if __name__ == '__main__':
+    unittest.main()
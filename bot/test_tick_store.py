@@ -0,0 +1,113 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_bithumb.tick_store import TickStore, to_millis
+
+# 2024-01-01 00:00:00 UTC
+T0 = 1704067200000
+
+
+def random_ticks(count=20000, days=3, seed=0):
+    rng = np.random.default_rng(seed)
+    ts = np.sort(T0 + rng.integers(0, days * 86400 * 1000, count))
+    return pd.DataFrame({
+        "timestamp": ts,
+        "trade_price": np.round(1000 + np.cumsum(rng.normal(0, 1, count)), 0),
+        "trade_volume": rng.random(count),
+        "ask_bid": np.where(rng.random(count) > 0.5, "BID", "ASK"),
+        "sequential_id": np.arange(count) * 10 + 7,
+    })
+
+
+class TestTickStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = TickStore(self.tmp.name, index_stride=64, chunk_rows=1000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_dedupes_overlapping_polls(self):
+        """최신순으로 겹쳐 들어온 체결을 날짜별로 나누어 한 번씩만 저장"""
+        ticks = random_ticks()
+        records = ticks.to_dict("records")
+        for start in range(0, len(records), 700):
+            # get_trades_ticks처럼 최신순, 앞 배치와 100건씩 겹침
+            batch = records[max(0, start - 100):start + 700][::-1]
+            self.store.append("KRW-BTC", batch)
+        self.assertEqual(self.store.append("KRW-BTC", records[-50:]), 0)
+
+        self.assertEqual([str(day) for day in self.store.days("KRW-BTC")],
+                         ["2024-01-01", "2024-01-02", "2024-01-03"])
+        stored = self.store.range("KRW-BTC")
+        self.assertEqual(len(stored), len(ticks))
+        np.testing.assert_array_equal(stored["timestamp"], ticks["timestamp"])
+        np.testing.assert_array_equal(stored["side"], np.where(ticks["ask_bid"] == "BID", 1, -1))
+        day = self.store.day("KRW-BTC", "2024-01-02")
+        self.assertIsInstance(day.price, np.memmap)
+        self.assertEqual(len(day.index), -(-len(day) // 64))
+
+    def test_range_queries_are_views(self):
+        """구간 조회는 희소 인덱스로 찾은 메모리 맵 뷰이며 전체 탐색 결과와 같음"""
+        ticks = random_ticks()
+        self.store.append("KRW-BTC", ticks)
+        rng = np.random.default_rng(1)
+        for _ in range(50):
+            start, end = np.sort(rng.integers(T0 - 1000, T0 + 3 * 86400 * 1000 + 1000, 2))
+            expected = ticks[(ticks["timestamp"] >= start) & (ticks["timestamp"] < end)]
+            views = list(self.store.slices("KRW-BTC", int(start), int(end)))
+            self.assertEqual(sum(len(view.timestamp) for view in views), len(expected))
+            if len(expected):
+                np.testing.assert_array_equal(np.concatenate([v.timestamp for v in views]), expected["timestamp"])
+                self.assertTrue(all(isinstance(view.price.base, np.memmap) or isinstance(view.price, np.memmap)
+                                    for view in views))
+        # 시간대 없는 시각은 KST (2024-01-01 09:00 KST = 00:00 UTC)
+        self.assertEqual(to_millis("2024-01-01 09:00"), T0)
+        self.assertEqual(self.store.count("KRW-BTC", "2024-01-01 09:00", "2024-01-02 09:00"),
+                         int((ticks["timestamp"] < T0 + 86400 * 1000).sum()))
+
+    def test_vwap_and_volume_profile(self):
+        """VWAP와 가격대별 거래량이 pandas 계산과 같음"""
+        ticks = random_ticks()
+        self.store.append("KRW-BTC", ticks)
+        start, end = T0 + 3600 * 1000, T0 + 50 * 3600 * 1000
+        part = ticks[(ticks["timestamp"] >= start) & (ticks["timestamp"] < end)]
+        expected = (part["trade_price"] * part["trade_volume"]).sum() / part["trade_volume"].sum()
+        self.assertAlmostEqual(self.store.vwap("KRW-BTC", start, end), expected, places=9)
+        buys = part[part["ask_bid"] == "BID"]
+        self.assertAlmostEqual(self.store.vwap("KRW-BTC", start, end, side=1),
+                               (buys["trade_price"] * buys["trade_volume"]).sum() / buys["trade_volume"].sum(), places=9)
+        self.assertIsNone(self.store.vwap("KRW-ETH"))
+
+        profile = self.store.volume_profile("KRW-BTC", start, end, bin_size=5)
+        grouped = part.groupby(np.floor(part["trade_price"] / 5) * 5)
+        np.testing.assert_allclose(profile["volume"].to_numpy(), grouped["trade_volume"].sum().to_numpy())
+        np.testing.assert_allclose(profile["buy_volume"] + profile["sell_volume"], profile["volume"])
+        self.assertEqual(list(profile.index), list(grouped["trade_volume"].sum().index))
+
+    def test_recovers_from_torn_append(self):
+        """추가 도중 중단되어 컬럼 길이가 어긋나도 공통 행까지만 읽고 다음 추가 때 맞춤"""
+        ticks = random_ticks(count=3000, days=1)
+        self.store.append("KRW-BTC", ticks.iloc[:2000])
+        path = os.path.join(self.tmp.name, "KRW-BTC", "2024-01-01")
+        with open(os.path.join(path, "price.bin"), "ab") as f:
+            f.write(b"\0" * 8 * 5)  # price만 5행 더 쓰고 중단
+        os.truncate(os.path.join(path, "index.bin"), 8)
+        self.assertEqual(len(self.store.day("KRW-BTC", "2024-01-01")), 2000)
+        self.assertEqual(self.store.append("KRW-BTC", ticks), 1000)
+        stored = self.store.range("KRW-BTC")
+        np.testing.assert_array_equal(stored["price"], ticks["trade_price"])
+        day = self.store.day("KRW-BTC", "2024-01-01")
+        np.testing.assert_array_equal(day.index, ticks["timestamp"].to_numpy()[::64])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+from urllib.parse import urlencode
+
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import python_bithumb
+from python_bithumb import ExchangeSimulator, SimulatorServer
+from python_bithumb.public_api import TICKER_FLOAT_FIELDS, _ticker_chunks
+from bot.universe import fetch_tickers
+
+MARKETS = [f"KRW-C{i:03d}" for i in range(400)] + ["KRW-BTC", "KRW-XRP"]
+
+
+class TestGetTickers(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.simulator = ExchangeSimulator(MARKETS, history=30)
+        cls.server = SimulatorServer(cls.simulator).start()
+        python_bithumb.set_base_url(cls.server.url)
+
+    @classmethod
+    def tearDownClass(cls):
+        python_bithumb.set_base_url(None)
+        cls.server.stop()
+
+    def ticker_requests(self):
+        return self.simulator.stats["GET /v1/ticker"]
+
+    def test_whole_market_in_one_call_with_typed_columns(self):
+        """전체 마켓을 한 번의 요청으로 조회하고 타입이 정해진 컬럼으로 반환"""
+        before = self.ticker_requests()
+        df = python_bithumb.get_tickers()
+        self.assertEqual(self.ticker_requests() - before, 1)
+        self.assertEqual(list(df.index), MARKETS)
+        for name in TICKER_FLOAT_FIELDS:
+            self.assertEqual(df[name].dtype, np.float64, name)
+        self.assertEqual(df["timestamp"].dtype, np.int64)
+        self.assertEqual(str(df["change"].dtype), "category")
+        self.assertFalse(any(dtype == object for dtype in df.dtypes))
+        self.assertTrue((df["trade_price"] > 0).all())
+        self.assertTrue(df["acc_trade_price_24h"].isna().all())  # 시뮬레이터 응답에 없는 필드
+        self.assertEqual(df.loc["KRW-XRP", "trade_price"], python_bithumb.get_current_price("KRW-XRP"))
+
+    def test_url_length_and_market_limits_split_requests(self):
+        """URL 길이/마켓 수 제한을 넘지 않게 나누어 요청하고 요청 순서를 유지"""
+        url = f"{self.server.url}/v1/ticker"
+        chunks = _ticker_chunks(url, MARKETS, 1000)
+        self.assertEqual(sum(chunks, []), MARKETS)
+        for chunk in chunks:
+            self.assertLessEqual(len(f"{url}?{urlencode({'markets': ','.join(chunk)})}"), 1000)
+            self.assertGreater(len(chunk), 50)
+
+        before = self.ticker_requests()
+        selected = ["KRW-XRP", "KRW-C010", "KRW-BTC"]
+        df = python_bithumb.get_tickers(selected, max_markets=2)
+        self.assertEqual(self.ticker_requests() - before, 2)
+        self.assertEqual(list(df.index), selected)
+        self.assertEqual(len(python_bithumb.get_tickers([])), 0)
+
+        table = fetch_tickers(selected, chunk_size=100)
+        self.assertEqual(list(table.columns),
+                         ["trade_price", "acc_trade_price_24h", "acc_trade_volume_24h", "signed_change_rate"])
+
+
+if __name__ == '__main__':
+    unittest.main()
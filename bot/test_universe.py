@@ -0,0 +1,155 @@
+import unittest
+import asyncio
+import sys
+import os
+from contextlib import redirect_stdout
+from io import StringIO
+
+import pandas as pd
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_bithumb.rate_limit import RateLimiter
+from bot.engine import TradingEngine
+from bot.mock_exchange import MockExchange
+from bot.strategy import StrategyConfig
+from bot.universe import UniverseSelector, krw_trade_amount
+
+# 마켓 -> (현재가, 24시간 거래대금, 매수1호가, 매도1호가)
+MARKETS = {
+    "KRW-BTC": (9e7, 5e11, 89_990_000, 90_000_000),
+    "KRW-ETH": (4e6, 2e11, 3_999_000, 4_000_000),
+    "KRW-XRP": (800, 1e11, 799, 800),
+    "KRW-WIDE": (100, 9e10, 90, 110),      # 스프레드가 넓음
+    "KRW-WARN": (50, 8e10, 49.9, 50),      # 유의 종목
+    "KRW-SMALL": (10, 1e6, 9.99, 10),      # 거래대금 부족
+    "KRW-ADA": (700, 5e10, 699, 700),
+    "BTC-ETH": (0.04, 1e12, 0.0399, 0.04),  # KRW 마켓 아님
+}
+
+
+class FakeApi:
+    def __init__(self):
+        self.ticker_calls = []
+        self.orderbook_calls = []
+
+    def market_all(self):
+        return [{"market": market} for market in MARKETS]
+
+    def tickers(self, markets, chunk_size=100):
+        self.ticker_calls.append(list(markets))
+        rows = {m: {"trade_price": MARKETS[m][0], "acc_trade_price_24h": MARKETS[m][1],
+                    "acc_trade_volume_24h": MARKETS[m][1] / MARKETS[m][0], "signed_change_rate": 0.0}
+                for m in markets}
+        return pd.DataFrame.from_dict(rows, orient="index").rename_axis("market")
+
+    def orderbook(self, markets):
+        self.orderbook_calls.append(list(markets))
+        return {m: {"market": m, "orderbook_units": [{"bid_price": MARKETS[m][2], "ask_price": MARKETS[m][3]}]}
+                for m in markets}
+
+    def warnings(self):
+        return [{"market": "KRW-WARN", "warning_type": "PRICE_SUDDEN_FLUCTUATION"}]
+
+    def selector(self, top_n, **kwargs):
+        return UniverseSelector(top_n, market_fn=self.market_all, ticker_fn=self.tickers,
+                                orderbook_fn=self.orderbook, warning_fn=self.warnings, **kwargs)
+
+
+class TestUniverseSelector(unittest.TestCase):
+    def test_filters_and_ranks_by_value(self):
+        """거래대금 순위에서 유의 종목/스프레드/거래대금 조건을 벡터 마스크로 거름"""
+        api = FakeApi()
+        selector = api.selector(4, min_value_24h=1e9, max_spread_bps=50, ticker_chunk_size=3,
+                                orderbook_chunk_size=10)
+        self.assertEqual(selector.select(), ["KRW-BTC", "KRW-ETH", "KRW-XRP", "KRW-ADA"])
+
+        table = selector.last_table
+        self.assertNotIn("BTC-ETH", table.index)
+        self.assertTrue(table.at["KRW-WARN", "warning"])
+        self.assertFalse(table.at["KRW-WIDE", "eligible"])
+        self.assertFalse(table.at["KRW-SMALL", "eligible"])
+        self.assertAlmostEqual(table.at["KRW-XRP", "spread_bps"], 1 / 799.5 * 1e4)
+        # 티커는 3개씩 묶어 요청, 호가는 거래대금 조건을 통과한 후보만 한 번에 요청
+        self.assertEqual([len(chunk) for chunk in api.ticker_calls], [3, 3, 1])
+        self.assertEqual(len(api.orderbook_calls), 1)
+        self.assertNotIn("KRW-SMALL", api.orderbook_calls[0])
+
+    def test_include_and_exclude(self):
+        """제외 목록은 항상 빠지고 포함 목록은 조건과 무관하게 선택"""
+        api = FakeApi()
+        selector = api.selector(3, min_value_24h=1e9, max_spread_bps=50, exclude=["KRW-BTC"],
+                                include=["KRW-SMALL"])
+        self.assertEqual(selector.select(), ["KRW-ETH", "KRW-XRP", "KRW-SMALL"])
+
+        amount = krw_trade_amount(10_000)
+        self.assertEqual(amount("KRW-XRP", 800), 12.5)
+        self.assertIsNone(amount("KRW-XRP", 0))
+
+
+class ScriptedUniverse:
+    """sync_universe 호출마다 정해진 선택 결과를 반환"""
+
+    def __init__(self, selections):
+        self.selections = list(selections)
+        self.limiter = None
+        self.last_table = None
+
+    def select(self):
+        selected = self.selections.pop(0) if len(self.selections) > 1 else self.selections[0]
+        self.last_table = pd.DataFrame({"trade_price": [1000.0] * len(selected)}, index=selected)
+        return list(selected)
+
+
+class TestEngineUniverse(unittest.TestCase):
+    def test_engine_follows_universe(self):
+        """선택에서 빠진 마켓은 포지션이 없을 때 종료되고 새로 선택된 마켓은 시작"""
+        markets = [f"KRW-MOCK{i}" for i in range(6)]
+        speed = 200.0
+        exchange = MockExchange(markets, speed=speed)
+        engine = TradingEngine(
+            exchange,
+            limiter=RateLimiter(1_000_000, burst=1000),
+            orderbook_fn=exchange.get_orderbook,
+            ohlcv_fn=exchange.get_ohlcv,
+            notify=lambda message, title=None: None,
+            log=lambda message: None,
+            config=StrategyConfig(max_polls=5, cooldown_seconds=1),
+            sleep_scale=1.0 / speed,
+        )
+        universe = ScriptedUniverse([markets[:4], markets[2:6]])
+
+        async def scenario():
+            added, retiring = await engine.sync_universe(universe, krw_trade_amount(10_000))
+            self.assertEqual(added, markets[:4])
+            self.assertEqual(retiring, [])
+            await asyncio.sleep(0.2)
+            added, retiring = await engine.sync_universe(universe, krw_trade_amount(10_000))
+            self.assertEqual(added, markets[4:6])
+            self.assertEqual(retiring, markets[:2])
+            # 매수 포지션을 들고 있지 않으면 다음 단계 전에 종료됨
+            for ticker in markets[:2]:
+                engine.traders[ticker].state.current_position = None
+            for _ in range(100):
+                if not any(ticker in engine.traders for ticker in markets[:2]):
+                    break
+                await asyncio.sleep(0.05)
+
+        async def run():
+            try:
+                await scenario()
+            finally:
+                for task in list(engine._tasks.values()):
+                    task.cancel()
+                await asyncio.gather(*engine._tasks.values(), return_exceptions=True)
+
+        with redirect_stdout(StringIO()):
+            asyncio.run(run())
+
+        self.assertEqual(sorted(engine.traders), markets[2:6])
+        self.assertEqual(engine.traders["KRW-MOCK4"].trade_amount, 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
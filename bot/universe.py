@@ -0,0 +1,196 @@
+"""
+거래 대상 마켓(유니버스) 선택
+
+get_market_all로 전체 KRW 마켓을 조회하고, 여러 마켓을 묶은 /v1/ticker 요청 몇 번으로
+24시간 거래대금을 받아 순위를 매깁니다. 거래대금 상위 후보만 묶음 호가 요청으로 스프레드를
+계산하고, 유의 종목(get_virtual_asset_warning)과 제외 목록을 DataFrame 마스크로 한 번에
+걸러 상위 N개 마켓을 고릅니다. TradingEngine.run(universe=...)이 주기적으로 선택 결과에 맞춰
+트레이더 태스크를 시작/중지합니다.
+"""
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+import python_bithumb
+
+
+def fetch_tickers(markets, chunk_size=100):
+    """
+    python_bithumb.get_tickers로 최대 chunk_size개 마켓씩 묶어 조회하고 순위 계산에 쓰는 컬럼만 반환합니다.
+
+    Returns
+    -------
+    pandas.DataFrame
+        index: market, 컬럼: trade_price, acc_trade_price_24h, acc_trade_volume_24h, signed_change_rate
+    """
+    columns = ["trade_price", "acc_trade_price_24h", "acc_trade_volume_24h", "signed_change_rate"]
+    return python_bithumb.get_tickers(list(markets), max_markets=chunk_size)[columns]
+
+
+class UniverseSelector:
+    """
+    거래대금/스프레드/유의 종목 기준 상위 N개 마켓 선택기.
+
+    Parameters
+    ----------
+    top_n : int
+        선택할 마켓 수
+    quote : str, optional (default "KRW")
+        대상 마켓의 기준 화폐
+    min_value_24h : float, optional (default 0)
+        최소 24시간 거래대금(원)
+    max_spread_bps : float, optional
+        최대 스프레드 ((매도1호가 - 매수1호가) / 중간가, bp). None이면 스프레드를 조회하지 않음
+    exclude_warnings : bool, optional (default True)
+        유의 종목 제외 여부
+    exclude : list of str, optional
+        항상 제외할 마켓
+    include : list of str, optional
+        조건과 무관하게 항상 포함할 마켓 (top_n에 포함되어 계산)
+    candidate_factor : int, optional (default 3)
+        스프레드를 조회할 거래대금 상위 후보 수 = top_n x candidate_factor
+    ticker_chunk_size : int, optional (default 100)
+        /v1/ticker 요청 1회당 마켓 수
+    orderbook_chunk_size : int, optional (default 50)
+        호가 요청 1회당 마켓 수
+    market_fn, ticker_fn, orderbook_fn, warning_fn : callable, optional
+        조회 함수 (기본값: python_bithumb.get_market_all, fetch_tickers,
+        python_bithumb.get_orderbook, python_bithumb.get_virtual_asset_warning)
+    limiter : RateLimiter, optional
+        지정 시 API 요청마다 acquire (TradingEngine.sync_universe는 엔진의 limiter를 사용)
+    """
+
+    def __init__(self, top_n, quote="KRW", min_value_24h=0.0, max_spread_bps=None, exclude_warnings=True,
+                 exclude=None, include=None, candidate_factor=3, ticker_chunk_size=100, orderbook_chunk_size=50,
+                 market_fn=None, ticker_fn=None, orderbook_fn=None, warning_fn=None, limiter=None):
+        self.top_n = top_n
+        self.quote = quote
+        self.min_value_24h = min_value_24h
+        self.max_spread_bps = max_spread_bps
+        self.exclude_warnings = exclude_warnings
+        self.exclude = set(exclude or [])
+        self.include = list(include or [])
+        self.candidate_factor = candidate_factor
+        self.ticker_chunk_size = ticker_chunk_size
+        self.orderbook_chunk_size = orderbook_chunk_size
+        self._market_fn = market_fn or python_bithumb.get_market_all
+        self._ticker_fn = ticker_fn or fetch_tickers
+        self._orderbook_fn = orderbook_fn or python_bithumb.get_orderbook
+        self._warning_fn = warning_fn or python_bithumb.get_virtual_asset_warning
+        self.limiter = limiter
+        self.last_table = None
+
+    def _call(self, fn, *args, **kwargs):
+        if self.limiter is not None:
+            self.limiter.acquire()
+        return fn(*args, **kwargs)
+
+    @classmethod
+    def from_env(cls):
+        """
+        .env 설정값(UNIVERSE_TOP_N, UNIVERSE_MIN_VALUE_24H, UNIVERSE_MAX_SPREAD_BPS,
+        UNIVERSE_EXCLUDE, UNIVERSE_INCLUDE)으로 생성합니다. UNIVERSE_TOP_N이 0이면 None.
+        """
+        top_n = int(os.getenv("UNIVERSE_TOP_N", "0"))
+        if top_n <= 0:
+            return None
+        max_spread = os.getenv("UNIVERSE_MAX_SPREAD_BPS", "30")
+
+        def markets(name):
+            return [m.strip() for m in os.getenv(name, "").split(",") if m.strip()]
+
+        return cls(
+            top_n,
+            min_value_24h=float(os.getenv("UNIVERSE_MIN_VALUE_24H", "1000000000")),  # 기본값 10억원
+            max_spread_bps=float(max_spread) if max_spread else None,
+            exclude=markets("UNIVERSE_EXCLUDE"),
+            include=markets("UNIVERSE_INCLUDE"),
+        )
+
+    def _markets(self):
+        prefix = f"{self.quote}-"
+        return [item["market"] for item in self._call(self._market_fn) if item["market"].startswith(prefix)]
+
+    def _warned(self):
+        try:
+            return {item["market"] for item in (self._call(self._warning_fn) or [])}
+        except Exception:
+            # 경보 목록 조회 실패 시 모두 제외하지 않고 진행
+            return set()
+
+    def _spreads(self, markets):
+        spreads = pd.Series(np.nan, index=pd.Index(markets, name="market"))
+        for start in range(0, len(markets), self.orderbook_chunk_size):
+            chunk = markets[start:start + self.orderbook_chunk_size]
+            result = self._call(self._orderbook_fn, chunk)
+            if result is None:
+                continue
+            if "orderbook_units" in result:  # 단일 마켓 형식
+                result = {result["market"]: result}
+            for market, orderbook in result.items():
+                units = orderbook.get("orderbook_units") or []
+                if units:
+                    bid, ask = float(units[0]["bid_price"]), float(units[0]["ask_price"])
+                    mid = (bid + ask) / 2
+                    spreads[market] = (ask - bid) / mid * 1e4 if mid > 0 else np.nan
+        return spreads
+
+    def rank(self) -> pd.DataFrame:
+        """
+        전체 마켓의 지표와 필터 결과를 계산합니다.
+
+        Returns
+        -------
+        pandas.DataFrame
+            index: market (거래대금 내림차순), 컬럼: trade_price, acc_trade_price_24h,
+            acc_trade_volume_24h, signed_change_rate, spread_bps, warning, eligible, selected
+        """
+        markets = self._markets()
+        frames = [self._call(self._ticker_fn, markets[start:start + self.ticker_chunk_size],
+                             chunk_size=self.ticker_chunk_size)
+                  for start in range(0, len(markets), self.ticker_chunk_size)]
+        table = pd.concat(frames) if frames else self._ticker_fn([])
+        table = table.sort_values("acc_trade_price_24h", ascending=False)
+        table["warning"] = table.index.isin(self._warned()) if self.exclude_warnings else False
+        eligible = (table["acc_trade_price_24h"] >= self.min_value_24h).to_numpy(copy=True)
+        eligible &= ~table["warning"].to_numpy(dtype=bool)
+        eligible &= ~table.index.isin(self.exclude)
+        eligible &= (table["trade_price"] > 0).to_numpy(dtype=bool)
+
+        table["spread_bps"] = np.nan
+        if self.max_spread_bps is not None:
+            candidates = list(table.index[eligible][:self.top_n * self.candidate_factor])
+            forced = [m for m in self.include if m in table.index and m not in candidates]
+            if candidates or forced:
+                table.loc[candidates + forced, "spread_bps"] = self._spreads(candidates + forced)
+            # 스프레드를 조회하지 않은(후보 밖) 마켓은 선택 대상에서 제외
+            eligible &= (table["spread_bps"] <= self.max_spread_bps).to_numpy(dtype=bool)
+
+        table["eligible"] = eligible.copy()
+        forced = table.index.isin(self.include)
+        slots = max(self.top_n - int(forced.sum()), 0)
+        selected = forced.copy()
+        selected[np.flatnonzero(eligible & ~forced)[:slots]] = True
+        table["selected"] = selected
+        self.last_table = table
+        return table
+
+    def select(self) -> list:
+        """
+        선택된 마켓 목록 (거래대금 내림차순).
+        """
+        table = self.rank()
+        return list(table.index[table["selected"].to_numpy()])
+
+
+def krw_trade_amount(krw_amount, decimals=8):
+    """
+    1회 주문 금액(원)을 현재가 기준 주문 수량으로 바꾸는 함수를 만듭니다 (TradingEngine.run의 universe_amount).
+    """
+    def amount(market, price):
+        if not price or price <= 0:
+            return None
+        return math.floor(krw_amount / price * 10 ** decimals) / 10 ** decimals
+    return amount
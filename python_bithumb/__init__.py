@@ -1,21 +1,61 @@
 from .public_api import (
     get_ohlcv,
     get_current_price,
+    get_tickers,
     get_orderbook,
     get_market_all,
     get_trades_ticks,
     get_virtual_asset_warning,
+    set_base_url,
     BithumbAPIException
 )
 from .private_api import Bithumb
+from .order_store import OrderStore
+from .order_rules import OrderValidationError, get_tick_size, round_price
+from .execution_cost import CostEstimate, estimate_cost, max_size_within
+from .rate_limit import RateLimiter, SharedRateLimiter
+from .simulator import ExchangeSimulator, SimulatorServer
+from .candle_aggregator import CandleAggregator, TradeCandleBook
+from .resample import OHLCVResampler, resample_ohlcv
+from .downloader import HistoryDownloader
+from .tick_store import TickStore
 
 __all__ = [
     "Bithumb",
+    "OrderStore",
+    "OrderValidationError",
+    "get_tick_size",
+    "round_price",
+    "CostEstimate",
+    "estimate_cost",
+    "max_size_within",
+    "RateLimiter",
+    "SharedRateLimiter",
+    "ExchangeSimulator",
+    "SimulatorServer",
+    "CandleAggregator",
+    "TradeCandleBook",
+    "OHLCVResampler",
+    "resample_ohlcv",
+    "PriceBoardPublisher",
+    "PriceBoardReader",
+    "HistoryDownloader",
+    "TickStore",
     "get_ohlcv",
     "get_current_price",
+    "get_tickers",
     "get_orderbook",
     "get_market_all",
     "get_trades_ticks",
     "get_virtual_asset_warning",
+    "set_base_url",
     "BithumbAPIException"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # price_board는 multiprocessing.shared_memory(Python 3.8+)가 필요하므로 처음 사용할 때 import
+    if name in ("PriceBoardPublisher", "PriceBoardReader"):
+        from . import price_board
+        return getattr(price_board, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
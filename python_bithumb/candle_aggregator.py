@@ -0,0 +1,383 @@
+# candle_aggregator.py
+import calendar
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from .public_api import get_trades_ticks
+
+KST_OFFSET = 9 * 3600
+_INTERVAL_RE = re.compile(r"^(second|minute|tick|volume|value)(\d+(?:\.\d+)?)$")
+_TIME_FMT = "%Y-%m-%dT%H:%M:%S"
+COLUMNS = ["market", "candle_date_time_utc", "open", "high", "low", "close", "timestamp", "value", "volume"]
+
+
+def parse_interval(interval: str):
+    """
+    캔들 간격을 (종류, 크기)로 해석합니다.
+
+    - "day", "week", "month": 한국 시간(KST) 기준 일/주(월요일 시작)/월 캔들
+    - "minuteN": get_ohlcv와 같은 분 캔들 (N은 1, 3, 5, 10, 15, 30, 60, 240 외에도 가능)
+    - "secondN": N초 캔들
+    - "tickN": 체결 N건마다 마감하는 캔들
+    - "volumeX", "valueX": 누적 거래량/거래대금이 X 이상이 되면 마감하는 캔들
+
+    Returns
+    -------
+    tuple
+        ("time", 초) / ("day", 1) / ("week", 1) / ("month", 1) / ("tick", N) / ("volume", X) / ("value", X)
+    """
+    if interval in ("day", "week", "month"):
+        return interval, 1
+    match = _INTERVAL_RE.match(interval)
+    if not match:
+        raise ValueError(f"Invalid interval: {interval}")
+    kind, size = match.group(1), float(match.group(2))
+    if size <= 0:
+        raise ValueError(f"Invalid interval: {interval}")
+    if kind == "second":
+        return "time", size
+    if kind == "minute":
+        return "time", size * 60
+    if kind == "tick":
+        return "tick", int(size)
+    return kind, size
+
+
+def bucket_start(ts: float, interval: str) -> float:
+    """
+    시각(UTC epoch 초)이 속한 시간 캔들의 시작 시각(UTC epoch 초)을 반환합니다.
+
+    분/초 캔들은 UTC epoch 기준으로 나누므로 minute60 이하는 KST 정각, minute240은
+    KST 01/05/09/13/17/21시에 시작합니다. 일/주/월 캔들은 KST 자정 기준입니다.
+    """
+    kind, size = parse_interval(interval)
+    if kind == "time":
+        return ts - ts % size
+    kst = ts + KST_OFFSET
+    if kind == "day":
+        return kst - kst % 86400 - KST_OFFSET
+    if kind == "week":
+        days = int(kst // 86400)
+        monday = days - (days + 3) % 7  # 1970-01-01은 목요일
+        return monday * 86400 - KST_OFFSET
+    if kind == "month":
+        local = datetime.fromtimestamp(kst, tz=timezone.utc)
+        return calendar.timegm((local.year, local.month, 1, 0, 0, 0)) - KST_OFFSET
+    raise ValueError(f"{interval} is not a time interval")
+
+
+def trade_key(trade: dict):
+    """
+    체결 중복 제거용 키. sequential_id가 없으면 (시각, 가격, 수량, 매수/매도) 사용.
+    """
+    sequential_id = trade.get("sequential_id")
+    if sequential_id is not None:
+        return sequential_id
+    return trade.get("timestamp"), trade.get("trade_price"), trade.get("trade_volume"), trade.get("ask_bid")
+
+
+class CandleAggregator:
+    """
+    체결을 받아 OHLCV 캔들을 점진적으로 만드는 집계기 (티커 1개, 간격 1개).
+
+    to_frame()은 get_ohlcv와 같은 컬럼(open, high, low, close, volume, value 등)과
+    candle_date_time_kst 인덱스를 가진 DataFrame을 반환하므로, 전략 코드가 REST 호출 없이
+    메모리의 실시간 캔들을 읽을 수 있습니다. 체결이 없는 구간의 캔들은 만들지 않습니다 (API와 동일).
+
+    Parameters
+    ----------
+    market : str
+        마켓 코드 (예: "KRW-BTC")
+    interval : str
+        캔들 간격 (parse_interval 참고)
+    max_bars : int, optional (default 200)
+        보관할 최대 캔들 개수 (진행 중 캔들 포함)
+    """
+
+    def __init__(self, market: str, interval: str, max_bars: int = 200):
+        self.market = market
+        self.interval = interval
+        self.kind, self.size = parse_interval(interval)
+        self.max_bars = max_bars
+        # 캔들: [시작(UTC epoch 초), open, high, low, close, volume, value, 마지막 체결 timestamp(ms), 체결 수]
+        self._bars = deque(maxlen=max_bars)
+        self._lock = threading.Lock()
+        # seed()로 채운 캔들에 이미 포함된 체결(이 시각 이하)은 다시 더하지 않음
+        self._seeded_until = None
+        self.trades = 0
+
+    def __len__(self):
+        return len(self._bars)
+
+    def seed(self, df: pd.DataFrame):
+        """
+        get_ohlcv 결과로 과거 캔들을 채웁니다 (시간 캔들만). 이후 체결로 이어서 갱신합니다.
+        """
+        if self.kind in ("tick", "volume", "value"):
+            raise ValueError("Only time-based candles can be seeded from get_ohlcv")
+        if df is None or df.empty:
+            return
+        starts = (df.index.values.astype("datetime64[s]").astype("int64") - KST_OFFSET).tolist()
+        value = df["value"] if "value" in df else df["close"] * df["volume"]
+        timestamps = df["timestamp"] if "timestamp" in df else [(s + self.size) * 1000 for s in starts]
+        with self._lock:
+            self._bars.clear()
+            for row in zip(starts, df["open"], df["high"], df["low"], df["close"], df["volume"], value, timestamps):
+                self._bars.append([float(row[0]), *map(float, row[1:7]), int(row[7]), 0])
+            self._seeded_until = self._bars[-1][7] if self._bars else None
+
+    def add(self, timestamp_ms: int, price: float, volume: float) -> bool:
+        """
+        체결 1건을 반영합니다.
+
+        Parameters
+        ----------
+        timestamp_ms : int
+            체결 시각 (UTC epoch 밀리초)
+        price, volume : float
+            체결 가격과 수량
+
+        Returns
+        -------
+        bool
+            새 캔들을 시작했으면 True (직전 캔들 마감)
+        """
+        with self._lock:
+            return self._add(timestamp_ms, float(price), float(volume))
+
+    def add_trades(self, trades) -> int:
+        """
+        get_trades_ticks 형식의 체결 목록을 시각 순으로 반영하고 마감된 캔들 수를 반환합니다.
+        """
+        ordered = sorted(trades, key=lambda t: t["timestamp"])
+        closed = 0
+        with self._lock:
+            for trade in ordered:
+                closed += self._add(int(trade["timestamp"]), float(trade["trade_price"]),
+                                    float(trade["trade_volume"]))
+        return closed
+
+    def _add(self, timestamp_ms, price, volume):
+        if self._seeded_until is not None and timestamp_ms <= self._seeded_until:
+            return False
+        self.trades += 1
+        bars = self._bars
+        last = bars[-1] if bars else None
+        if self.kind in ("tick", "volume", "value"):
+            if last is None or self._full(last):
+                bars.append(self._new_bar(timestamp_ms / 1000.0, timestamp_ms, price, volume))
+                return last is not None
+            self._update(last, timestamp_ms, price, volume)
+            return False
+
+        start = bucket_start(timestamp_ms / 1000.0, self.interval)
+        if last is None or start > last[0]:
+            bars.append(self._new_bar(start, timestamp_ms, price, volume))
+            return last is not None
+        # 늦게 도착한 체결: 보관 중인 캔들이면 해당 캔들에 반영, 너무 오래되었으면 버림
+        for bar in reversed(bars):
+            if bar[0] == start:
+                self._update(bar, timestamp_ms, price, volume, late=bar is not last)
+                break
+            if bar[0] < start:
+                break
+        return False
+
+    def _full(self, bar):
+        if self.kind == "tick":
+            return bar[8] >= self.size
+        if self.kind == "volume":
+            return bar[5] >= self.size
+        return bar[6] >= self.size
+
+    @staticmethod
+    def _new_bar(start, timestamp_ms, price, volume):
+        return [start, price, price, price, price, volume, price * volume, timestamp_ms, 1]
+
+    @staticmethod
+    def _update(bar, timestamp_ms, price, volume, late=False):
+        if price > bar[2]:
+            bar[2] = price
+        if price < bar[3]:
+            bar[3] = price
+        if not late and timestamp_ms >= bar[7]:
+            bar[4] = price
+            bar[7] = timestamp_ms
+        bar[5] += volume
+        bar[6] += price * volume
+        bar[8] += 1
+
+    def to_frame(self, count: int = None, include_partial: bool = True, now: float = None) -> pd.DataFrame:
+        """
+        캔들을 get_ohlcv와 같은 형식의 DataFrame으로 반환합니다.
+
+        Parameters
+        ----------
+        count : int, optional
+            최근 count개만 반환
+        include_partial : bool, optional (default True)
+            진행 중인 마지막 캔들 포함 여부. False이면 마감된 캔들만 반환
+            (시간 캔들은 now가 캔들 구간을 지났으면 마감으로 간주)
+        now : float, optional
+            현재 시각 (UTC epoch 초, 기본값 time.time())
+        """
+        with self._lock:
+            bars = [list(bar) for bar in self._bars]
+        if bars and not include_partial:
+            last = bars[-1]
+            if self.kind == "time":
+                closed = (now if now is not None else time.time()) >= last[0] + self.size
+            elif self.kind in ("day", "week", "month"):
+                current = bucket_start(now if now is not None else time.time(), self.interval)
+                closed = current > last[0]
+            else:
+                closed = self._full(last)
+            if not closed:
+                bars.pop()
+        if count is not None:
+            bars = bars[-count:] if count > 0 else []
+        if not bars:
+            return pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([], name="candle_date_time_kst"))
+        starts = [bar[0] for bar in bars]
+        index = pd.to_datetime([int(s + KST_OFFSET) for s in starts], unit="s")
+        index.name = "candle_date_time_kst"
+        df = pd.DataFrame({
+            "market": self.market,
+            "candle_date_time_utc": [datetime.fromtimestamp(s, tz=timezone.utc).strftime(_TIME_FMT) for s in starts],
+            "open": [bar[1] for bar in bars],
+            "high": [bar[2] for bar in bars],
+            "low": [bar[3] for bar in bars],
+            "close": [bar[4] for bar in bars],
+            "timestamp": [bar[7] for bar in bars],
+            "value": [bar[6] for bar in bars],
+            "volume": [bar[5] for bar in bars],
+        }, index=index)
+        return df
+
+
+class TradeCandleBook:
+    """
+    여러 티커/간격의 CandleAggregator 묶음. 체결 중복을 제거하여 티커의 모든 간격에 전달합니다.
+
+    get_trades_ticks 폴링처럼 같은 체결이 여러 번 들어오는 입력이나, 체결 스트림에서
+    받은 체결을 feed()로 넣으면 됩니다.
+
+    Parameters
+    ----------
+    intervals : list of str
+        만들 캔들 간격 목록 (예: ["minute1", "second10", "tick100"])
+    max_bars : int, optional (default 200)
+        간격별 보관 캔들 개수
+    dedupe_size : int, optional (default 5000)
+        티커별로 기억할 최근 체결 키 개수
+    max_pages : int, optional (default 10)
+        poll()이 이전에 받은 체결과 겹칠 때까지 cursor로 거슬러 조회할 최대 페이지 수
+    """
+
+    def __init__(self, intervals, max_bars: int = 200, dedupe_size: int = 5000, max_pages: int = 10):
+        for interval in intervals:
+            parse_interval(interval)
+        self.intervals = list(intervals)
+        self.max_bars = max_bars
+        self.dedupe_size = dedupe_size
+        self.max_pages = max_pages
+        # 티커 -> 거슬러 조회해도 이전 체결과 이어지지 않은 횟수 (빠진 체결이 있을 수 있음)
+        self.gaps = Counter()
+        self._aggregators = {}
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def aggregator(self, market: str, interval: str) -> CandleAggregator:
+        key = (market, interval)
+        aggregator = self._aggregators.get(key)
+        if aggregator is None:
+            with self._lock:
+                aggregator = self._aggregators.get(key)
+                if aggregator is None:
+                    aggregator = self._aggregators[key] = CandleAggregator(market, interval, self.max_bars)
+        return aggregator
+
+    def feed(self, market: str, trades) -> int:
+        """
+        체결 목록을 반영하고 새로 반영한 체결 수를 반환합니다 (이미 받은 체결은 무시).
+        """
+        with self._lock:
+            seen = self._seen.setdefault(market, OrderedDict())
+            fresh = []
+            for trade in trades:
+                key = trade_key(trade)
+                if key in seen:
+                    continue
+                seen[key] = None
+                fresh.append(trade)
+            while len(seen) > self.dedupe_size:
+                seen.popitem(last=False)
+        if fresh:
+            for interval in self.intervals:
+                self.aggregator(market, interval).add_trades(fresh)
+        return len(fresh)
+
+    def seed(self, market: str, interval: str, df: pd.DataFrame):
+        """
+        get_ohlcv 결과로 (티커, 간격)의 과거 캔들을 채웁니다.
+        """
+        self.aggregator(market, interval).seed(df)
+
+    def poll(self, market: str, count: int = 200, trades_fn=None) -> int:
+        """
+        get_trades_ticks(또는 trades_fn)로 최근 체결 count건을 조회해 반영합니다.
+
+        폴링 사이에 체결이 count건보다 많아 이전에 받은 체결과 겹치지 않으면, 마지막 체결의
+        sequential_id를 cursor로 겹칠 때까지 최대 max_pages 페이지를 더 조회합니다.
+        그래도 겹치지 않으면 gaps[market]을 1 늘립니다 (get_ohlcv로 다시 채워야 함).
+        """
+        trades_fn = trades_fn or get_trades_ticks
+        page = trades_fn(market, count=count) or []
+        trades = list(page)
+        pages = 1
+        while len(page) >= count and not self._overlaps(market, page):
+            cursor = page[-1].get("sequential_id")
+            if cursor is None or pages >= self.max_pages:
+                self.gaps[market] += 1
+                break
+            page = trades_fn(market, count=count, cursor=cursor) or []
+            trades.extend(page)
+            pages += 1
+        return self.feed(market, trades)
+
+    def _overlaps(self, market, trades) -> bool:
+        # 처음 조회하는 티커는 이어 붙일 체결이 없으므로 겹친 것으로 봄
+        with self._lock:
+            seen = self._seen.get(market)
+            return not seen or any(trade_key(trade) in seen for trade in trades)
+
+    def candles(self, market: str, interval: str, count: int = None, include_partial: bool = True):
+        """
+        (티커, 간격)의 캔들을 get_ohlcv 형식으로 반환합니다. 체결을 받은 적이 없으면 None.
+        """
+        aggregator = self._aggregators.get((market, interval))
+        if aggregator is None or len(aggregator) == 0:
+            return None
+        return aggregator.to_frame(count, include_partial=include_partial)
+
+    def markets(self) -> set:
+        """
+        캔들을 보관 중인 티커 집합.
+        """
+        return {market for market, _ in list(self._aggregators)}
+
+    def discard(self, market: str):
+        """
+        티커의 캔들과 중복 제거 기록을 삭제합니다.
+        """
+        with self._lock:
+            self._seen.pop(market, None)
+            self.gaps.pop(market, None)
+            for key in [key for key in self._aggregators if key[0] == market]:
+                del self._aggregators[key]
+
@@ -0,0 +1,475 @@
+# downloader.py
+import argparse
+import json
+import os
+import threading
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+
+import pandas as pd
+
+from .candle_aggregator import KST_OFFSET
+from .public_api import get_market_all, get_ohlcv, get_trades_ticks
+from .rate_limit import RateLimiter
+
+FORMATS = {"parquet": ".parquet", "feather": ".feather", "csv": ".csv"}
+CANDLE_PAGE = 200
+TICK_PAGE = 500
+# 체결 API(daysAgo)로 조회 가능한 최대 일수
+MAX_TICK_DAYS = 7
+MANIFEST = "_manifest.json"
+_TIME_FMT = "%Y-%m-%d %H:%M:%S"
+
+# 연속성 검사 결과. kind: "candles" / "ticks", reason: "missing" / "incomplete" / "hole" / "tick_mismatch"
+Gap = namedtuple("Gap", ["kind", "market", "date", "reason", "detail"])
+
+
+def require_format(fmt: str):
+    """
+    저장 형식을 확인합니다. parquet/feather는 pyarrow가 필요합니다.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}. Choose from {sorted(FORMATS)}")
+    if fmt in ("parquet", "feather"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(f"{fmt} output requires pyarrow. Install it with "
+                              f"`pip install python-bithumb[history]` or use --format csv") from None
+
+
+def write_frame(df: pd.DataFrame, path: str, fmt: str):
+    """
+    DataFrame을 임시 파일에 쓴 뒤 이름을 바꿔 저장합니다 (중단되어도 반쯤 쓴 파일이 남지 않음).
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    df = df.reset_index(drop=True)
+    if fmt == "parquet":
+        df.to_parquet(tmp, index=False)
+    elif fmt == "feather":
+        df.to_feather(tmp)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def read_frame(path: str, fmt: str) -> pd.DataFrame:
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    if fmt == "feather":
+        return pd.read_feather(path)
+    try:
+        return pd.read_csv(path)
+    except pd.errors.EmptyDataError:  # 체결/캔들이 없는 날짜
+        return pd.DataFrame()
+
+
+def _kst_today(now: float) -> date:
+    return datetime.fromtimestamp(now + KST_OFFSET, tz=timezone.utc).date()
+
+
+def _utc_today(now: float) -> date:
+    return datetime.fromtimestamp(now, tz=timezone.utc).date()
+
+
+def date_range(start, end):
+    """
+    start부터 end까지(포함)의 날짜 목록. 문자열("YYYY-MM-DD") 또는 date.
+    """
+    start, end = pd.Timestamp(start).date(), pd.Timestamp(end).date()
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+class HistoryDownloader:
+    """
+    여러 마켓의 과거 분봉과 체결 내역을 날짜별 파일로 내려받는 다운로더.
+
+    (마켓, 날짜) 단위 작업을 스레드 풀에서 병렬로 실행하며, 모든 API 요청은 하나의 속도 제한기를
+    공유합니다. 파일은 다음 경로에 날짜별로 저장됩니다.
+
+    - 캔들: {root}/candles/{interval}/{market}/{YYYY-MM-DD}.{ext}  (KST 날짜, get_ohlcv 형식)
+    - 체결: {root}/ticks/{market}/{YYYY-MM-DD}.{ext}  (UTC 날짜, get_trades_ticks 형식)
+
+    마켓 디렉토리의 _manifest.json에 날짜별 완료 여부(행 수, 하루가 끝난 뒤 받았는지)를 기록하므로
+    중단 후 다시 실행하면 끝난 날짜는 건너뜁니다. 체결 API는 최근 7일만 조회할 수 있으므로 체결은
+    매일 실행해 쌓아야 합니다.
+
+    Parameters
+    ----------
+    root : str
+        저장 디렉토리
+    fmt : str, optional (default "csv")
+        저장 형식 ("csv", "parquet", "feather"). parquet/feather는 pyarrow 필요 (`pip install python-bithumb[history]`)
+    interval : str, optional (default "minute1")
+        캔들 간격 (분 캔들)
+    limiter : RateLimiter, optional
+        공유 속도 제한기. 생략 시 rate로 생성
+    rate : float, optional (default 10)
+        초당 최대 요청 수
+    workers : int, optional (default 4)
+        동시에 내려받을 작업 수
+    max_gap_minutes : float, optional (default 180)
+        check() 때 하루 안의 캔들 사이 공백이 이보다 길면 hole로 보고. None이면 검사 안 함
+    ohlcv_fn, trades_fn : callable, optional
+        캔들/체결 조회 함수 (기본값: get_ohlcv, get_trades_ticks)
+    log : callable, optional
+        로그 출력 함수 (기본값: print)
+    clock : callable, optional
+        현재 시각(epoch 초) 함수 (기본값: time.time)
+    """
+
+    def __init__(self, root, fmt="csv", interval="minute1", limiter=None, rate=10.0, workers=4,
+                 max_gap_minutes=180, ohlcv_fn=None, trades_fn=None, log=print, clock=time.time):
+        require_format(fmt)
+        if not interval.startswith("minute"):
+            raise ValueError("HistoryDownloader stores minute candles only")
+        self.root = root
+        self.fmt = fmt
+        self.interval = interval
+        self.limiter = limiter or RateLimiter(rate, burst=max(1, int(rate)))
+        self.workers = workers
+        self.max_gap_minutes = max_gap_minutes
+        self._ohlcv_fn = ohlcv_fn or get_ohlcv
+        self._trades_fn = trades_fn or get_trades_ticks
+        self.log = log
+        self.clock = clock
+        self.requests = 0
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    # 경로와 진행 기록
+
+    def _dataset(self, kind, market):
+        if kind == "candles":
+            return os.path.join(self.root, "candles", self.interval, market)
+        return os.path.join(self.root, "ticks", market)
+
+    def path(self, kind, market, day) -> str:
+        return os.path.join(self._dataset(kind, market), f"{day.isoformat()}{FORMATS[self.fmt]}")
+
+    def _lock(self, dataset):
+        with self._locks_lock:
+            return self._locks.setdefault(dataset, threading.Lock())
+
+    def manifest(self, kind, market) -> dict:
+        """
+        마켓의 날짜별 진행 기록 {"YYYY-MM-DD": {"rows", "complete", ...}}.
+        """
+        path = os.path.join(self._dataset(kind, market), MANIFEST)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _update_manifest(self, kind, market, day, **entry):
+        dataset = self._dataset(kind, market)
+        with self._lock(dataset):
+            manifest = self.manifest(kind, market)
+            manifest[day.isoformat()] = {**manifest.get(day.isoformat(), {}), **entry}
+            os.makedirs(dataset, exist_ok=True)
+            path = os.path.join(dataset, MANIFEST)
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=1, sort_keys=True)
+            os.replace(f"{path}.tmp", path)
+
+    def is_done(self, kind, market, day) -> bool:
+        entry = self.manifest(kind, market).get(day.isoformat())
+        return bool(entry and entry.get("complete")) and os.path.exists(self.path(kind, market, day))
+
+    def load(self, kind, market, day):
+        """
+        저장된 날짜 파일을 읽습니다 (없으면 None). 캔들은 get_ohlcv와 같은 candle_date_time_kst 인덱스.
+        """
+        path = self.path(kind, market, day)
+        if not os.path.exists(path):
+            return None
+        df = read_frame(path, self.fmt)
+        if kind == "candles" and "candle_date_time_kst" in df:
+            df["candle_date_time_kst"] = pd.to_datetime(df["candle_date_time_kst"])
+            df = df.set_index("candle_date_time_kst")
+        return df
+
+    # 다운로드
+
+    def _request(self, fn, *args, **kwargs):
+        self.limiter.acquire()
+        with self._locks_lock:
+            self.requests += 1
+        return fn(*args, **kwargs)
+
+    def fetch_candle_day(self, market, day) -> pd.DataFrame:
+        """
+        KST 날짜 하루의 캔들을 최신순 페이지(200개)로 거슬러 올라가며 조회합니다.
+        """
+        start = pd.Timestamp(day)
+        to = start + pd.Timedelta(days=1)
+        frames = []
+        while True:
+            page = self._request(self._ohlcv_fn, market, interval=self.interval, count=CANDLE_PAGE,
+                                 to=to.strftime(_TIME_FMT))
+            if page is None or page.empty:
+                break
+            page = page[page.index < to]
+            if page.empty:
+                break
+            frames.append(page[page.index >= start])
+            oldest = page.index.min()
+            if oldest <= start or len(page) < CANDLE_PAGE:
+                break
+            to = oldest
+        if not frames:
+            return pd.DataFrame()
+        df = pd.concat(frames)
+        return df[~df.index.duplicated(keep="first")].sort_index()
+
+    def fetch_tick_day(self, market, day) -> pd.DataFrame:
+        """
+        UTC 날짜 하루의 체결을 sequential_id 커서로 거슬러 올라가며 조회합니다 (최근 7일 이내).
+        """
+        days_ago = (_utc_today(self.clock()) - day).days
+        if days_ago < 0 or days_ago > MAX_TICK_DAYS:
+            raise ValueError(f"Trade ticks are only available for the last {MAX_TICK_DAYS} days")
+        day_str = day.isoformat()
+        cursor = None
+        items = {}
+        while True:
+            page = self._request(self._trades_fn, market, count=TICK_PAGE, cursor=cursor,
+                                 daysAgo=days_ago or None)
+            if not page:
+                break
+            for item in page:
+                if item.get("trade_date_utc") == day_str:
+                    items[item.get("sequential_id", (item["timestamp"], len(items)))] = item
+            last = page[-1]
+            next_cursor = last.get("sequential_id")
+            if len(page) < TICK_PAGE or next_cursor is None or next_cursor == cursor \
+                    or last.get("trade_date_utc", day_str) < day_str:
+                break
+            cursor = next_cursor
+        if not items:
+            return pd.DataFrame()
+        return pd.DataFrame(list(items.values())).sort_values(["timestamp"], kind="stable").reset_index(drop=True)
+
+    def _completed(self, kind, day) -> bool:
+        # 하루가 끝난 뒤 받은 파일만 완료로 기록 (진행 중인 날짜는 다음 실행 때 다시 받음)
+        now = self.clock()
+        if kind == "candles":
+            return day < _kst_today(now - 120)  # 마지막 분봉이 확정될 여유 2분
+        return day < _utc_today(now - 120)
+
+    def download(self, kind, market, day) -> int:
+        """
+        (kind, market, day) 하나를 내려받아 저장하고 행 수를 반환합니다.
+        """
+        complete = self._completed(kind, day)
+        if kind == "candles":
+            df = self.fetch_candle_day(market, day)
+            frame = df.reset_index() if not df.empty else df
+        else:
+            frame = self.fetch_tick_day(market, day)
+        write_frame(frame, self.path(kind, market, day), self.fmt)
+        self._update_manifest(kind, market, day, rows=int(len(frame)), complete=complete,
+                              downloaded_at=round(self.clock(), 3))
+        return len(frame)
+
+    def plan(self, markets, start, end, candles=True, ticks=False, pending_only=True):
+        """
+        아직 완료되지 않은 (kind, market, day) 작업 목록. pending_only=False이면 완료된 날짜도 포함.
+        """
+        kinds = [kind for kind, enabled in (("candles", candles), ("ticks", ticks)) if enabled]
+        tasks = []
+        oldest_tick = _utc_today(self.clock()) - timedelta(days=MAX_TICK_DAYS)
+        for market in markets:
+            for kind in kinds:
+                done = {day for day, entry in self.manifest(kind, market).items() if entry.get("complete")}
+                for day in date_range(start, end):
+                    if kind == "ticks" and day < oldest_tick:
+                        continue
+                    if pending_only and day.isoformat() in done and os.path.exists(self.path(kind, market, day)):
+                        continue
+                    tasks.append((kind, market, day))
+        return tasks
+
+    def _execute(self, tasks, stats):
+        if not tasks:
+            return
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="downloader") as pool:
+            futures = {pool.submit(self.download, *task): task for task in tasks}
+            try:
+                for future in as_completed(futures):
+                    kind, market, day = futures[future]
+                    try:
+                        rows = future.result()
+                        stats["downloaded"] += 1
+                        stats["rows"] += rows
+                    except Exception as e:
+                        stats["failed"] += 1
+                        self.log(f"Failed to download {kind} {market} {day}: {e}")
+                    done = stats["downloaded"] + stats["failed"]
+                    if done % 100 == 0 or done == len(tasks):
+                        self.log(f"{done}/{len(tasks)} partitions, {self.requests} requests")
+            except BaseException:
+                # 중단 시 남은 작업 취소 (완료된 날짜는 기록되어 다음 실행 때 이어서 받음)
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def run(self, markets, start, end, candles=True, ticks=False, check=True) -> dict:
+        """
+        끝나지 않은 날짜를 병렬로 내려받고, check=True이면 연속성을 검사해 공백을 다시 받습니다.
+
+        Returns
+        -------
+        dict
+            downloaded, skipped, failed, rows, gaps, refilled, requests
+        """
+        tasks = self.plan(markets, start, end, candles=candles, ticks=ticks)
+        stats = Counter()
+        stats["skipped"] = len(self.plan(markets, start, end, candles=candles, ticks=ticks, pending_only=False)) \
+            - len(tasks)
+        self._execute(tasks, stats)
+        if check:
+            gaps = self.check(markets, start, end, candles=candles, ticks=ticks)
+            stats["gaps"] = len(gaps)
+            stats["refilled"] = self.refill(gaps)
+        stats["requests"] = self.requests
+        return dict(stats)
+
+    # 연속성 검사
+
+    def check(self, markets, start, end, candles=True, ticks=False):
+        """
+        저장된 파일의 연속성을 검사합니다.
+
+        - missing: 파일이 없는 날짜
+        - incomplete: 하루가 끝나기 전에 받은 파일
+        - hole: 하루 안 캔들 사이 공백이 max_gap_minutes보다 긴 구간
+        - tick_mismatch: 분별 체결량 합계가 분봉 거래량과 다른 분 (체결과 캔들이 모두 있을 때)
+
+        refill()로 다시 받은 hole/tick_mismatch는 거래소 데이터 자체의 공백으로 보고 다시 보고하지 않습니다.
+
+        Returns
+        -------
+        list of Gap
+        """
+        gaps = []
+        oldest_tick = _utc_today(self.clock()) - timedelta(days=MAX_TICK_DAYS)
+        for market in markets:
+            for kind, enabled in (("candles", candles), ("ticks", ticks)):
+                if not enabled:
+                    continue
+                manifest = self.manifest(kind, market)
+                for day in date_range(start, end):
+                    if kind == "ticks" and day < oldest_tick:
+                        continue
+                    entry = manifest.get(day.isoformat())
+                    if entry is None or not os.path.exists(self.path(kind, market, day)):
+                        gaps.append(Gap(kind, market, day, "missing", None))
+                    elif not entry.get("complete") and self._completed(kind, day):
+                        gaps.append(Gap(kind, market, day, "incomplete", None))
+                    elif not entry.get("verified"):
+                        gap = self._check_candle_holes(market, day) if kind == "candles" \
+                            else self._check_ticks(market, day)
+                        if gap is not None:
+                            gaps.append(gap)
+        return gaps
+
+    def _check_candle_holes(self, market, day):
+        if self.max_gap_minutes is None:
+            return None
+        df = self.load("candles", market, day)
+        if df is None or len(df) < 2:
+            return None
+        index = df.index.sort_values()
+        steps = (index[1:] - index[:-1]) / pd.Timedelta(minutes=1)
+        holes = [(str(index[i]), str(index[i + 1])) for i in (steps > self.max_gap_minutes).nonzero()[0]]
+        return Gap("candles", market, day, "hole", holes) if holes else None
+
+    def _check_ticks(self, market, day):
+        ticks = self.load("ticks", market, day)
+        if ticks is None or ticks.empty:
+            return None
+        # UTC 하루는 KST 이틀에 걸침
+        frames = [self.load("candles", market, day), self.load("candles", market, day + timedelta(days=1))]
+        frames = [frame for frame in frames if frame is not None and not frame.empty]
+        if not frames or self.interval != "minute1":
+            return None
+        candles = pd.concat(frames)
+        minutes = pd.to_datetime((ticks["timestamp"] // 60000) * 60 + KST_OFFSET, unit="s")
+        volume = ticks.groupby(minutes.values)["trade_volume"].sum()
+        stored = candles["volume"].reindex(volume.index)
+        covered = volume.index.normalize().isin(candles.index.normalize().unique())
+        stored, volume = stored[covered], volume[covered]
+        mismatch = ~((stored - volume).abs() <= 1e-8 + 1e-6 * volume.abs())
+        if not mismatch.any():
+            return None
+        return Gap("ticks", market, day, "tick_mismatch", [str(t) for t in volume.index[mismatch.to_numpy()][:10]])
+
+    def refill(self, gaps) -> int:
+        """
+        공백이 있는 날짜를 다시 받고 다시 받은 날짜 수를 반환합니다.
+        """
+        tasks = list(dict.fromkeys((gap.kind, gap.market, gap.date) for gap in gaps))
+        reasons = {(gap.kind, gap.market, gap.date): gap.reason for gap in gaps}
+        stats = Counter()
+        self._execute(tasks, stats)
+        for task in tasks:
+            if reasons[task] in ("hole", "tick_mismatch") and os.path.exists(self.path(*task)):
+                self._update_manifest(*task, verified=True)
+        return stats["downloaded"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Download Bithumb minute candles and trade ticks into date-partitioned files (resumable).")
+    parser.add_argument("--markets", default="", help="comma separated markets (default: all markets of --quote)")
+    parser.add_argument("--quote", default="KRW", help="quote currency used when --markets is omitted")
+    parser.add_argument("--start", required=True, help="first date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="last date (YYYY-MM-DD, default: yesterday)")
+    parser.add_argument("--out", default="bithumb-history", help="output directory")
+    parser.add_argument("--format", default="csv", choices=sorted(FORMATS),
+                        help="parquet/feather need pyarrow (pip install python-bithumb[history])")
+    parser.add_argument("--interval", default="minute1", help="minute candle interval")
+    parser.add_argument("--ticks", action="store_true", help="also download trade ticks (last 7 days only)")
+    parser.add_argument("--no-candles", action="store_true", help="skip candles")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=10.0, help="max requests per second")
+    parser.add_argument("--max-gap-minutes", type=float, default=180.0)
+    parser.add_argument("--no-check", action="store_true", help="skip the continuity check and refill")
+    parser.add_argument("--check-only", action="store_true", help="only report gaps in already downloaded files")
+    args = parser.parse_args(argv)
+    try:
+        require_format(args.format)
+    except ImportError as e:
+        parser.error(str(e))
+
+    markets = [m.strip() for m in args.markets.split(",") if m.strip()]
+    if not markets:
+        markets = sorted(item["market"] for item in get_market_all() if item["market"].startswith(f"{args.quote}-"))
+    end = args.end or (date.today() - timedelta(days=1)).isoformat()
+    downloader = HistoryDownloader(args.out, fmt=args.format, interval=args.interval, rate=args.rate,
+                                   workers=args.workers, max_gap_minutes=args.max_gap_minutes)
+    candles = not args.no_candles
+    if args.check_only:
+        gaps = downloader.check(markets, args.start, end, candles=candles, ticks=args.ticks)
+        for gap in gaps:
+            print(f"{gap.kind} {gap.market} {gap.date} {gap.reason} {gap.detail or ''}".rstrip())
+        print(f"{len(gaps)} gaps")
+        return 1 if gaps else 0
+    print(f"Downloading {len(markets)} markets from {args.start} to {end} into {args.out}")
+    try:
+        stats = downloader.run(markets, args.start, end, candles=candles, ticks=args.ticks,
+                               check=not args.no_check)
+    except KeyboardInterrupt:
+        print("Interrupted. Run the same command again to resume.")
+        return 130
+    print(", ".join(f"{key}: {value}" for key, value in sorted(stats.items())))
+    return 1 if stats.get("failed") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,161 @@
+# execution_cost.py
+from collections import namedtuple
+
+import numpy as np
+
+# 호가를 따라 체결할 때의 예상 비용
+CostEstimate = namedtuple("CostEstimate", [
+    "volume",           # 체결 가능 수량 (호가 잔량이 부족하면 요청보다 작음)
+    "funds",            # 체결 금액 (KRW)
+    "average_price",    # 평균 체결 가격 (체결 수량이 0이면 NaN)
+    "reference_price",  # 최우선 호가
+    "worst_price",      # 마지막으로 체결되는 호가
+    "slippage",         # 최우선 호가 대비 평균 체결 가격의 불리한 정도 (비율, 0.001 = 0.1%)
+    "cost",             # 최우선 호가로 모두 체결될 때보다 더 내거나 덜 받는 금액 (KRW)
+    "levels",           # 사용한 호가 단계 수
+    "complete",         # 요청 수량/금액을 모두 체결할 수 있는지 여부
+])
+
+
+def book_levels(orderbook, side: str):
+    """
+    주문 방향에 따라 체결될 호가의 (가격, 잔량) 배열을 반환합니다.
+
+    Parameters
+    ----------
+    orderbook : dict or tuple
+        get_orderbook 단일 마켓 결과, 또는 이미 변환한 (가격 배열, 잔량 배열)
+    side : str
+        "bid" (매수, 매도호가를 따라 체결) 또는 "ask" (매도, 매수호가를 따라 체결)
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        최우선 호가부터 정렬된 (가격, 잔량)
+    """
+    if side not in ("bid", "ask"):
+        raise ValueError(f"side must be 'bid' or 'ask': {side}")
+    if isinstance(orderbook, tuple):
+        prices, sizes = orderbook
+        return np.asarray(prices, dtype=np.float64), np.asarray(sizes, dtype=np.float64)
+    units = (orderbook or {}).get("orderbook_units") or []
+    book = "ask" if side == "bid" else "bid"
+    prices = np.array([float(unit[f"{book}_price"]) for unit in units], dtype=np.float64)
+    sizes = np.array([float(unit[f"{book}_size"]) for unit in units], dtype=np.float64)
+    return prices, sizes
+
+
+def estimate_cost(orderbook, side: str, volume=None, amount=None) -> CostEstimate:
+    """
+    주어진 수량 또는 금액을 시장가로 체결할 때의 평균 가격, 슬리피지, 사용 호가 단계 수를 계산합니다.
+
+    호가 단계별 누적 잔량/금액을 한 번 계산한 뒤 searchsorted로 찾으므로 여러 크기를 배열로
+    넘기면 한 번에 계산됩니다 (결과의 각 필드도 같은 모양의 배열).
+
+    Parameters
+    ----------
+    orderbook : dict or tuple
+        get_orderbook 단일 마켓 결과 또는 book_levels 결과
+    side : str
+        "bid" (매수) 또는 "ask" (매도)
+    volume : float or array-like, optional
+        주문 수량
+    amount : float or array-like, optional
+        주문 금액 (KRW). volume과 amount 중 하나만 지정
+
+    Returns
+    -------
+    CostEstimate
+        호가에 보이는 잔량보다 크면 볼 수 있는 만큼만 계산하고 complete=False
+    """
+    if (volume is None) == (amount is None):
+        raise ValueError("Specify exactly one of volume or amount")
+    prices, sizes = book_levels(orderbook, side)
+    requested = np.asarray(volume if volume is not None else amount, dtype=np.float64)
+    scalar = requested.ndim == 0
+    requested = np.atleast_1d(requested)
+    if len(prices) == 0:
+        nan = np.full(requested.shape, np.nan)
+        zero = np.zeros(requested.shape)
+        result = CostEstimate(zero, zero, nan, nan, nan, nan, nan, zero.astype(np.int64), requested <= 0)
+        return CostEstimate(*(field[0] for field in result)) if scalar else result
+
+    cum_volume = np.concatenate([[0.0], np.cumsum(sizes)])
+    cum_funds = np.concatenate([[0.0], np.cumsum(prices * sizes)])
+    if volume is not None:
+        filled = np.minimum(requested, cum_volume[-1])
+        level = np.clip(np.searchsorted(cum_volume[1:], filled), 0, len(prices) - 1)
+        funds = cum_funds[level] + prices[level] * (filled - cum_volume[level])
+    else:
+        funds = np.minimum(requested, cum_funds[-1])
+        level = np.clip(np.searchsorted(cum_funds[1:], funds), 0, len(prices) - 1)
+        filled = cum_volume[level] + (funds - cum_funds[level]) / prices[level]
+    complete = requested <= (cum_volume[-1] if volume is not None else cum_funds[-1]) * (1 + 1e-12)
+
+    sign = 1.0 if side == "bid" else -1.0
+    reference = prices[0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average = np.where(filled > 0, funds / filled, np.nan)
+    slippage = sign * (average - reference) / reference + 0.0  # -0.0 방지
+    cost = sign * (funds - reference * filled) + 0.0
+    levels = np.where(filled > 0, level + 1, 0)
+    worst = np.where(filled > 0, prices[level], np.nan)
+    result = CostEstimate(filled, funds, average, np.full(requested.shape, reference), worst, slippage, cost,
+                          levels, complete)
+    if scalar:
+        return CostEstimate(*(field[0].item() for field in result))
+    return result
+
+
+def max_size_within(orderbook, side: str, max_slippage, amount: bool = False):
+    """
+    평균 체결 가격의 슬리피지가 max_slippage 이하인 가장 큰 주문 크기를 계산합니다.
+
+    Parameters
+    ----------
+    orderbook : dict or tuple
+        get_orderbook 단일 마켓 결과 또는 book_levels 결과
+    side : str
+        "bid" (매수) 또는 "ask" (매도)
+    max_slippage : float or array-like
+        허용 슬리피지 (비율, 0.002 = 0.2%)
+    amount : bool, optional (default False)
+        True이면 수량 대신 금액(KRW)을 반환
+
+    Returns
+    -------
+    float or numpy.ndarray
+        주문 크기. 보이는 호가 전체가 예산 안이면 호가 잔량 합계 (더 깊은 호가는 알 수 없음),
+        호가가 없으면 0
+    """
+    prices, sizes = book_levels(orderbook, side)
+    budget = np.asarray(max_slippage, dtype=np.float64)
+    scalar = budget.ndim == 0
+    budget = np.atleast_1d(budget)
+    if len(prices) == 0:
+        result = np.zeros(budget.shape)
+        return float(result[0]) if scalar else result
+
+    sign = 1.0 if side == "bid" else -1.0
+    cum_volume = np.cumsum(sizes)
+    cum_funds = np.cumsum(prices * sizes)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        average = np.where(cum_volume > 0, cum_funds / cum_volume, prices[0])
+    # 누적 평균 가격은 호가를 내려갈수록 불리해지므로 (sign 곱하면 단조 증가) 이분 탐색 가능
+    target = prices[0] * (1 + sign * budget)
+    last = np.searchsorted(sign * average, sign * target + np.abs(target) * 1e-12, side="right") - 1
+    last = np.clip(last, 0, len(prices) - 1)
+
+    volume = cum_volume[last].copy()
+    funds = cum_funds[last].copy()
+    partial = last < len(prices) - 1
+    if partial.any():
+        # 다음 호가 p를 v - V만큼 더 체결했을 때 평균 가격 (F + p(v - V)) / v = target 이 되는 v
+        step = last[partial] + 1
+        price = prices[step]
+        extra = (price * volume[partial] - funds[partial]) / (price - target[partial]) - volume[partial]
+        extra = np.clip(extra, 0.0, sizes[step])
+        volume[partial] += extra
+        funds[partial] += price * extra
+    result = funds if amount else volume
+    return float(result[0]) if scalar else result
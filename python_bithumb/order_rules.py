@@ -0,0 +1,214 @@
+# order_rules.py
+import threading
+import time
+from bisect import bisect_right
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+
+# 원화(KRW) 마켓 호가 단위 표 (가격 하한, 호가 단위)
+KRW_TICK_TABLE = [
+    (Decimal("0"), Decimal("0.0001")),
+    (Decimal("1"), Decimal("0.001")),
+    (Decimal("10"), Decimal("0.01")),
+    (Decimal("100"), Decimal("0.1")),
+    (Decimal("1000"), Decimal("1")),
+    (Decimal("5000"), Decimal("5")),
+    (Decimal("10000"), Decimal("10")),
+    (Decimal("50000"), Decimal("50")),
+    (Decimal("100000"), Decimal("100")),
+    (Decimal("500000"), Decimal("500")),
+    (Decimal("1000000"), Decimal("1000")),
+]
+_TICK_BOUNDS = [bound for bound, _ in KRW_TICK_TABLE]
+_TICK_SIZES = [tick for _, tick in KRW_TICK_TABLE]
+
+# 주문 수량 소수점 자리수
+VOLUME_PRECISION = Decimal("0.00000001")
+
+
+class OrderValidationError(ValueError):
+    """Exception raised when an order fails client-side validation.
+
+    Attributes:
+        reason -- short machine-readable reason (e.g. "min_total", "insufficient_balance")
+        market -- market ID of the rejected order
+    """
+
+    def __init__(self, reason, market, message):
+        self.reason = reason
+        self.market = market
+        super().__init__(f"Order validation failed for {market} ({reason}): {message}")
+
+
+def _to_decimal(value) -> Decimal:
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def get_tick_size(price) -> Decimal:
+    """
+    원화 마켓에서 주어진 가격의 호가 단위를 반환합니다.
+
+    Parameters
+    ----------
+    price : float or str or Decimal
+        주문 가격
+
+    Returns
+    -------
+    Decimal
+        호가 단위
+    """
+    index = bisect_right(_TICK_BOUNDS, _to_decimal(price)) - 1
+    return _TICK_SIZES[max(index, 0)]
+
+
+def round_price(price, side: str) -> Decimal:
+    """
+    가격을 호가 단위에 맞게 보정합니다.
+
+    매수(bid)는 더 비싸게 주문하지 않도록 내림, 매도(ask)는 더 싸게 팔지 않도록 올림합니다.
+    """
+    price = _to_decimal(price)
+    tick = get_tick_size(price)
+    rounding = ROUND_FLOOR if side == "bid" else ROUND_CEILING
+    return (price / tick).to_integral_value(rounding=rounding) * tick
+
+
+def round_volume(volume) -> Decimal:
+    """
+    주문 수량을 허용 소수점 자리수로 내림합니다.
+    """
+    return _to_decimal(volume).quantize(VOLUME_PRECISION, rounding=ROUND_FLOOR)
+
+
+def format_decimal(value: Decimal) -> str:
+    """
+    지수 표기 없이 불필요한 0을 제거한 문자열로 변환합니다.
+    """
+    return format(value.normalize(), "f")
+
+
+def validate_limit_order(chance: dict, market: str, side: str, price, volume):
+    """
+    get_order_chance() 응답을 기준으로 지정가 주문을 검증하고 보정합니다.
+
+    Parameters
+    ----------
+    chance : dict
+        get_order_chance() 응답
+    market : str
+        마켓 ID (예: "KRW-BTC")
+    side : str
+        "bid" (매수) 또는 "ask" (매도)
+    price : float or str
+        주문 가격
+    volume : float or str
+        주문 수량
+
+    Returns
+    -------
+    tuple of (Decimal, Decimal)
+        호가 단위와 수량 자리수에 맞게 보정된 (가격, 수량)
+
+    Raises
+    ------
+    OrderValidationError
+        거래소에서 거절될 주문인 경우
+    """
+    price = _to_decimal(price)
+    volume = _to_decimal(volume)
+    if price <= 0 or volume <= 0:
+        raise OrderValidationError("invalid_value", market, f"price={price}, volume={volume}")
+
+    market_info = chance.get("market") or {}
+    state = market_info.get("state")
+    if state and state != "active":
+        raise OrderValidationError("market_state", market, f"market state is '{state}'")
+
+    order_sides = market_info.get("order_sides")
+    if order_sides and side not in order_sides:
+        raise OrderValidationError("order_side", market, f"side '{side}' is not supported")
+
+    side_info = market_info.get(side) or {}
+    price_unit = side_info.get("price_unit")
+    if price_unit:
+        unit = _to_decimal(price_unit)
+        rounding = ROUND_FLOOR if side == "bid" else ROUND_CEILING
+        price = (price / unit).to_integral_value(rounding=rounding) * unit
+    elif market.startswith("KRW-"):
+        price = round_price(price, side)
+    volume = round_volume(volume)
+    if price <= 0 or volume <= 0:
+        raise OrderValidationError("invalid_value", market, f"price={price}, volume={volume} after rounding")
+
+    total = price * volume
+    min_total = side_info.get("min_total")
+    if min_total and total < _to_decimal(min_total):
+        raise OrderValidationError("min_total", market, f"total {total} < min_total {min_total}")
+    max_total = market_info.get("max_total")
+    if max_total and total > _to_decimal(max_total):
+        raise OrderValidationError("max_total", market, f"total {total} > max_total {max_total}")
+
+    if side == "bid":
+        fee = _to_decimal(chance.get("bid_fee") or 0)
+        account = chance.get("bid_account") or {}
+        required = total * (1 + fee)
+    else:
+        account = chance.get("ask_account") or {}
+        required = volume
+    balance = account.get("balance")
+    if balance is not None and required > _to_decimal(balance):
+        raise OrderValidationError("insufficient_balance", market,
+                                   f"required {required} > available {balance} {account.get('currency', '')}")
+
+    return price, volume
+
+
+class OrderChanceCache:
+    """
+    마켓별 주문 가능 정보(get_order_chance)를 TTL 동안 보관하는 캐시.
+
+    Parameters
+    ----------
+    fetch : callable
+        market을 받아 주문 가능 정보를 반환하는 함수
+    ttl : float, optional (default 60.0)
+        캐시 유효 시간(초)
+    """
+
+    def __init__(self, fetch, ttl: float = 60.0):
+        self._fetch = fetch
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, market: str) -> dict:
+        """
+        캐시된 정보를 반환하고, 없거나 만료되었으면 새로 조회합니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(market)
+        if entry is not None and now - entry[0] < self.ttl:
+            return entry[1]
+        return self.refresh(market)
+
+    def refresh(self, market: str) -> dict:
+        """
+        캐시를 무시하고 새로 조회하여 저장합니다.
+        """
+        chance = self._fetch(market)
+        with self._lock:
+            self._entries[market] = (time.monotonic(), chance)
+        return chance
+
+    def invalidate(self, market: str = None):
+        """
+        특정 마켓(또는 전체)의 캐시를 비웁니다.
+        """
+        with self._lock:
+            if market is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(market, None)
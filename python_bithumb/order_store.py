@@ -0,0 +1,126 @@
+# order_store.py
+import json
+import sqlite3
+import threading
+
+
+class OrderStore:
+    """
+    주문 조회 결과를 보관하는 로컬 인덱스 저장소.
+
+    SQLite를 사용하며 uuid를 기본 키로, market/state에 인덱스를 두어
+    반복 조회를 API 호출 없이 빠르게 처리합니다.
+
+    Parameters
+    ----------
+    path : str, optional (default ":memory:")
+        SQLite 데이터베이스 파일 경로. 기본값은 메모리 DB
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS orders ("
+                " uuid TEXT PRIMARY KEY,"
+                " market TEXT,"
+                " state TEXT,"
+                " side TEXT,"
+                " created_at TEXT,"
+                " data TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_market ON orders (market)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_state ON orders (state)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_market_state ON orders (market, state)")
+
+    def upsert(self, order: dict):
+        """
+        주문 1건을 저장합니다. 같은 uuid가 있으면 최신 정보로 덮어씁니다.
+        """
+        self.upsert_many([order])
+
+    def upsert_many(self, orders):
+        """
+        여러 주문을 한 트랜잭션으로 저장합니다.
+
+        Parameters
+        ----------
+        orders : iterable of dict
+            get_orders() 응답 형태의 주문 정보
+        """
+        rows = [
+            (
+                order["uuid"],
+                order.get("market"),
+                order.get("state"),
+                order.get("side"),
+                order.get("created_at"),
+                json.dumps(order),
+            )
+            for order in orders
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO orders (uuid, market, state, side, created_at, data)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def get(self, order_uuid: str):
+        """
+        uuid로 주문을 조회합니다. 없으면 None을 반환합니다.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM orders WHERE uuid = ?", (order_uuid,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(self, market=None, state=None, states=None, order_by='desc'):
+        """
+        market/state 조건으로 저장된 주문을 조회합니다.
+
+        Parameters
+        ----------
+        market : str, optional
+            마켓 ID
+        state : str, optional
+            단일 주문 상태
+        states : list of str, optional
+            주문 상태 목록
+        order_by : str, optional (default 'desc')
+            created_at 기준 정렬방식 ('asc' or 'desc')
+
+        Returns
+        -------
+        list of dict
+            주문 정보 리스트
+        """
+        clauses = []
+        args = []
+        if market:
+            clauses.append("market = ?")
+            args.append(market)
+        if state:
+            clauses.append("state = ?")
+            args.append(state)
+        if states:
+            clauses.append(f"state IN ({','.join('?' for _ in states)})")
+            args.extend(states)
+        sql = "SELECT data FROM orders"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at " + ("ASC" if order_by == 'asc' else "DESC")
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,357 @@
+# price_board.py
+import argparse
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from .public_api import get_current_price, get_orderbook
+
+MAGIC = 0x42544842  # "BHTB"
+VERSION = 1
+NAME_SIZE = 32
+HEADER_SIZE = 64
+# 행 1개 = 64바이트 (캐시 라인 1개). seq가 홀수이면 쓰는 중
+ROW_DTYPE = np.dtype([
+    ("seq", np.uint64),
+    ("last", np.float64),
+    ("bid", np.float64),
+    ("ask", np.float64),
+    ("bid_size", np.float64),
+    ("ask_size", np.float64),
+    ("updated_at", np.float64),
+    ("reserved", np.float64),
+])
+FIELDS = ("last", "bid", "ask", "bid_size", "ask_size", "updated_at")
+
+
+def _layout(capacity):
+    names = HEADER_SIZE
+    rows = names + capacity * NAME_SIZE
+    rows += (-rows) % 64
+    return names, rows, rows + capacity * ROW_DTYPE.itemsize
+
+
+def _views(buf, capacity):
+    names_at, rows_at, _ = _layout(capacity)
+    header = np.ndarray((HEADER_SIZE // 8,), dtype=np.uint64, buffer=buf)
+    names = np.ndarray((capacity,), dtype=f"S{NAME_SIZE}", buffer=buf, offset=names_at)
+    rows = np.ndarray((capacity,), dtype=ROW_DTYPE, buffer=buf, offset=rows_at)
+    return header, names, rows
+
+
+class PriceBoardPublisher:
+    """
+    마켓별 최신 가격을 공유 메모리(multiprocessing.shared_memory) NumPy 배열에 쓰는 게시자.
+
+    마켓마다 64바이트 행 하나(최근 체결가, 최우선 매수/매도 호가와 잔량, 갱신 시각, seq)를 두고
+    seqlock 방식으로 씁니다: seq를 홀수로 만든 뒤 값을 쓰고 다시 짝수로 만듭니다. 같은 기기의
+    여러 프로세스(봇, 리스크 모니터, 대시보드 등)는 PriceBoardReader로 API 호출 없이 읽습니다.
+    게시자는 하나만 두어야 합니다.
+
+    Parameters
+    ----------
+    name : str
+        공유 메모리 이름 (읽는 쪽과 같은 이름)
+    markets : list of str, optional
+        처음 등록할 마켓 목록
+    capacity : int, optional (default 1024)
+        최대 마켓 수
+    """
+
+    def __init__(self, name: str, markets=None, capacity: int = 1024):
+        self.name = name
+        self.capacity = capacity
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=_layout(capacity)[2])
+        self._header, self._names, self._rows = _views(self._shm.buf, capacity)
+        self._rows["seq"] = 0
+        for field in FIELDS:
+            self._rows[field] = np.nan
+        self._index = {}
+        self._lock = threading.Lock()
+        self._header[1] = VERSION
+        self._header[2] = capacity
+        self._header[3] = 0
+        self._header[0] = MAGIC  # 마지막에 기록 (읽는 쪽은 MAGIC으로 초기화 완료 확인)
+        for market in markets or []:
+            self.add_market(market)
+        self._thread = None
+        self._stop = threading.Event()
+        self.updates = 0
+
+    def add_market(self, market: str) -> int:
+        """
+        마켓을 등록하고 행 번호를 반환합니다 (이미 있으면 기존 행 번호).
+        """
+        with self._lock:
+            row = self._index.get(market)
+            if row is not None:
+                return row
+            row = len(self._index)
+            if row >= self.capacity:
+                raise ValueError(f"Price board is full ({self.capacity} markets)")
+            encoded = market.encode()
+            if len(encoded) > NAME_SIZE:
+                raise ValueError(f"Market name too long: {market}")
+            self._names[row] = encoded
+            self._index[market] = row
+            self._header[3] = row + 1  # 이름을 쓴 뒤 개수 증가
+            return row
+
+    @property
+    def markets(self):
+        return list(self._index)
+
+    def update(self, market: str, last=None, bid=None, ask=None, bid_size=None, ask_size=None, ts=None):
+        """
+        마켓 행을 갱신합니다. None인 값은 이전 값을 유지합니다.
+        """
+        row = self._index.get(market)
+        if row is None:
+            row = self.add_market(market)
+        rows = self._rows
+        seq = int(rows["seq"][row])
+        rows["seq"][row] = seq + 1  # 홀수: 쓰는 중
+        record = rows[row]
+        if last is not None:
+            record["last"] = last
+        if bid is not None:
+            record["bid"] = bid
+        if ask is not None:
+            record["ask"] = ask
+        if bid_size is not None:
+            record["bid_size"] = bid_size
+        if ask_size is not None:
+            record["ask_size"] = ask_size
+        record["updated_at"] = time.time() if ts is None else ts
+        rows["seq"][row] = seq + 2
+        self.updates += 1
+
+    def update_orderbooks(self, orderbooks):
+        """
+        get_orderbook 결과(단일 또는 마켓별 dict)로 최우선 호가/잔량을 갱신합니다.
+        """
+        if not orderbooks:
+            return
+        if "orderbook_units" in orderbooks:
+            orderbooks = {orderbooks["market"]: orderbooks}
+        for market, book in orderbooks.items():
+            units = book.get("orderbook_units") or []
+            if not units:
+                continue
+            top = units[0]
+            ts = book.get("timestamp")
+            self.update(market, bid=float(top["bid_price"]), ask=float(top["ask_price"]),
+                        bid_size=float(top["bid_size"]), ask_size=float(top["ask_size"]),
+                        ts=ts / 1000.0 if ts else None)
+
+    def update_prices(self, prices):
+        """
+        get_current_price 결과(마켓별 dict)로 최근 체결가를 갱신합니다.
+        """
+        for market, price in (prices or {}).items():
+            self.update(market, last=float(price))
+
+    def refresh(self, chunk_size: int = 100, orderbook_fn=None, price_fn=None):
+        """
+        등록된 전체 마켓의 호가와 현재가를 다중 마켓 요청으로 조회해 갱신합니다.
+        """
+        orderbook_fn = orderbook_fn or get_orderbook
+        price_fn = price_fn or get_current_price
+        markets = self.markets
+        for start in range(0, len(markets), chunk_size):
+            chunk = markets[start:start + chunk_size]
+            self.update_orderbooks(orderbook_fn(chunk))
+            prices = price_fn(chunk)
+            if prices is not None and not isinstance(prices, dict):
+                prices = {chunk[0]: prices}  # 단일 마켓이면 가격만 반환
+            self.update_prices(prices)
+
+    def _run(self, interval, chunk_size, log):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.refresh(chunk_size)
+            except Exception as e:
+                log(f"Price board refresh failed: {e}")
+            self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+    def start(self, interval: float = 1.0, chunk_size: int = 100, log=print):
+        """
+        백그라운드 스레드에서 interval초마다 refresh()를 실행합니다.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval, chunk_size, log),
+                                        name="PriceBoardPublisher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def close(self, unlink: bool = True):
+        """
+        게시를 멈추고 공유 메모리를 닫습니다. unlink=True이면 공유 메모리를 삭제합니다.
+        """
+        self.stop()
+        self._header = self._names = self._rows = None
+        self._shm.close()
+        if unlink:
+            self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class PriceBoardReader:
+    """
+    PriceBoardPublisher가 쓰는 공유 메모리 가격판을 읽는 쪽.
+
+    rows는 공유 메모리를 그대로 가리키는 NumPy 구조체 배열(복사 없음)이고, get()/snapshot()은
+    seqlock으로 쓰는 중이 아닌 일관된 값을 복사해 반환합니다.
+
+    Parameters
+    ----------
+    name : str
+        공유 메모리 이름
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._shm = _attach(name)
+        header = np.ndarray((HEADER_SIZE // 8,), dtype=np.uint64, buffer=self._shm.buf)
+        if int(header[0]) != MAGIC or int(header[1]) != VERSION:
+            self._shm.close()
+            raise ValueError(f"{name} is not a price board")
+        self.capacity = int(header[2])
+        self._header, self._names, self.rows = _views(self._shm.buf, self.capacity)
+        self._index = {}
+        self._count = 0
+
+    def _refresh_index(self):
+        count = int(self._header[3])
+        if count != self._count:
+            for row in range(self._count, count):
+                self._index[self._names[row].decode()] = row
+            self._count = count
+        return count
+
+    @property
+    def markets(self):
+        self._refresh_index()
+        return list(self._index)
+
+    def row(self, market: str):
+        """
+        마켓의 행 번호 (없으면 None).
+        """
+        row = self._index.get(market)
+        if row is None:
+            self._refresh_index()
+            row = self._index.get(market)
+        return row
+
+    def get(self, market: str, retries: int = 1000):
+        """
+        마켓의 최신 값을 일관되게 읽어 dict로 반환합니다 (seq 포함). 등록되지 않은 마켓이면 None.
+        """
+        row = self.row(market)
+        if row is None:
+            return None
+        rows = self.rows
+        for attempt in range(retries):
+            before = int(rows["seq"][row])
+            if before & 1:
+                if attempt % 16 == 15:
+                    time.sleep(0)  # 게시자가 쓰는 도중 선점된 경우 CPU 양보
+                continue
+            record = rows[row].copy()
+            if int(rows["seq"][row]) == before:
+                return {**{field: float(record[field]) for field in FIELDS}, "seq": before}
+        raise RuntimeError(f"Could not read a consistent row for {market}")
+
+    def snapshot(self, retries: int = 1000) -> np.ndarray:
+        """
+        등록된 전체 마켓 행의 일관된 복사본 (구조체 배열, markets 순서).
+        """
+        count = self._refresh_index()
+        rows = self.rows[:count]
+        for _ in range(retries):
+            before = rows["seq"].copy()
+            copy = rows.copy()
+            after = rows["seq"]
+            if not (before & 1).any() and np.array_equal(before, after):
+                return copy
+        # 계속 쓰는 중인 행이 있으면 행 단위로 읽음
+        out = rows.copy()
+        for row, market in enumerate(list(self._index)[:count]):
+            values = self.get(market, retries)
+            for field in FIELDS:
+                out[field][row] = values[field]
+            out["seq"][row] = values["seq"]
+        return out
+
+    def close(self):
+        self._header = self._names = self.rows = None
+        self._shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+_attach_lock = threading.Lock()
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, create=False, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    # 읽는 프로세스가 종료될 때 resource_tracker가 공유 메모리를 지우지 않도록 등록을 건너뜀.
+    # (등록 후 unregister하면 게시자와 같은 tracker를 쓰는 자식 프로세스에서 게시자의 등록까지 지워짐)
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name, create=False)
+        finally:
+            resource_tracker.register = register
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish the latest Bithumb prices to a shared-memory board.")
+    parser.add_argument("--name", default="bithumb-prices", help="shared memory name")
+    parser.add_argument("--markets", default="", help="comma separated markets (default: all KRW markets)")
+    parser.add_argument("--interval", type=float, default=1.0, help="refresh interval in seconds")
+    parser.add_argument("--capacity", type=int, default=1024)
+    args = parser.parse_args()
+
+    markets = [m.strip() for m in args.markets.split(",") if m.strip()]
+    if not markets:
+        from .public_api import get_market_all
+        markets = [item["market"] for item in get_market_all() if item["market"].startswith("KRW-")]
+    publisher = PriceBoardPublisher(args.name, markets, capacity=max(args.capacity, len(markets)))
+    publisher.start(args.interval)
+    print(f"Publishing {len(markets)} markets to shared memory '{args.name}'")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
+
+
+if __name__ == "__main__":
+    main()
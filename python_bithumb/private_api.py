@@ -6,12 +6,20 @@ import time
 import hashlib
 from urllib.parse import urlencode
 import json
-from .public_api import BithumbAPIException
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .public_api import BithumbAPIException, DEFAULT_BASE_URL
+from .order_rules import OrderChanceCache, OrderValidationError, validate_limit_order, format_decimal
+
+# get_orders 페이지당 최대 주문 수
+MAX_ORDERS_PER_PAGE = 100
 
 class Bithumb:
-    BASE_URL = "https://api.bithumb.com"
+    BASE_URL = DEFAULT_BASE_URL
 
-    def __init__(self, access_key: str, secret_key: str):
+    def __init__(self, access_key: str, secret_key: str, validate_orders: bool = False, chance_ttl: float = 60.0,
+                 base_url: str = None):
         """
         Bithumb Private API 접근을 위한 클래스.
         
@@ -21,9 +29,19 @@ class Bithumb:
             Bithumb에서 발급받은 Access Key
         secret_key : str
             Bithumb에서 발급받은 Secret Key
+        validate_orders : bool, optional (default False)
+            True이면 지정가 주문 전 캐시된 주문 가능 정보로 가격/수량을 검증·보정
+        chance_ttl : float, optional (default 60.0)
+            주문 가능 정보 캐시 유효 시간(초)
+        base_url : str, optional
+            API 서버 주소 (예: 로컬 시뮬레이터 "http://127.0.0.1:8080").
+            생략 시 환경변수 BITHUMB_BASE_URL 또는 "https://api.bithumb.com"
         """
+        self.BASE_URL = (base_url or os.getenv("BITHUMB_BASE_URL") or self.BASE_URL).rstrip("/")
         self.access_key = access_key
         self.secret_key = secret_key
+        self.validate_orders = validate_orders
+        self._chance_cache = OrderChanceCache(self.get_order_chance, ttl=chance_ttl)
 
     def _create_token(self, query_hash=None, query_hash_alg=None):
         """
@@ -185,8 +203,13 @@ class Bithumb:
     def buy_limit_order(self, ticker: str, price: float, volume: float):
         """
         지정가 매수 주문.
+
+        validate_orders가 True이면 전송 전에 호가 단위/최소·최대 주문금액/잔고를
+        검증하고, 실패 시 OrderValidationError를 발생시킵니다.
         """
         endpoint = "/v1/orders"
+        if self.validate_orders:
+            price, volume = self._prepare_limit_order(ticker, "bid", price, volume)
         request_body = {
             "market": ticker,
             "side": "bid",
@@ -199,8 +222,13 @@ class Bithumb:
     def sell_limit_order(self, ticker: str, price: float, volume: float):
         """
         지정가 매도 주문.
+
+        validate_orders가 True이면 전송 전에 호가 단위/최소·최대 주문금액/잔고를
+        검증하고, 실패 시 OrderValidationError를 발생시킵니다.
         """
         endpoint = "/v1/orders"
+        if self.validate_orders:
+            price, volume = self._prepare_limit_order(ticker, "ask", price, volume)
         request_body = {
             "market": ticker,
             "side": "ask",
@@ -256,6 +284,36 @@ class Bithumb:
         params = {"market": market}
         return self._request("GET", endpoint, params=params)
 
+    def get_order_chance_cached(self, market: str):
+        """
+        캐시된 주문 가능 정보 조회 (chance_ttl 동안 재사용)
+        
+        Parameters
+        ----------
+        market : str
+            마켓 ID (예: "KRW-BTC")
+        
+        Returns
+        -------
+        dict
+            주문 가능 정보 JSON
+        """
+        return self._chance_cache.get(market)
+
+    def _prepare_limit_order(self, ticker: str, side: str, price, volume):
+        """
+        지정가 주문의 가격/수량을 검증하고 전송용 문자열로 보정합니다.
+        
+        잔고 부족으로 실패한 경우 캐시가 오래되었을 수 있으므로 한 번 새로 조회한 뒤 다시 검증합니다.
+        """
+        try:
+            price, volume = validate_limit_order(self._chance_cache.get(ticker), ticker, side, price, volume)
+        except OrderValidationError as e:
+            if e.reason != "insufficient_balance":
+                raise
+            price, volume = validate_limit_order(self._chance_cache.refresh(ticker), ticker, side, price, volume)
+        return format_decimal(price), format_decimal(volume)
+
     def get_order(self, uuid: str):
         """
         개별 주문 조회
@@ -360,6 +418,75 @@ class Bithumb:
         resp = requests.get(url, headers=headers)
         return self._handle_response(resp)
 
+    def iter_orders(self, market=None, uuids=None, state=None, states=None, limit=100, order_by='desc',
+                    start_page=1, prefetch=4, store=None, limiter=None):
+        """
+        주문 리스트를 모든 페이지에 걸쳐 순회하는 제너레이터.
+
+        호출한 쪽이 현재 페이지를 읽어 나가기 시작하면(두 번째 주문을 요청하면) 다음 페이지들을
+        현재 페이지 포함 최대 prefetch개까지 동시에 미리 요청하고, 페이지 순서대로 주문을 하나씩
+        반환합니다. limit보다 적은 주문이 담긴 페이지를 만나면 종료합니다.
+
+        Parameters
+        ----------
+        market, uuids, state, states, order_by
+            get_orders()와 동일
+        limit : int, optional (default 100)
+            페이지당 개수 (최대 100, 더 크면 100으로 조회)
+        start_page : int, optional (default 1)
+            순회를 시작할 페이지
+        prefetch : int, optional (default 4)
+            동시에 요청해 둘 최대 페이지 수
+        store : OrderStore, optional
+            지정 시 받아온 주문을 페이지 단위로 저장
+        limiter : RateLimiter, optional
+            지정 시 페이지 요청(미리 요청 포함)마다 토큰을 하나씩 사용
+
+        Yields
+        ------
+        dict
+            주문 정보
+        """
+        prefetch = max(1, int(prefetch))
+        # API 최대치보다 큰 limit으로 요청하면 100개만 오므로 마지막 페이지로 오인하지 않도록 제한
+        limit = max(1, min(int(limit), MAX_ORDERS_PER_PAGE))
+        pending = deque()
+        next_page = start_page
+
+        def fetch(page):
+            if limiter is not None:
+                limiter.acquire()
+            return self.get_orders(market=market, uuids=uuids, state=state, states=states,
+                                   page=page, limit=limit, order_by=order_by)
+
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            try:
+                pending.append(executor.submit(fetch, next_page))
+                next_page += 1
+
+                while pending:
+                    orders = pending.popleft().result() or []
+                    if store is not None and orders:
+                        store.upsert_many(orders)
+                    last_page = len(orders) < limit
+                    for index, order in enumerate(orders):
+                        yield order
+                        # 호출한 쪽이 이 페이지를 계속 읽을 때만 다음 페이지들을 미리 요청
+                        if index == 0 and not last_page:
+                            while len(pending) < prefetch - 1:
+                                pending.append(executor.submit(fetch, next_page))
+                                next_page += 1
+                    if last_page:
+                        break
+                    if not pending:
+                        # prefetch=1이거나 한 건짜리 페이지를 다 읽은 경우
+                        pending.append(executor.submit(fetch, next_page))
+                        next_page += 1
+            finally:
+                # 마지막 페이지 이후로 미리 요청해 둔 페이지는 버립니다.
+                for future in pending:
+                    future.cancel()
+
     def cancel_order(self, order_uuid: str):
         """
         주문 취소 접수
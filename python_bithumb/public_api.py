@@ -1,6 +1,21 @@
+import os
 import requests
+import numpy as np
 import pandas as pd
 import time
+from urllib.parse import urlencode
+
+try:
+    import orjson  # 설치되어 있으면 get_tickers 응답을 더 빠르게 디코딩
+except ImportError:
+    orjson = None
+
+# Public API 서버 주소 (set_base_url() > 환경변수 BITHUMB_BASE_URL > 기본값 순으로 사용)
+DEFAULT_BASE_URL = "https://api.bithumb.com"
+_base_url = None
+
+# 캔들 조회 1회(HTTP 요청 1번)로 받을 수 있는 최대 개수. get_ohlcv는 count가 더 크면 나눠서 요청
+MAX_CANDLES_PER_REQUEST = 200
 
 class BithumbAPIException(Exception):
     """Exception raised for Bithumb API errors.
@@ -48,8 +63,35 @@ def _handle_response(response):
     
     return response.json()
 
+def set_base_url(url: str = None):
+    """
+    Public API 요청을 보낼 서버 주소를 변경합니다.
+
+    로컬 시뮬레이터(python_bithumb.simulator) 등 다른 서버를 사용할 때 지정하며,
+    None을 넘기면 환경변수 BITHUMB_BASE_URL 또는 기본 주소로 되돌립니다.
+
+    Parameters
+    ----------
+    url : str, optional
+        서버 주소 (예: "http://127.0.0.1:8080")
+    """
+    global _base_url
+    _base_url = url.rstrip("/") if url else None
+
+def get_base_url() -> str:
+    """
+    현재 Public API 서버 주소를 반환합니다.
+    """
+    return (_base_url or os.getenv("BITHUMB_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+
+def ohlcv_request_count(count: int) -> int:
+    """
+    get_ohlcv(count=count)가 보내는 HTTP 요청 수 (속도 제한 토큰 수).
+    """
+    return max(1, -(-int(count) // MAX_CANDLES_PER_REQUEST))
+
 def get_ohlcv(ticker: str, interval: str = "day", count: int = 200, period: float = 0.1, to: str = None):
-    base_url = "https://api.bithumb.com/v1"
+    base_url = f"{get_base_url()}/v1"
 
     if interval == "day":
         endpoint = "candles/days"
@@ -70,7 +112,7 @@ def get_ohlcv(ticker: str, interval: str = "day", count: int = 200, period: floa
     else:
         endpoint = "candles/days"
 
-    max_count = 200
+    max_count = MAX_CANDLES_PER_REQUEST
     all_data = []
     remaining = count
     current_to = to
@@ -97,10 +139,16 @@ def get_ohlcv(ticker: str, interval: str = "day", count: int = 200, period: floa
         if remaining > 0:
             time.sleep(period)
 
-    if len(all_data) == 0:
+    return candles_to_frame(all_data)
+
+def candles_to_frame(candles) -> pd.DataFrame:
+    """
+    /v1/candles 응답(캔들 dict 목록)을 get_ohlcv와 같은 DataFrame으로 변환합니다.
+    """
+    if len(candles) == 0:
         return pd.DataFrame()
 
-    df = pd.DataFrame(all_data)
+    df = pd.DataFrame(candles)
     # ISO 8601 형식의 날짜 문자열을 datetime으로 변환
     df['candle_date_time_kst'] = pd.to_datetime(df['candle_date_time_kst'], format='%Y-%m-%dT%H:%M:%S')
     df.set_index('candle_date_time_kst', inplace=True)
@@ -116,7 +164,7 @@ def get_ohlcv(ticker: str, interval: str = "day", count: int = 200, period: floa
     return df
 
 def get_current_price(markets):
-    base_url = "https://api.bithumb.com/v1"
+    base_url = f"{get_base_url()}/v1"
     if isinstance(markets, list):
         market_str = ",".join(markets)
     else:
@@ -145,8 +193,100 @@ def get_current_price(markets):
             result[market] = float(item["trade_price"])
         return result
 
+# get_tickers 결과 컬럼 (/v1/ticker 응답 필드)
+TICKER_FLOAT_FIELDS = [
+    "opening_price", "high_price", "low_price", "trade_price", "prev_closing_price",
+    "change_price", "change_rate", "signed_change_price", "signed_change_rate", "trade_volume",
+    "acc_trade_price", "acc_trade_price_24h", "acc_trade_volume", "acc_trade_volume_24h",
+    "highest_52_week_price", "lowest_52_week_price",
+]
+TICKER_TIME_FIELDS = ["trade_timestamp", "timestamp"]
+TICKER_CHANGES = ["RISE", "EVEN", "FALL"]
+# 요청 URL 최대 길이 (대부분의 서버/프록시가 허용하는 8KB보다 여유 있게)
+MAX_URL_LENGTH = 7000
+
+def _ticker_chunks(url, markets, max_url_length, max_markets=None):
+    # URL 인코딩 후 길이(쉼표는 %2C)가 max_url_length를 넘지 않도록 마켓을 나눔
+    budget = max_url_length - len(url) - len("?markets=")
+    chunks, chunk, length = [], [], 0
+    for market in markets:
+        size = len(urlencode({"m": market})) - 2 + (3 if chunk else 0)
+        if chunk and (length + size > budget or (max_markets and len(chunk) >= max_markets)):
+            chunks.append(chunk)
+            chunk, length = [], 0
+            size -= 3
+        chunk.append(market)
+        length += size
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def _decode_tickers(response):
+    if orjson is not None and response.status_code == 200:
+        return orjson.loads(response.content)
+    return _handle_response(response)
+
+def get_tickers(markets=None, max_url_length: int = MAX_URL_LENGTH, max_markets: int = None) -> pd.DataFrame:
+    """
+    전체 또는 지정한 마켓의 현재가 정보를 타입이 정해진 표로 조회합니다.
+
+    URL 길이가 허용하는 만큼 마켓을 묶어 /v1/ticker를 최소 횟수로 호출하고(KRW 전체 마켓은 보통 1회),
+    JSON 디코딩으로 만든 행(dict) 목록을 한 번만 훑으며 필드별 열로 모은 뒤 NumPy 배열(float64, int64)로
+    변환합니다. 결과에는 행마다의 Python 객체 컬럼이 없습니다.
+
+    Parameters
+    ----------
+    markets : list of str, optional
+        마켓 코드 목록. 생략 시 get_market_all()의 전체 마켓 (조회 1회 추가)
+    max_url_length : int, optional (default 7000)
+        요청 URL 최대 길이
+    max_markets : int, optional
+        요청 1회당 최대 마켓 수
+
+    Returns
+    -------
+    pandas.DataFrame
+        market 인덱스(요청 순서). 가격/변동/거래량/거래대금 컬럼은 float64 (응답에 없으면 NaN),
+        trade_timestamp/timestamp는 UTC epoch 밀리초 int64 (없으면 0),
+        change는 "RISE"/"EVEN"/"FALL" 범주형
+    """
+    if markets is None:
+        markets = [item["market"] for item in get_market_all()]
+    elif isinstance(markets, str):
+        markets = [markets]
+    url = f"{get_base_url()}/v1/ticker"
+    rows = []
+    for chunk in _ticker_chunks(url, list(markets), max_url_length, max_markets):
+        data = _decode_tickers(requests.get(url, params={"markets": ",".join(chunk)}))
+        rows.extend(data if isinstance(data, list) else data.get("data", []))
+
+    # 요청 순서대로 정렬 (응답에 없는 마켓은 제외)
+    position = {market: i for i, market in enumerate(markets)}
+    rows.sort(key=lambda row: position.get(row.get("market"), len(position)))
+    floats = [(name, []) for name in TICKER_FLOAT_FIELDS]
+    times = [(name, []) for name in TICKER_TIME_FIELDS]
+    markets_column, changes = [], []
+    # 행을 한 번만 훑으며 필드별 열로 모음 (필드마다 전체 행을 다시 훑지 않음)
+    for row in rows:
+        get = row.get
+        markets_column.append(get("market"))
+        changes.append(get("change"))
+        for name, column in floats:
+            column.append(get(name))
+        for name, column in times:
+            column.append(get(name) or 0)
+    columns = {}
+    for name, column in floats:
+        # None(필드 없음)은 NaN으로 변환
+        columns[name] = np.array(column, dtype=np.float64)
+    for name, column in times:
+        columns[name] = np.array(column, dtype=np.int64)
+    columns["change"] = pd.Categorical(changes, categories=TICKER_CHANGES)
+    index = pd.Index(markets_column, name="market", dtype=str)
+    return pd.DataFrame(columns, index=index)
+
 def get_orderbook(markets):
-    base_url = "https://api.bithumb.com/v1"
+    base_url = f"{get_base_url()}/v1"
     if isinstance(markets, list):
         market_str = ",".join(markets)
     else:
@@ -198,7 +338,7 @@ def get_market_all():
         ...
     ]
     """
-    base_url = "https://api.bithumb.com/v1"
+    base_url = f"{get_base_url()}/v1"
     resp = requests.get(f"{base_url}/market/all")
     return _handle_response(resp)
 
@@ -221,7 +361,7 @@ def get_trades_ticks(market: str, to: str = None, count: int = 1, cursor: str =
       }
     ]
     """
-    base_url = "https://api.bithumb.com/v1"
+    base_url = f"{get_base_url()}/v1"
     params = {"market": market, "count": count}
     if to:
         params["to"] = to
@@ -247,6 +387,6 @@ def get_virtual_asset_warning():
       ...
     ]
     """
-    base_url = "https://api.bithumb.com/v1"
+    base_url = f"{get_base_url()}/v1"
     resp = requests.get(f"{base_url}/market/virtual_asset_warning")
     return _handle_response(resp)
\ No newline at end of file
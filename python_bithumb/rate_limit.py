@@ -0,0 +1,106 @@
+# rate_limit.py
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    여러 스레드/태스크가 공유하는 API 호출 속도 제한기.
+
+    GCRA(Generic Cell Rate Algorithm) 방식으로 초당 rate회 호출을 허용하며,
+    최대 burst회까지는 대기 없이 연속 호출할 수 있습니다.
+
+    Parameters
+    ----------
+    rate : float
+        초당 허용 호출 수
+    burst : int, optional (default 1)
+        대기 없이 허용되는 최대 연속 호출 수
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, int(burst))
+        self._interval = 1.0 / rate
+        self._tolerance = (self.burst - 1) * self._interval
+        self._tat = 0.0  # theoretical arrival time
+        self._lock = threading.Lock()
+
+    def reserve(self, now: float = None) -> float:
+        """
+        호출 슬롯 하나를 예약하고, 호출 전 기다려야 할 시간(초)을 반환합니다.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            tat = max(self._tat, now)
+            self._tat = tat + self._interval
+        return max(0.0, tat - now - self._tolerance)
+
+    def acquire(self):
+        """
+        호출 가능할 때까지 현재 스레드를 대기시킵니다.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """
+        호출 가능할 때까지 이벤트 루프를 막지 않고 대기합니다.
+        """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    여러 프로세스가 공유하는 API 호출 속도 제한기.
+
+    RateLimiter와 같은 GCRA 방식이며, 다음 허용 시각(TAT)을 공유 메모리(multiprocessing.Value)에
+    두어 프로세스 전체의 호출 수를 하나의 예산으로 제한합니다. 시각은 시스템 전역인
+    time.monotonic()을 사용합니다. 자식 프로세스에는 Process 인자로 전달하십시오.
+
+    Parameters
+    ----------
+    rate : float
+        초당 허용 호출 수 (모든 프로세스 합계)
+    burst : int, optional (default 1)
+        대기 없이 허용되는 최대 연속 호출 수
+    context : multiprocessing context, optional
+        공유 값을 만들 컨텍스트 (기본값: multiprocessing 기본 컨텍스트)
+    """
+
+    def __init__(self, rate: float, burst: int = 1, context=None):
+        super().__init__(rate, burst)
+        if context is None:
+            import multiprocessing as context
+        self._shared_tat = context.Value("d", 0.0)
+
+    def reserve(self, now: float = None) -> float:
+        if now is None:
+            now = time.monotonic()
+        with self._shared_tat.get_lock():
+            tat = max(self._shared_tat.value, now)
+            self._shared_tat.value = tat + self._interval
+        return max(0.0, tat - now - self._tolerance)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
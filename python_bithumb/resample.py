@@ -0,0 +1,268 @@
+# resample.py
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .candle_aggregator import COLUMNS, KST_OFFSET, parse_interval
+from .public_api import MAX_CANDLES_PER_REQUEST, get_ohlcv, ohlcv_request_count
+
+# 간격별 캔들 1개의 (최대) 분 수. month는 31일로 계산
+_MINUTES = {"day": 1440, "week": 7 * 1440, "month": 31 * 1440}
+_COMPARE = ("open", "high", "low", "close", "volume")
+
+
+def interval_minutes(interval: str) -> int:
+    """
+    캔들 1개가 덮는 최대 분 수 (minute1 캐시로 만들 수 있는지 판단할 때 사용).
+    """
+    kind, size = parse_interval(interval)
+    if kind == "time":
+        if size % 60:
+            raise ValueError(f"{interval} cannot be resampled from minute1 candles")
+        return int(size // 60)
+    if kind in _MINUTES:
+        return _MINUTES[kind]
+    raise ValueError(f"{interval} cannot be resampled from minute1 candles")
+
+
+def bucket_starts(ts: np.ndarray, interval: str) -> np.ndarray:
+    """
+    시각 배열(UTC epoch 초, int64)의 캔들 시작 시각 배열. candle_aggregator.bucket_start의 벡터 버전.
+    """
+    kind, size = parse_interval(interval)
+    ts = np.asarray(ts, dtype=np.int64)
+    if kind == "time":
+        return ts - ts % int(size)
+    kst = ts + KST_OFFSET
+    if kind == "day":
+        return kst - kst % 86400 - KST_OFFSET
+    if kind == "week":
+        days = kst // 86400
+        return (days - (days + 3) % 7) * 86400 - KST_OFFSET  # 1970-01-01은 목요일
+    if kind == "month":
+        months = kst.astype("datetime64[s]").astype("datetime64[M]")
+        return months.astype("datetime64[s]").astype(np.int64) - KST_OFFSET
+    raise ValueError(f"{interval} is not a time interval")
+
+
+def _epoch_seconds(index) -> np.ndarray:
+    # get_ohlcv 인덱스(KST naive datetime) -> UTC epoch 초
+    return index.values.astype("datetime64[s]").astype(np.int64) - KST_OFFSET
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    get_ohlcv 형식의 minute1 캔들을 더 긴 간격으로 합칩니다 (Bithumb KST 캔들 경계 기준).
+
+    open은 구간 첫 캔들의 시가, close는 마지막 캔들의 종가, high/low는 최대/최소,
+    volume/value는 합계입니다. 체결이 없어 비어 있는 구간의 캔들은 만들지 않습니다 (API와 동일).
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        minute1 캔들 (candle_date_time_kst 인덱스, 오름차순)
+    interval : str
+        만들 간격 ("minute3" ~ "minute240", "day", "week", "month")
+
+    Returns
+    -------
+    pandas.DataFrame
+        get_ohlcv와 같은 컬럼과 인덱스를 가진 캔들
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=COLUMNS, index=pd.DatetimeIndex([], name="candle_date_time_kst"))
+    interval_minutes(interval)
+    starts = bucket_starts(_epoch_seconds(df.index), interval)
+    first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    last = np.r_[first[1:] - 1, len(starts) - 1]
+    opens = df["open"].to_numpy(dtype=np.float64)
+    highs = df["high"].to_numpy(dtype=np.float64)
+    lows = df["low"].to_numpy(dtype=np.float64)
+    closes = df["close"].to_numpy(dtype=np.float64)
+    volumes = df["volume"].to_numpy(dtype=np.float64)
+    values = df["value"].to_numpy(dtype=np.float64) if "value" in df else closes * volumes
+    bucket = starts[first]
+    index = pd.DatetimeIndex((bucket + KST_OFFSET).astype("datetime64[s]").astype("datetime64[ns]"),
+                             name="candle_date_time_kst")
+    out = pd.DataFrame({
+        "market": df["market"].to_numpy()[first] if "market" in df else None,
+        "candle_date_time_utc": pd.DatetimeIndex(bucket.astype("datetime64[s]").astype("datetime64[ns]"))
+        .strftime("%Y-%m-%dT%H:%M:%S"),
+        "open": opens[first],
+        "high": np.maximum.reduceat(highs, first),
+        "low": np.minimum.reduceat(lows, first),
+        "close": closes[last],
+        "timestamp": df["timestamp"].to_numpy()[last] if "timestamp" in df else (bucket * 1000),
+        "value": np.add.reduceat(values, first),
+        "volume": np.add.reduceat(volumes, first),
+    }, index=index)
+    return out
+
+
+class OHLCVResampler:
+    """
+    minute1 캐시에서 더 긴 간격의 캔들을 로컬로 만드는 get_ohlcv 대체 계층.
+
+    티커별 minute1 캔들을 max_minutes개까지 보관하고 refresh()로 최근 update_count개만 받아
+    갱신합니다. get_ohlcv(ticker, interval, count)는 캐시가 요청 구간을 모두 덮으면 로컬에서
+    합쳐 반환하고, 덮지 못하면(캐시 시작 이전 구간이 필요한 경우) API를 호출합니다. 최근 캔들이
+    캐시와 겹치지 않으면(공백) 더 많이 조회하거나 캐시를 다시 채웁니다.
+    간격마다 처음 한 번은 API 결과와 비교(verify)하여 다르면 그 간격은 API만 사용합니다.
+
+    Parameters
+    ----------
+    ohlcv_fn : callable, optional
+        캔들 조회 함수 (기본값: python_bithumb.get_ohlcv)
+    max_minutes : int, optional (default 1440)
+        티커별로 보관할 minute1 캔들 개수
+    update_count : int, optional (default 3)
+        refresh() 때 조회할 최근 minute1 캔들 개수
+    max_age : float, optional
+        get_ohlcv 호출 시 캐시가 이 시간(초)보다 오래되었으면 먼저 refresh(). None이면 자동 갱신 안 함
+    verify : bool, optional (default True)
+        간격별 첫 사용 시 API 결과와 비교 검증 여부
+    verify_count : int, optional (default 5)
+        검증 시 비교할 최근 캔들 개수
+    rtol : float, optional (default 1e-6)
+        검증 허용 상대 오차 (거래량 합계의 부동소수점 오차)
+    limiter : RateLimiter, optional
+        공유 API 속도 제한기. 갱신/검증/대체 조회 모두 HTTP 요청(200개 단위 페이지)마다 하나씩 사용
+    """
+
+    def __init__(self, ohlcv_fn=None, max_minutes=1440, update_count=3, max_age=None, verify=True, verify_count=5,
+                 rtol=1e-6, limiter=None):
+        self._ohlcv_fn = ohlcv_fn or get_ohlcv
+        self._limiter = limiter
+        self.max_minutes = max_minutes
+        self.update_count = update_count
+        self.max_age = max_age
+        self.verify_enabled = verify
+        self.verify_count = verify_count
+        self.rtol = rtol
+        self._minutes = {}
+        self._refreshed_at = {}
+        self._lock = threading.Lock()
+        self.verified = {}
+        self.api_calls = 0
+        self.local_hits = 0
+        self.fallbacks = 0
+
+    def _fetch(self, ticker, interval, count):
+        # get_ohlcv는 200개씩 나눠 요청하므로 페이지 수만큼 토큰을 먼저 받음
+        pages = ohlcv_request_count(count)
+        if self._limiter is not None:
+            for _ in range(pages):
+                self._limiter.acquire()
+        self.api_calls += pages
+        return self._ohlcv_fn(ticker, interval=interval, count=count)
+
+    def refresh(self, ticker: str) -> pd.DataFrame:
+        """
+        티커의 minute1 캐시를 갱신합니다. 처음이거나 최근 캔들이 캐시와 겹치지 않으면(공백) 다시 채웁니다.
+        """
+        cached = self._minutes.get(ticker)
+        if cached is not None and not cached.empty:
+            # 거래가 뜸한 마켓은 최근 몇 개로 겹치지 않을 수 있으므로 한 페이지(200개)까지 늘려 조회
+            for count in dict.fromkeys((self.update_count, min(MAX_CANDLES_PER_REQUEST, self.max_minutes))):
+                latest = self._fetch(ticker, "minute1", count)
+                if latest is None or latest.empty or latest.index[0] > cached.index[-1]:
+                    continue
+                merged = pd.concat([cached[cached.index < latest.index[0]], latest])
+                return self._store(ticker, merged.iloc[-self.max_minutes:])
+        seeded = self._fetch(ticker, "minute1", self.max_minutes)
+        return self._store(ticker, seeded if seeded is not None else pd.DataFrame())
+
+    def _store(self, ticker, minutes):
+        with self._lock:
+            self._minutes[ticker] = minutes
+            self._refreshed_at[ticker] = time.monotonic()
+        return minutes
+
+    def minutes(self, ticker: str):
+        """
+        티커의 minute1 캐시 (없으면 None).
+        """
+        return self._minutes.get(ticker)
+
+    def tickers(self) -> set:
+        """
+        minute1 캐시를 보관 중인 티커 집합.
+        """
+        return set(self._minutes)
+
+    def discard(self, ticker: str):
+        with self._lock:
+            self._minutes.pop(ticker, None)
+            self._refreshed_at.pop(ticker, None)
+
+    def resample(self, ticker: str, interval: str, count: int = None):
+        """
+        캐시로 만든 캔들 중 캐시가 구간 전체를 덮는 캔들만 반환합니다. 캐시가 없으면 None.
+        """
+        minutes = self._minutes.get(ticker)
+        if minutes is None or minutes.empty:
+            return None
+        if interval == "minute1":
+            bars = minutes
+        else:
+            bars = resample_ohlcv(minutes, interval)
+            # 캐시 시작 시각 이전부터 시작하는 첫 캔들은 일부 구간만 덮으므로 제외
+            if len(bars) and bars.index[0] < minutes.index[0]:
+                bars = bars.iloc[1:]
+        return bars.iloc[-count:] if count else bars
+
+    def verify(self, ticker: str, interval: str, count: int = None) -> bool:
+        """
+        로컬로 만든 캔들을 API 캔들과 비교합니다. 겹치는 마감 캔들의 OHLCV가 모두 같으면 True.
+        """
+        count = count or self.verify_count
+        local = self.resample(ticker, interval)
+        remote = self._fetch(ticker, interval, count + 1)
+        if local is None or remote is None or remote.empty:
+            return False
+        # 진행 중인 마지막 캔들은 조회 시점 차이로 다를 수 있으므로 제외
+        common = local.index[:-1].intersection(remote.index[:-1])
+        if len(common) == 0:
+            return False
+        a = local.loc[common, list(_COMPARE)].to_numpy(dtype=np.float64)
+        b = remote.loc[common, list(_COMPARE)].to_numpy(dtype=np.float64)
+        return bool(np.allclose(a, b, rtol=self.rtol, atol=0.0))
+
+    def get_ohlcv(self, ticker: str, interval: str = "day", count: int = 200, refresh: bool = False):
+        """
+        get_ohlcv와 같은 결과를 가능하면 minute1 캐시로 만들어 반환합니다.
+
+        Parameters
+        ----------
+        ticker : str
+            마켓 코드
+        interval : str, optional (default "day")
+            캔들 간격
+        count : int, optional (default 200)
+            캔들 개수
+        refresh : bool, optional (default False)
+            True이면 먼저 minute1 캐시를 갱신
+        """
+        stale = self.max_age is not None and \
+            time.monotonic() - self._refreshed_at.get(ticker, float("-inf")) > self.max_age
+        if refresh or stale or ticker not in self._minutes:
+            self.refresh(ticker)
+        try:
+            covered = interval_minutes(interval) * count <= self.max_minutes
+        except ValueError:
+            covered = False
+        if covered and self.verify_enabled and interval != "minute1" and interval not in self.verified:
+            self.verified[interval] = self.verify(ticker, interval)
+        if covered and self.verified.get(interval, True):
+            bars = self.resample(ticker, interval, count)
+            if bars is not None and len(bars) >= count:
+                self.local_hits += 1
+                return bars
+        self.fallbacks += 1
+        return self._fetch(ticker, interval, count)
+
+    def stats(self) -> dict:
+        return {"api_calls": self.api_calls, "local_hits": self.local_hits, "fallbacks": self.fallbacks,
+                "verified": dict(self.verified)}
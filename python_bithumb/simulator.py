@@ -0,0 +1,986 @@
+# simulator.py
+"""
+로컬 거래소 시뮬레이터
+
+실제 자금 없이 라이브러리와 봇을 부하 테스트할 수 있도록 빗썸 /v1 REST API 일부를
+흉내 내는 HTTP 서버입니다. 마켓별 주문장(가격-시간 우선 매칭), 계정 잔고, 무작위 보행으로
+움직이는 가상 유동성(호가/체결/캔들)을 가지며, Bithumb._create_token이 만드는 JWT
+(서명, nonce, query_hash)를 검증합니다.
+
+지원 엔드포인트:
+    GET    /v1/accounts, /v1/orders, /v1/order, /v1/orders/chance
+    POST   /v1/orders
+    DELETE /v1/order
+    GET    /v1/orderbook, /v1/ticker, /v1/candles/{minutes/N, days, weeks, months},
+           /v1/trades/ticks, /v1/market/all
+    GET    /sim/stats (요청 수/처리량)
+
+사용 예:
+    python -m python_bithumb.simulator --port 8080 --secret test-secret
+
+    import python_bithumb
+    python_bithumb.set_base_url("http://127.0.0.1:8080")
+    bithumb = python_bithumb.Bithumb("any-access-key", "test-secret", base_url="http://127.0.0.1:8080")
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from bisect import insort
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import jwt
+import numpy as np
+
+from .order_rules import get_tick_size
+
+# 기본 마켓과 시작 가격
+DEFAULT_MARKETS = {
+    "KRW-BTC": 90_000_000,
+    "KRW-ETH": 4_000_000,
+    "KRW-XRP": 800,
+    "KRW-USDT": 1_400,
+}
+
+KST_OFFSET = 9 * 3600
+# 분봉 단위(분)
+MINUTE_UNITS = (1, 3, 5, 10, 15, 30, 60, 240)
+
+
+class SimulatorError(Exception):
+    """
+    API 오류 응답으로 변환되는 예외 ({"error": {"name": ..., "message": ...}}).
+    """
+
+    def __init__(self, status, name, message):
+        self.status = status
+        self.name = name
+        self.message = message
+        super().__init__(f"{name}: {message}")
+
+
+def _kst(ts: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ts + KST_OFFSET))
+
+
+def _utc(ts: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ts))
+
+
+def _parse_kst(text: str) -> float:
+    """
+    "YYYY-MM-DDTHH:MM:SS" 또는 "YYYY-MM-DD HH:MM:SS"(KST)를 epoch 초로 변환합니다.
+    """
+    text = text.replace("T", " ")[:19]
+    return float(np.datetime64(text.replace(" ", "T"), "s").astype(np.int64)) - KST_OFFSET
+
+
+def _tick(price: float) -> float:
+    return float(get_tick_size(price))
+
+
+class _Account:
+    def __init__(self, access_key, secret_key, balances):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        # 화폐 -> [balance, locked, avg_buy_price]
+        self.balances = {currency: [float(amount), 0.0, 0.0] for currency, amount in balances.items()}
+        self._nonces = set()
+        self._nonce_order = deque()
+
+    def wallet(self, currency):
+        return self.balances.setdefault(currency, [0.0, 0.0, 0.0])
+
+    def use_nonce(self, nonce, keep=100_000):
+        if nonce in self._nonces:
+            return False
+        self._nonces.add(nonce)
+        self._nonce_order.append(nonce)
+        if len(self._nonce_order) > keep:
+            self._nonces.discard(self._nonce_order.popleft())
+        return True
+
+
+class _Market:
+    """
+    마켓 하나의 가상 시세, 주문장, 분봉.
+    """
+
+    def __init__(self, market, price, rng, volatility, history, now):
+        self.market = market
+        self.mid = float(price)
+        self.last_price = float(price)
+        self.bids = {}  # 가격 -> deque(주문)
+        self.asks = {}
+        self.bid_prices = []  # 오름차순
+        self.ask_prices = []
+        self.trades = deque(maxlen=1000)
+        self.acc_volume = 0.0
+        self.acc_value = 0.0
+        # 분봉: [시작 시각, 시가, 고가, 저가, 종가, 거래량, 거래대금]
+        self.bars = []
+        self._seed_history(rng, volatility, history, now)
+
+    def _seed_history(self, rng, volatility, history, now):
+        minute = math.floor(now / 60) * 60
+        steps = rng.normal(0, volatility * math.sqrt(60), size=history)
+        closes = self.mid * np.exp(np.cumsum(steps[::-1])[::-1] * -1)
+        opens = np.r_[closes[0], closes[:-1]]
+        spread = np.abs(rng.normal(0, volatility * math.sqrt(60), size=history)) * closes
+        volumes = rng.uniform(1, 10, size=history) * 1e6 / self.mid
+        starts = minute - (history - np.arange(history)) * 60
+        highs = np.maximum(opens, closes) + spread
+        lows = np.minimum(opens, closes) - spread
+        self.bars = np.column_stack([starts, opens, highs, lows, closes, volumes, volumes * closes]).tolist()
+
+    def record(self, ts, price, volume):
+        minute = math.floor(ts / 60) * 60
+        bar = self.bars[-1] if self.bars else None
+        if bar is None or bar[0] < minute:
+            self.bars.append([minute, price, price, price, price, volume, volume * price])
+            if len(self.bars) > 20_000:
+                del self.bars[:5_000]
+        else:
+            bar[2] = max(bar[2], price)
+            bar[3] = min(bar[3], price)
+            bar[4] = price
+            bar[5] += volume
+            bar[6] += volume * price
+        self.last_price = price
+        self.acc_volume += volume
+        self.acc_value += volume * price
+
+    def synthetic_best(self, mid=None):
+        mid = self.mid if mid is None else mid
+        tick = _tick(mid)
+        best_bid = math.floor(mid / tick) * tick
+        return best_bid, best_bid + tick, tick
+
+    def add_resting(self, order):
+        price = order["_price"]
+        book, prices = (self.bids, self.bid_prices) if order["side"] == "bid" else (self.asks, self.ask_prices)
+        if price not in book:
+            book[price] = deque()
+            insort(prices, price)
+        book[price].append(order)
+
+    def remove_resting(self, order):
+        price = order["_price"]
+        book, prices = (self.bids, self.bid_prices) if order["side"] == "bid" else (self.asks, self.ask_prices)
+        queue = book.get(price)
+        if queue is None:
+            return
+        try:
+            queue.remove(order)
+        except ValueError:
+            return
+        if not queue:
+            del book[price]
+            prices.remove(price)
+
+
+class ExchangeSimulator:
+    """
+    시뮬레이터 상태(시세, 주문장, 계정)와 API 처리 로직. 스레드 안전합니다.
+
+    Parameters
+    ----------
+    markets : dict or list, optional
+        마켓 -> 시작 가격. 목록이면 DEFAULT_MARKETS의 가격 또는 10,000원으로 시작
+    accounts : dict, optional
+        access_key -> secret_key
+    default_secret : str, optional
+        지정 시 이 secret으로 서명한 JWT의 access_key는 처음 요청할 때 계정을 자동 생성
+    initial_balances : dict, optional
+        새 계정의 시작 잔고 (기본값 {"KRW": 1,000,000,000})
+    seed : int, optional (default 0)
+        난수 시드
+    speed : float, optional (default 1.0)
+        실제 1초당 진행할 가상 시간(초)
+    volatility : float, optional (default 0.0005)
+        가상 시세의 초당 로그 수익률 표준편차
+    fee : float, optional (default 0.0025)
+        매수/매도 수수료율
+    min_total : float, optional (default 5000)
+        최소 주문 금액(원)
+    depth_levels : int, optional (default 15)
+        호가 조회 시 반환할 단계 수
+    depth_krw : float, optional (default 50,000,000)
+        가상 유동성의 호가 단계별 금액(원)
+    history : int, optional (default 2000)
+        시작 시 만들어 둘 과거 분봉 개수
+    """
+
+    def __init__(self, markets=None, accounts=None, default_secret=None, initial_balances=None, seed=0,
+                 speed=1.0, volatility=0.0005, fee=0.0025, min_total=5000, depth_levels=15,
+                 depth_krw=50_000_000, history=2000):
+        if markets is None:
+            markets = dict(DEFAULT_MARKETS)
+        elif not isinstance(markets, dict):
+            markets = {m: DEFAULT_MARKETS.get(m, 10_000) for m in markets}
+        self._rng = np.random.default_rng(seed)
+        self.speed = speed
+        self.volatility = volatility
+        self.fee = fee
+        self.min_total = min_total
+        self.depth_levels = depth_levels
+        self.depth_krw = depth_krw
+        self.default_secret = default_secret
+        self.initial_balances = dict(initial_balances or {"KRW": 1_000_000_000})
+        self._wall_start = time.time()
+        self._sim_start = self._wall_start
+        self._sim_now = self._wall_start
+        self.markets = {m: _Market(m, p, self._rng, volatility, history, self._sim_now) for m, p in markets.items()}
+        self.accounts = {}
+        for access_key, secret_key in (accounts or {}).items():
+            self.add_account(access_key, secret_key)
+        self.orders = {}
+        self._lock = threading.RLock()
+        self._advance_lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self.stats = Counter()
+
+    # ------------------------------------------------------------------
+    # 계정/인증
+    # ------------------------------------------------------------------
+    def add_account(self, access_key, secret_key, balances=None):
+        """
+        계정을 추가합니다. balances 생략 시 initial_balances로 시작합니다.
+        """
+        account = _Account(access_key, secret_key, balances if balances is not None else self.initial_balances)
+        self.accounts[access_key] = account
+        return account
+
+    def authenticate(self, authorization, query):
+        """
+        Authorization 헤더의 JWT를 검증하고 계정을 반환합니다.
+
+        Parameters
+        ----------
+        authorization : str
+            "Bearer {token}"
+        query : str
+            query_hash 대상 문자열 (GET/DELETE는 원본 쿼리 문자열, POST는 body의 urlencode)
+        """
+        if not authorization or not authorization.startswith("Bearer "):
+            raise SimulatorError(401, "jwt_verification", "Authorization header is missing")
+        token = authorization[len("Bearer "):]
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False})
+        except jwt.PyJWTError as e:
+            raise SimulatorError(401, "jwt_verification", str(e))
+        access_key = claims.get("access_key")
+        with self._lock:
+            account = self.accounts.get(access_key)
+            if account is None and self.default_secret is not None and access_key:
+                account = self.add_account(access_key, self.default_secret)
+        if account is None:
+            raise SimulatorError(401, "invalid_access_key", "unknown access key")
+        try:
+            jwt.decode(token, account.secret_key, algorithms=["HS256"])
+        except jwt.PyJWTError as e:
+            raise SimulatorError(401, "jwt_verification", str(e))
+
+        if query:
+            if claims.get("query_hash_alg", "SHA512") != "SHA512":
+                raise SimulatorError(401, "invalid_query_payload", "unsupported query_hash_alg")
+            # 클라이언트가 uuids[]/states[]의 대괄호를 퍼센트 인코딩해 보내는 경우도 허용
+            candidates = {query, query.replace("%5B", "[").replace("%5D", "]")}
+            hashes = {hashlib.sha512(candidate.encode()).hexdigest() for candidate in candidates}
+            if claims.get("query_hash") not in hashes:
+                raise SimulatorError(401, "invalid_query_payload", "query_hash does not match")
+        with self._lock:
+            if not account.use_nonce(claims.get("nonce")):
+                raise SimulatorError(401, "nonce_used", "nonce already used")
+        return account
+
+    # ------------------------------------------------------------------
+    # 가상 시세
+    # ------------------------------------------------------------------
+    @property
+    def now(self):
+        return self._sim_now
+
+    def advance(self, seconds=None):
+        """
+        가상 시간을 진행시키며 시세를 움직이고, 가상 유동성에 닿은 미체결 주문을 체결합니다.
+
+        Parameters
+        ----------
+        seconds : float, optional
+            진행할 가상 시간(초). 생략 시 실제 경과 시간 x speed만큼 진행
+        """
+        # 진행은 한 스레드씩. 실제 시간으로 진행할 때 다른 스레드가 이미 진행 중이면 기다리지 않음
+        if not self._advance_lock.acquire(blocking=seconds is not None):
+            return
+        try:
+            with self._lock:
+                if seconds is None:
+                    target = self._sim_start + (time.time() - self._wall_start) * self.speed
+                else:
+                    target = self._sim_now + seconds
+                    self._sim_start += seconds  # 이후 실제 시간 진행과 겹치지 않도록
+                start = self._sim_now
+                steps = min(int(target - start), 3600)
+                if steps <= 0:
+                    return
+                markets = list(self.markets.values())
+                noise = self._rng.normal(0, self.volatility, size=(len(markets), steps))
+                volumes = self._rng.uniform(0, 2, size=(len(markets), steps))
+                paths = np.array([market.mid for market in markets])[:, None] * np.exp(np.cumsum(noise, axis=1))
+                volumes = (volumes * 1e5 / paths).tolist()
+                paths = paths.tolist()
+            # 1초 단위로 잠금을 풀어, 긴 구간을 진행하는 동안에도 다른 요청(호가/주문)이 처리되도록 함
+            for k in range(steps):
+                with self._lock:
+                    now = start + k + 1
+                    for row, market in enumerate(markets):
+                        price = paths[row][k]
+                        market.record(now, price, volumes[row][k])
+                        market.mid = price
+                        if market.bid_prices or market.ask_prices:
+                            self._match_synthetic(market, price, price)
+                    self._sim_now = now
+            with self._lock:
+                self._sim_now = max(self._sim_now, target)
+        finally:
+            self._advance_lock.release()
+
+    def _match_synthetic(self, market, low, high):
+        # 시세가 내려가 가상 매도호가가 매수 주문 가격에 닿으면 체결
+        _, ask_at_low, _ = market.synthetic_best(low)
+        while market.bid_prices and market.bid_prices[-1] >= ask_at_low:
+            price = market.bid_prices[-1]
+            for order in list(market.bids[price]):
+                self._execute(order, price, order["_remaining"], market)
+        bid_at_high, _, _ = market.synthetic_best(high)
+        while market.ask_prices and market.ask_prices[0] <= bid_at_high:
+            price = market.ask_prices[0]
+            for order in list(market.asks[price]):
+                self._execute(order, price, order["_remaining"], market)
+
+    def _market(self, name):
+        market = self.markets.get(name)
+        if market is None:
+            raise SimulatorError(404, "market_not_found", f"market {name} does not exist")
+        return market
+
+    # ------------------------------------------------------------------
+    # 주문 처리
+    # ------------------------------------------------------------------
+    def _new_order(self, account, market, side, ord_type, price, volume):
+        order_uuid = str(uuid.uuid4())
+        order = {
+            "uuid": order_uuid,
+            "side": side,
+            "ord_type": ord_type,
+            "price": None if price is None else format(Decimal(str(price)).normalize(), "f"),
+            "state": "wait",
+            "market": market.market,
+            "created_at": _kst(self._sim_now) + "+09:00",
+            "volume": None if volume is None else str(volume),
+            "remaining_volume": None if volume is None else str(volume),
+            "reserved_fee": "0",
+            "remaining_fee": "0",
+            "paid_fee": "0",
+            "locked": "0",
+            "executed_volume": "0",
+            "trades_count": 0,
+            "trades": [],
+            "_account": account,
+            "_price": None if price is None else float(price),
+            "_remaining": None if volume is None else float(volume),
+            "_locked": 0.0,
+            "_seq": next(self._sequence),
+        }
+        self.orders[order_uuid] = order
+        return order
+
+    def _execute(self, order, price, volume, market, record=True):
+        """
+        주문 하나를 price에 volume만큼 체결하고 잔고를 정산합니다.
+
+        사용자 주문끼리 체결되면 양쪽을 각각 정산하므로 체결 기록(record)은 한쪽에서만 남깁니다.
+        """
+        account = order["_account"]
+        base, quote = market.market.split("-")[1], market.market.split("-")[0]
+        funds = price * volume
+        fee = funds * self.fee
+        coin = account.wallet(base)
+        cash = account.wallet(quote)
+        if order["side"] == "bid":
+            cost = funds + fee
+            cash[1] -= cost
+            order["_locked"] -= cost
+            held = coin[0] + coin[1]
+            coin[2] = (coin[2] * held + funds) / (held + volume) if held + volume > 0 else 0.0
+            coin[0] += volume
+        else:
+            coin[1] -= volume
+            order["_locked"] -= volume
+            cash[0] += funds - fee
+        order["trades"].append({
+            "market": market.market,
+            "uuid": str(uuid.uuid4()),
+            "price": str(price),
+            "volume": str(volume),
+            "funds": str(funds),
+            "side": order["side"],
+            "created_at": _kst(self._sim_now) + "+09:00",
+        })
+        order["trades_count"] += 1
+        order["executed_volume"] = str(float(order["executed_volume"]) + volume)
+        order["paid_fee"] = str(float(order["paid_fee"]) + fee)
+        if order["_remaining"] is not None:
+            order["_remaining"] = max(order["_remaining"] - volume, 0.0)
+            order["remaining_volume"] = str(order["_remaining"])
+            if order["_remaining"] <= 1e-12:
+                order["_remaining"] = 0.0
+                order["remaining_volume"] = "0"
+                self._finish(order, market)
+        if record:
+            market.record(self._sim_now, price, volume)
+            market.trades.append((self._sim_now, price, volume, "ASK" if order["side"] == "bid" else "BID"))
+        self.stats["fills"] += 1
+
+    def _finish(self, order, market, state="done"):
+        if order["_price"] is not None:
+            market.remove_resting(order)
+        # 남은 잠금 금액/수량 해제
+        if order["_locked"] > 1e-9:
+            account = order["_account"]
+            currency = market.market.split("-")[0] if order["side"] == "bid" else market.market.split("-")[1]
+            wallet = account.wallet(currency)
+            wallet[1] -= order["_locked"]
+            wallet[0] += order["_locked"]
+        order["_locked"] = 0.0
+        order["locked"] = "0"
+        order["state"] = state
+
+    def _match_incoming(self, order, market, limit=None, budget=None):
+        """
+        새 주문을 상대편 미체결 주문(가격-시간 우선)과 가상 유동성에 매칭합니다.
+
+        limit: 지정가 (None이면 시장가), budget: 시장가 매수 금액
+        """
+        side = order["side"]
+        best_bid, best_ask, tick = market.synthetic_best()
+        level_size = self.depth_krw / max(market.mid, 1e-9)
+        synthetic_level = 0
+        while True:
+            remaining = order["_remaining"] if budget is None else budget
+            if remaining is None or remaining <= 1e-12:
+                break
+            synthetic_price = (best_ask + synthetic_level * tick) if side == "bid" else (best_bid - synthetic_level * tick)
+            if side == "bid":
+                book_price = market.ask_prices[0] if market.ask_prices else None
+                price = min(p for p in (book_price, synthetic_price) if p is not None)
+                if limit is not None and price > limit:
+                    break
+            else:
+                book_price = market.bid_prices[-1] if market.bid_prices else None
+                price = max(p for p in (book_price, synthetic_price) if p is not None)
+                if limit is not None and price < limit:
+                    break
+                if price <= 0:
+                    break
+            if book_price is not None and book_price == price:
+                resting = market.asks[price][0] if side == "bid" else market.bids[price][0]
+                volume = resting["_remaining"]
+                volume = min(volume, remaining if budget is None else budget / (price * (1 + self.fee)))
+                self._execute(resting, price, volume, market, record=False)
+            else:
+                volume = level_size if budget is None else budget / (price * (1 + self.fee))
+                volume = min(volume, level_size, remaining) if budget is None else min(volume, level_size)
+                synthetic_level += 1
+            if budget is not None:
+                order["_remaining"] = None
+                budget -= price * volume * (1 + self.fee)
+                self._execute(order, price, volume, market)
+                order["_budget"] = budget
+            else:
+                self._execute(order, price, volume, market)
+
+    def _lock_funds(self, account, currency, amount, name):
+        wallet = account.wallet(currency)
+        if amount > wallet[0] + 1e-9:
+            raise SimulatorError(400, name, f"insufficient {currency} balance: {wallet[0]} < {amount}")
+        wallet[0] -= amount
+        wallet[1] += amount
+
+    def place_order(self, account, body):
+        """
+        POST /v1/orders 처리.
+        """
+        market = self._market(body.get("market"))
+        side = body.get("side")
+        ord_type = body.get("ord_type")
+        if side not in ("bid", "ask"):
+            raise SimulatorError(400, "invalid_side", f"side must be bid or ask: {side}")
+        quote, base = market.market.split("-")
+        with self._lock:
+            if ord_type == "limit":
+                price, volume = float(body["price"]), float(body["volume"])
+                if price <= 0 or volume <= 0:
+                    raise SimulatorError(400, "invalid_parameter", "price and volume must be positive")
+                price_decimal = Decimal(str(body["price"]))
+                if price_decimal % get_tick_size(price_decimal) != 0:
+                    raise SimulatorError(400, "invalid_price", f"price {body['price']} does not match the tick size")
+                if price * volume < self.min_total:
+                    raise SimulatorError(400, f"under_min_total_{side}", f"order total must be >= {self.min_total}")
+                if side == "bid":
+                    amount = price * volume * (1 + self.fee)
+                    self._lock_funds(account, quote, amount, "insufficient_funds_bid")
+                else:
+                    amount = volume
+                    self._lock_funds(account, base, amount, "insufficient_funds_ask")
+                order = self._new_order(account, market, side, "limit", price, volume)
+                order["_locked"] = amount
+                self._match_incoming(order, market, limit=price)
+                if order["state"] == "wait":
+                    market.add_resting(order)
+            elif ord_type == "price" and side == "bid":
+                budget = float(body["price"])
+                if budget < self.min_total:
+                    raise SimulatorError(400, "under_min_total_bid", f"order total must be >= {self.min_total}")
+                self._lock_funds(account, quote, budget, "insufficient_funds_bid")
+                order = self._new_order(account, market, side, "price", budget, None)
+                order["_locked"] = budget
+                self._match_incoming(order, market, budget=budget)
+                self._finish(order, market, "cancel" if float(order["executed_volume"]) == 0 else "done")
+            elif ord_type == "market" and side == "ask":
+                volume = float(body["volume"])
+                if volume * market.mid < self.min_total:
+                    raise SimulatorError(400, "under_min_total_ask", f"order total must be >= {self.min_total}")
+                self._lock_funds(account, base, volume, "insufficient_funds_ask")
+                order = self._new_order(account, market, side, "market", None, volume)
+                order["_locked"] = volume
+                self._match_incoming(order, market)
+                if order["state"] == "wait":
+                    self._finish(order, market, "cancel")
+            else:
+                raise SimulatorError(400, "invalid_ord_type", f"unsupported ord_type {ord_type} for side {side}")
+            return self.public_order(order, trades=False)
+
+    def cancel_order(self, account, order_uuid):
+        """
+        DELETE /v1/order 처리.
+        """
+        with self._lock:
+            order = self.orders.get(order_uuid)
+            if order is None or order["_account"] is not account or order["state"] != "wait":
+                raise SimulatorError(404, "order_not_found", "주문을 찾지 못했습니다.")
+            self._finish(order, self.markets[order["market"]], "cancel")
+            return self.public_order(order, trades=False)
+
+    def get_order(self, account, order_uuid):
+        with self._lock:
+            order = self.orders.get(order_uuid)
+            if order is None or order["_account"] is not account:
+                raise SimulatorError(404, "order_not_found", "주문을 찾지 못했습니다.")
+            return self.public_order(order)
+
+    def list_orders(self, account, market=None, uuids=None, states=None, page=1, limit=100, order_by="desc"):
+        with self._lock:
+            orders = [o for o in self.orders.values() if o["_account"] is account]
+            if market:
+                orders = [o for o in orders if o["market"] == market]
+            if uuids:
+                wanted = set(uuids)
+                orders = [o for o in orders if o["uuid"] in wanted]
+            if states:
+                orders = [o for o in orders if o["state"] in states]
+            else:
+                orders = [o for o in orders if o["state"] == "wait"]
+            orders.sort(key=lambda o: o["_seq"], reverse=order_by != "asc")
+            limit = max(1, min(int(limit), 100))
+            start = (max(int(page), 1) - 1) * limit
+            return [self.public_order(o, trades=False) for o in orders[start:start + limit]]
+
+    @staticmethod
+    def public_order(order, trades=True):
+        result = {k: v for k, v in order.items() if not k.startswith("_") and (trades or k != "trades")}
+        if trades:
+            result["trades"] = list(order["trades"])
+        return result
+
+    def accounts_view(self, account):
+        with self._lock:
+            return [
+                {
+                    "currency": currency,
+                    "balance": format(balance, ".8f"),
+                    "locked": format(max(locked, 0.0), ".8f"),
+                    "avg_buy_price": format(avg, ".8f"),
+                    "avg_buy_price_modified": False,
+                    "unit_currency": "KRW",
+                }
+                for currency, (balance, locked, avg) in account.balances.items()
+            ]
+
+    def order_chance(self, account, market_name):
+        self._market(market_name)  # 없는 마켓이면 404
+        quote, base = market_name.split("-")
+        with self._lock:
+            views = {item["currency"]: item for item in self.accounts_view(account)}
+        empty = {"balance": "0", "locked": "0", "avg_buy_price": "0", "avg_buy_price_modified": False,
+                 "unit_currency": "KRW"}
+        return {
+            "bid_fee": str(self.fee),
+            "ask_fee": str(self.fee),
+            "maker_bid_fee": str(self.fee),
+            "maker_ask_fee": str(self.fee),
+            "market": {
+                "id": market_name,
+                "name": f"{base}/{quote}",
+                "order_types": ["limit", "price", "market"],
+                "ask_types": ["limit", "market"],
+                "bid_types": ["limit", "price"],
+                "order_sides": ["ask", "bid"],
+                "bid": {"currency": quote, "min_total": str(self.min_total)},
+                "ask": {"currency": quote, "min_total": str(self.min_total)},
+                "max_total": "1000000000",
+                "state": "active",
+            },
+            "bid_account": views.get(quote, dict(empty, currency=quote)),
+            "ask_account": views.get(base, dict(empty, currency=base)),
+        }
+
+    # ------------------------------------------------------------------
+    # 시세 조회
+    # ------------------------------------------------------------------
+    def orderbook(self, market_name):
+        market = self._market(market_name)
+        with self._lock:
+            best_bid, best_ask, tick = market.synthetic_best()
+            level_size = self.depth_krw / market.mid
+            levels = self.depth_levels
+            asks = {round(best_ask + k * tick, 8): level_size for k in range(levels)}
+            bids = {round(best_bid - k * tick, 8): level_size for k in range(levels) if best_bid - k * tick > 0}
+            for price, queue in market.asks.items():
+                asks[price] = asks.get(price, 0.0) + sum(o["_remaining"] for o in queue)
+            for price, queue in market.bids.items():
+                bids[price] = bids.get(price, 0.0) + sum(o["_remaining"] for o in queue)
+            ask_prices = sorted(asks)[:levels]
+            bid_prices = sorted(bids, reverse=True)[:levels]
+        units = [
+            {"ask_price": ask, "bid_price": bid, "ask_size": asks[ask], "bid_size": bids[bid]}
+            for ask, bid in zip(ask_prices, bid_prices)
+        ]
+        return {
+            "market": market_name,
+            "timestamp": int(self._sim_now * 1000),
+            "total_ask_size": sum(u["ask_size"] for u in units),
+            "total_bid_size": sum(u["bid_size"] for u in units),
+            "orderbook_units": units,
+        }
+
+    def ticker(self, market_name):
+        market = self._market(market_name)
+        with self._lock:
+            day = self._aggregate(market, 86400, 2, None)
+            today = day[0] if day else None
+            previous = day[1]["trade_price"] if len(day) > 1 else market.bars[0][1]
+            price = market.last_price
+        return {
+            "market": market_name,
+            "trade_date": _utc(self._sim_now)[:10].replace("-", ""),
+            "trade_time": _utc(self._sim_now)[11:].replace(":", ""),
+            "trade_timestamp": int(self._sim_now * 1000),
+            "opening_price": today["opening_price"] if today else price,
+            "high_price": today["high_price"] if today else price,
+            "low_price": today["low_price"] if today else price,
+            "trade_price": price,
+            "prev_closing_price": previous,
+            "change": "EVEN" if price == previous else ("RISE" if price > previous else "FALL"),
+            "change_price": abs(price - previous),
+            "change_rate": abs(price - previous) / previous if previous else 0.0,
+            "trade_volume": market.trades[-1][2] if market.trades else 0.0,
+            "acc_trade_volume": market.acc_volume,
+            "acc_trade_price": market.acc_value,
+            "timestamp": int(self._sim_now * 1000),
+        }
+
+    def _aggregate(self, market, seconds, count, to, month=False):
+        """
+        분봉을 묶어 최신순 캔들 목록을 만듭니다.
+        """
+        offset = KST_OFFSET if seconds >= 86400 or month else 0
+        candles = []
+        current_key = None
+        for bar in reversed(market.bars):
+            start = bar[0]
+            if to is not None and start >= to:
+                continue
+            if month:
+                kst = time.gmtime(start + KST_OFFSET)
+                key = kst.tm_year * 12 + kst.tm_mon
+            elif seconds == 604800:
+                # 주봉은 월요일 시작 (KST)
+                key = math.floor((start + offset - 4 * 86400) / seconds)
+            else:
+                key = math.floor((start + offset) / seconds)
+            if key != current_key:
+                if len(candles) == count:
+                    break
+                current_key = key
+                if month:
+                    kst = time.gmtime(start + KST_OFFSET)
+                    bucket = _parse_kst(f"{kst.tm_year:04d}-{kst.tm_mon:02d}-01 00:00:00")
+                elif seconds == 604800:
+                    bucket = key * seconds + 4 * 86400 - offset
+                else:
+                    bucket = key * seconds - offset
+                candles.append({
+                    "market": market.market,
+                    "candle_date_time_utc": _utc(bucket),
+                    "candle_date_time_kst": _kst(bucket),
+                    "opening_price": bar[1],
+                    "high_price": bar[2],
+                    "low_price": bar[3],
+                    "trade_price": bar[4],
+                    "timestamp": int(bar[0] * 1000),
+                    "candle_acc_trade_price": bar[6],
+                    "candle_acc_trade_volume": bar[5],
+                })
+            else:
+                candle = candles[-1]
+                candle["opening_price"] = bar[1]  # 역순으로 읽으므로 가장 이른 분봉의 시가
+                candle["high_price"] = max(candle["high_price"], bar[2])
+                candle["low_price"] = min(candle["low_price"], bar[3])
+                candle["candle_acc_trade_price"] += bar[6]
+                candle["candle_acc_trade_volume"] += bar[5]
+        return candles
+
+    def candles(self, kind, market_name, count=1, to=None, unit=None):
+        market = self._market(market_name)
+        count = max(1, min(int(count), 200))
+        to = _parse_kst(to) if to else None
+        with self._lock:
+            if kind == "minutes":
+                if unit not in MINUTE_UNITS:
+                    raise SimulatorError(400, "invalid_unit", f"unit must be one of {MINUTE_UNITS}")
+                candles = self._aggregate(market, unit * 60, count, to)
+                for candle in candles:
+                    candle["unit"] = unit
+                return candles
+            if kind == "days":
+                return self._aggregate(market, 86400, count, to)
+            if kind == "weeks":
+                return self._aggregate(market, 604800, count, to)
+            if kind == "months":
+                return self._aggregate(market, None, count, to, month=True)
+        raise SimulatorError(404, "not_found", f"unknown candle type {kind}")
+
+    def trades_ticks(self, market_name, count=1, cursor=None):
+        market = self._market(market_name)
+        with self._lock:
+            trades = list(market.trades)
+        if cursor is not None:
+            # cursor(sequential_id)보다 이전 체결부터
+            trades = [t for t in trades if int(t[0] * 1000) < int(cursor)]
+        trades = trades[-max(1, min(int(count), 500)):]
+        return [
+            {
+                "market": market_name,
+                "trade_date_utc": _utc(ts)[:10],
+                "trade_time_utc": _utc(ts)[11:],
+                "timestamp": int(ts * 1000),
+                "trade_price": price,
+                "trade_volume": volume,
+                "ask_bid": ask_bid,
+                "sequential_id": int(ts * 1000),
+            }
+            for ts, price, volume, ask_bid in reversed(trades)
+        ]
+
+    def market_all(self):
+        return [{"market": m, "korean_name": m.split("-")[1], "english_name": m.split("-")[1]} for m in self.markets]
+
+    # ------------------------------------------------------------------
+    # HTTP 요청 처리
+    # ------------------------------------------------------------------
+    def handle(self, method, path, raw_query, body, authorization):
+        """
+        요청 하나를 처리하고 (HTTP 상태, JSON으로 보낼 객체)를 반환합니다.
+        """
+        # 서버 스레드마다 동시에 호출되므로 통계도 시뮬레이터 잠금 안에서 갱신
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats[f"{method} {path}"] += 1
+        try:
+            self.advance()
+            query = parse_qs(raw_query, keep_blank_values=True)
+
+            def arg(name, default=None):
+                values = query.get(name)
+                return values[0] if values else default
+
+            if path.startswith("/v1/candles/"):
+                parts = path[len("/v1/candles/"):].split("/")
+                unit = int(parts[1]) if parts[0] == "minutes" and len(parts) > 1 else None
+                return 200, self.candles(parts[0], arg("market"), arg("count", 1), arg("to"), unit)
+            if path == "/v1/orderbook" and method == "GET":
+                return 200, [self.orderbook(m) for m in arg("markets", "").split(",") if m]
+            if path == "/v1/ticker" and method == "GET":
+                return 200, [self.ticker(m) for m in arg("markets", "").split(",") if m]
+            if path == "/v1/trades/ticks" and method == "GET":
+                return 200, self.trades_ticks(arg("market"), arg("count", 1), arg("cursor"))
+            if path == "/v1/market/all" and method == "GET":
+                return 200, self.market_all()
+            if path == "/sim/stats" and method == "GET":
+                return 200, self.stats_view()
+
+            if method == "POST":
+                account = self.authenticate(authorization, urlencode(body or {}))
+            else:
+                account = self.authenticate(authorization, raw_query)
+            if path == "/v1/accounts" and method == "GET":
+                return 200, self.accounts_view(account)
+            if path == "/v1/orders/chance" and method == "GET":
+                return 200, self.order_chance(account, arg("market"))
+            if path == "/v1/orders" and method == "POST":
+                return 201, self.place_order(account, body or {})
+            if path == "/v1/orders" and method == "GET":
+                states = query.get("states[]") or ([arg("state")] if arg("state") else None)
+                return 200, self.list_orders(account, arg("market"), query.get("uuids[]"), states,
+                                             arg("page", 1), arg("limit", 100), arg("order_by", "desc"))
+            if path == "/v1/order" and method == "GET":
+                return 200, self.get_order(account, arg("uuid"))
+            if path == "/v1/order" and method == "DELETE":
+                return 200, self.cancel_order(account, arg("uuid"))
+            raise SimulatorError(404, "not_found", f"{method} {path} is not supported")
+        except SimulatorError as e:
+            with self._lock:
+                self.stats["errors"] += 1
+            return e.status, {"error": {"name": e.name, "message": e.message}}
+        except (KeyError, ValueError, TypeError) as e:
+            with self._lock:
+                self.stats["errors"] += 1
+            return 400, {"error": {"name": "invalid_parameter", "message": str(e)}}
+
+    def stats_view(self):
+        elapsed = time.time() - self._wall_start
+        with self._lock:
+            return {
+                "uptime_seconds": elapsed,
+                "requests_per_second": self.stats["requests"] / elapsed if elapsed > 0 else 0.0,
+                "simulated_time": _kst(self._sim_now),
+                "open_orders": sum(1 for o in self.orders.values() if o["state"] == "wait"),
+                "counts": dict(self.stats),
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    simulator = None
+
+    def _dispatch(self, method):
+        parts = urlsplit(self.path)
+        body = None
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            raw = self.rfile.read(length)
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                body = {k: v[0] for k, v in parse_qs(raw.decode()).items()}
+        status, payload = self.simulator.handle(method, parts.path, parts.query, body,
+                                                self.headers.get("Authorization"))
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SimulatorServer:
+    """
+    ExchangeSimulator를 HTTP로 제공하는 서버 (요청마다 스레드).
+
+    Parameters
+    ----------
+    simulator : ExchangeSimulator, optional
+        시뮬레이터. 생략 시 기본 설정으로 생성
+    host : str, optional (default "127.0.0.1")
+    port : int, optional (default 0)
+        0이면 빈 포트를 자동 선택
+
+    Examples
+    --------
+    >>> with SimulatorServer(ExchangeSimulator(default_secret="secret")) as server:
+    ...     python_bithumb.set_base_url(server.url)
+    ...     bithumb = Bithumb("key", "secret", base_url=server.url)
+    """
+
+    def __init__(self, simulator=None, host="127.0.0.1", port=0):
+        self.simulator = simulator or ExchangeSimulator()
+        handler = type("SimulatorHandler", (_Handler,), {"simulator": self.simulator})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="SimulatorServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local exchange simulator serving the Bithumb /v1 REST API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--markets", help="comma separated markets, e.g. KRW-BTC,KRW-XRP")
+    parser.add_argument("--secret", default="simulator-secret", help="secret key accepted for any access key")
+    parser.add_argument("--speed", type=float, default=1.0, help="simulated seconds per wall-clock second")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    markets = args.markets.split(",") if args.markets else None
+    server = SimulatorServer(ExchangeSimulator(markets, default_secret=args.secret, speed=args.speed, seed=args.seed),
+                             host=args.host, port=args.port)
+    print(f"Simulator listening on {server.url} (secret: {args.secret})")
+    try:
+        server.start()._thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.simulator.stats_view(), indent=2))
@@ -0,0 +1,351 @@
+# tick_store.py
+import os
+import threading
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from .candle_aggregator import KST_OFFSET
+from .public_api import get_trades_ticks
+
+# 컬럼 이름 -> dtype. 마켓/날짜 디렉토리에 컬럼마다 파일 하나 ({컬럼}.bin)
+COLUMNS = {
+    "timestamp": np.dtype("<i8"),  # 체결 시각 (UTC epoch 밀리초)
+    "price": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+    "side": np.dtype("i1"),  # 1: 매수(BID), -1: 매도(ASK), 0: 알 수 없음
+    "seq": np.dtype("<i8"),  # sequential_id (없으면 0). 중복 제거용
+}
+INDEX_FILE = "index.bin"
+SIDES = {"BID": 1, "ASK": -1}
+DAY_MS = 86400 * 1000
+
+TickSlice = namedtuple("TickSlice", ["day", "timestamp", "price", "volume", "side"])
+
+
+def to_millis(value) -> int:
+    """
+    시각을 UTC epoch 밀리초로 변환합니다. 정수는 그대로, 시간대 없는 시각은 KST로 봅니다 (get_ohlcv 인덱스와 같음).
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize(timezone(timedelta(seconds=KST_OFFSET)))
+    return int(ts.value // 1_000_000)
+
+
+def _day_of(ms: int) -> date:
+    return datetime.fromtimestamp(ms // 1000, tz=timezone.utc).date()
+
+
+def _day_start(day: date) -> int:
+    return int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp()) * 1000
+
+
+class TickDay:
+    """
+    한 마켓 하루(UTC)치 체결의 메모리 맵 컬럼.
+
+    timestamp, price, volume, side, seq는 파일을 그대로 가리키는 읽기 전용 np.memmap이며(복사 없음),
+    index는 index_stride행마다의 시각을 담은 희소 시각 인덱스입니다.
+    """
+
+    def __init__(self, path, day, index_stride):
+        self.path = path
+        self.day = day
+        self.index_stride = index_stride
+        sizes = [os.path.getsize(self._file(name)) // dtype.itemsize if os.path.exists(self._file(name)) else 0
+                 for name, dtype in COLUMNS.items()]
+        # 쓰다가 중단되어 컬럼 길이가 다르면 모든 컬럼에 있는 행까지만 사용
+        self.count = min(sizes)
+        for name, dtype in COLUMNS.items():
+            setattr(self, name, self._map(self._file(name), dtype, self.count))
+        index_path = os.path.join(path, INDEX_FILE)
+        index_count = min(-(-self.count // index_stride),
+                          os.path.getsize(index_path) // 8 if os.path.exists(index_path) else 0)
+        self.index = self._map(index_path, COLUMNS["timestamp"], index_count)
+
+    def _file(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    @staticmethod
+    def _map(path, dtype, count):
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    def __len__(self):
+        return self.count
+
+    def locate(self, ms: int) -> int:
+        """
+        시각이 ms 이상인 첫 행 번호. 희소 인덱스로 블록을 찾은 뒤 블록 안에서만 이진 탐색합니다.
+        """
+        if self.count == 0:
+            return 0
+        stride = self.index_stride
+        block = max(int(np.searchsorted(self.index, ms, side="left")) - 1, 0)
+        lo = block * stride
+        hi = min(lo + stride + 1, self.count) if block + 1 < len(self.index) else self.count
+        return lo + int(np.searchsorted(self.timestamp[lo:hi], ms, side="left"))
+
+    def slice(self, start=None, end=None) -> TickSlice:
+        """
+        [start, end) 구간 체결의 메모리 맵 뷰 (복사 없음).
+        """
+        lo = 0 if start is None else self.locate(start)
+        hi = self.count if end is None else self.locate(end)
+        hi = max(lo, hi)
+        return TickSlice(self.day, self.timestamp[lo:hi], self.price[lo:hi], self.volume[lo:hi], self.side[lo:hi])
+
+    def last_key(self):
+        if self.count == 0:
+            return None
+        return int(self.timestamp[-1]), int(self.seq[-1])
+
+
+class TickStore:
+    """
+    마켓/날짜(UTC)별 추가 전용 컬럼형 체결 저장소.
+
+    체결 시각, 가격, 수량, 매수/매도 구분을 컬럼별 바이너리 파일({root}/{market}/{YYYY-MM-DD}/{컬럼}.bin)에
+    이어 쓰고, index_stride행마다의 시각을 희소 인덱스(index.bin)로 둡니다. 조회와 집계(vwap,
+    volume_profile)는 파일을 np.memmap으로 열어 필요한 구간의 뷰만 사용하므로 한 달치 체결도
+    메모리에 모두 올리지 않고 분석할 수 있습니다.
+
+    하루 파일 안에서는 (시각, sequential_id) 순서를 유지하며, 이미 저장된 마지막 체결 이전의 체결은
+    중복으로 보고 버립니다 (겹쳐서 폴링한 get_trades_ticks 결과를 그대로 추가 가능).
+
+    Parameters
+    ----------
+    root : str
+        저장 디렉토리
+    index_stride : int, optional (default 1024)
+        희소 시각 인덱스 간격(행 수)
+    chunk_rows : int, optional (default 1,000,000)
+        집계 시 한 번에 처리할 최대 행 수 (임시 배열 크기 제한)
+    """
+
+    def __init__(self, root: str, index_stride: int = 1024, chunk_rows: int = 1_000_000):
+        self.root = root
+        self.index_stride = index_stride
+        self.chunk_rows = chunk_rows
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _path(self, market, day):
+        return os.path.join(self.root, market, day.isoformat())
+
+    def _lock(self, market):
+        with self._locks_lock:
+            return self._locks.setdefault(market, threading.Lock())
+
+    def markets(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def days(self, market):
+        """
+        체결이 저장된 날짜(UTC) 목록.
+        """
+        path = os.path.join(self.root, market)
+        if not os.path.isdir(path):
+            return []
+        return sorted(date.fromisoformat(name) for name in os.listdir(path) if len(name) == 10)
+
+    def day(self, market, day) -> TickDay:
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        return TickDay(self._path(market, day), day, self.index_stride)
+
+    # 추가
+
+    def append(self, market: str, trades) -> int:
+        """
+        체결을 추가하고 새로 저장한 행 수를 반환합니다.
+
+        Parameters
+        ----------
+        market : str
+            마켓 코드
+        trades : list of dict or pandas.DataFrame
+            get_trades_ticks 형식 (timestamp, trade_price, trade_volume, ask_bid, sequential_id). 순서 무관
+        """
+        if trades is None or len(trades) == 0:
+            return 0
+        df = trades if isinstance(trades, pd.DataFrame) else pd.DataFrame(list(trades))
+        side = df["ask_bid"].map(SIDES).fillna(0) if "ask_bid" in df else np.zeros(len(df))
+        seq = df["sequential_id"] if "sequential_id" in df else np.zeros(len(df))
+        return self.append_arrays(market, df["timestamp"], df["trade_price"], df["trade_volume"], side, seq)
+
+    def append_arrays(self, market, timestamp, price, volume, side=None, seq=None) -> int:
+        """
+        배열로 체결을 추가합니다. 날짜별로 나누어 (시각, seq) 순으로 정렬한 뒤 마지막 저장 체결 이후만 씁니다.
+        """
+        timestamp = np.asarray(timestamp, dtype=np.int64)
+        n = len(timestamp)
+        if n == 0:
+            return 0
+        columns = {
+            "timestamp": timestamp,
+            "price": np.asarray(price, dtype=np.float64),
+            "volume": np.asarray(volume, dtype=np.float64),
+            "side": np.zeros(n, dtype=np.int8) if side is None else np.asarray(side, dtype=np.int8),
+            "seq": np.zeros(n, dtype=np.int64) if seq is None else np.asarray(seq, dtype=np.int64),
+        }
+        order = np.lexsort((columns["seq"], timestamp))
+        columns = {name: values[order] for name, values in columns.items()}
+        days = columns["timestamp"] // DAY_MS
+        bounds = np.flatnonzero(np.r_[True, days[1:] != days[:-1], True])
+        written = 0
+        with self._lock(market):
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                day = _day_of(int(columns["timestamp"][lo]))
+                written += self._append_day(market, day, {name: values[lo:hi] for name, values in columns.items()})
+        return written
+
+    def _append_day(self, market, day, columns):
+        path = self._path(market, day)
+        os.makedirs(path, exist_ok=True)
+        current = TickDay(path, day, self.index_stride)
+        count, last = current.count, current.last_key()
+        del current
+        if last is not None:
+            ts, seq = columns["timestamp"], columns["seq"]
+            keep = (ts > last[0]) | ((ts == last[0]) & (seq > last[1]))
+            columns = {name: values[keep] for name, values in columns.items()}
+        # 같은 배치 안의 중복 제거
+        ts, seq = columns["timestamp"], columns["seq"]
+        if len(ts) > 1:
+            unique = np.r_[True, (ts[1:] != ts[:-1]) | (seq[1:] != seq[:-1])]
+            columns = {name: values[unique] for name, values in columns.items()}
+        added = len(columns["timestamp"])
+        if added == 0:
+            return 0
+        for name, dtype in COLUMNS.items():
+            file = os.path.join(path, f"{name}.bin")
+            with open(file, "ab") as f:
+                # 중단으로 길이가 어긋난 컬럼은 공통 행 수로 맞춘 뒤 추가
+                if f.tell() != count * dtype.itemsize:
+                    f.truncate(count * dtype.itemsize)
+                    f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+        stride = self.index_stride
+        index_path = os.path.join(path, INDEX_FILE)
+        expected = -(-count // stride) * 8
+        if (os.path.getsize(index_path) if os.path.exists(index_path) else 0) != expected:
+            # 인덱스를 쓰기 전에 중단된 경우 저장된 시각 컬럼으로 다시 만듦
+            stored = np.fromfile(os.path.join(path, "timestamp.bin"), dtype=COLUMNS["timestamp"], count=count)
+            stored[::stride].astype("<i8").tofile(index_path)
+        rows = np.arange(count, count + added)
+        marks = rows[rows % stride == 0]
+        with open(index_path, "ab") as f:
+            f.write(columns["timestamp"][marks - count].astype("<i8").tobytes())
+        return added
+
+    def poll(self, market: str, count: int = 500, trades_fn=None) -> int:
+        """
+        최근 체결을 조회해 추가합니다 (이미 저장된 체결은 건너뜀).
+        """
+        trades_fn = trades_fn or get_trades_ticks
+        return self.append(market, trades_fn(market, count=count))
+
+    # 조회와 집계
+
+    def slices(self, market, start=None, end=None):
+        """
+        [start, end) 구간 체결을 날짜별 메모리 맵 뷰(TickSlice)로 차례대로 반환합니다.
+
+        start/end는 UTC epoch 밀리초 또는 시각 (시간대 없으면 KST).
+        """
+        start = None if start is None else to_millis(start)
+        end = None if end is None else to_millis(end)
+        for day in self.days(market):
+            day_start = _day_start(day)
+            if end is not None and day_start >= end:
+                break
+            if start is not None and day_start + DAY_MS <= start:
+                continue
+            view = self.day(market, day).slice(start, end)
+            if len(view.timestamp):
+                yield view
+
+    def _chunks(self, market, start, end):
+        step = self.chunk_rows
+        for view in self.slices(market, start, end):
+            for lo in range(0, len(view.timestamp), step):
+                yield TickSlice(view.day, *(values[lo:lo + step] for values in view[1:]))
+
+    def range(self, market, start=None, end=None) -> pd.DataFrame:
+        """
+        구간 체결을 DataFrame으로 복사해 반환합니다 (작은 구간용). 큰 구간은 slices()를 사용하세요.
+        """
+        views = list(self.slices(market, start, end))
+        if not views:
+            return pd.DataFrame(columns=["timestamp", "price", "volume", "side"])
+        return pd.DataFrame({name: np.concatenate([getattr(view, name) for view in views])
+                             for name in ("timestamp", "price", "volume", "side")})
+
+    def count(self, market, start=None, end=None) -> int:
+        return sum(len(view.timestamp) for view in self.slices(market, start, end))
+
+    def vwap(self, market, start=None, end=None, side=None):
+        """
+        구간 거래량 가중 평균 가격 (체결이 없으면 None). side=1/-1이면 매수/매도 체결만.
+        """
+        value = volume = 0.0
+        for view in self._chunks(market, start, end):
+            if side is None:
+                value += float(np.dot(view.price, view.volume))
+                volume += float(view.volume.sum())
+            else:
+                mask = view.side == side
+                value += float(np.dot(view.price[mask], view.volume[mask]))
+                volume += float(view.volume[mask].sum())
+        return value / volume if volume else None
+
+    def volume_profile(self, market, start=None, end=None, bin_size=None, bins=None) -> pd.DataFrame:
+        """
+        가격대별 거래량 (매수/매도 체결 구분 포함).
+
+        Parameters
+        ----------
+        bin_size : float, optional
+            가격 구간 크기. 생략 시 bins 사용
+        bins : int, optional
+            bin_size 생략 시 구간 [최저가, 최고가]를 나눌 개수 (기본 50)
+
+        Returns
+        -------
+        pandas.DataFrame
+            price(구간 하한) 인덱스, volume / buy_volume / sell_volume 컬럼
+        """
+        if bin_size is None:
+            low, high = np.inf, -np.inf
+            for view in self._chunks(market, start, end):
+                low, high = min(low, float(view.price.min())), max(high, float(view.price.max()))
+            if low > high:
+                return pd.DataFrame(columns=["volume", "buy_volume", "sell_volume"])
+            bin_size = (high - low) / (bins or 50) or 1.0
+        totals = {}
+        for view in self._chunks(market, start, end):
+            keys = np.floor(view.price / bin_size).astype(np.int64)
+            for column, mask in (("volume", None), ("buy_volume", view.side == 1), ("sell_volume", view.side == -1)):
+                k = keys if mask is None else keys[mask]
+                v = view.volume if mask is None else view.volume[mask]
+                if not len(k):
+                    continue
+                uniq, inverse = np.unique(k, return_inverse=True)
+                sums = np.bincount(inverse, weights=v)
+                part = totals.setdefault(column, {})
+                for key, amount in zip(uniq.tolist(), sums.tolist()):
+                    part[key] = part.get(key, 0.0) + amount
+        keys = sorted(set().union(*[part.keys() for part in totals.values()])) if totals else []
+        profile = pd.DataFrame({column: [totals.get(column, {}).get(key, 0.0) for key in keys]
+                                for column in ("volume", "buy_volume", "sell_volume")},
+                               index=pd.Index(np.array(keys, dtype=np.float64) * bin_size, name="price"))
+        return profile
@@ -16,8 +16,19 @@ setuptools.setup(
     install_requires=[
         "requests>=2.0.0",
         "pyjwt>=2.0.0",
-        "pandas>=1.0.0"
+        "pandas>=1.0.0",
+        # bot.percentile.RollingPercentile의 정렬 컨테이너 (추가/제거 O(log n))
+        "sortedcontainers>=2.0.0",
     ],
+    extras_require={
+        # bithumb-download의 parquet/feather 저장
+        "history": ["pyarrow>=7.0.0"],
+    },
+    entry_points={
+        "console_scripts": [
+            "bithumb-download=python_bithumb.downloader:main",
+        ],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: Apache Software License",